@@ -83,7 +83,8 @@ node_pair : list (x number of possible link states)
     
 event_queue : heap of Event objects
     Queue containing all future transition events, sorted by time of occurrence
-    (from soonest to latest).
+    (from soonest to latest). Only used by the default 'heap' engine (see
+    below).
     
 next_update : 1d array (x number of active links)
     Time (in the future) at which the link will undergo its next transition.
@@ -116,6 +117,18 @@ xn_to : 2d array of ints (# possible link states x max. # transitions)
 xn_rate : 2d array of floats (# possible link states x max. # transitions)
     Rate associated with each link-state transition.
 
+Event engines
+-------------
+By default (engine='heap'), each scheduled transition is an Event object on a
+heapq priority queue, and its time is drawn from numpy one at a time. With
+engine='indexed', events are handled by a compiled EventEngine instead: each
+active link has at most one scheduled transition, held in an array-backed heap
+indexed by link and keyed on *next_update* (so a rescheduled link is moved in
+the heap rather than leaving a stale event behind), random numbers are drawn
+in batches, and transitions are carried out in compiled code, returning to
+Python only for property-update callbacks and plotting. With this engine,
+node states are held as integers.
+
 
 Created GT Sep 2014, starting from link_ca.py.
 """
@@ -127,6 +140,8 @@ import landlab
 import numpy
 import pylab as plt
 
+from .cfuncs import EventEngine
+
 _NEVER = 1e50
 
 _DEBUG = False
@@ -302,7 +317,8 @@ class CellLabCTSModel(object):
     determined by the states of the cell pair.
     """
     def __init__(self, model_grid, node_state_dict, transition_list,
-                 initial_node_states, prop_data=None, prop_reset_value=None):
+                 initial_node_states, prop_data=None, prop_reset_value=None,
+                 engine='heap'):
         """
         LandlabCellularAutomaton() constructor initializes the CA model.
         
@@ -321,7 +337,14 @@ class CellLabCTSModel(object):
             Array of properties associated with each node/cell
         prop_reset_value : (scalar; same type as entries in prop_data) (optional)
             Default or initial value for a node/cell property (e.g., 0.0)
+        engine : {'heap', 'indexed'} (optional)
+            Event engine to use (see module documentation)
         """
+        if engine not in ('heap', 'indexed'):
+            raise ValueError('engine must be either heap or indexed')
+        self._engine_type = engine
+        self._engine = None
+
         # Are we calling this from a subclass __init__? If so, then the 
         # variable self.number_of_orientations should already be defined.
         try:
@@ -336,10 +359,9 @@ class CellLabCTSModel(object):
         
         # Create an array that knows which links are connected to a boundary 
         # node
-        self.bnd_lnk = numpy.zeros(self.grid.number_of_links, dtype=bool)
-        for link_id in range(self.grid.number_of_links):
-            if self.grid.node_status[self.grid.node_at_link_tail[link_id]]!=_CORE or self.grid.node_status[self.grid.node_at_link_head[link_id]]!=_CORE:
-                self.bnd_lnk[link_id] = True
+        self.bnd_lnk = numpy.logical_or(
+            self.grid.node_status[self.grid.node_at_link_tail]!=_CORE,
+            self.grid.node_status[self.grid.node_at_link_head]!=_CORE)
 
         # Set up the initial node-state grid
         self.set_node_state_grid(initial_node_states)
@@ -418,9 +440,6 @@ class CellLabCTSModel(object):
         # Create transition data for links
         self.setup_transition_data(transition_list_as_ID)
 
-        # Put the various transitions on the event queue
-        self.push_transitions_to_event_queue()
-        
         # In order to keep track of cell "properties", we create an array of
         # indices that refer to locations in the caller's code where properties
         # are tracked.
@@ -431,6 +450,12 @@ class CellLabCTSModel(object):
         else:
             self.prop_data = prop_data
             self.prop_reset_value = prop_reset_value
+
+        if self._engine_type == 'indexed':
+            self.setup_event_engine()
+
+        # Put the various transitions on the event queue
+        self.push_transitions_to_event_queue()
         
 
     def set_node_state_grid(self, node_states):
@@ -457,8 +482,12 @@ class CellLabCTSModel(object):
                'initial_node_states must be a Numpy array'
         assert (len(node_states)==self.grid.number_of_nodes), \
                'length of initial_node_states must equal number of nodes in grid'
+        if self._engine_type == 'indexed' and node_states.dtype != numpy.int:
+            node_states = node_states.astype(numpy.int)
         self.grid.at_node['node_state'] = node_states
         self.node_state = node_states
+        if self._engine is not None:
+            self._engine.set_node_state(self.node_state)
         
                  
     def create_link_state_dict_and_pair_list(self):
@@ -524,13 +553,8 @@ class CellLabCTSModel(object):
         to link states.
         """
         self.link_state = numpy.zeros(self.grid.number_of_links, dtype=int)
-    
-        for i in self.grid.active_links:
-            orientation = self.link_orientation[i]
-            node_pair = (self.node_state[self.grid.node_at_link_tail[i]],
-                         self.node_state[self.grid.node_at_link_head[i]],
-                         orientation)
-            self.link_state[i] = self.link_state_dict[node_pair]
+        self.link_state[self.grid.active_links] = \
+            self.current_link_states(self.grid.active_links)
                     
         if False and _DEBUG:
             print()
@@ -589,6 +613,39 @@ class CellLabCTSModel(object):
             print(('  rate:',self.xn_rate))
             
             
+    def setup_event_engine(self):
+        """
+        Creates the compiled EventEngine used with engine='indexed'.
+
+        The transitions are flattened so that those out of link state *s*
+        are numbered from self.xn_offset[s] to self.xn_offset[s+1]-1.
+        """
+        n_xn_from_state = self.n_xn
+        self.xn_offset = numpy.zeros(self.num_link_states + 1, dtype=numpy.int)
+        numpy.cumsum(n_xn_from_state, out=self.xn_offset[1:])
+        has_xn = (numpy.arange(self.xn_to.shape[1]) <
+                  n_xn_from_state.reshape((-1, 1)))
+
+        self._xn_prop_update_fn = self.xn_prop_update_fn[has_xn]
+        self._xn_propswap = self.xn_propswap[has_xn]
+        has_callback = numpy.array([fn is not None
+                                    for fn in self._xn_prop_update_fn],
+                                   dtype=bool)
+
+        is_core = self.grid.node_status == _CORE
+        self._engine = EventEngine(
+            numpy.ascontiguousarray(self.grid.node_at_link_tail, dtype=numpy.int),
+            numpy.ascontiguousarray(self.grid.node_at_link_head, dtype=numpy.int),
+            self.link_orientation,
+            numpy.ascontiguousarray(self.node_active_links.T, dtype=numpy.int),
+            is_core.view(numpy.uint8), self.bnd_lnk.view(numpy.uint8),
+            self.xn_offset, self.xn_to[has_xn], self.xn_rate[has_xn],
+            self._xn_propswap.view(numpy.uint8),
+            has_callback.view(numpy.uint8), self.num_node_states,
+            self.next_update, self.propid)
+        self._engine.set_node_state(self.node_state)
+
+
     def current_link_state(self, link_id):
         """
         Used to determine whether the link state at link *link_id* has changed 
@@ -626,6 +683,43 @@ class CellLabCTSModel(object):
         return orientation*self.num_node_states_sq+tail_node_state*self.num_node_states+head_node_state
         
         
+    def current_link_states(self, links):
+        """
+        Vectorized version of current_link_state(): returns the current
+        state of each of *links*, based on the states of their end nodes.
+        
+        Parameters
+        ----------
+        links : array of ints
+            IDs of the links
+            
+        Returns
+        -------
+        array of ints
+            Link state codes
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components.cellular_automata.celllab_cts import Transition
+        >>> from landlab.components.cellular_automata.oriented_raster_cts import OrientedRasterCTS
+        >>> mg = RasterModelGrid(3, 3, 1.0)
+        >>> nsg = mg.add_zeros('node', 'node_state_grid', dtype=int)
+        >>> xnlist = [Transition((0,1,0), (1,1,0), 1.0, 'hopping')]
+        >>> ca = OrientedRasterCTS(mg, {0 : 'oui', 1 : 'non'}, xnlist, nsg)
+        >>> nsg[4] = 1
+        >>> ca.current_link_states(mg.active_links)
+        array([5, 6, 1, 2])
+        >>> [ca.current_link_state(link) for link in mg.active_links]
+        [5, 6, 1, 2]
+        """
+        tail_node_state = self.node_state[self.grid.node_at_link_tail[links]]
+        head_node_state = self.node_state[self.grid.node_at_link_head[links]]
+        states = (self.link_orientation[links]*self.num_node_states_sq +
+                  tail_node_state*self.num_node_states + head_node_state)
+        return states.astype(int, copy=False)
+        
+        
     def update_link_states_and_transitions(self, current_time):
         """
         Following an "external" change to the node state grid, updates link
@@ -633,15 +727,22 @@ class CellLabCTSModel(object):
         
         Algorithm
         ---------
-            FOR each active link:
-                if the actual node pair is different from the link's code:
-                    change the link state to be correct
-                    schedule an event
+            Find the current state of every active link (vectorized)
+            FOR each active link whose state differs from the link's code:
+                change the link state to be correct
+                schedule an event
         """
-        for i in self.grid.active_links:
-        ###for i in range(self.grid.number_of_active_links):
-            current_state = self.current_link_state(i)
-            if current_state!=self.link_state[i]:
+        links = self.grid.active_links
+        current_states = self.current_link_states(links)
+        changed = current_states!=self.link_state[links]
+        links = links[changed].astype(int)
+        current_states = current_states[changed]
+
+        if self._engine is not None:
+            self._engine.update_link_states(links, current_states,
+                                            current_time)
+        else:
+            for i, current_state in zip(links, current_states):
                 self.update_link_state(i, current_state, current_time)
                 
     
@@ -720,6 +821,11 @@ class CellLabCTSModel(object):
         """
         if _DEBUG:
             print(('push_transitions_to_event_queue():', self.num_link_states, self.n_xn))
+
+        if self._engine is not None:
+            self._engine.reset(self.node_state, self.link_state,
+                               self.grid.active_links.astype(numpy.int), 0.0)
+            return
             
         for i in self.grid.active_links:
         ###for i in range(self.grid.number_of_active_links):
@@ -792,6 +898,10 @@ class CellLabCTSModel(object):
         current_time : float
             Current time in simulation
         """
+        if self._engine is not None:
+            self._engine.update_link_state(link, new_link_state, current_time)
+            return
+
 #        if _DEBUG:
 #            print()
 #            print('update_link_state()')
@@ -965,10 +1075,12 @@ class CellLabCTSModel(object):
         *new_node_state_array* is the updated list of node states, which must
         still all be compatible with the state list originally supplied to
         this component.
+
+        Only the links whose states have changed are given new transitions;
+        these are scheduled from the model's current time.
         """
         self.set_node_state_grid(new_node_state_array)
-        self.assign_link_states_from_node_types()
-        self.push_transitions_to_event_queue()
+        self.update_link_states_and_transitions(self.current_time)
         
                   
     def run(self, run_duration, node_state_grid=None, plot_each_transition=False,
@@ -989,6 +1101,10 @@ class CellLabCTSModel(object):
         """
         if node_state_grid is not None:
             self.set_node_state_grid(node_state_grid)
+
+        if self._engine is not None:
+            self._run_event_engine(run_duration, plot_each_transition, plotter)
+            return
     
         # Continue until we've run out of either time or events
         while self.current_time < run_duration and self.event_queue:
@@ -1007,6 +1123,41 @@ class CellLabCTSModel(object):
             # Update current time
             self.current_time = ev.time
 
+
+    def _run_event_engine(self, run_duration, plot_each_transition=False,
+                          plotter=None):
+        """
+        Runs the model forward with the compiled event engine, handling
+        plotting and property updates (which need Python) as the engine
+        hands them back.
+        """
+        engine = self._engine
+        plot_each_transition = plot_each_transition and (plotter is not None)
+
+        engine.current_time = self.current_time
+        xn = engine.run(run_duration, plot_each_transition)
+        while xn >= 0:
+            tail_node = self.grid.node_at_link_tail[engine.last_link]
+            head_node = self.grid.node_at_link_head[engine.last_link]
+
+            if plot_each_transition:
+                plotter.update_plot()
+
+            # The engine has swapped the property IDs; reset boundary
+            # properties and make any callback here.
+            if self._xn_propswap[xn]:
+                if self.grid.node_status[tail_node]!=_CORE:
+                    self.prop_data[self.propid[tail_node]] = self.prop_reset_value
+                if self.grid.node_status[head_node]!=_CORE:
+                    self.prop_data[self.propid[head_node]] = self.prop_reset_value
+                if self._xn_prop_update_fn[xn] is not None:
+                    self._xn_prop_update_fn[xn](self, tail_node, head_node,
+                                                engine.current_time)
+
+            xn = engine.run(run_duration, plot_each_transition)
+
+        self.current_time = engine.current_time
+
             
     
 if __name__ == "__main__":
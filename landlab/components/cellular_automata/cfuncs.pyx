@@ -0,0 +1,402 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+DTYPE_INT = np.int
+ctypedef np.int_t DTYPE_INT_t
+
+ctypedef np.uint8_t DTYPE_BOOL_t
+
+
+cdef double _NEVER = 1e50
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef class EventEngine:
+    """Array-backed event queue and transition engine for CellLab-CTS.
+
+    Each active link has at most one scheduled transition. The links are held
+    in a binary heap, indexed by link, and keyed on the link's *next_update*
+    time, so rescheduling a link moves it within the heap rather than pushing
+    another event and waiting for the old one to be discarded. Transition
+    times are drawn from a buffer of exponential random numbers that is
+    refilled, from numpy's global random state, in batches.
+
+    Parameters
+    ----------
+    tail, head : ndarray of int
+        Tail and head node of each link.
+    link_orientation : ndarray of int
+        Orientation code of each link.
+    node_links : ndarray of int, shape (n_nodes, max_links_per_node)
+        Active links at each node, padded with -1.
+    is_core : ndarray of uint8
+        1 for core nodes, 0 otherwise.
+    bnd_lnk : ndarray of uint8
+        1 for links that touch a boundary node, 0 otherwise.
+    trn_offset : ndarray of int
+        Index of the first transition out of each link state (transitions out
+        of state *s* are *trn_offset[s]* to *trn_offset[s + 1] - 1*).
+    trn_to : ndarray of int
+        New link state for each transition.
+    trn_rate : ndarray of float
+        Rate of each transition.
+    trn_propswap : ndarray of uint8
+        1 for transitions that swap properties, 0 otherwise.
+    trn_has_callback : ndarray of uint8
+        1 for transitions that have a property update function, 0 otherwise.
+    num_node_states : int
+        Number of node states.
+    next_update : ndarray of float
+        Time of the next transition at each link.
+    propid : ndarray of int
+        Property ID of each node.
+    batch_size : int, optional
+        Number of random numbers to draw at a time.
+    """
+    cdef DTYPE_INT_t[:] tail
+    cdef DTYPE_INT_t[:] head
+    cdef DTYPE_INT_t[:] orientation
+    cdef DTYPE_INT_t[:, :] node_links
+    cdef DTYPE_BOOL_t[:] is_core
+    cdef DTYPE_BOOL_t[:] bnd_lnk
+    cdef DTYPE_INT_t[:] trn_offset
+    cdef DTYPE_INT_t[:] trn_to
+    cdef DTYPE_FLOAT_t[:] trn_rate
+    cdef DTYPE_BOOL_t[:] trn_propswap
+    cdef DTYPE_BOOL_t[:] trn_has_callback
+    cdef DTYPE_FLOAT_t[:] next_update
+    cdef DTYPE_INT_t[:] propid
+    cdef DTYPE_INT_t[:] node_state
+    cdef DTYPE_INT_t[:] link_state
+
+    cdef DTYPE_INT_t[:] heap
+    cdef DTYPE_INT_t[:] heap_pos
+    cdef Py_ssize_t heap_size
+    cdef DTYPE_INT_t[:] next_trn
+
+    cdef object _random_buffer
+    cdef DTYPE_FLOAT_t[:] random
+    cdef Py_ssize_t random_index
+
+    cdef DTYPE_INT_t n_states
+    cdef DTYPE_INT_t n_states_sq
+
+    cdef public double current_time
+    cdef public DTYPE_INT_t last_link
+
+    def __init__(self, tail, head, link_orientation, node_links, is_core,
+                 bnd_lnk, trn_offset, trn_to, trn_rate, trn_propswap,
+                 trn_has_callback, num_node_states, next_update, propid,
+                 batch_size=65536):
+        n_links = len(tail)
+
+        self.tail = tail
+        self.head = head
+        self.orientation = link_orientation
+        self.node_links = node_links
+        self.is_core = is_core
+        self.bnd_lnk = bnd_lnk
+        self.trn_offset = trn_offset
+        self.trn_to = trn_to
+        self.trn_rate = trn_rate
+        self.trn_propswap = trn_propswap
+        self.trn_has_callback = trn_has_callback
+        self.next_update = next_update
+        self.propid = propid
+
+        self.n_states = num_node_states
+        self.n_states_sq = num_node_states * num_node_states
+
+        self.heap = np.empty(n_links, dtype=int)
+        self.heap_pos = np.full(n_links, -1, dtype=int)
+        self.heap_size = 0
+        self.next_trn = np.full(n_links, -1, dtype=int)
+
+        self._random_buffer = np.empty(batch_size, dtype=float)
+        self.random = self._random_buffer
+        self.random_index = batch_size
+
+        self.current_time = 0.
+        self.last_link = -1
+
+    property size:
+        """Number of links with a scheduled transition."""
+        def __get__(self):
+            return self.heap_size
+
+    def next_transition_at_link(self, DTYPE_INT_t link):
+        """Index of the transition scheduled at *link* (-1 if none)."""
+        return self.next_trn[link]
+
+    def set_node_state(self, np.ndarray[DTYPE_INT_t, ndim=1] node_state):
+        """Use *node_state* as the array of node states."""
+        self.node_state = node_state
+
+    def reset(self, np.ndarray[DTYPE_INT_t, ndim=1] node_state,
+              np.ndarray[DTYPE_INT_t, ndim=1] link_state,
+              np.ndarray[DTYPE_INT_t, ndim=1] links, double current_time):
+        """Empty the queue and schedule a transition at each of *links*.
+
+        Parameters
+        ----------
+        node_state : ndarray of int
+            Node states.
+        link_state : ndarray of int
+            Link states (which must match the node states).
+        links : ndarray of int
+            IDs of the links to schedule (the active links).
+        current_time : float
+            Time from which to schedule.
+        """
+        cdef Py_ssize_t i
+
+        self.node_state = node_state
+        self.link_state = link_state
+
+        for i in range(self.heap_size):
+            self.heap_pos[self.heap[i]] = -1
+        self.heap_size = 0
+
+        for i in range(links.shape[0]):
+            self._set_link_state(links[i], link_state[links[i]], current_time)
+
+    def update_link_state(self, DTYPE_INT_t link, DTYPE_INT_t new_link_state,
+                          double current_time):
+        """Set the state of *link* and schedule its next transition.
+
+        Parameters
+        ----------
+        link : int
+            ID of the link.
+        new_link_state : int
+            New state of the link (recalculated from the node states if the
+            link touches a boundary).
+        current_time : float
+            Time from which to schedule.
+        """
+        self._set_link_state(link, new_link_state, current_time)
+
+    def update_link_states(self, np.ndarray[DTYPE_INT_t, ndim=1] links,
+                           np.ndarray[DTYPE_INT_t, ndim=1] new_link_states,
+                           double current_time):
+        """Set the states of *links* and schedule their next transitions.
+
+        Parameters
+        ----------
+        links : ndarray of int
+            IDs of the links.
+        new_link_states : ndarray of int
+            New state of each link.
+        current_time : float
+            Time from which to schedule.
+        """
+        cdef Py_ssize_t i
+
+        for i in range(links.shape[0]):
+            self._set_link_state(links[i], new_link_states[i], current_time)
+
+    def run(self, double run_duration, bint stop_after_each=False):
+        """Carry out transitions until *current_time* reaches *run_duration*.
+
+        Returns early, after carrying out a transition, if the caller has
+        more to do for it: if it swaps properties with a boundary node or has
+        a property update function (or after every transition, if
+        *stop_after_each* is set). The link is then in *last_link*.
+
+        Parameters
+        ----------
+        run_duration : float
+            Time at which to stop.
+        stop_after_each : bool, optional
+            Return after every transition.
+
+        Returns
+        -------
+        int
+            Index of the transition carried out, or -1 if the run finished.
+        """
+        cdef DTYPE_INT_t link
+        cdef DTYPE_INT_t trn
+        cdef DTYPE_INT_t tail
+        cdef DTYPE_INT_t head
+        cdef DTYPE_INT_t propid
+        cdef double event_time
+
+        while self.current_time < run_duration and self.heap_size > 0:
+            link = self.heap[0]
+            event_time = self.next_update[link]
+            trn = self.next_trn[link]
+
+            tail = self.tail[link]
+            head = self.head[link]
+            self._do_transition(link, trn, event_time)
+            self.current_time = event_time
+
+            if self.trn_propswap[trn]:
+                propid = self.propid[tail]
+                self.propid[tail] = self.propid[head]
+                self.propid[head] = propid
+                if (self.trn_has_callback[trn] or not self.is_core[tail] or
+                        not self.is_core[head]):
+                    self.last_link = link
+                    return trn
+
+            if stop_after_each:
+                self.last_link = link
+                return trn
+
+        return -1
+
+    cdef void _do_transition(self, DTYPE_INT_t link, DTYPE_INT_t trn,
+                             double event_time):
+        """Change the states of a link's nodes and update its links."""
+        cdef DTYPE_INT_t tail = self.tail[link]
+        cdef DTYPE_INT_t head = self.head[link]
+        cdef DTYPE_INT_t new_state = self.trn_to[trn]
+        cdef DTYPE_INT_t old_tail_state = self.node_state[tail]
+        cdef DTYPE_INT_t old_head_state = self.node_state[head]
+
+        if self.is_core[tail]:
+            self.node_state[tail] = (
+                (new_state % self.n_states_sq) // self.n_states)
+        if self.is_core[head]:
+            self.node_state[head] = new_state % self.n_states
+
+        self._set_link_state(link, new_state, event_time)
+
+        if self.node_state[tail] != old_tail_state:
+            self._update_links_at_node(tail, link, event_time)
+        if self.node_state[head] != old_head_state:
+            self._update_links_at_node(head, link, event_time)
+
+    cdef void _update_links_at_node(self, DTYPE_INT_t node,
+                                    DTYPE_INT_t except_link,
+                                    double event_time):
+        """Recalculate the state of the links at a node that changed state."""
+        cdef Py_ssize_t i
+        cdef DTYPE_INT_t link
+
+        for i in range(self.node_links.shape[1]):
+            link = self.node_links[node, i]
+            if link != -1 and link != except_link:
+                self._set_link_state(link, self._link_state_from_nodes(link),
+                                     event_time)
+
+    cdef inline DTYPE_INT_t _link_state_from_nodes(self, DTYPE_INT_t link):
+        return (self.orientation[link] * self.n_states_sq +
+                self.node_state[self.tail[link]] * self.n_states +
+                self.node_state[self.head[link]])
+
+    cdef void _set_link_state(self, DTYPE_INT_t link,
+                              DTYPE_INT_t new_link_state,
+                              double current_time):
+        """Set a link's state and (re)schedule its next transition."""
+        cdef DTYPE_INT_t first
+        cdef DTYPE_INT_t last
+        cdef DTYPE_INT_t trn
+        cdef DTYPE_INT_t next_trn = -1
+        cdef double next_time = _NEVER
+        cdef double this_time
+
+        if self.bnd_lnk[link]:
+            new_link_state = self._link_state_from_nodes(link)
+        self.link_state[link] = new_link_state
+
+        first = self.trn_offset[new_link_state]
+        last = self.trn_offset[new_link_state + 1]
+        for trn in range(first, last):
+            this_time = self._draw_exponential() / self.trn_rate[trn]
+            if this_time < next_time:
+                next_time = this_time
+                next_trn = trn
+
+        self.next_trn[link] = next_trn
+        if next_trn >= 0:
+            self.next_update[link] = current_time + next_time
+            self._heap_update(link)
+        else:
+            self.next_update[link] = _NEVER
+            self._heap_remove(link)
+
+    cdef double _draw_exponential(self):
+        """Next standard exponential random number from the buffer."""
+        if self.random_index == self.random.shape[0]:
+            self._random_buffer[:] = np.random.exponential(
+                1., self.random.shape[0])
+            self.random_index = 0
+        self.random_index += 1
+        return self.random[self.random_index - 1]
+
+    cdef void _heap_update(self, DTYPE_INT_t link):
+        """Add *link* to the heap, or move it after its key has changed."""
+        cdef Py_ssize_t i = self.heap_pos[link]
+
+        if i < 0:
+            i = self.heap_size
+            self.heap_size += 1
+            self.heap[i] = link
+            self.heap_pos[link] = i
+            self._sift_up(i)
+        elif i > 0 and (self.next_update[link] <
+                        self.next_update[self.heap[(i - 1) // 2]]):
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    cdef void _heap_remove(self, DTYPE_INT_t link):
+        """Remove *link* from the heap, if it is there."""
+        cdef Py_ssize_t i = self.heap_pos[link]
+        cdef DTYPE_INT_t last
+
+        if i < 0:
+            return
+
+        self.heap_pos[link] = -1
+        self.heap_size -= 1
+        if i < self.heap_size:
+            last = self.heap[self.heap_size]
+            self.heap[i] = last
+            self.heap_pos[last] = i
+            self._heap_update(last)
+
+    cdef void _sift_up(self, Py_ssize_t i):
+        cdef DTYPE_INT_t link = self.heap[i]
+        cdef double key = self.next_update[link]
+        cdef Py_ssize_t parent
+
+        while i > 0:
+            parent = (i - 1) // 2
+            if key >= self.next_update[self.heap[parent]]:
+                break
+            self.heap[i] = self.heap[parent]
+            self.heap_pos[self.heap[i]] = i
+            i = parent
+        self.heap[i] = link
+        self.heap_pos[link] = i
+
+    cdef void _sift_down(self, Py_ssize_t i):
+        cdef DTYPE_INT_t link = self.heap[i]
+        cdef double key = self.next_update[link]
+        cdef Py_ssize_t child
+
+        while True:
+            child = 2 * i + 1
+            if child >= self.heap_size:
+                break
+            if (child + 1 < self.heap_size and
+                    self.next_update[self.heap[child + 1]] <
+                    self.next_update[self.heap[child]]):
+                child += 1
+            if key <= self.next_update[self.heap[child]]:
+                break
+            self.heap[i] = self.heap[child]
+            self.heap_pos[self.heap[i]] = i
+            i = child
+        self.heap[i] = link
+        self.heap_pos[link] = i
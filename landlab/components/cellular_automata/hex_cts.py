@@ -34,7 +34,8 @@ class HexCTS(CellLabCTSModel):
     """
     
     def __init__(self, model_grid, node_state_dict, transition_list,
-                 initial_node_states, prop_data=None, prop_reset_value=None):
+                 initial_node_states, prop_data=None, prop_reset_value=None,
+                 engine='heap'):
         """
         HexCTS constructor: sets number of orientations to 1 and calls
         base-class constructor.
@@ -54,6 +55,8 @@ class HexCTS(CellLabCTSModel):
             Array of properties associated with each node/cell
         prop_reset_value : (scalar; same type as entries in prop_data) (optional)
             Default or initial value for a node/cell property (e.g., 0.0)
+        engine : {'heap', 'indexed'} (optional)
+            Event engine to use (see celllab_cts.py)
         """
         
         # Make sure caller has sent the right grid type        
@@ -67,7 +70,8 @@ class HexCTS(CellLabCTSModel):
         # Call the LandlabCellularAutomaton.__init__() method to do the rest of
         # the initialization
         super(HexCTS, self).__init__(model_grid, node_state_dict, 
-            transition_list, initial_node_states, prop_data, prop_reset_value)
+            transition_list, initial_node_states, prop_data, prop_reset_value,
+            engine)
         
 
 if __name__=='__main__':
@@ -38,7 +38,8 @@ class OrientedRasterCTS(CellLabCTSModel):
     >>> orcts = OrientedRasterCTS(mg, nsd, xnlist, nsg)
     """
     def __init__(self, model_grid, node_state_dict, transition_list,
-                 initial_node_states, prop_data=None, prop_reset_value=None):
+                 initial_node_states, prop_data=None, prop_reset_value=None,
+                 engine='heap'):
         """
         RasterCTS constructor: sets number of orientations to 2 and calls
         base-class constructor.
@@ -58,6 +59,8 @@ class OrientedRasterCTS(CellLabCTSModel):
             Array of properties associated with each node/cell
         prop_reset_value : (scalar; same type as entries in prop_data) (optional)
             Default or initial value for a node/cell property (e.g., 0.0)
+        engine : {'heap', 'indexed'} (optional)
+            Event engine to use (see celllab_cts.py)
         """
         
         if _DEBUG:
@@ -74,7 +77,8 @@ class OrientedRasterCTS(CellLabCTSModel):
         # Call the LandlabCellularAutomaton constructor to do the rest of
         # the initialization
         super(OrientedRasterCTS, self).__init__(model_grid, node_state_dict, 
-            transition_list, initial_node_states, prop_data, prop_reset_value)
+            transition_list, initial_node_states, prop_data, prop_reset_value,
+            engine)
             
         if _DEBUG:
             print('ORCTS:')
@@ -32,7 +32,8 @@ class RasterCTS(CellLabCTSModel):
     >>> rcts = RasterCTS(mg, nsd, xnlist, nsg)
     """
     def __init__(self, model_grid, node_state_dict, transition_list,
-                 initial_node_states, prop_data=None, prop_reset_value=None):
+                 initial_node_states, prop_data=None, prop_reset_value=None,
+                 engine='heap'):
         """
         RasterLCA constructor: sets number of orientations to 1 and calls
         base-class constructor.
@@ -52,6 +53,8 @@ class RasterCTS(CellLabCTSModel):
             Array of properties associated with each node/cell
         prop_reset_value : (scalar; same type as entries in prop_data) (optional)
             Default or initial value for a node/cell property (e.g., 0.0)
+        engine : {'heap', 'indexed'} (optional)
+            Event engine to use (see celllab_cts.py)
         """
         # Make sure caller has sent the right grid type        
         if not isinstance(model_grid, RasterModelGrid):
@@ -64,7 +67,8 @@ class RasterCTS(CellLabCTSModel):
         # Call the LandlabCellularAutomaton.__init__() method to do the rest of
         # the initialization
         super(RasterCTS, self).__init__(model_grid, node_state_dict, 
-            transition_list, initial_node_states, prop_data, prop_reset_value)
+            transition_list, initial_node_states, prop_data, prop_reset_value,
+            engine)
         
 
 if __name__=='__main__':
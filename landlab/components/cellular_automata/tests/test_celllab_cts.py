@@ -7,7 +7,8 @@ Created on Thu Jul  9 08:20:06 2015
 @author: gtucker
 """
 
-from nose.tools import assert_equal
+import numpy as np
+from nose.tools import assert_equal, assert_true
 from numpy.testing import assert_array_equal
 from landlab import RasterModelGrid, HexModelGrid
 from landlab.components.cellular_automata.celllab_cts import Transition, Event
@@ -129,6 +130,41 @@ def test_raster_cts():
     #assert (ca.prop_data[ca.propid[6]]==150), 'error in prop swap'
     
 
+def test_raster_cts_indexed_engine():
+    """
+    Tests a RasterCTS that uses the compiled, indexed event engine, with
+    a property swap and a callback function.
+    """
+    mg = RasterModelGrid(4, 4, 1.0)
+    mg.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    node_state_grid = mg.add_ones('node', 'node_state_map', dtype=int)
+    node_state_grid[6] = 0
+    ns_dict = { 0 : 'black', 1 : 'white' }
+    xn_list = []
+    xn_list.append( Transition((1,0,0), (0,1,0), 0.1, '', True, callback_function))
+    pd = mg.add_zeros('node', 'property_data', dtype=int)
+    pd[5] = 50
+    ca = RasterCTS(mg, ns_dict, xn_list, node_state_grid, prop_data=pd,
+                   engine='indexed')
+
+    # Only link 16 (between nodes 5 and 6) has a transition scheduled
+    assert_equal(ca.event_queue, [])
+    assert_equal(ca._engine.size, 1)
+    assert_equal(ca._engine.next_transition_at_link(16), 0)
+    assert (ca.next_update[16] > 0.0), 'transition not scheduled'
+    event_time = ca.next_update[16]
+
+    # Run until the one transition has happened, and nothing is left
+    ca.run(event_time + 1.0)
+    assert_equal(ca.current_time, event_time)
+    assert_equal(ca._engine.size, 0)
+    assert_equal(ca.node_state[5], 0)
+    assert_equal(ca.node_state[6], 1)
+    assert_equal(ca.link_state[16], 1)
+    assert_equal(ca.propid[5], 6)
+    assert_equal(ca.propid[6], 5)
+
+
 def test_oriented_raster_cts():
     """Tests instantiation of an OrientedRasterCTS() object"""
     mg = RasterModelGrid(3, 3, 1.0)
@@ -165,8 +201,170 @@ def test_oriented_hex_cts():
     ohcts = OrientedHexCTS(mg, nsd, xnlist, nsg)
     
     assert_equal(ohcts.num_link_states, 12)
-    assert_array_equal(ohcts.link_orientation, [2, 1, 0, 0, 0, 2, 1, 0, 2, 1, 0])
+    assert_array_equal(ohcts.link_orientation, [2, 1, 0, 0, 2, 2, 1, 0, 0, 0, 1])
+
+
+def _three_state_transitions():
+    """Particles (1) that hop into empty nodes (0), and react with each
+    other to form a second kind of particle (2)."""
+    return [Transition((0,1,0), (1,0,0), 1.0, 'hop left'),
+            Transition((1,0,0), (0,1,0), 1.0, 'hop right'),
+            Transition((1,1,0), (1,2,0), 0.5, 'react'),
+            Transition((2,1,0), (1,2,0), 0.2, 'swap'),
+            Transition((2,0,0), (0,2,0), 0.3, 'drift')]
+
+
+def _three_state_ca(engine='heap', seed=1234, node_states=None):
+    mg = RasterModelGrid(6, 7, 1.0)
+    if node_states is None:
+        np.random.seed(seed)
+        node_states = np.random.randint(3, size=mg.number_of_nodes)
+    nsg = mg.add_field('node', 'node_state_grid', node_states.copy())
+    np.random.seed(seed)
+    return RasterCTS(mg, {0 : 'empty', 1 : 'particle', 2 : 'product'},
+                     _three_state_transitions(), nsg, engine=engine)
+
+
+def _change_core_nodes(ca, nodes):
+    """Copy of the node states with the states of *nodes* changed."""
+    new_states = ca.node_state.copy()
+    new_states[nodes] = (new_states[nodes] + 1) % 3
+    return new_states
+
+
+def _assert_only_changed_links_rescheduled(engine):
+    ca = _three_state_ca(engine)
+
+    # Carry out one transition
+    ca.run(1e-9)
+    assert_true(ca.current_time > 0.)
+
+    links = ca.grid.active_links
+    old_link_state = ca.link_state[links].copy()
+    old_next_update = ca.next_update[links].copy()
+
+    ca.update_component_data(_change_core_nodes(ca, [15, 16, 24]))
+
+    # The link states are as if the model were started from the new states
+    fresh = _three_state_ca(engine, node_states=ca.node_state)
+    assert_array_equal(ca.link_state[links], fresh.link_state[links])
+
+    changed = ca.link_state[links] != old_link_state
+    assert_true(np.any(changed))
+    assert_true(np.any(~ changed))
+
+    # Links whose state didn't change keep their events...
+    assert_array_equal(ca.next_update[links][~ changed],
+                       old_next_update[~ changed])
+    # ...and the others get new ones, scheduled from the current time.
+    has_xn = ca.n_xn[ca.link_state[links]] > 0
+    assert_true(np.all(ca.next_update[links][changed & has_xn] >=
+                       ca.current_time))
+    assert_true(np.all(ca.next_update[links][changed & has_xn] !=
+                       old_next_update[changed & has_xn]))
+    return ca, links[changed & has_xn]
+
+
+def test_update_component_data_reschedules_changed_links():
+    (ca, rescheduled) = _assert_only_changed_links_rescheduled('heap')
+    queued = dict((event.link, event.time) for event in ca.event_queue
+                  if event.time == ca.next_update[event.link])
+    for link in rescheduled:
+        assert_equal(queued[link], ca.next_update[link])
+
+
+def test_update_component_data_reschedules_changed_links_indexed():
+    (ca, rescheduled) = _assert_only_changed_links_rescheduled('indexed')
+    for link in rescheduled:
+        assert_true(ca._engine.next_transition_at_link(link) >= 0)
+
+
+def test_update_link_states_matches_loop_over_links():
+    """The vectorized update is the same as checking the links one at a
+    time, for the same random numbers."""
+    (updated, looped) = (_three_state_ca(), _three_state_ca())
+    for ca in (updated, looped):
+        np.random.seed(99)
+        ca.run(1e-9)
+        ca.set_node_state_grid(_change_core_nodes(ca, [15, 16, 24, 30]))
+    assert_equal(updated.current_time, looped.current_time)
+
+    np.random.seed(42)
+    updated.update_link_states_and_transitions(updated.current_time)
+
+    np.random.seed(42)
+    for link in looped.grid.active_links:
+        current_state = looped.current_link_state(link)
+        if current_state != looped.link_state[link]:
+            looped.update_link_state(link, current_state, looped.current_time)
+
+    assert_array_equal(updated.link_state, looped.link_state)
+    assert_array_equal(updated.next_update, looped.next_update)
+    assert_equal(sorted((e.time, e.link, e.xn_to)
+                        for e in updated.event_queue),
+                 sorted((e.time, e.link, e.xn_to)
+                        for e in looped.event_queue))
+
+
+def _box_ca(engine, seed, callback=None):
+    """A three-state RasterCTS in a closed box, whose transitions all swap
+    properties and call *callback*."""
+    mg = RasterModelGrid(20, 20, 1.0)
+    mg.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    np.random.seed(seed)
+    nsg = mg.add_field('node', 'node_state_grid',
+                       np.random.randint(3, size=mg.number_of_nodes))
+    xn_list = [Transition(xn.from_state, xn.to_state, xn.rate, xn.name,
+                          True, callback)
+               for xn in _three_state_transitions()]
+    xn_list.append(Transition((2,2,0), (0,2,0), 0.1, 'decay', True,
+                              callback))
+    pd = mg.add_zeros('node', 'property_data')
+    return RasterCTS(mg, {0 : 'empty', 1 : 'particle', 2 : 'product'},
+                     xn_list, nsg, prop_data=pd, engine=engine)
+
+
+def _proportions_of_states(ca):
+    states = ca.node_state[ca.grid.core_nodes]
+    return np.bincount(states, minlength=3) / float(states.size)
+
+
+def test_indexed_engine_event_order():
+    """Transitions of the indexed engine are carried out in time order."""
+    times = []
+    def record_time(ca, node1, node2, time_now):
+        times.append(time_now)
+
+    ca = _box_ca('indexed', 1, callback=record_time)
+    ca.run(2.)
+    assert_true(len(times) > 100)
+    assert_true(np.all(np.diff(times) >= 0.))
+    assert_true(times[-1] >= 2.)
+    assert_true(np.all(np.array(times[:-1]) < 2.))
+    assert_equal(ca.current_time, times[-1])
+
+    # Everything still scheduled is due after the current time
+    links = ca.grid.active_links
+    scheduled = ca.next_update[links] < 1e50
+    assert_true(np.all(ca.next_update[links][scheduled] >= ca.current_time))
+
 
+def test_indexed_engine_matches_heap():
+    """After many transitions, the proportions of the node states are, on
+    average, the same with either engine (within four standard errors of
+    the differences between runs from the same initial states)."""
+    differences = []
+    for seed in range(20):
+        (heap, indexed) = (_box_ca('heap', seed), _box_ca('indexed', seed))
+        heap.run(8.)
+        indexed.run(8.)
+        differences.append(_proportions_of_states(heap) -
+                           _proportions_of_states(indexed))
+    differences = np.array(differences)
+    standard_error = differences.std(axis=0) / np.sqrt(len(differences))
+    assert_true(np.all(standard_error < .01))
+    assert_true(np.all(np.abs(differences.mean(axis=0)) <
+                       4. * standard_error + 1e-3))
 
 if __name__=='__main__':
     test_oriented_hex_cts()
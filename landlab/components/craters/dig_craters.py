@@ -144,11 +144,9 @@ class impactor(object):
                         
         #full length arrays for memory management
         
-        #Build the permanent maps for the distances and azimuths between nodes:
-        ###The resulting matrix is too big in practical cases (GB of memory use). Need to take another apporach - see set_elevation_change_only_beneath_footsix.print_()
-        #print 'Building the distances map for the grid... may take some time...'
-        #self.all_node_distances_map, self.all_node_azimuths_map = grid.build_all_node_distances_azimuths_maps()
-        #print '...Done.'
+        #We no longer build permanent maps of the distances and azimuths between nodes:
+        ###The resulting matrix is too big in practical cases (GB of memory use). Nodes near a point can instead be found with
+        #grid.nodes_within_radius(center_tuple, radius, return_distances=True, return_azimuths=True)
         
         self.impact_property_dict = {}
         
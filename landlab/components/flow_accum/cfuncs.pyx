@@ -0,0 +1,214 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+DTYPE_INT = np.int
+# Index arrays can be either 32- or 64-bit (see ModelGrid.index_dtype) but,
+# in any one call, they must all be of the same type.
+ctypedef fused DTYPE_INT_t:
+    np.int32_t
+    np.int64_t
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _fill_array_of_donors(np.ndarray[DTYPE_INT_t, ndim=1] r,
+                          np.ndarray[DTYPE_INT_t, ndim=1] delta,
+                          np.ndarray[DTYPE_INT_t, ndim=1] D):
+    """Fill the Braun & Willett array of donors.
+
+    Parameters
+    ----------
+    r : array_like
+        ID of receiver for each node.
+    delta : array_like
+        Index where each node's list of donors begins in *D*.
+    D : array_like
+        On output, the IDs of the donors of each node.
+    """
+    cdef Py_ssize_t n_nodes = r.shape[0]
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] w = np.zeros(n_nodes, dtype=r.dtype)
+    cdef Py_ssize_t i
+    cdef DTYPE_INT_t ri
+
+    for i in range(n_nodes):
+        ri = r[i]
+        D[delta[ri] + w[ri]] = i
+        w[ri] += 1
+
+
+cdef Py_ssize_t _add_node_to_stack(Py_ssize_t l, Py_ssize_t j,
+                                   Py_ssize_t n_nodes,
+                                   DTYPE_INT_t *s, DTYPE_INT_t *delta,
+                                   DTYPE_INT_t *D,
+                                   DTYPE_INT_t *to_visit) except -1:
+    """Add node *l*, and everything upstream of it, to the stack *s*.
+
+    *s* and *to_visit* hold *n_nodes* IDs. A node can only be added once if
+    the receivers form a forest, so running out of room in either means they
+    don't (or that a baselevel node was added twice).
+    """
+    cdef Py_ssize_t n_to_visit = 1
+    cdef Py_ssize_t n
+    cdef DTYPE_INT_t node
+    cdef DTYPE_INT_t m
+
+    if l < 0 or l >= n_nodes:
+        raise ValueError('node %d is not on the grid' % l)
+
+    to_visit[0] = l
+    while n_to_visit > 0:
+        n_to_visit -= 1
+        node = to_visit[n_to_visit]
+        if j >= n_nodes:
+            raise ValueError('stack is full: receivers do not form a forest, '
+                             'or a node was added more than once')
+        s[j] = node
+        j += 1
+
+        # Push the donors in reverse, so they come off in order.
+        for n in range(delta[node + 1] - 1, delta[node] - 1, -1):
+            m = D[n]
+            if m != node:
+                if n_to_visit >= n_nodes:
+                    raise ValueError('stack is full: receivers do not form '
+                                     'a forest')
+                to_visit[n_to_visit] = m
+                n_to_visit += 1
+
+    return j
+
+
+def _add_to_stack(Py_ssize_t l, Py_ssize_t j,
+                  np.ndarray[DTYPE_INT_t, ndim=1, mode='c'] s,
+                  np.ndarray[DTYPE_INT_t, ndim=1, mode='c'] delta,
+                  np.ndarray[DTYPE_INT_t, ndim=1, mode='c'] D,
+                  np.ndarray[DTYPE_INT_t, ndim=1, mode='c'] to_visit):
+    """Add node *l*, and everything upstream of it, to the stack.
+
+    This is Braun & Willett's recursive add_to_stack, rewritten as a
+    depth-first traversal with its own stack so that it is not limited by
+    the Python recursion depth. Donors are visited in the same order as by
+    the recursive version, so the resulting stack is identical.
+
+    Parameters
+    ----------
+    l : int
+        ID of the node to add.
+    j : int
+        Index in *s* at which to add it.
+    s : array_like
+        The stack (downstream-to-upstream ordered node IDs).
+    delta : array_like
+        Index where each node's list of donors begins in *D*.
+    D : array_like
+        IDs of the donors of each node.
+    to_visit : array_like
+        Work array, at least as long as *s*.
+
+    Returns
+    -------
+    int
+        Index in *s* following the last node added.
+
+    Raises
+    ------
+    ValueError
+        If *l* is not a node, or the stack overflows because the donors
+        don't form a forest or *l* is already on the stack.
+    """
+    if to_visit.shape[0] < s.shape[0] or delta.shape[0] <= s.shape[0]:
+        raise ValueError('work arrays are too short for the stack')
+    return _add_node_to_stack(l, j, s.shape[0], <DTYPE_INT_t *>s.data,
+                              <DTYPE_INT_t *>delta.data,
+                              <DTYPE_INT_t *>D.data,
+                              <DTYPE_INT_t *>to_visit.data)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _make_stack(np.ndarray[DTYPE_INT_t, ndim=1] baselevel_nodes,
+                np.ndarray[DTYPE_INT_t, ndim=1, mode='c'] s,
+                np.ndarray[DTYPE_INT_t, ndim=1, mode='c'] delta,
+                np.ndarray[DTYPE_INT_t, ndim=1, mode='c'] D):
+    """Build the stack by adding every baselevel node, in turn.
+
+    Parameters
+    ----------
+    baselevel_nodes : array_like
+        IDs of the baselevel nodes.
+    s : array_like
+        On output, the stack.
+    delta : array_like
+        Index where each node's list of donors begins in *D*.
+    D : array_like
+        IDs of the donors of each node.
+
+    Returns
+    -------
+    int
+        Number of nodes added to the stack.
+
+    Raises
+    ------
+    ValueError
+        If a baselevel node is not a node, or the stack overflows because
+        the donors don't form a forest or a baselevel node is repeated (or
+        is upstream of another).
+    """
+    if delta.shape[0] <= s.shape[0]:
+        raise ValueError('delta is too short for the stack')
+
+    cdef Py_ssize_t n_baselevel = baselevel_nodes.shape[0]
+    cdef np.ndarray[DTYPE_INT_t, ndim=1, mode='c'] to_visit = np.empty(
+        s.shape[0], dtype=s.dtype)
+    cdef Py_ssize_t i
+    cdef Py_ssize_t j = 0
+
+    for i in range(n_baselevel):
+        j = _add_node_to_stack(baselevel_nodes[i], j, s.shape[0],
+                               <DTYPE_INT_t *>s.data,
+                               <DTYPE_INT_t *>delta.data,
+                               <DTYPE_INT_t *>D.data,
+                               <DTYPE_INT_t *>to_visit.data)
+
+    return j
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _accumulate_drainage_area_and_discharge(
+        np.ndarray[DTYPE_INT_t, ndim=1] s,
+        np.ndarray[DTYPE_INT_t, ndim=1] r,
+        np.ndarray[DTYPE_FLOAT_t, ndim=1] drainage_area,
+        np.ndarray[DTYPE_FLOAT_t, ndim=1] discharge):
+    """Accumulate drainage area and discharge down the stack.
+
+    Parameters
+    ----------
+    s : array_like
+        Ordered (downstream to upstream) array of node IDs.
+    r : array_like
+        ID of receiver for each node.
+    drainage_area : array_like
+        On input, the local contribution of each node; on output, its
+        drainage area.
+    discharge : array_like
+        On input, the local contribution of each node; on output, its
+        discharge.
+    """
+    cdef Py_ssize_t n_nodes = s.shape[0]
+    cdef Py_ssize_t i
+    cdef DTYPE_INT_t donor
+    cdef DTYPE_INT_t recvr
+
+    for i in range(n_nodes - 1, -1, -1):
+        donor = s[i]
+        recvr = r[donor]
+        if donor != recvr:
+            drainage_area[recvr] += drainage_area[donor]
+            discharge[recvr] += discharge[donor]
@@ -28,6 +28,33 @@ from six.moves import range
 
 import numpy
 
+from .cfuncs import (_fill_array_of_donors, _add_to_stack, _make_stack,
+                     _accumulate_drainage_area_and_discharge)
+
+
+def _as_id_array(ids, dtype=None):
+    """Array of node IDs, of a type that the compiled kernels accept.
+
+    IDs that are already 32- or 64-bit integers keep their type, unless
+    *dtype* is given.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum.flow_accum_bw import _as_id_array
+    >>> _as_id_array(np.array([1, 2], dtype=np.int32)).dtype
+    dtype('int32')
+    >>> _as_id_array([1, 2], dtype=np.int32).dtype
+    dtype('int32')
+    >>> _as_id_array(np.array([1, 2], dtype=np.uint8)).dtype == int
+    True
+    """
+    if dtype is None:
+        dtype = numpy.asarray(ids).dtype
+        if dtype not in (numpy.int32, numpy.int64):
+            dtype = int
+    return numpy.asarray(ids, dtype=dtype)
+
 
 class _DrainageStack():
     """
@@ -35,19 +62,26 @@ class _DrainageStack():
     function (as a method) and also keeps track of the counter (j) and the
     stack (s). It is used by the make_ordered_node_array() function.
     """
-    def __init__(self, delta, D):
+    def __init__(self, delta, D, s=None):
         """
-        Initializes the index counter j to zero, creates the stack array s,
-        and stores references to delta and D.
+        Initializes the index counter j to zero, creates the stack array s
+        (or uses the one given), and stores references to delta and D.
         """
         self.j = 0
-        self.s = numpy.zeros(len(D), dtype=int)
-        self.delta = delta
-        self.D = D
+        if s is None:
+            s = numpy.zeros(len(D), dtype=_as_id_array(D).dtype)
+        self.s = s
+        self.delta = _as_id_array(delta, dtype=s.dtype)
+        self.D = _as_id_array(D, dtype=s.dtype)
+        self._to_visit = numpy.empty(len(D), dtype=s.dtype)
 
     def add_to_stack(self, l):
         """
         Adds node l to the stack and increments the current index (j).
+
+        The traversal is done in compiled code with an explicit stack, rather
+        than by recursion, so very long flow paths don't overflow Python's
+        recursion limit.
         
         Examples
         --------
@@ -60,21 +94,10 @@ class _DrainageStack():
         >>> ds.s
         array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
         """
-        self.s[self.j] = l
-        self.j += 1
-        #make some aliases to make the weave faster & better
-        delta = self.delta
-        D = self.D
-        add_it = self.add_to_stack
-        delta_l = int(numpy.take(delta,l))
-        delta_lplus1 = int(numpy.take(delta,l+1))
+        self.j = _add_to_stack(l, self.j, self.s, self.delta, self.D,
+                               self._to_visit)
+
 
-        for n in range(delta_l, delta_lplus1):
-            m = self.D[n]
-            if m != l:
-                self.add_to_stack(m)
-                
-                
 def _make_number_of_donors_array(r):
     """Number of donors for each node.
 
@@ -108,7 +131,7 @@ def _make_number_of_donors_array(r):
 #    for i in range(np):
 #        nd[r[i]] += 1
 
-    nd = numpy.zeros(r.size, dtype=int)
+    nd = numpy.zeros(r.size, dtype=_as_id_array(r).dtype)
     max_index = numpy.max(r)
     nd[:(max_index + 1)] = numpy.bincount(r)
     return nd
@@ -144,7 +167,7 @@ def _make_delta_array(nd):
 
     #DEJH efficient delooping (only a small gain)
     np = len(nd)
-    delta = numpy.zeros(np+1, dtype=int)
+    delta = numpy.zeros(np+1, dtype=_as_id_array(nd).dtype)
     delta.fill(np)
     delta[-2::-1] -= numpy.cumsum(nd[::-1])
     return delta
@@ -159,7 +182,7 @@ def _make_array_of_donors(r, delta):
     Table 1 (except that here the ID numbers are one less, because we number
     indices from zero).
     
-    Vectorized - inefficiently! - DEJH, 5/20/14
+    The loop over nodes is done in compiled code (cfuncs.pyx).
     
     Examples
     --------
@@ -171,35 +194,18 @@ def _make_array_of_donors(r, delta):
     >>> D
     array([0, 2, 1, 4, 5, 7, 6, 3, 8, 9])
     """    
-    np = len(r)
-    w = numpy.zeros(np, dtype=int)
-    D = numpy.zeros(np, dtype=int)
-
-    for i in range(np):
-        ri = r[i]
-        D[delta[ri]+w[ri]] = i
-        w[ri] += 1
-
+    r = _as_id_array(r)
+    D = numpy.zeros(len(r), dtype=r.dtype)
+    _fill_array_of_donors(r, _as_id_array(delta, dtype=r.dtype), D)
     return D
-    
-    #DEJH notes that for reasons he's not clear on, this looped version is
-    #actually much slower!
-    #D = numpy.zeros(np, dtype=int)
-    #wri_fin = numpy.bincount(r)
-    #wri_fin_nz = wri_fin.nonzero()[0]
-    #wri_fin_nz_T = wri_fin_nz.reshape((wri_fin_nz.size,1))
-    #logical = numpy.tile(r,(wri_fin_nz.size,1))==wri_fin_nz_T
-    #cum_logical = numpy.cumsum(logical, axis=1)
-    #wri = numpy.sum(numpy.where(logical, cum_logical-1,0) ,axis=0)
-    #D_index = delta[r] + wri
-    #D[D_index] = numpy.arange(r.size)
-    #return D
 
 
-def make_ordered_node_array(receiver_nodes, baselevel_nodes):
+def make_ordered_node_array(receiver_nodes, baselevel_nodes, out=None):
     """
     Creates and returns an array of node IDs that is arranged in order from
-    downstream to upstream. 
+    downstream to upstream. If given, the integer array *out* is filled and
+    returned instead of a new one. The IDs are of the same integer type as
+    *out* or, if it is not given, as *receiver_nodes*.
     
     The lack of a leading underscore is meant to signal that this operation
     could be useful outside of this module!
@@ -213,21 +219,29 @@ def make_ordered_node_array(receiver_nodes, baselevel_nodes):
     >>> s = make_ordered_node_array(r, b)
     >>> s
     array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
+
+    Each node must be downstream of exactly one baselevel node.
+
+    >>> make_ordered_node_array(np.array([0, 0, 1, 2]), np.array([0, 1]))
+    Traceback (most recent call last):
+    ValueError: stack is full: receivers do not form a forest, or a node was added more than once
     """
+    if out is None:
+        receiver_nodes = _as_id_array(receiver_nodes)
+    else:
+        receiver_nodes = _as_id_array(receiver_nodes, dtype=out.dtype)
     nd = _make_number_of_donors_array(receiver_nodes)
     delta = _make_delta_array(nd)
     D = _make_array_of_donors(receiver_nodes, delta)
-    dstack = _DrainageStack(delta, D)
-    len_bl_nodes = baselevel_nodes.size
-    s = numpy.zeros(D.size, dtype=int)
-    add_it = dstack.add_to_stack
-    for k in baselevel_nodes:
-        add_it(k) #don't think this is a bottleneck, so no C++
-    return dstack.s
+    if out is None:
+        out = numpy.zeros(D.size, dtype=D.dtype)
+    _make_stack(_as_id_array(baselevel_nodes, dtype=D.dtype).ravel(), out,
+                delta, D)
+    return out
     
     
 def find_drainage_area_and_discharge(s, r, node_cell_area=1.0, runoff=1.0,
-                                     boundary_nodes=None):
+                                     boundary_nodes=None, out=None):
     """
     Calculates and returns the drainage area and water discharge at each node.
     
@@ -239,6 +253,8 @@ def find_drainage_area_and_discharge(s, r, node_cell_area=1.0, runoff=1.0,
             runoff = scalar or numpy array of local runoff rate at each cell
                      (in water depth per time). If it's an array, must have same
                      length as s (that is, the number of nodes).
+            out = optional tuple of (drainage_area, discharge) float arrays
+                  into which to write the results.
                      
     Returns: drainage area and discharge as Numpy arrays
     
@@ -275,8 +291,13 @@ def find_drainage_area_and_discharge(s, r, node_cell_area=1.0, runoff=1.0,
     # out as the area of the cell in question, then (unless the cell has no
     # donors) grows from there. Discharge starts out as the cell's local runoff
     # rate times the cell's surface area.
-    drainage_area = numpy.zeros(np, dtype=int) + node_cell_area
-    discharge = numpy.zeros(np, dtype=int) + node_cell_area*runoff
+    if out is None:
+        drainage_area = numpy.empty(np, dtype=float)
+        discharge = numpy.empty(np, dtype=float)
+    else:
+        drainage_area, discharge = out
+    drainage_area[:] = node_cell_area
+    numpy.multiply(drainage_area, runoff, out=discharge)
     
     # Optionally zero out drainage area and discharge at boundary nodes
     if boundary_nodes is not None:
@@ -285,22 +306,21 @@ def find_drainage_area_and_discharge(s, r, node_cell_area=1.0, runoff=1.0,
     
     # Iterate backward through the list, which means we work from upstream to
     # downstream.
-    num_pts = len(s)
-    for i in range(np-1, -1, -1):
-        donor = s[i]
-        recvr = r[donor]
-        if donor != recvr:
-            drainage_area[recvr] += drainage_area[donor]
-            discharge[recvr] += discharge[donor]
+    s = _as_id_array(s)
+    _accumulate_drainage_area_and_discharge(s, _as_id_array(r, dtype=s.dtype),
+                                            drainage_area, discharge)
 
     return drainage_area, discharge
     
 
 def flow_accumulation(receiver_nodes, baselevel_nodes, node_cell_area=1.0,
-                      runoff_rate=1.0, boundary_nodes=None):
+                      runoff_rate=1.0, boundary_nodes=None, out=None):
     """
     Calculates and returns the drainage area and (steady) discharge at each
     node, along with a downstream-to-upstream ordered list (array) of node IDs.
+
+    To reuse arrays between calls, pass *out* as a tuple of (drainage_area,
+    discharge, stack) arrays; these are filled in place and returned.
     
     Examples
     --------
@@ -315,15 +335,29 @@ def flow_accumulation(receiver_nodes, baselevel_nodes, node_cell_area=1.0,
     array([  1.,   3.,   1.,   1.,  10.,   4.,   3.,   2.,   1.,   1.])
     >>> s
     array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
+
+    >>> out = (np.empty(10), np.empty(10), np.empty(10, dtype=int))
+    >>> a, q, s = flow_accumulation(r, b, out=out)
+    >>> a is out[0]
+    True
+    >>> a
+    array([  1.,   3.,   1.,   1.,  10.,   4.,   3.,   2.,   1.,   1.])
     """
+    if out is None:
+        out = (None, None, None)
     
-    s = make_ordered_node_array(receiver_nodes, baselevel_nodes)
+    s = make_ordered_node_array(receiver_nodes, baselevel_nodes, out=out[2])
     #Note that this ordering of s DOES INCLUDE closed nodes. It really shouldn't! 
     #But as we don't have a copy of the grid accessible here, we'll solve this
     #problem as part of route_flow_dn.
     
+    if out[0] is None:
+        area_out = None
+    else:
+        area_out = out[:2]
     a, q = find_drainage_area_and_discharge(s, receiver_nodes, node_cell_area,
-                                            runoff_rate, boundary_nodes)
+                                            runoff_rate, boundary_nodes,
+                                            out=area_out)
     
     return a, q, s
     
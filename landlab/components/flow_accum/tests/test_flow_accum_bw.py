@@ -0,0 +1,73 @@
+#! /usr/bin/env python
+"""
+Unit tests for landlab.components.flow_accum.flow_accum_bw
+"""
+import numpy as np
+from numpy.testing import assert_array_equal
+from nose.tools import assert_equal, raises
+
+from landlab.components.flow_accum.flow_accum_bw import (
+    _DrainageStack, _make_number_of_donors_array, _make_delta_array,
+    _make_array_of_donors, make_ordered_node_array)
+
+
+def _drainage_stack(r):
+    r = np.asarray(r)
+    delta = _make_delta_array(_make_number_of_donors_array(r))
+    return _DrainageStack(delta, _make_array_of_donors(r, delta))
+
+
+def test_add_to_stack():
+    ds = _drainage_stack(np.array([2, 5, 2, 7, 5, 5, 6, 5, 7, 8]) - 1)
+    ds.add_to_stack(4)
+    assert_equal(ds.j, 10)
+    assert_array_equal(ds.s, [4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
+
+
+@raises(ValueError)
+def test_add_node_twice():
+    ds = _drainage_stack([0, 0, 1, 2])
+    ds.add_to_stack(0)
+    ds.add_to_stack(1)
+
+
+@raises(ValueError)
+def test_add_node_not_on_grid():
+    ds = _drainage_stack([0, 0, 1, 2])
+    ds.add_to_stack(4)
+
+
+@raises(ValueError)
+def test_add_cycle():
+    """Receivers that loop back on themselves don't form a forest."""
+    ds = _drainage_stack([0, 0, 3, 2])
+    ds.add_to_stack(0)
+    ds.add_to_stack(2)
+
+
+def test_make_ordered_node_array_of_forest():
+    r = np.array([0, 0, 1, 3, 3, 2])
+    assert_array_equal(make_ordered_node_array(r, np.array([0, 3])),
+                       [0, 1, 2, 5, 3, 4])
+    assert_array_equal(make_ordered_node_array(r, np.array([3, 0])),
+                       [3, 4, 0, 1, 2, 5])
+
+
+@raises(ValueError)
+def test_make_ordered_node_array_with_repeated_baselevel():
+    make_ordered_node_array(np.array([0, 0, 1, 2]), np.array([0, 1, 2, 2, 1]))
+
+
+@raises(ValueError)
+def test_make_ordered_node_array_with_upstream_baselevel():
+    make_ordered_node_array(np.array([0, 0, 1, 2]), np.array([0, 1]))
+
+
+@raises(ValueError)
+def test_make_ordered_node_array_with_baselevel_not_on_grid():
+    make_ordered_node_array(np.array([0, 0, 1, 2]), np.array([4]))
+
+
+@raises(ValueError)
+def test_make_ordered_node_array_with_cycle():
+    make_ordered_node_array(np.array([0, 0, 3, 2]), np.array([0, 2]))
@@ -7,8 +7,11 @@ DTYPE_FLOAT = np.double
 ctypedef np.double_t DTYPE_FLOAT_t
 
 DTYPE_INT = np.int
-#ctypedef np.longlong_t DTYPE_INT_t
-ctypedef np.int_t DTYPE_INT_t
+# Index arrays can be either 32- or 64-bit (see ModelGrid.index_dtype) but,
+# in any one call, they must all be of the same type.
+ctypedef fused DTYPE_INT_t:
+    np.int32_t
+    np.int64_t
 
 
 @cython.boundscheck(False)
@@ -55,3 +58,499 @@ def adjust_flow_receivers(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
             receiver[dst_id] = src_id
             steepest_slope[dst_id] = - link_slope[i]
             receiver_link[dst_id] = active_links[i]
+
+
+cdef inline void _heap_push(DTYPE_FLOAT_t *keys, DTYPE_INT_t *nodes,
+                            Py_ssize_t *size, DTYPE_FLOAT_t key,
+                            DTYPE_INT_t node):
+    """Push a (key, node) pair onto a binary min-heap."""
+    cdef Py_ssize_t child = size[0]
+    cdef Py_ssize_t parent
+
+    size[0] += 1
+    while child > 0:
+        parent = (child - 1) // 2
+        if keys[parent] <= key:
+            break
+        keys[child] = keys[parent]
+        nodes[child] = nodes[parent]
+        child = parent
+    keys[child] = key
+    nodes[child] = node
+
+
+cdef inline DTYPE_INT_t _heap_pop(DTYPE_FLOAT_t *keys, DTYPE_INT_t *nodes,
+                                  Py_ssize_t *size):
+    """Remove and return the node with the smallest key from a min-heap."""
+    cdef DTYPE_INT_t top = nodes[0]
+    cdef DTYPE_FLOAT_t key
+    cdef DTYPE_INT_t node
+    cdef Py_ssize_t parent = 0
+    cdef Py_ssize_t child
+
+    size[0] -= 1
+    key = keys[size[0]]
+    node = nodes[size[0]]
+    child = 1
+    while child < size[0]:
+        if child + 1 < size[0] and keys[child + 1] < keys[child]:
+            child += 1
+        if key <= keys[child]:
+            break
+        keys[parent] = keys[child]
+        nodes[parent] = nodes[child]
+        parent = child
+        child = 2 * parent + 1
+    keys[parent] = key
+    nodes[parent] = node
+
+    return top
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def flood_depressions(np.ndarray[DTYPE_INT_t, ndim=1] nbr_offset,
+                      np.ndarray[DTYPE_INT_t, ndim=1] nbr_nodes,
+                      np.ndarray[DTYPE_INT_t, ndim=1] nbr_links,
+                      np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
+                      np.ndarray[DTYPE_INT_t, ndim=1] seeds,
+                      np.ndarray[DTYPE_FLOAT_t, ndim=1] water_level,
+                      np.ndarray[DTYPE_INT_t, ndim=1] outlet,
+                      np.ndarray[DTYPE_INT_t, ndim=1] parent,
+                      np.ndarray[DTYPE_INT_t, ndim=1] parent_link):
+    """Fill depressions with the priority-flood algorithm.
+
+    Flooding starts from the *seeds* (normally the open boundary nodes) and
+    works inward, always expanding from the lowest water level found so far.
+    Every node is pushed onto the priority queue once, so the cost is
+    O(N log N).
+
+    Parameters
+    ----------
+    nbr_offset : array_like
+        Index into *nbr_nodes* where each node's neighbors begin (length is
+        number of nodes plus one).
+    nbr_nodes : array_like
+        Neighbors of every node, grouped by node.
+    nbr_links : array_like
+        ID of the link connecting each entry of *nbr_nodes* to its node.
+    z : array_like
+        Node elevations.
+    seeds : array_like
+        IDs of the nodes to flood from.
+    water_level : array_like
+        On output, the filled surface elevation of each flooded node.
+    outlet : array_like
+        On output, the spill-point node of each depression node.
+    parent : array_like
+        On output, the node from which each node was flooded. Following
+        *parent* from a depression node leads to its outlet.
+    parent_link : array_like
+        On output, the link joining each node to its *parent*.
+    """
+    cdef Py_ssize_t n_nodes = z.shape[0]
+    cdef Py_ssize_t n_seeds = seeds.shape[0]
+    cdef np.ndarray[DTYPE_FLOAT_t, ndim=1] heap_keys = np.empty(n_nodes,
+                                                                dtype=float)
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] heap_nodes = np.empty(
+        n_nodes, dtype=seeds.dtype)
+    cdef np.ndarray[np.uint8_t, ndim=1] visited = np.zeros(n_nodes,
+                                                           dtype=np.uint8)
+    cdef DTYPE_FLOAT_t *keys = <DTYPE_FLOAT_t *>heap_keys.data
+    cdef DTYPE_INT_t *nodes = <DTYPE_INT_t *>heap_nodes.data
+    cdef Py_ssize_t size = 0
+    cdef Py_ssize_t i
+    cdef Py_ssize_t j
+    cdef DTYPE_INT_t node
+    cdef DTYPE_INT_t nbr
+    cdef DTYPE_FLOAT_t level
+
+    for i in range(n_seeds):
+        node = seeds[i]
+        if not visited[node]:
+            visited[node] = 1
+            water_level[node] = z[node]
+            parent[node] = node
+            _heap_push(keys, nodes, &size, z[node], node)
+
+    while size > 0:
+        node = _heap_pop(keys, nodes, &size)
+        level = water_level[node]
+        for j in range(nbr_offset[node], nbr_offset[node + 1]):
+            nbr = nbr_nodes[j]
+            if visited[nbr]:
+                continue
+            visited[nbr] = 1
+            parent[nbr] = node
+            parent_link[nbr] = nbr_links[j]
+            if z[nbr] < level:
+                water_level[nbr] = level
+                if water_level[node] > z[node]:
+                    outlet[nbr] = outlet[node]
+                else:
+                    outlet[nbr] = node
+            else:
+                water_level[nbr] = z[nbr]
+            _heap_push(keys, nodes, &size, water_level[nbr], nbr)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def update_flow_receivers_at_nodes(np.ndarray[DTYPE_INT_t, ndim=1] nodes,
+                                   np.ndarray[DTYPE_INT_t, ndim=1] link_offset,
+                                   np.ndarray[DTYPE_INT_t, ndim=1] node_links,
+                                   np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
+                                   np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
+                                   np.ndarray[DTYPE_FLOAT_t, ndim=1] link_length,
+                                   np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
+                                   np.ndarray[DTYPE_INT_t, ndim=1] active_links,
+                                   np.ndarray[DTYPE_INT_t, ndim=1] receiver,
+                                   np.ndarray[DTYPE_INT_t, ndim=1] receiver_link,
+                                   np.ndarray[DTYPE_FLOAT_t, ndim=1] steepest_slope,
+                                   Py_ssize_t undefined_index):
+    """Recalculate flow receivers for a subset of nodes.
+
+    For each of *nodes*, this gives the same receiver, slope and receiver link
+    as :func:`adjust_flow_receivers` does when run over all links.
+
+    Parameters
+    ----------
+    nodes : array_like
+        IDs of the nodes to update.
+    link_offset : array_like
+        Index into *node_links* where each node's links begin (length is
+        number of nodes plus one).
+    node_links : array_like
+        Indices (into *src_nodes* and *dst_nodes*) of the links touching
+        each node, grouped by node and in increasing order.
+    src_nodes : array_like
+        Node at the start of each link.
+    dst_nodes : array_like
+        Node at the end of each link.
+    link_length : array_like
+        Length of each link.
+    z : array_like
+        Node elevations.
+    active_links : array_like
+        Link IDs for active links.
+    receiver : array_like
+        Flow-receiver node IDs.
+    receiver_link : array_like
+        Flow-receiver link IDs.
+    steepest_slope : array_like
+        Gradient of steepest descent from nodes.
+    undefined_index : int
+        Receiver link of nodes that have no receiver.
+    """
+    cdef Py_ssize_t n_nodes = nodes.shape[0]
+    cdef Py_ssize_t i
+    cdef Py_ssize_t j
+    cdef DTYPE_INT_t node
+    cdef DTYPE_INT_t link
+    cdef DTYPE_INT_t src_id
+    cdef DTYPE_INT_t dst_id
+    cdef DTYPE_FLOAT_t slope
+
+    for i in range(n_nodes):
+        node = nodes[i]
+        receiver[node] = node
+        receiver_link[node] = undefined_index
+        steepest_slope[node] = 0.
+
+        for j in range(link_offset[node], link_offset[node + 1]):
+            link = node_links[j]
+            src_id = src_nodes[link]
+            dst_id = dst_nodes[link]
+            slope = - ((z[dst_id] - z[src_id]) / link_length[link])
+
+            if node == src_id:
+                if z[src_id] > z[dst_id] and slope > steepest_slope[node]:
+                    receiver[node] = dst_id
+                    steepest_slope[node] = slope
+                    receiver_link[node] = active_links[link]
+            elif z[dst_id] > z[src_id] and - slope > steepest_slope[node]:
+                receiver[node] = src_id
+                steepest_slope[node] = - slope
+                receiver_link[node] = active_links[link]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def find_downstream_nodes(np.ndarray[DTYPE_INT_t, ndim=1] starts,
+                          np.ndarray[DTYPE_INT_t, ndim=1] receiver,
+                          np.ndarray[np.uint8_t, ndim=1] visited,
+                          np.ndarray[DTYPE_INT_t, ndim=1] index_in_set,
+                          np.ndarray[DTYPE_INT_t, ndim=1] found,
+                          Py_ssize_t n_found):
+    """Find the nodes on the flow paths leading from a set of nodes.
+
+    Parameters
+    ----------
+    starts : array_like
+        IDs of the nodes from which to follow the flow.
+    receiver : array_like
+        Flow-receiver node IDs.
+    visited : array_like
+        Flags nodes whose flow paths have been followed already (during this
+        call, so it should normally be all zeros). Updated on output.
+    index_in_set : array_like
+        For each node, its index in *found*, or -1 if it has not been found
+        yet. Updated on output.
+    found : array_like
+        The nodes found so far; new ones are appended.
+    n_found : int
+        Number of nodes already in *found*.
+
+    Returns
+    -------
+    int
+        The new number of nodes in *found*.
+    """
+    cdef Py_ssize_t n_starts = starts.shape[0]
+    cdef Py_ssize_t i
+    cdef DTYPE_INT_t node
+
+    for i in range(n_starts):
+        node = starts[i]
+        while not visited[node]:
+            visited[node] = 1
+            if index_in_set[node] < 0:
+                index_in_set[node] = n_found
+                found[n_found] = node
+                n_found += 1
+            if receiver[node] == node:
+                break
+            node = receiver[node]
+
+    return n_found
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def patch_flow_accumulation(np.ndarray[DTYPE_INT_t, ndim=1] nodes,
+                            np.ndarray[DTYPE_INT_t, ndim=1] old_receiver,
+                            np.ndarray[DTYPE_INT_t, ndim=1] new_receiver,
+                            np.ndarray[DTYPE_FLOAT_t, ndim=1] drainage_area,
+                            np.ndarray[DTYPE_FLOAT_t, ndim=1] discharge):
+    """Update drainage area and discharge after some receivers have changed.
+
+    *nodes* must contain every node whose receiver changed, together with
+    every node on the old and new flow paths downstream of them. Everything
+    else keeps its old drainage area, so a node's new value is its old one,
+    less what it used to get from donors in *nodes*, plus what it now gets
+    from them.
+
+    Parameters
+    ----------
+    nodes : array_like
+        IDs of the nodes to update.
+    old_receiver : array_like
+        Index, within *nodes*, of the old receiver of each node, or -1 if it
+        was its own receiver.
+    new_receiver : array_like
+        Index, within *nodes*, of the new receiver of each node, or -1 if it
+        is its own receiver.
+    drainage_area : array_like
+        Drainage area of every node; updated on output.
+    discharge : array_like
+        Discharge of every node; updated on output.
+    """
+    cdef Py_ssize_t n_nodes = nodes.shape[0]
+    cdef np.ndarray[DTYPE_FLOAT_t, ndim=1] area = np.empty(n_nodes,
+                                                           dtype=float)
+    cdef np.ndarray[DTYPE_FLOAT_t, ndim=1] flux = np.empty(n_nodes,
+                                                           dtype=float)
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] n_donors = np.zeros(
+        n_nodes, dtype=nodes.dtype)
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] queue = np.empty(n_nodes,
+                                                          dtype=nodes.dtype)
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n_queued = 0
+    cdef Py_ssize_t next_in_queue = 0
+    cdef DTYPE_INT_t recvr
+
+    for i in range(n_nodes):
+        area[i] = drainage_area[nodes[i]]
+        flux[i] = discharge[nodes[i]]
+
+    # Take away the old contributions of the nodes being updated.
+    for i in range(n_nodes):
+        recvr = old_receiver[i]
+        if recvr >= 0:
+            area[recvr] -= drainage_area[nodes[i]]
+            flux[recvr] -= discharge[nodes[i]]
+        recvr = new_receiver[i]
+        if recvr >= 0:
+            n_donors[recvr] += 1
+
+    # Add the new ones, working downstream from nodes with no donors in
+    # the set.
+    for i in range(n_nodes):
+        if n_donors[i] == 0:
+            queue[n_queued] = i
+            n_queued += 1
+
+    while next_in_queue < n_queued:
+        i = queue[next_in_queue]
+        next_in_queue += 1
+
+        drainage_area[nodes[i]] = area[i]
+        discharge[nodes[i]] = flux[i]
+
+        recvr = new_receiver[i]
+        if recvr >= 0:
+            area[recvr] += area[i]
+            flux[recvr] += flux[i]
+            n_donors[recvr] -= 1
+            if n_donors[recvr] == 0:
+                queue[n_queued] = recvr
+                n_queued += 1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def partition_divergent_flow(np.ndarray[DTYPE_INT_t, ndim=1] slot_offset,
+                             np.ndarray[DTYPE_INT_t, ndim=1] slot_nbr,
+                             np.ndarray[DTYPE_FLOAT_t, ndim=1] slot_length,
+                             np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
+                             DTYPE_FLOAT_t exponent,
+                             np.ndarray[DTYPE_FLOAT_t, ndim=1] steepest_slope,
+                             np.ndarray[DTYPE_INT_t, ndim=1] recvr_offset,
+                             np.ndarray[DTYPE_INT_t, ndim=1] recvr_nodes,
+                             np.ndarray[DTYPE_FLOAT_t, ndim=1] proportions):
+    """Divide the flow from each node between its downhill neighbors.
+
+    Flow is divided in proportion to the downhill slope to each neighbor,
+    raised to the power *exponent*. Slopes are scaled by the steepest one
+    first, so large exponents do not overflow.
+
+    Parameters
+    ----------
+    slot_offset : array_like
+        Index into *slot_nbr* where each node's neighbors begin (length is
+        number of nodes plus one).
+    slot_nbr : array_like
+        Neighbors of every node, grouped by node.
+    slot_length : array_like
+        Distance to each of *slot_nbr*.
+    z : array_like
+        Node elevations.
+    exponent : float
+        Partition exponent.
+    steepest_slope : array_like
+        On output, the steepest downhill slope from each node (or zero).
+    recvr_offset : array_like
+        On output, index into *recvr_nodes* where each node's receivers
+        begin.
+    recvr_nodes : array_like
+        On output, receivers of every node, grouped by node. Must be at least
+        as long as *slot_nbr*.
+    proportions : array_like
+        On output, proportion of a node's flow that goes to each of
+        *recvr_nodes*. Must be at least as long as *slot_nbr*.
+
+    Returns
+    -------
+    int
+        Total number of receivers.
+    """
+    cdef Py_ssize_t n_nodes = slot_offset.shape[0] - 1
+    cdef Py_ssize_t node
+    cdef Py_ssize_t j
+    cdef Py_ssize_t k
+    cdef Py_ssize_t n_recvrs = 0
+    cdef Py_ssize_t first
+    cdef DTYPE_FLOAT_t slope
+    cdef DTYPE_FLOAT_t max_slope
+    cdef DTYPE_FLOAT_t total
+
+    for node in range(n_nodes):
+        recvr_offset[node] = n_recvrs
+        first = n_recvrs
+        max_slope = 0.
+        for j in range(slot_offset[node], slot_offset[node + 1]):
+            slope = (z[node] - z[slot_nbr[j]]) / slot_length[j]
+            if slope > 0.:
+                recvr_nodes[n_recvrs] = slot_nbr[j]
+                proportions[n_recvrs] = slope
+                n_recvrs += 1
+                if slope > max_slope:
+                    max_slope = slope
+        steepest_slope[node] = max_slope
+
+        if n_recvrs > first:
+            total = 0.
+            for k in range(first, n_recvrs):
+                if exponent != 1.:
+                    proportions[k] = (proportions[k] / max_slope) ** exponent
+                total += proportions[k]
+            for k in range(first, n_recvrs):
+                proportions[k] /= total
+    recvr_offset[n_nodes] = n_recvrs
+
+    return n_recvrs
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def accumulate_divergent_flow(np.ndarray[DTYPE_INT_t, ndim=1] recvr_offset,
+                              np.ndarray[DTYPE_INT_t, ndim=1] recvr_nodes,
+                              np.ndarray[DTYPE_FLOAT_t, ndim=1] proportions,
+                              np.ndarray[DTYPE_FLOAT_t, ndim=1] drainage_area,
+                              np.ndarray[DTYPE_FLOAT_t, ndim=1] discharge,
+                              np.ndarray[DTYPE_INT_t, ndim=1] order):
+    """Accumulate drainage area and discharge over multiple flow directions.
+
+    Nodes are visited in topological order: a node is not visited until all
+    of its donors have been, so the accumulation is a single sweep.
+
+    Parameters
+    ----------
+    recvr_offset : array_like
+        Index into *recvr_nodes* where each node's receivers begin (length
+        is number of nodes plus one).
+    recvr_nodes : array_like
+        Receivers of every node, grouped by node.
+    proportions : array_like
+        Proportion of a node's flow that goes to each of *recvr_nodes*.
+    drainage_area : array_like
+        On input, the local contribution of each node; on output, its
+        drainage area.
+    discharge : array_like
+        On input, the local contribution of each node; on output, its
+        discharge.
+    order : array_like
+        On output, the node IDs in the order they were visited (upstream to
+        downstream).
+    """
+    cdef Py_ssize_t n_nodes = drainage_area.shape[0]
+    cdef Py_ssize_t n_recvrs = recvr_offset[n_nodes]
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] n_donors = np.zeros(
+        n_nodes, dtype=order.dtype)
+    cdef Py_ssize_t n_ordered = 0
+    cdef Py_ssize_t next_in_order = 0
+    cdef Py_ssize_t i
+    cdef Py_ssize_t j
+    cdef DTYPE_INT_t node
+    cdef DTYPE_INT_t recvr
+
+    for j in range(n_recvrs):
+        n_donors[recvr_nodes[j]] += 1
+
+    for i in range(n_nodes):
+        if n_donors[i] == 0:
+            order[n_ordered] = i
+            n_ordered += 1
+
+    while next_in_order < n_ordered:
+        node = order[next_in_order]
+        next_in_order += 1
+        for j in range(recvr_offset[node], recvr_offset[node + 1]):
+            recvr = recvr_nodes[j]
+            drainage_area[recvr] += proportions[j] * drainage_area[node]
+            discharge[recvr] += proportions[j] * discharge[node]
+            n_donors[recvr] -= 1
+            if n_donors[recvr] == 0:
+                order[n_ordered] = recvr
+                n_ordered += 1
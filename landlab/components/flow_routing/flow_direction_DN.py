@@ -108,7 +108,7 @@ def grid_flow_directions(grid, elevations):
 
 
 def flow_directions(elev, active_links, fromnode, tonode, link_slope,
-                    grid=None, baselevel_nodes=None):
+                    grid=None, baselevel_nodes=None, out=None):
     """Find flow directions on a grid.
 
     Finds and returns flow directions for a given elevation grid. Each node is
@@ -130,6 +130,9 @@ def flow_directions(elev, active_links, fromnode, tonode, link_slope,
         means the link runs uphill from the fromnode to the tonode).
     baselevel_nodes : array_like, optional
         IDs of open boundary (baselevel) nodes.
+    out : tuple of ndarray, optional
+        Tuple of (receiver, steepest_slope, receiver_link) arrays into which
+        the results are written, rather than allocating new ones.
     
     Returns
     -------
@@ -167,6 +170,18 @@ def flow_directions(elev, active_links, fromnode, tonode, link_slope,
     >>> rl[3:8]
     array([        15, 2147483647,          1,          6,          2])
 
+    Results can be written into existing arrays, which are reused rather
+    than reallocated on every call.
+
+    >>> r = np.empty(10, dtype=int)
+    >>> ss = np.empty(10)
+    >>> rl = np.empty(10, dtype=int)
+    >>> out = flow_directions(z, active_links, fn, tn, s, out=(r, ss, rl))
+    >>> out[0] is r
+    True
+    >>> r
+    array([1, 4, 1, 6, 4, 4, 5, 4, 6, 7])
+
     OK, the following are rough notes on design: we want to work with just the
     active links. Ways to do this:
         - Pass active_links in as argument
@@ -175,9 +190,18 @@ def flow_directions(elev, active_links, fromnode, tonode, link_slope,
     """
     # Setup
     num_nodes = len(elev)
-    steepest_slope = np.zeros(num_nodes)
-    receiver = np.arange(num_nodes)
-    receiver_link = UNDEFINED_INDEX + np.zeros(num_nodes, dtype=np.int)
+    if out is None:
+        node_id = np.arange(num_nodes, dtype=np.asarray(fromnode).dtype)
+        steepest_slope = np.zeros(num_nodes)
+        receiver = node_id.copy()
+        receiver_link = UNDEFINED_INDEX + np.zeros(num_nodes,
+                                                   dtype=node_id.dtype)
+    else:
+        receiver, steepest_slope, receiver_link = out
+        node_id = np.arange(num_nodes, dtype=receiver.dtype)
+        receiver[:] = node_id
+        steepest_slope.fill(0.)
+        receiver_link.fill(UNDEFINED_INDEX)
     
     # For each link, find the higher of the two nodes. The higher is the
     # potential donor, and the lower is the potential receiver. If the slope
@@ -236,8 +260,7 @@ def flow_directions(elev, active_links, fromnode, tonode, link_slope,
             downslope_active = downslope[grid.active_nodes]
             receiver[downslope] = neighbor_nodes[np.indices(axis_indices.shape),axis_indices][0,downslope_active]
             receiver_link[downslope] = links_list[np.indices(axis_indices.shape),axis_indices][0,downslope_active]
-            
-    node_id = np.arange(num_nodes)
+
 
     # Optionally, handle baselevel nodes: they are their own receivers
     if baselevel_nodes is not None:
@@ -8,8 +8,11 @@ from __future__ import print_function
 
 from landlab import ModelParameterDictionary, Component, FieldError, FIXED_VALUE_BOUNDARY
 from landlab.core.model_parameter_dictionary import MissingKeyError
-from landlab.grid.base import BAD_INDEX_VALUE
-import numpy  # Used for: count_nonzero
+from landlab.grid.base import (BAD_INDEX_VALUE, CORE_NODE,
+                               FIXED_GRADIENT_BOUNDARY)
+from landlab.components.flow_accum import flow_accum_bw
+from .cfuncs import flood_depressions
+import numpy
 import landlab
 
 
@@ -28,15 +31,15 @@ class DepressionFinderAndRouter(Component):
                             ])
     
     _output_var_names = set(['depression__depth',  # depth below spill point
-                             'depression__outlet_node_ID',
+                             'depression__outlet_node_id',
                              ])
                              
     _var_units = {'depression__depth' : 'm',
-                  'depression__outlet_node_ID' : '-'
+                  'depression__outlet_node_id' : '-'
                   }
     
     _var_mapping = {'depression__depth' : 'node',
-                    'depression__outlet_node_ID' : 'node'
+                    'depression__outlet_node_id' : 'node'
                     }
     
     _var_defs = {'topographic__elevation' : 'Surface topographic elevation',
@@ -92,23 +95,47 @@ class DepressionFinderAndRouter(Component):
         # Note that we initialize depression depth to -1 (negative values make
         # no sense, so this is a clue to non-flooded nodes), and depression
         # outlet ID to BAD_INDEX_VALUE (which is a major clue!)
-        self.depression_depth = self._grid.add_zeros('node', 'depression__depth') - 1.0             
-        self.depression_outlet = self._grid.add_zeros('node', 'depression__outlet_node_id', dtype=int) + BAD_INDEX_VALUE               
-                
-        # Later on, we'll need a number that's guaranteed to be larger than the
-        # highest elevation in the grid.
-        self._BIG_ELEV = numpy.amax(self._elev)+1
-        
-        # We'll also need a handy copy of the node neighbor lists
-        # TODO: presently, this grid method seems to only exist for Raster grids.
-        # We need it for *all* grids!
-        self._node_nbrs = self._grid.get_neighbor_list()
-        if type(self._grid) is landlab.grid.raster.RasterModelGrid:
-            diag_nbrs = self._grid.get_diagonal_list()
-            self._node_nbrs = numpy.concatenate((self._node_nbrs, diag_nbrs), 1)
-            #print('NN',self._node_nbrs)
-                
-                
+        self.depression_depth = self._grid.add_zeros('node', 'depression__depth')
+        self.depression_depth.fill(-1.)
+        self.depression_outlet = self._grid.add_zeros('node', 'depression__outlet_node_id', dtype=int)
+        self.depression_outlet.fill(BAD_INDEX_VALUE)
+
+
+    def _build_neighbor_arrays(self):
+        """
+        Creates compressed lists of the neighbors of every node, as seen
+        across active links. The neighbors of node *i* are
+        self._nbr_nodes[self._nbr_offset[i]:self._nbr_offset[i+1]], and the
+        links that lead to them are the same slice of self._nbr_links.
+
+        On a raster, the active links include the diagonals, so that
+        depressions are mapped with the same D8 connectivity that FlowRouter
+        uses. We rebuild these lists on every call, in case the boundary
+        conditions have changed.
+        """
+        if isinstance(self._grid, landlab.grid.raster.RasterModelGrid):
+            (self._active_links, self._activelink_from,
+             self._activelink_to) = self._grid.d8_active_links()
+        else:
+            self._active_links = self._grid.active_links
+            self._activelink_from = self._grid.activelink_fromnode
+            self._activelink_to = self._grid.activelink_tonode
+
+        tails = numpy.concatenate((self._activelink_from,
+                                   self._activelink_to))
+        heads = numpy.concatenate((self._activelink_to,
+                                   self._activelink_from))
+        links = numpy.concatenate((self._active_links, self._active_links))
+        order = numpy.argsort(tails, kind='mergesort')
+
+        self._nbr_nodes = heads[order].astype(int, copy=False)
+        self._nbr_links = links[order].astype(int, copy=False)
+        self._nbr_offset = numpy.zeros(self._grid.number_of_nodes + 1,
+                                       dtype=int)
+        numpy.cumsum(numpy.bincount(tails,
+                                    minlength=self._grid.number_of_nodes),
+                     out=self._nbr_offset[1:])
+
     def find_pits(self):
         """
         Locates local depressions ("pits") in a gridded elevation field.
@@ -132,194 +159,121 @@ class DepressionFinderAndRouter(Component):
             1. All neighboring core nodes have equal or greater elevation, and
             2. Any neighboring open boundary nodes have a greater elevation.
         
-        The algorithm starts off assuming that all core nodes are pits. We then
-        loop through all active links. For each link, if one node is higher
-        than the other, the higher one cannot be a pit, so we flag it False.
-        We also look at cases in which an active link's nodes have equal 
-        elevations. If one is an open boundary, then the other must be a core
-        node, and we declare the latter not to be a pit (via rule 2 above).
+        The algorithm starts off assuming that all core nodes are pits. Then,
+        for every active link (including diagonals, on a raster), if one node
+        is higher than the other, the higher one cannot be a pit, so we flag
+        it False. We also look at cases in which an active link's nodes have
+        equal elevations. If one is an open boundary, then the other must be
+        a core node, and we declare the latter not to be a pit (via rule 2
+        above).
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components.flow_routing.lake_mapper import DepressionFinderAndRouter
+        >>> rg = RasterModelGrid(4, 4)
+        >>> z = rg.add_zeros('node', 'topographic__elevation')
+        >>> z[:] = [5., 5., 5., 5., 5., 1., 3., 5., 5., 3., 2., 5., 5., 5., 5., 5.]
+        >>> df = DepressionFinderAndRouter(rg)
+        >>> df.find_pits()
+        >>> df.number_of_pits
+        1
+        >>> df.pit_node_ids
+        array([5])
         """
-        
-        # Create the is_pit array, with all core nodes initialized to True and
-        # all boundary nodes initialized to False.
-        self.is_pit = self._grid.add_ones('node', 'is_pit', dtype=bool)
+        if self._grid.has_field('node', 'is_pit'):
+            self.is_pit = self._grid.at_node['is_pit']
+            self.is_pit.fill(True)
+        else:
+            self.is_pit = self._grid.add_ones('node', 'is_pit', dtype=bool)
         self.is_pit[self._grid.boundary_nodes] = False
-        
-#        # Get a list of active links; in a raster, this (TODO: optionally)
-#        # includes diagonals.
-#        if type(self._grid) is landlab.grid.raster.RasterModelGrid:
-#            (active_links, tails, heads) = self._grid.d8_active_links()
-#        else:
-#            active_links = self._grid.active_links
-#            tails = self._grid.node_index_at_link_tail
-#            heads = self._grid.node_index_at_link_head
-#        print 'AL',active_links
-#        print 'T',tails
-#        print 'H',heads
-        
-        # Loop over all active links: if one of a link's two nodes is higher
-        # than the other, the higher one is not a pit. Also, if they have
-        # equal elevations and one is an open boundary, the other is not a pit.
-        for link in self._grid.active_links:
-            h = self._grid.node_at_link_head[link]
-            t = self._grid.node_at_link_tail[link]
-            if self._elev[h] > self._elev[t]:
-                self.is_pit[h] = False
-            elif self._elev[t] > self._elev[h]:
-                self.is_pit[t] = False
-            elif self._elev[h] == self._elev[t]:
-                if self._grid.node_boundary_status[h]==FIXED_VALUE_BOUNDARY:
-                    self.is_pit[t] = False
-                elif self._grid.node_boundary_status[t]==FIXED_VALUE_BOUNDARY:
-                    self.is_pit[h] = False
-                    
-        # If we have a raster grid, handle the diagonal active links too
-        # (At the moment, their data structure is a bit different)
-        # TODO: update the diagonal link data structures
-        if type(self._grid) is landlab.grid.raster.RasterModelGrid:
-            if not self._grid._diagonal_links_created:
-                self._grid._setup_diagonal_links()
-            for i in range(len(self._grid._diag_active_links)):
-                h = self._grid._diag_activelink_tonode[i]
-                t = self._grid._diag_activelink_fromnode[i]
-                if self._elev[h] > self._elev[t]:
-                    self.is_pit[h] = False
-                elif self._elev[t] > self._elev[h]:
-                    self.is_pit[t] = False
-                elif self._elev[h] == self._elev[t]:
-                    if self._grid.node_boundary_status[h]==FIXED_VALUE_BOUNDARY:
-                        self.is_pit[t] = False
-                    elif self._grid.node_boundary_status[t]==FIXED_VALUE_BOUNDARY:
-                        self.is_pit[h] = False
+
+        self._build_neighbor_arrays()
+
+        # If one of a link's two nodes is higher than the other, the higher
+        # one is not a pit. Also, if they have equal elevations and one is an
+        # open boundary, the other is not a pit.
+        h = self._activelink_to
+        t = self._activelink_from
+        z_h = self._elev[h]
+        z_t = self._elev[t]
+        self.is_pit[h[z_h > z_t]] = False
+        self.is_pit[t[z_t > z_h]] = False
+
+        status = self._grid.node_boundary_status
+        is_level = z_h == z_t
+        self.is_pit[t[is_level & (status[h] == FIXED_VALUE_BOUNDARY)]] = False
+        self.is_pit[h[is_level & (status[t] == FIXED_VALUE_BOUNDARY)]] = False
 
         # Record the number of pits and the IDs of pit nodes.
         self.number_of_pits = numpy.count_nonzero(self.is_pit)
         (self.pit_node_ids, ) = numpy.where(self.is_pit)
         
-        
-    def find_lowest_node_on_lake_perimeter(self, nodes_this_depression):
-        
-        # Start with the first node on the list, and an arbitrarily large elev
-        lowest_node = nodes_this_depression[0]
-        lowest_elev = self._BIG_ELEV
-        
-        for n in nodes_this_depression:
-            
-            #print '  working on node',n,'neighbors are:'
-            for nbr in self._node_nbrs[n]:
-                #print nbr
-                if nbr!=BAD_INDEX_VALUE:
-                    if self.flood_status[nbr]==_UNFLOODED:
-                        if self._elev[nbr] < lowest_elev:
-                            lowest_node = nbr
-                            lowest_elev = self._elev[nbr]
-                    elif self.flood_status[nbr]==_PIT or self.flood_status[nbr]==_FLOODED:
-                        nodes_this_depression.append(nbr)
-                        self.flood_status[nbr] = _CURRENT_LAKE
-                        
-        #print '  lowest node on lake perim is',lowest_node,'with elev',lowest_elev
-        return lowest_node
-        
-        
-    def node_can_drain(self, the_node, nodes_this_depression):
-        
-        #print '    checking drainage for node',the_node
-        for nbr in self._node_nbrs[the_node]:
-            #print '    checking nbr',nbr
-            if nbr!=BAD_INDEX_VALUE:
-                #print '    this nbr is valid'
-                #print '    its flood status is',self.flood_status[nbr]
-                if self._elev[nbr] < self._elev[the_node] and \
-                   self.flood_status[nbr]!=_CURRENT_LAKE and \
-                   self.flood_status[nbr]!=_FLOODED:  # caveat about outlet elevation...
-                    #print '    Eureka!'
-                    return True
-        
-        #print '    no, this node cannot drain'
-        return False
-            
-        
-    def is_valid_outlet(self, the_node, nodes_this_depression):
-        
-        if self._grid.node_boundary_status[the_node]==FIXED_VALUE_BOUNDARY:
-            #print '   this node is an open boundary, so of course it can drain'
-            return True
-            
-        if self.node_can_drain(the_node, nodes_this_depression):
-            #print '   this node can drain!'
-            return True
-        #else:
-            #print '   it cannot drain'
-            
-            
-    def record_depression_depth_and_outlet(self, nodes_this_depression, outlet_id):
-        
-        for n in nodes_this_depression:
-            self.flood_status[n] = _FLOODED
-            self.depression_depth[n] = self._elev[outlet_id] - self._elev[n]
-            self.depression_outlet[n] = outlet_id
-            
+    def identify_depressions_and_outlets(self):
+        """
+        Maps every depression and its outlet with a "priority flood".
 
-    def find_depression_from_pit(self, pit_node):
-        
-        #print ' processing pit at',pit_node
-        
-        # Place pit_node at top of depression list
-        nodes_this_depression = []
-        nodes_this_depression.insert(0, pit_node)
-        
-        # Flag the pit as being _CURRENT_LAKE (it's the first node in the
-        # current lake)
-        self.flood_status[pit_node] = _CURRENT_LAKE
-        
-        # This flag keeps track of when we're done with this depression
-        found_outlet = False
-        
-        # Safety check
-        count = 0
-        max_count = self._grid.number_of_nodes + 1
-        
-        while not found_outlet:
-            
-            lowest_node_on_perimeter = self.find_lowest_node_on_lake_perimeter(nodes_this_depression)
-            
-            found_outlet = self.is_valid_outlet(lowest_node_on_perimeter, nodes_this_depression)
-            
-            if not found_outlet:
-                
-                # Add lowest_node to the lake list
-                nodes_this_depression.append(lowest_node_on_perimeter)
-                
-                # Flag it as being part of the current lake/depression
-                self.flood_status[lowest_node_on_perimeter] = _CURRENT_LAKE
-                
-                #print ' lake list:',nodes_this_depression
-                
-            #else:
-                #print ' node',lowest_node_on_perimeter,'has drainage and'
-                #print ' therefore it is the outlet point'                
-            
-            # Safety check, in case a bug (ha!) puts us in an infinite loop
-            assert (count<max_count), 'too many iterations in lake filler!'
-        
-        # Now that we've mapped this depression, record it in the arrays
-        # depression_depth, depression_outlet, and flood_status
-        self.record_depression_depth_and_outlet(nodes_this_depression, lowest_node_on_perimeter)
-        
-        # TODO: ideally we need a way to keep track of the number, area extent,
-        # and average depth of depressions. Tricky thing is that one might be
-        # devoured by another, so would need to be removed from the list.
-        
+        Flooding starts at the open boundary nodes and always proceeds from
+        the lowest node reached so far (Barnes et al., 2014, Computers &
+        Geosciences, 62, 117-127). A node that is lower than the water level
+        of the node it is reached from lies in a depression; it inherits that
+        water level and the outlet (spill point) of that depression. Because
+        each node is visited exactly once, the cost is O(N log N) no matter
+        how many pits there are, rather than growing each depression outward
+        from its pit one node at a time.
+
+        Creates
+        -------
+        self.water_level : node array of floats
+            Elevation of the filled surface.
+        self.flood_parent : node array of ints
+            Node from which each node was flooded (BAD_INDEX_VALUE if
+            it cannot be reached from an open boundary).
+        self.flood_parent_link : node array of ints
+            Link joining each node to its flood parent.
+
+        Notes
+        -----
+        Uses the neighbor lists set up by :func:`find_pits`.
+        """
+        status = self._grid.node_boundary_status
+        (seeds, ) = numpy.where((status == FIXED_VALUE_BOUNDARY) |
+                                (status == FIXED_GRADIENT_BOUNDARY))
+
+        self.water_level = numpy.array(self._elev, dtype=float)
+        self.flood_parent = numpy.empty(self._grid.number_of_nodes, dtype=int)
+        self.flood_parent.fill(BAD_INDEX_VALUE)
+        self.flood_parent_link = numpy.empty_like(self.flood_parent)
+        self.flood_parent_link.fill(BAD_INDEX_VALUE)
+        self.depression_outlet.fill(BAD_INDEX_VALUE)
+
+        flood_depressions(self._nbr_offset, self._nbr_nodes, self._nbr_links,
+                          numpy.asarray(self._elev, dtype=float),
+                          seeds.astype(int), self.water_level,
+                          self.depression_outlet, self.flood_parent,
+                          self.flood_parent_link)
+
+        flooded = self.water_level > self._elev
+        self.flood_status.fill(_UNFLOODED)
+        self.flood_status[flooded] = _FLOODED
+
+        self.depression_depth.fill(-1.)
+        self.depression_depth[flooded] = (self.water_level[flooded] -
+                                          self._elev[flooded])
         
-    def identify_depressions_and_outlets(self):
-                
-        for pit_node in self.pit_node_ids:
-            #print 'mapping lake starting from pit',pit_node
-            self.find_depression_from_pit(pit_node)
-      
-                
-    def map_depressions(self):
+    def map_depressions(self, reroute_flow=False):
         """
+        Finds the depressions in the elevation field, along with their
+        outlets (spill points) and depths.
+
+        Parameters
+        ----------
+        reroute_flow : bool, optional
+            If True, also re-route the flow directions, drainage areas and
+            discharges calculated by FlowRouter so that flow passes through
+            depressions to their outlets (see :func:`route_flow`).
+
         Examples
         --------
         Test #1: 5x5 raster grid with a diagonal lake.
@@ -339,16 +293,146 @@ class DepressionFinderAndRouter(Component):
         . . ~ . . 
         . ~ . . . 
         o . . . . 
+        >>> df.depression_depth[[8, 12, 16]]
+        array([ 89.,  88.,  87.])
+        >>> df.depression_outlet[[8, 12, 16]]
+        array([20, 20, 20])
+
+        Test #2: a pit on a hexagonal grid. Node 10, which drains to the low
+        boundary node 11, is the outlet of the pit at node 9.
+
+        >>> from landlab import HexModelGrid
+        >>> hg = HexModelGrid(5, 3)
+        >>> z = hg.add_zeros('node', 'topographic__elevation')
+        >>> z[:] = 10.
+        >>> z[11] = 1.
+        >>> z[hg.core_nodes] = [5., 6., 4., 0.5, 3., 5., 7.]
+        >>> df = DepressionFinderAndRouter(hg)
+        >>> df.map_depressions()
+        >>> np.where(df.depression_depth >= 0.)[0]
+        array([9])
+        >>> df.depression_outlet[9], df.depression_depth[9]
+        (10, 2.5)
         """
         # Locate nodes with pits
         self.find_pits()
         
         # Set up "lake code" array
-        self.flood_status = self._grid.add_zeros('node', 'flood_status_code') + _UNFLOODED
+        if self._grid.has_field('node', 'flood_status_code'):
+            self.flood_status = self._grid.at_node['flood_status_code']
+        else:
+            self.flood_status = self._grid.add_zeros('node',
+                                                     'flood_status_code',
+                                                     dtype=int)
+        self.flood_status.fill(_UNFLOODED)
         self.flood_status[self.pit_node_ids] = _PIT
         
         self.identify_depressions_and_outlets()
-        
+
+        if reroute_flow:
+            self.route_flow()
+
+    def route_flow(self):
+        """
+        Re-routes flow through depressions.
+
+        Takes the flow directions, drainage areas and discharges stored in the
+        grid by FlowRouter and modifies them so that flow that enters a
+        depression passes through it to the depression's outlet, and leaves
+        from there. Must be called after :func:`map_depressions`.
+
+        Each depression node drains toward its outlet along the path by which
+        the depression was flooded, and is given a zero slope. Outlets that
+        would otherwise drain back into their own depression, and core nodes
+        with no downhill neighbor, are sent to the neighbor from which they
+        were flooded, which leads to an open boundary. Drainage area,
+        discharge and the upstream node ordering are then recalculated.
+
+        Updates the following ModelGrid fields (in place):
+            - *'flow_receiver'*
+            - *'topographic__steepest_slope'*
+            - *'links_to_flow_receiver'*
+            - *'flow_sinks'*
+            - *'upstream_ID_order'*
+            - *'drainage_area'*
+            - *'water__volume_flux'*
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components.flow_routing.route_flow_dn import FlowRouter
+        >>> from landlab.components.flow_routing.lake_mapper import DepressionFinderAndRouter
+        >>> rg = RasterModelGrid(5, 5)
+        >>> z = rg.add_zeros('node', 'topographic__elevation')
+        >>> z[:] = np.array([100.,100.,95.,100.,100.,100.,101.,92.,1.,100.,100.,101.,2.,101.,100.,100.,3.,101.,101.,100.,90.,95.,100.,100.,100])
+        >>> fr = FlowRouter(rg)
+        >>> _ = fr.route_flow()
+
+        All of the core nodes drain into the pit at node 8:
+
+        >>> rg.at_node['flow_receiver'][[8, 12, 16]]
+        array([ 8,  8, 12])
+        >>> rg.at_node['drainage_area'][[8, 20]]
+        array([ 9.,  1.])
+
+        Once flow is re-routed, it crosses the lake to the outlet at node 20:
+
+        >>> df = DepressionFinderAndRouter(rg)
+        >>> df.map_depressions(reroute_flow=True)
+        >>> rg.at_node['flow_receiver'][[8, 12, 16]]
+        array([12, 16, 20])
+        >>> rg.at_node['drainage_area'][[8, 12, 16, 20]]
+        array([  3.,   8.,   9.,  10.])
+        >>> rg.at_node['flow_sinks'][rg.core_nodes].any()
+        False
+        """
+        grid = self._grid
+        receiver = grid.at_node['flow_receiver']
+        steepest_slope = grid.at_node['topographic__steepest_slope']
+        recvr_link = grid.at_node['links_to_flow_receiver']
+
+        node_id = numpy.arange(grid.number_of_nodes)
+        flooded = self.flood_status == _FLOODED
+        reached = self.flood_parent != BAD_INDEX_VALUE
+
+        # A node must be re-routed if it lies in a depression, if its flow
+        # would go back into the depression it is the outlet of, or if it is
+        # a core node with nowhere to send its flow.
+        drains_into_own_lake = numpy.zeros(grid.number_of_nodes, dtype=bool)
+        rcvr_flooded = flooded[receiver]
+        drains_into_own_lake[rcvr_flooded] = (
+            self.depression_outlet[receiver[rcvr_flooded]] ==
+            node_id[rcvr_flooded])
+        is_stuck = ((receiver == node_id) &
+                    (grid.node_boundary_status == CORE_NODE))
+        reroute = (flooded | drains_into_own_lake | is_stuck) & reached
+        reroute &= self.flood_parent != node_id
+
+        parent = self.flood_parent[reroute]
+        receiver[reroute] = parent
+        recvr_link[reroute] = self.flood_parent_link[reroute]
+        link_len = numpy.hypot(grid.node_x[reroute] - grid.node_x[parent],
+                               grid.node_y[reroute] - grid.node_y[parent])
+        steepest_slope[reroute] = numpy.maximum(
+            (self._elev[reroute] - self._elev[parent]) / link_len, 0.)
+        steepest_slope[flooded] = 0.
+
+        (sink, ) = numpy.where(receiver == node_id)
+        grid.at_node['flow_sinks'][:] = False
+        grid.at_node['flow_sinks'][sink] = True
+
+        try:
+            runoff_rate = grid.at_node['water__volume_flux_in']
+        except FieldError:
+            runoff_rate = 1.
+        a, q, s = flow_accum_bw.flow_accumulation(
+            receiver, sink, node_cell_area=grid.forced_cell_areas,
+            runoff_rate=runoff_rate)
+
+        grid.at_node['drainage_area'][:] = a
+        grid.at_node['water__volume_flux'][:] = q
+        grid.at_node['upstream_ID_order'][:] = s
         
     def display_depression_map(self):
         
@@ -369,59 +453,8 @@ class DepressionFinderAndRouter(Component):
                     print('~', end=' ')
                 n+=1
             print()
-        
-        
-        
-    
 
-def main():
-    """
-    temporary: test.
-    """
-    print('howdy')
-    from landlab import RasterModelGrid
-    from numpy.random import rand
-    grid = RasterModelGrid(4, 5, 1.0)
-    z = grid.add_zeros('node', 'topographic__elevation')
-    z[:] = rand(len(z))*100
-    print(z)
-    dep_finder = DepressionFinderAndRouter(grid, '/Users/gtucker/Dev/Landlab/gt_tests/test_inputs_for_depression_mapper.txt')
-    #dep_finder.initialize()
-    dep_finder.map_depressions()
-    
-    n=0
-    for r in range(grid.number_of_node_rows-1, -1, -1):
-        for c in range(grid.number_of_node_columns):
-            print(int(z[n]),'(',dep_finder.is_pit[n],')', end=' ')
-            n+=1
-        print()
-        
-    n=0
-    for r in range(grid.number_of_node_rows):
-        for c in range(grid.number_of_node_columns):
-            if dep_finder.depression_outlet[n]==BAD_INDEX_VALUE:
-                print(dep_finder.depression_depth[n],'( X )', end=' ')
-            else:
-                print(dep_finder.depression_depth[n],'(',dep_finder.depression_outlet[n],')', end=' ')
-            n+=1
-        print()
-
-    dep_finder.display_depression_map()
-    
-    # Now, route flow through.
-    # First, find flow dirs without lakes. Then, adjust.
-    from landlab.components.flow_routing.flow_direction_DN import grid_flow_directions
-    (rcvr, ss) = grid_flow_directions(grid, z)
-    print(z)
-    print(rcvr)
-    print(ss)
-                    
-    
-    
-    
+
 if __name__=='__main__':
     import doctest
     doctest.testmod()
-    main()
-
-    
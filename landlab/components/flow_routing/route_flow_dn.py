@@ -19,6 +19,9 @@ import landlab
 from landlab.components.flow_routing import flow_direction_DN
 #reload(flow_direction_DN)
 from landlab.components.flow_accum import flow_accum_bw
+from landlab.components.flow_routing.cfuncs import (
+    update_flow_receivers_at_nodes, find_downstream_nodes,
+    patch_flow_accumulation)
 from landlab import FieldError, Component
 from landlab import ModelParameterDictionary
 import numpy
@@ -103,16 +106,13 @@ class FlowRouter(Component):
                 input_dict = input_params
         
         # We'll also keep track of the active links; if raster, then these are
-        # the "D8" links; otherwise, it's just activelinks
-        if type(model_grid) is landlab.grid.raster.RasterModelGrid:
-            dal, d8f, d8t = model_grid.d8_active_links()
-            self._active_links = dal
-            self._activelink_from = d8f
-            self._activelink_to = d8t
-        else:
-            self._active_links = model_grid.active_links
-            self._activelink_from = model_grid.activelink_fromnode
-            self._activelink_to = model_grid.activelink_tonode
+        # the "D8" links; otherwise, it's just activelinks. The compiled
+        # routines need all of these IDs to be of the grid's index type.
+        self._index_dtype = model_grid.index_dtype
+        self._is_raster = (type(model_grid) is
+                           landlab.grid.raster.RasterModelGrid)
+        self._node_link_offset = None
+        self._find_active_links()
         
         #test input variables are present:
         model_grid.at_node['topographic__elevation']
@@ -140,15 +140,114 @@ class FlowRouter(Component):
         # Keep track of the following variables:
         #   - drainage area at each node
         #   - receiver of each node
-        self.drainage_area = model_grid.add_zeros('node', 'drainage_area')
-        self.receiver = model_grid.create_node_array_zeros('flow_receiver')
-        self.steepest_slope = model_grid.create_node_array_zeros('topographic__steepest_slope')
-        self.discharges = model_grid.create_node_array_zeros('water__volume_flux')
-        self.upstream_ordered_nodes = model_grid.create_node_array_zeros('upstream_ID_order')
-        self.links_to_receiver = model_grid.create_node_array_zeros('links_to_flow_receiver')
-        
-        
-    def route_flow(self):
+        # These arrays are the workspace for route_flow, which fills them in
+        # place rather than allocating new ones on each call.
+        self.drainage_area = self._output_array('drainage_area', float)
+        self.receiver = self._output_array('flow_receiver', self._index_dtype)
+        self.steepest_slope = self._output_array('topographic__steepest_slope',
+                                                 float)
+        self.discharges = self._output_array('water__volume_flux', float)
+        self.upstream_ordered_nodes = self._output_array('upstream_ID_order',
+                                                         self._index_dtype)
+        self.links_to_receiver = self._output_array('links_to_flow_receiver',
+                                                    self._index_dtype)
+        self.sinks = self._output_array('flow_sinks', bool)
+
+        # Set on each full routing, and used by incremental updates
+        self._routed_arrays = None
+
+    def _find_active_links(self):
+        """
+        Finds the links that flow can go along, which depend on the node
+        status, and makes the link-sized workspace for them. The node status
+        they were found for is kept, so they can be found again if it
+        changes. Arrays for incremental updates are then rebuilt when they
+        are next needed.
+        """
+        grid = self._grid
+        if self._is_raster:
+            links = grid.d8_active_links()
+        else:
+            links = (grid.active_links, grid.activelink_fromnode,
+                     grid.activelink_tonode)
+        (self._active_links, self._activelink_from, self._activelink_to) = [
+            numpy.asarray(ids, dtype=self._index_dtype) for ids in links]
+        self._link_slope = numpy.empty(len(self._active_links))
+        self._links_status = grid.node_status.copy()
+        self._node_link_offset = None
+
+    def _node_status_has_changed(self):
+        """Check if the node status has changed since the links were found."""
+        return not numpy.array_equal(self._links_status,
+                                     self._grid.node_status)
+
+    def _output_array(self, name, dtype):
+        """Get the node field *name*, to be written into in place.
+
+        The existing field is used if it has the right type; otherwise, a new
+        array of zeros is added to the grid (replacing any existing field).
+        """
+        try:
+            field = self._grid.at_node[name]
+        except FieldError:
+            pass
+        else:
+            if field.dtype == dtype and field.ndim == 1:
+                return field
+        return self._grid.add_zeros('node', name, dtype=dtype)
+
+    def _output_arrays(self):
+        """The output fields, in the order used by :func:`route_flow`."""
+        return (self._output_array('flow_receiver', self._index_dtype),
+                self._output_array('topographic__steepest_slope', float),
+                self._output_array('links_to_flow_receiver',
+                                   self._index_dtype),
+                self._output_array('drainage_area', float),
+                self._output_array('water__volume_flux', float),
+                self._output_array('upstream_ID_order', self._index_dtype),
+                self._output_array('flow_sinks', bool))
+
+    def _build_node_link_arrays(self):
+        """
+        Creates compressed lists of the links touching every node, for use
+        by incremental updates. The links of node *i* are
+        self._node_links[self._node_link_offset[i]:self._node_link_offset[i+1]],
+        and are given as indices into self._active_links, in increasing
+        order, so that ties are broken just as in a full routing.
+        """
+        n_links = len(self._active_links)
+        ends = numpy.concatenate((self._activelink_from, self._activelink_to))
+        links = numpy.concatenate((numpy.arange(n_links),
+                                   numpy.arange(n_links))).astype(
+                                       self._index_dtype)
+        order = numpy.lexsort((links, ends))
+
+        self._node_links = links[order]
+        self._node_link_offset = numpy.zeros(self._grid.number_of_nodes + 1,
+                                             dtype=self._index_dtype)
+        numpy.cumsum(numpy.bincount(ends,
+                                    minlength=self._grid.number_of_nodes),
+                     out=self._node_link_offset[1:])
+
+        # Link lengths, exactly as used for the gradients in a full routing
+        if self._is_raster:
+            n_straight = len(self._grid.active_links)
+            self._d8_link_length = numpy.empty(n_links)
+            self._d8_link_length[:n_straight] = self._grid.dx
+            self._d8_link_length[n_straight:] = 1.4142 * self._grid.dx
+        else:
+            self._d8_link_length = numpy.asarray(
+                self._grid.link_length[self._active_links], dtype=float)
+
+        self._index_in_set = numpy.empty(self._grid.number_of_nodes,
+                                         dtype=self._index_dtype)
+        self._index_in_set.fill(-1)
+        self._set_nodes = numpy.empty(self._grid.number_of_nodes,
+                                      dtype=self._index_dtype)
+        self._visited = numpy.zeros(self._grid.number_of_nodes,
+                                    dtype=numpy.uint8)
+
+    def route_flow(self, changed_nodes=None):
         """
         Routes surface-water flow by (1) assigning to each node a single 
         drainage direction, and then (2) adding up the number of nodes that
@@ -166,6 +265,15 @@ class FlowRouter(Component):
               receiver (or ITS OWN ID if there is no receiver):
               *'links_to_flow_receiver'*
             - Boolean node array of all local lows: *'flow_sinks'*
+
+        If only a few elevations have changed since the last call, give their
+        IDs as *changed_nodes*. Receivers are then recalculated only for those
+        nodes and their neighbors, and drainage area and discharge are
+        patched along the flow paths that lead from nodes whose receivers
+        changed (the stack is still rebuilt, but in compiled code). This
+        assumes that nothing else (boundary conditions, runoff rates, or the
+        fields themselves) has changed since the last call; if there was no
+        last call, all flow is routed as normal.
         
         Returns:
             - the modified grid object
@@ -205,9 +313,29 @@ class FlowRouter(Component):
         array([    0.,   600.,  5400.,   300.,   400.,   500.,  5200.,   700.,
                  800.,   900.,  3700.,  1100.,  1200.,  1300.,  1400.,  1500.,
                 1600.,  1700.,  1800.,  1900.])
-        
+
+        If we then raise a node, we can update just the part of the flow
+        network it affects. The result is the same as if we had routed flow
+        over the whole grid; node 14 is now a pit.
+
+        >>> elev[10] = 40.
+        >>> mg = fr.route_flow(changed_nodes=[10])
+        >>> mg.at_node['flow_receiver']
+        array([ 0,  1,  2,  3,  4,  1,  2,  7,  8,  6,  6, 11, 12, 14, 14, 15, 16,
+               17, 18, 19])
+        >>> mg.at_node['water__volume_flux']
+        array([    0.,   600.,  2700.,   300.,   400.,   500.,  2500.,   700.,
+                 800.,   900.,  1000.,  1100.,  1200.,  1300.,  2700.,  1500.,
+                1600.,  1700.,  1800.,  1900.])
         """
+        if changed_nodes is not None and self._can_update():
+            self._update_flow(numpy.asarray(changed_nodes,
+                                            dtype=self._index_dtype))
+            return self._grid
         
+        if self._node_status_has_changed():
+            self._find_active_links()
+
         #if elevs is not provided, default to stored grid values, which must be provided as grid
         elevs = self._grid['node'][self.value_field]
         
@@ -217,17 +345,33 @@ class FlowRouter(Component):
         # Calculate the downhill-positive slopes at the d8 active links
         #TODO: generalize to use EITHER D8, if raster, or just active links,
         # otherwise.
-        link_slope = -self._grid.calculate_gradients_at_d8_active_links(elevs)
+        link_slope = self._link_slope
+        if self._is_raster:
+            self._grid.calculate_gradients_at_d8_active_links(elevs,
+                                                              out=link_slope)
+        else:
+            self._grid.calculate_gradients_at_active_links(elevs,
+                                                           out=link_slope)
+        numpy.negative(link_slope, out=link_slope)
         # Find the baselevel nodes
         (baselevel_nodes, ) = numpy.where(numpy.logical_or(self._grid.node_status==1, self._grid.node_status==2))
 
+        # Fetch the output fields, which are overwritten in place
+        receiver = self._output_array('flow_receiver', self._index_dtype)
+        steepest_slope = self._output_array('topographic__steepest_slope',
+                                            float)
+        recvr_link = self._output_array('links_to_flow_receiver',
+                                        self._index_dtype)
+
         # Calculate flow directions
         receiver, steepest_slope, sink, recvr_link  = \
             flow_direction_DN.flow_directions(elevs, self._active_links, 
                                          self._activelink_from,
                                          self._activelink_to, link_slope, 
                                          grid=self._grid,
-                                         baselevel_nodes=baselevel_nodes)
+                                         baselevel_nodes=baselevel_nodes,
+                                         out=(receiver, steepest_slope,
+                                              recvr_link))
 #############grid=None???
         
         # TODO: either need a way to calculate and return the *length* of the
@@ -236,23 +380,107 @@ class FlowRouter(Component):
         #print 'sinks:', sink
 
         # Calculate drainage area, discharge, and ...
-        a, q, s = flow_accum_bw.flow_accumulation(receiver, sink,
-                                                  node_cell_area=node_cell_area, 
-                                                  runoff_rate=self._grid.at_node['water__volume_flux_in'])
-                                                  
+        accum_out = (self._output_array('drainage_area', float),
+                     self._output_array('water__volume_flux', float),
+                     self._output_array('upstream_ID_order',
+                                        self._index_dtype))
+        flow_accum_bw.flow_accumulation(receiver, sink,
+                                        node_cell_area=node_cell_area, 
+                                        runoff_rate=self._grid.at_node['water__volume_flux_in'],
+                                        out=accum_out)
+
         #added DEJH March 2014:
         #store the generated data in the grid
-        self._grid['node']['drainage_area'] = a
-        self._grid['node']['flow_receiver'] = receiver
-        self._grid['node']['topographic__steepest_slope'] = steepest_slope
-        self._grid['node']['water__volume_flux'] = q
-        self._grid['node']['upstream_ID_order'] = s
-        self._grid['node']['links_to_flow_receiver'] = recvr_link
-        self._grid['node']['flow_sinks'] = numpy.zeros_like(receiver, dtype=bool)
-        self._grid['node']['flow_sinks'][sink] = True
+        flow_sinks = self._output_array('flow_sinks', bool)
+        flow_sinks.fill(False)
+        flow_sinks[sink] = True
+
+        self._routed_arrays = self._output_arrays()
         
         return self._grid
 
+    def _can_update(self):
+        """Check the output fields are the ones from the last routing, and
+        that the node status is the same as it was."""
+        if self._routed_arrays is None or self._node_status_has_changed():
+            return False
+        for (old, new) in zip(self._routed_arrays, self._output_arrays()):
+            if old is not new:
+                return False
+        return True
+
+    def _update_flow(self, changed_nodes):
+        """Update flow routing after the elevations of some nodes changed.
+
+        See :func:`route_flow`.
+        """
+        if self._node_link_offset is None:
+            self._build_node_link_arrays()
+
+        elevs = self._grid['node'][self.value_field]
+        (receiver, steepest_slope, recvr_link, drainage_area, discharge,
+         stack, flow_sinks) = self._routed_arrays
+
+        # The receivers of the changed nodes, and of their neighbors, may
+        # have changed.
+        offset = self._node_link_offset
+        node_links = self._node_links[
+            numpy.concatenate([numpy.arange(offset[node], offset[node + 1])
+                               for node in changed_nodes] + [[]]).astype(int)]
+        nodes = numpy.union1d(
+            changed_nodes,
+            numpy.concatenate((self._activelink_from[node_links],
+                               self._activelink_to[node_links])))
+
+        old_receiver = receiver[nodes]
+        update_flow_receivers_at_nodes(
+            nodes, offset, self._node_links, self._activelink_from,
+            self._activelink_to, self._d8_link_length, elevs,
+            self._active_links, receiver, recvr_link, steepest_slope,
+            flow_direction_DN.UNDEFINED_INDEX)
+
+        status = self._grid.node_status[nodes]
+        baselevel_nodes = nodes[(status == 1) | (status == 2)]
+        receiver[baselevel_nodes] = baselevel_nodes
+        recvr_link[baselevel_nodes] = flow_direction_DN.UNDEFINED_INDEX
+        steepest_slope[baselevel_nodes] = 0.
+
+        is_moved = receiver[nodes] != old_receiver
+        if not numpy.any(is_moved):
+            return
+        moved_nodes = nodes[is_moved]
+        new_receiver = receiver[moved_nodes]
+
+        # Collect the nodes whose drainage area may have changed: those on
+        # the old and on the new flow paths downstream of moved nodes.
+        index_in_set = self._index_in_set
+        set_nodes = self._set_nodes
+        visited = self._visited
+        receiver[moved_nodes] = old_receiver[is_moved]
+        n_in_set = find_downstream_nodes(moved_nodes, receiver, visited,
+                                         index_in_set, set_nodes, 0)
+        visited[set_nodes[:n_in_set]] = 0
+        receiver[moved_nodes] = new_receiver
+        n_in_set = find_downstream_nodes(moved_nodes, receiver, visited,
+                                         index_in_set, set_nodes, n_in_set)
+        set_nodes = set_nodes[:n_in_set]
+        visited[set_nodes] = 0
+
+        set_receiver = receiver[set_nodes]
+        set_receiver[index_in_set[moved_nodes]] = old_receiver[is_moved]
+        old_index = numpy.where(set_receiver == set_nodes, -1,
+                                index_in_set[set_receiver])
+        set_receiver = receiver[set_nodes]
+        new_index = numpy.where(set_receiver == set_nodes, -1,
+                                index_in_set[set_receiver])
+        patch_flow_accumulation(set_nodes, old_index, new_index,
+                                drainage_area, discharge)
+        index_in_set[set_nodes] = -1
+
+        flow_sinks[nodes] = receiver[nodes] == nodes
+        (sink, ) = numpy.where(flow_sinks)
+        flow_accum_bw.make_ordered_node_array(receiver, sink, out=stack)
+
     @property
     def node_drainage_area(self):
         return self._grid['node']['drainage_area']
@@ -0,0 +1,363 @@
+#! /usr/env/python
+
+"""
+route_flow_mfd.py:
+
+Given a ModelGrid, calculates multiple-flow-direction (divergent) flow
+routing and drainage area, and (optionally) discharge.
+
+Each node passes its flow to *all* of its downslope neighbors, in
+proportion to the downhill slope toward each raised to a power (the
+"partition exponent"), as in Freeman (1991) and Quinn et al. (1991). On a
+raster, the neighbors include the diagonals, as for the D8 FlowRouter. A
+large exponent concentrates the flow along the steepest path, so the result
+approaches single-direction routing.
+
+The proportions for all nodes are found in a single (compiled) pass over
+the links. Because every receiver is lower than its donor, the flow network
+has no loops, so the accumulation is a single sweep downstream through the
+nodes, visiting each node only once all of its donors have been visited.
+"""
+
+import numpy
+
+import landlab
+from landlab import FieldError, Component
+from landlab import ModelParameterDictionary
+from landlab.components.flow_routing.cfuncs import (partition_divergent_flow,
+                                                   accumulate_divergent_flow)
+
+
+class MFDFlowRouter(Component):
+    """
+    This class implements multiple-flow-direction flow routing, and
+    calculates drainage area and (optionally) discharge. It works on any
+    kind of ModelGrid; on a RasterModelGrid, flow can also go along the
+    diagonals.
+
+    It initializes with a reference to a ModelGrid. Optionally, it can also
+    take *input_params*, the string which is the name of a text input file
+    (or a dictionary). This can contain 'runoff_rate', a float giving a
+    (spatially constant) runoff rate, which otherwise defaults to the input
+    field 'water__volume_flux_in' (or to 1), exactly as for the FlowRouter;
+    and 'partition_exponent' (default 1.1), the power to which slopes are
+    raised when dividing flow between receivers. The exponent can also be
+    given as a keyword.
+
+    The primary method of this class is :func:`route_flow`. After calling
+    it, the receivers of each node, and the proportion of its flow that each
+    receives, are available as the (number of nodes, maximum number of
+    receivers) arrays :attr:`receivers` (padded with -1) and
+    :attr:`proportions`.
+    """
+
+    _name = 'MFDFlowRouter'
+
+    _input_var_names = set(['topographic__elevation',
+                            'water__volume_flux_in',
+                            ])
+
+    _output_var_names = set(['drainage_area',
+                             'topographic__steepest_slope',
+                             'water__volume_flux',
+                             'upstream_ID_order',
+                             'flow_sinks',
+                             ])
+
+    _var_units = {'topographic__elevation' : 'm',
+                  'water__volume_flux_in' : 'm**3/s',
+                  'drainage_area' : 'm**2',
+                  'topographic__steepest_slope' : '-',
+                  'water__volume_flux' : 'm**3/s',
+                  'upstream_ID_order' : '-',
+                  'flow_sinks' : '-',
+                  }
+
+    _var_mapping = {'topographic__elevation' : 'node',
+                    'water__volume_flux_in' : 'node',
+                    'drainage_area' : 'node',
+                    'topographic__steepest_slope' : 'node',
+                    'water__volume_flux' : 'node',
+                    'upstream_ID_order' : 'node',
+                    'flow_sinks' : 'node',
+                    }
+
+    _var_defs = {'topographic__elevation' : 'Land surface topographic elevation',
+                 'water__volume_flux_in' : 'External volume water input to each node (e.g., rainfall)',
+                 'drainage_area' : "Upstream accumulated surface area contributing to the node's discharge",
+                 'topographic__steepest_slope' : 'Node array of steepest *downhill* slopes',
+                 'water__volume_flux' : 'Discharge of water through each node',
+                 'upstream_ID_order' : 'Node array containing downstream-to-upstream ordered list of node IDs',
+                 'flow_sinks' : 'Boolean array, True at local lows',
+                 }
+
+    def __init__(self, model_grid, input_params=None,
+                 partition_exponent=None):
+
+        # We keep a local reference to the grid
+        self._grid = model_grid
+        self.value_field = 'topographic__elevation'
+
+        input_dict = {}
+        if input_params:
+            if type(input_params) == str:
+                input_dict = ModelParameterDictionary(input_params)
+            else:
+                assert type(input_params) == dict
+                input_dict = input_params
+
+        if partition_exponent is None:
+            try:
+                partition_exponent = input_dict['partition_exponent']
+            except KeyError:
+                partition_exponent = 1.1
+        self.partition_exponent = float(partition_exponent)
+
+        # Node IDs are stored with the grid's index type.
+        self._index_dtype = model_grid.index_dtype
+        self._slot_status = None
+
+        # Nodes without cells contribute no area of their own
+        self._node_cell_area = numpy.array(model_grid.forced_cell_areas)
+
+        #test input variables are present:
+        model_grid.at_node['topographic__elevation']
+        try:
+            model_grid.at_node['water__volume_flux_in']
+        except FieldError:
+            model_grid.add_ones('node', 'water__volume_flux_in')
+        try:
+            model_grid.at_node['water__volume_flux_in'].fill(
+                input_dict['runoff_rate'])
+        except KeyError:
+            pass
+
+        self._routed = False
+
+    def _find_active_links(self):
+        """
+        Finds the links that flow can go along, and their lengths. These are
+        the active links, including the diagonals on a raster, so they
+        change with the node status.
+        """
+        grid = self._grid
+        if isinstance(grid, landlab.grid.raster.RasterModelGrid):
+            (self._active_links, self._activelink_from,
+             self._activelink_to) = grid.d8_active_links()
+            n_straight = len(grid.active_links)
+            self._link_length = numpy.empty(len(self._active_links))
+            self._link_length[:n_straight] = grid.dx
+            self._link_length[n_straight:] = numpy.sqrt(2.) * grid.dx
+        else:
+            self._active_links = grid.active_links
+            self._activelink_from = grid.activelink_fromnode
+            self._activelink_to = grid.activelink_tonode
+            self._link_length = numpy.asarray(
+                grid.link_length[self._active_links], dtype=float)
+
+    def _build_node_link_arrays(self):
+        """
+        Lists the neighbors to which each core node could send its flow. The
+        neighbors of node *i* are
+        self._slot_nbr[self._slot_offset[i]:self._slot_offset[i+1]], at the
+        distances given by the same slice of self._slot_length. The lists
+        depend only on the grid and the node status, so they are rebuilt
+        only if the boundary conditions change.
+        """
+        grid = self._grid
+        self._find_active_links()
+        n_nodes = grid.number_of_nodes
+        n_links = len(self._active_links)
+        nodes = numpy.concatenate((self._activelink_from,
+                                   self._activelink_to)).astype(
+                                       self._index_dtype)
+        nbrs = numpy.concatenate((self._activelink_to,
+                                  self._activelink_from)).astype(
+                                      self._index_dtype)
+        links = numpy.concatenate((numpy.arange(n_links),
+                                   numpy.arange(n_links)))
+
+        self._slot_status = grid.node_status.copy()
+        is_core = self._slot_status[nodes] == landlab.CORE_NODE
+        nodes = nodes[is_core]
+        nbrs = nbrs[is_core]
+        links = links[is_core]
+        order = numpy.lexsort((links, nodes))
+
+        self._slot_nbr = nbrs[order]
+        self._slot_length = self._link_length[links[order]]
+        n_slots = numpy.bincount(nodes, minlength=n_nodes)
+        self._slot_offset = numpy.zeros(n_nodes + 1, dtype=self._index_dtype)
+        numpy.cumsum(n_slots, out=self._slot_offset[1:])
+        self._max_receivers = max(n_slots.max(), 1)
+
+        self._recvr_offset = numpy.zeros(n_nodes + 1,
+                                         dtype=self._index_dtype)
+        self._recvr_nodes = numpy.empty(len(nodes), dtype=self._index_dtype)
+        self._proportions = numpy.empty(len(nodes))
+        self._routed = False
+
+    def _output_array(self, name, dtype):
+        """Get the node field *name*, to be written into in place."""
+        try:
+            field = self._grid.at_node[name]
+        except FieldError:
+            pass
+        else:
+            if field.dtype == dtype and field.ndim == 1:
+                return field
+        return self._grid.add_zeros('node', name, dtype=dtype)
+
+    def route_flow(self):
+        """
+        Routes surface-water flow by (1) dividing the flow from each node
+        between all of its downslope neighbors, and then (2) adding up the
+        flow that reaches each node from upstream (including the node
+        itself).
+
+        Stores as ModelGrid fields:
+            - Node array of drainage areas: *'drainage_area'*
+            - Node array of discharges: *'water__volume_flux'*
+            - Node array of steepest downhill slopes:
+              *'topographic__steepest_slope'*
+            - Node array containing downstream-to-upstream ordered list of
+              node IDs: *'upstream_ID_order'*
+            - Boolean node array of all local lows: *'flow_sinks'*
+
+        Returns:
+            - the modified grid object
+
+        Examples
+        --------
+        Flow on a plane sloping toward the bottom edge (the only open one)
+        divides between the three nodes below each node. With a partition
+        exponent of 1, it divides in proportion to the slope to each.
+
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components.flow_routing.route_flow_mfd import MFDFlowRouter
+        >>> mg = RasterModelGrid(4, 5, 1.0)
+        >>> _ = mg.add_field('node', 'topographic__elevation', mg.node_y.copy())
+        >>> mg.set_closed_boundaries_at_grid_edges(False, True, True, True)
+        >>> fr = MFDFlowRouter(mg, partition_exponent=1.)
+        >>> mg = fr.route_flow()
+        >>> fr.receivers[12]
+        array([ 7,  6,  8, -1, -1, -1, -1, -1])
+        >>> np.round(fr.proportions[12], 3)
+        array([ 0.414,  0.293,  0.293,  0.   ,  0.   ,  0.   ,  0.   ,  0.   ])
+        >>> np.round(mg.at_node['drainage_area'].reshape((4, 5)), 3)
+        array([[ 1.55 ,  2.435,  3.029,  2.435,  1.55 ],
+               [ 1.   ,  1.879,  2.243,  1.879,  1.   ],
+               [ 1.   ,  1.   ,  1.   ,  1.   ,  1.   ],
+               [ 1.   ,  1.   ,  1.   ,  1.   ,  1.   ]])
+
+        All of the area of the six core nodes leaves through the open edge:
+
+        >>> round(mg.at_node['drainage_area'][:5].sum() - 5., 6)
+        6.0
+
+        Flow can equally be routed on unstructured grids.
+
+        >>> from landlab import HexModelGrid
+        >>> hg = HexModelGrid(5, 3)
+        >>> z = hg.add_field('node', 'topographic__elevation', hg.node_x.copy())
+        >>> hfr = MFDFlowRouter(hg)
+        >>> hg = hfr.route_flow()
+        >>> a = hg.at_node['drainage_area']
+        >>> np.allclose(a[hg.node_status == 1].sum(),
+        ...             hg.forced_cell_areas[hg.node_status == 0].sum())
+        True
+        """
+        grid = self._grid
+        n_nodes = grid.number_of_nodes
+        elevs = numpy.asarray(grid.at_node[self.value_field], dtype=float)
+
+        if (self._slot_status is None or
+                not numpy.array_equal(self._slot_status, grid.node_status)):
+            self._build_node_link_arrays()
+
+        # Divide the flow from each core node between its downhill neighbors
+        steepest_slope = self._output_array('topographic__steepest_slope',
+                                            float)
+        partition_divergent_flow(self._slot_offset, self._slot_nbr,
+                                 self._slot_length, elevs,
+                                 self.partition_exponent, steepest_slope,
+                                 self._recvr_offset, self._recvr_nodes,
+                                 self._proportions)
+        n_recvrs = numpy.diff(self._recvr_offset)
+
+        flow_sinks = self._output_array('flow_sinks', bool)
+        numpy.equal(n_recvrs, 0, out=flow_sinks)
+
+        # Accumulate, in a single sweep downstream
+        drainage_area = self._output_array('drainage_area', float)
+        discharge = self._output_array('water__volume_flux', float)
+        drainage_area[:] = self._node_cell_area
+        numpy.multiply(drainage_area, grid.at_node['water__volume_flux_in'],
+                       out=discharge)
+        visit_order = numpy.empty(n_nodes, dtype=self._index_dtype)
+        accumulate_divergent_flow(self._recvr_offset, self._recvr_nodes,
+                                  self._proportions, drainage_area, discharge,
+                                  visit_order)
+
+        upstream_order = self._output_array('upstream_ID_order',
+                                            self._index_dtype)
+        upstream_order[:] = visit_order[::-1]
+        self._routed = True
+
+        return grid
+
+    def _padded_by_node(self, values, fill_value):
+        """Arrange values given for each receiver by node, with padding."""
+        n_nodes = self._grid.number_of_nodes
+        n_recvrs = self._recvr_offset[-1]
+        values = values[:n_recvrs]
+        donor = numpy.repeat(numpy.arange(n_nodes),
+                             numpy.diff(self._recvr_offset))
+        rank = numpy.arange(n_recvrs) - self._recvr_offset[donor]
+        out = numpy.empty((n_nodes, self._max_receivers), dtype=values.dtype)
+        out.fill(fill_value)
+        out[donor, rank] = values
+        return out
+
+    @property
+    def receivers(self):
+        """Receivers of each node, padded with -1.
+
+        A (number of nodes, maximum number of receivers) array, or None if
+        flow has not yet been routed.
+        """
+        if not self._routed:
+            return None
+        return self._padded_by_node(self._recvr_nodes, -1)
+
+    @property
+    def proportions(self):
+        """Proportion of the flow from each node that goes to each receiver.
+
+        Matches :attr:`receivers`, and is padded with zeros.
+        """
+        if not self._routed:
+            return None
+        return self._padded_by_node(self._proportions, 0.)
+
+    @property
+    def node_drainage_area(self):
+        return self._grid['node']['drainage_area']
+
+    @property
+    def node_steepest_slope(self):
+        return self._grid['node']['topographic__steepest_slope']
+
+    @property
+    def node_water_discharge(self):
+        return self._grid['node']['water__volume_flux']
+
+    @property
+    def node_order_upstream(self):
+        return self._grid['node']['upstream_ID_order']
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
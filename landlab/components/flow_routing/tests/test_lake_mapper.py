@@ -0,0 +1,83 @@
+#! /usr/bin/env python
+"""
+Unit tests for landlab.components.flow_routing.lake_mapper
+"""
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+from nose.tools import assert_true
+
+from landlab import RasterModelGrid, HexModelGrid, BAD_INDEX_VALUE
+from landlab.components.flow_routing.route_flow_dn import FlowRouter
+from landlab.components.flow_routing.lake_mapper import (
+    DepressionFinderAndRouter)
+
+
+def _lake_grid():
+    """A 5x5 raster with a diagonal lake that spills at node 20."""
+    rg = RasterModelGrid(5, 5)
+    z = rg.add_zeros('node', 'topographic__elevation')
+    z[:] = [100., 100., 95., 100., 100.,
+            100., 101., 92., 1., 100.,
+            100., 101., 2., 101., 100.,
+            100., 3., 101., 101., 100.,
+            90., 95., 100., 100., 100.]
+    return rg
+
+
+def test_output_fields_are_written():
+    rg = _lake_grid()
+    df = DepressionFinderAndRouter(rg)
+    df.map_depressions()
+
+    depth = rg.at_node['depression__depth']
+    outlet = rg.at_node['depression__outlet_node_id']
+    assert_true(depth is df.depression_depth)
+    assert_true(outlet is df.depression_outlet)
+
+    expected_depth = - np.ones(rg.number_of_nodes)
+    expected_depth[[8, 12, 16]] = [89., 88., 87.]
+    assert_array_almost_equal(depth, expected_depth)
+
+    expected_outlet = np.full(rg.number_of_nodes, BAD_INDEX_VALUE)
+    expected_outlet[[8, 12, 16]] = 20
+    assert_array_equal(outlet, expected_outlet)
+
+
+def test_output_fields_before_mapping():
+    rg = _lake_grid()
+    DepressionFinderAndRouter(rg)
+    assert_array_equal(rg.at_node['depression__depth'], -1.)
+    assert_array_equal(rg.at_node['depression__outlet_node_id'],
+                       BAD_INDEX_VALUE)
+
+
+def test_output_fields_on_hex():
+    hg = HexModelGrid(5, 3)
+    z = hg.add_zeros('node', 'topographic__elevation')
+    z[:] = 10.
+    z[11] = 1.
+    z[hg.core_nodes] = [5., 6., 4., 0.5, 3., 5., 7.]
+    df = DepressionFinderAndRouter(hg)
+    df.map_depressions()
+
+    depth = hg.at_node['depression__depth']
+    assert_array_equal(np.where(depth >= 0.)[0], [9])
+    assert_array_almost_equal(depth[9], 2.5)
+    assert_array_equal(hg.at_node['depression__outlet_node_id'][9], 10)
+
+
+def test_output_var_names_are_fields():
+    rg = _lake_grid()
+    DepressionFinderAndRouter(rg)
+    for name in DepressionFinderAndRouter._output_var_names:
+        assert_true(rg.has_field('node', name))
+
+
+def test_rerouted_drainage_area_is_finite_on_hex():
+    hg = HexModelGrid(9, 7)
+    np.random.seed(1066)
+    hg.add_field('node', 'topographic__elevation',
+                 np.random.rand(hg.number_of_nodes))
+    FlowRouter(hg).route_flow()
+    DepressionFinderAndRouter(hg).map_depressions(reroute_flow=True)
+    assert_true(np.all(np.isfinite(hg.at_node['drainage_area'])))
@@ -0,0 +1,94 @@
+#! /usr/bin/env python
+"""
+Unit tests for landlab.components.flow_routing.route_flow_dn
+"""
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+
+from landlab import (RasterModelGrid, HexModelGrid, VoronoiDelaunayGrid,
+                     CLOSED_BOUNDARY)
+from landlab.components.flow_routing.route_flow_dn import FlowRouter
+
+
+_OUTPUTS = ('flow_receiver', 'drainage_area', 'water__volume_flux',
+            'topographic__steepest_slope', 'links_to_flow_receiver',
+            'flow_sinks')
+
+
+def _assert_same_routing(grid):
+    """Routing on *grid* is the same as by a newly-made router."""
+    actual = dict((name, grid.at_node[name].copy()) for name in _OUTPUTS)
+    FlowRouter(grid).route_flow()
+    for name in _OUTPUTS:
+        assert_array_almost_equal(actual[name], grid.at_node[name])
+
+
+def _raster():
+    mg = RasterModelGrid((5, 4), 1.)
+    mg.add_field('node', 'topographic__elevation',
+                 mg.node_y + .1 * mg.node_x)
+    return mg
+
+
+def test_boundary_change_on_raster():
+    mg = _raster()
+    fr = FlowRouter(mg)
+    fr.route_flow()
+    assert_array_equal(mg.at_node['flow_receiver'][5], 1)
+
+    mg.set_closed_boundaries_at_grid_edges(True, False, False, False)
+    fr.route_flow()
+
+    assert mg.at_node['flow_receiver'][5] != 1
+    _assert_same_routing(mg)
+
+
+def test_boundary_change_on_hex():
+    hg = HexModelGrid(5, 3)
+    hg.add_field('node', 'topographic__elevation', hg.node_x.copy())
+    fr = FlowRouter(hg)
+    fr.route_flow()
+
+    hg.node_status[hg.node_x == hg.node_x.min()] = CLOSED_BOUNDARY
+    hg.update_links_nodes_cells_to_new_BCs()
+    fr.route_flow()
+
+    _assert_same_routing(hg)
+
+
+def test_update_after_boundary_change():
+    mg = _raster()
+    fr = FlowRouter(mg)
+    fr.route_flow()
+    fr.route_flow(changed_nodes=[6])
+
+    mg.set_closed_boundaries_at_grid_edges(True, False, False, False)
+    mg.at_node['topographic__elevation'][6] += 10.
+    fr.route_flow(changed_nodes=[6])
+
+    _assert_same_routing(mg)
+
+
+def _assert_finite_drainage_area(grid):
+    """Drainage area is finite everywhere, and all of the area of the cells
+    ends up at the sinks (outlets and pits)."""
+    np.random.seed(1066)
+    grid.add_field('node', 'topographic__elevation',
+                   np.random.rand(grid.number_of_nodes))
+    FlowRouter(grid).route_flow()
+
+    area = grid.at_node['drainage_area']
+    assert np.all(np.isfinite(area))
+    sinks = grid.at_node['flow_receiver'] == np.arange(grid.number_of_nodes)
+    assert_array_almost_equal(area[sinks].sum(),
+                              grid.forced_cell_areas.sum())
+
+
+def test_finite_drainage_area_on_hex():
+    _assert_finite_drainage_area(HexModelGrid(9, 7))
+
+
+def test_finite_drainage_area_on_voronoi():
+    np.random.seed(42)
+    _assert_finite_drainage_area(
+        VoronoiDelaunayGrid(np.random.rand(40) * 10., np.random.rand(40) * 10.))
@@ -0,0 +1,57 @@
+#! /usr/bin/env python
+"""
+Unit tests for landlab.components.flow_routing.route_flow_mfd
+"""
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+
+from landlab import RasterModelGrid, HexModelGrid, CLOSED_BOUNDARY
+from landlab.components.flow_routing.route_flow_mfd import MFDFlowRouter
+
+
+_OUTPUTS = ('drainage_area', 'water__volume_flux',
+            'topographic__steepest_slope', 'flow_sinks')
+
+
+def _assert_same_routing(grid, router):
+    """Routing by *router* is the same as by a newly-made router."""
+    actual = dict((name, grid.at_node[name].copy()) for name in _OUTPUTS)
+    actual_receivers = [router.receivers[node]
+                        for node in range(grid.number_of_nodes)]
+
+    fresh = MFDFlowRouter(grid, partition_exponent=router.partition_exponent)
+    fresh.route_flow()
+    for name in _OUTPUTS:
+        assert_array_almost_equal(actual[name], grid.at_node[name])
+    for node in range(grid.number_of_nodes):
+        assert_array_equal(actual_receivers[node], fresh.receivers[node])
+
+
+def test_boundary_change_on_raster():
+    mg = RasterModelGrid((4, 5), 1.)
+    mg.add_field('node', 'topographic__elevation',
+                 mg.node_y + .1 * mg.node_x)
+    fr = MFDFlowRouter(mg, partition_exponent=1.)
+    fr.route_flow()
+    assert 1 in fr.receivers[6]
+
+    mg.node_status[1] = CLOSED_BOUNDARY
+    mg.update_links_nodes_cells_to_new_BCs()
+    fr.route_flow()
+
+    assert 1 not in fr.receivers[6]
+    assert_array_almost_equal(mg.at_node['drainage_area'][1], 1.)
+    _assert_same_routing(mg, fr)
+
+
+def test_boundary_change_on_hex():
+    hg = HexModelGrid(5, 3)
+    hg.add_field('node', 'topographic__elevation', hg.node_x.copy())
+    fr = MFDFlowRouter(hg)
+    fr.route_flow()
+
+    hg.node_status[hg.node_x == hg.node_x.min()] = CLOSED_BOUNDARY
+    hg.update_links_nodes_cells_to_new_BCs()
+    fr.route_flow()
+
+    _assert_same_routing(hg, fr)
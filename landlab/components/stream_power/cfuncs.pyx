@@ -9,7 +9,11 @@ DTYPE_FLOAT = np.double
 ctypedef np.double_t DTYPE_FLOAT_t
 
 DTYPE_INT = np.int
-ctypedef np.int_t DTYPE_INT_t
+# Index arrays can be either 32- or 64-bit (see ModelGrid.index_dtype) but,
+# in any one call, they must all be of the same type.
+ctypedef fused DTYPE_INT_t:
+    np.int32_t
+    np.int64_t
 
 
 cdef extern from "math.h":
@@ -53,6 +57,111 @@ def erode_avoiding_pits(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
             node_dz[src_id] = (node_z[src_id] - z_dst_after) * 0.999999
 
 
+@cython.boundscheck(False)
+def erode_explicit_subcycled(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
+                             np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
+                             np.ndarray[DTYPE_FLOAT_t, ndim=1] flow_length,
+                             np.ndarray[DTYPE_FLOAT_t, ndim=1] coeff,
+                             DTYPE_FLOAT_t n, DTYPE_FLOAT_t threshold,
+                             DTYPE_FLOAT_t dt, DTYPE_FLOAT_t courant_factor,
+                             DTYPE_FLOAT_t min_dt,
+                             np.ndarray[DTYPE_FLOAT_t, ndim=1] node_z,
+                             np.ndarray[DTYPE_FLOAT_t, ndim=1] node_dz,
+                             np.ndarray[DTYPE_FLOAT_t, ndim=1] sp_erosion):
+    """Erode by stream power over *dt*, in as many stable substeps as needed.
+
+    Slopes are recalculated from *node_z* along the flow directions before
+    each substep, and each substep is limited so that no node erodes by more
+    than *courant_factor* of the (linearized) drop to its receiver. Pits are
+    avoided as in :func:`erode_avoiding_pits`.
+
+    Parameters
+    ----------
+    src_nodes : array_like
+        Ordered upstream node ids.
+    dst_nodes : array_like
+        Node ids of nodes receiving flow.
+    flow_length : array_like
+        Distance from each node to its receiver.
+    coeff : array_like
+        Erosion rate per unit slope**n at each node (zero to not erode).
+    n : float
+        Exponent on slope.
+    threshold : float
+        Erosion threshold over the full *dt*.
+    dt : float
+        Time to erode for.
+    courant_factor : float
+        Fraction of the stable substep to take.
+    min_dt : float
+        Shortest substep allowed.
+    node_z : array_like
+        Node elevations.
+    node_dz : array_like
+        Work array for erosion depths.
+    sp_erosion : array_like
+        On output, the stream power erosion over *dt*, without the
+        threshold, for the slopes at the start of the step.
+
+    Returns
+    -------
+    int
+        Number of substeps taken.
+    """
+    cdef unsigned int n_nodes = src_nodes.size
+    cdef double threshold_rate = threshold / dt
+    cdef double n_stab = n if n > 1. else 1.
+    cdef double time_left = dt
+    cdef double dt_sub
+    cdef double drop
+    cdef double rate
+    cdef double z_dst_after
+    cdef unsigned int src_id
+    cdef unsigned int dst_id
+    cdef unsigned int i
+    cdef int n_substeps = 0
+    cdef bint first = True
+
+    while time_left > 0.:
+        dt_sub = time_left
+        for i in range(n_nodes):
+            src_id = src_nodes[i]
+            dst_id = dst_nodes[src_id]
+            rate = 0.
+            drop = node_z[src_id] - node_z[dst_id]
+            if src_id != dst_id and coeff[src_id] > 0. and drop > 0.:
+                rate = coeff[src_id] * pow(drop / flow_length[src_id], n)
+            if first:
+                sp_erosion[src_id] = rate * dt
+            rate -= threshold_rate
+            if rate > 0.:
+                dt_sub = min(dt_sub, courant_factor * drop / (n_stab * rate))
+            else:
+                rate = 0.
+            node_dz[src_id] = rate
+        first = False
+
+        dt_sub = max(dt_sub, min_dt)
+        if dt_sub > time_left or time_left - dt_sub < 1e-9 * dt:
+            dt_sub = time_left
+
+        for i in range(n_nodes):
+            src_id = src_nodes[i]
+            dst_id = dst_nodes[src_id]
+            node_dz[src_id] *= dt_sub
+            z_dst_after = node_z[dst_id] - node_dz[dst_id]
+            if node_z[src_id] - node_dz[src_id] < z_dst_after:
+                node_dz[src_id] = (node_z[src_id] - z_dst_after) * 0.999999
+
+        for i in range(n_nodes):
+            node_z[src_nodes[i]] -= node_dz[src_nodes[i]]
+
+        time_left -= dt_sub
+        n_substeps += 1
+
+    return n_substeps
+
+
 @cython.boundscheck(False)
 def erode_with_alpha(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
                      np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
@@ -60,6 +169,9 @@ def erode_with_alpha(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
                      np.ndarray[DTYPE_FLOAT_t, ndim=1] z):
     """Erode node elevations based on a scaling factor.
 
+    The GIL is released while eroding, so independent drainage basins can be
+    eroded in parallel threads.
+
     Parameters
     ----------
     src_nodes : array_like
@@ -76,14 +188,60 @@ def erode_with_alpha(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
     cdef unsigned int dst_id
     cdef unsigned int i
 
-    for i in range(n_nodes):
-        src_id = src_nodes[i]
-        dst_id = dst_nodes[src_id]
-        if src_id != dst_id:
-            z[src_id] = ((z[src_id] + alpha[src_id] * z[dst_id]) /
-                         (1.0 + alpha[src_id]))
+    with nogil:
+        for i in range(n_nodes):
+            src_id = src_nodes[i]
+            dst_id = dst_nodes[src_id]
+            if src_id != dst_id:
+                z[src_id] = ((z[src_id] + alpha[src_id] * z[dst_id]) /
+                             (1.0 + alpha[src_id]))
+
+
+cdef inline double _implicit_elevation(double z_old, double z_dst,
+                                       double alpha, double n) nogil:
+    """Solve z - z_old + alpha * (z - z_dst) ** n = 0 for z.
+
+    The root lies between *z_dst* and *z_old*. Newton's method is used,
+    starting from *z_old*, but a step that leaves the bracket around the root
+    is replaced by bisection, so the solution converges for any n > 0 (for
+    n >= 1, Newton steps never leave the bracket).
+    """
+    cdef double lower = z_dst
+    cdef double upper = z_old
+    cdef double next_z = z_old
+    cdef double prev_z
+    cdef double z_diff
+    cdef double f
+    cdef double residual
+    cdef int i
+
+    if z_old <= z_dst:
+        return z_old
+
+    for i in range(100):
+        prev_z = next_z
+
+        z_diff = prev_z - z_dst
+        f = alpha * pow(z_diff, n - 1.)
+        residual = prev_z - z_old + f * z_diff
+        if residual == 0.:
+            break
+        elif residual > 0.:
+            upper = prev_z
+        else:
+            lower = prev_z
+
+        next_z = prev_z - residual / (1. + n * f)
+        if next_z <= lower or next_z >= upper:
+            next_z = 0.5 * (lower + upper)
 
+        if fabs(next_z - prev_z) < 1.48e-08 * fabs(next_z):
+            break
 
+    return next_z
+
+
+@cython.boundscheck(False)
 def erode_with_link_alpha(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
                           np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
                           np.ndarray[DTYPE_FLOAT_t, ndim=1] alpha,
@@ -91,6 +249,9 @@ def erode_with_link_alpha(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
                           np.ndarray[DTYPE_FLOAT_t, ndim=1] z):
     """Erode node elevations using alpha scaled by link length.
 
+    Works for any n > 0. The GIL is released while eroding, so independent
+    drainage basins can be eroded in parallel threads.
+
     Parameters
     ----------
     src_nodes : array_like
@@ -108,27 +269,12 @@ def erode_with_link_alpha(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
     cdef unsigned int src_id
     cdef unsigned int dst_id
     cdef unsigned int i
-    cdef double z_diff
-    cdef double prev_z
-    cdef double next_z
-    cdef double f
-
-    for i in range(n_nodes):
-        src_id = src_nodes[i]
-        dst_id = dst_nodes[src_id]
-
-        if src_id != dst_id:
-            next_z = z[src_id]
-
-            while True:
-                prev_z = next_z;
-
-                z_diff = prev_z - z[dst_id]
-                f = alpha[src_id] * pow(z_diff, n - 1.)
-                next_z = prev_z - ((prev_z - z[src_id] + f * z_diff) /
-                                   (1. + n * f))
 
-                if fabs((next_z - prev_z) / next_z) < 1.48e-08:
-                    break
+    with nogil:
+        for i in range(n_nodes):
+            src_id = src_nodes[i]
+            dst_id = dst_nodes[src_id]
 
-            z[src_id] = next_z
+            if src_id != dst_id:
+                z[src_id] = _implicit_elevation(z[src_id], z[dst_id],
+                                                alpha[src_id], n)
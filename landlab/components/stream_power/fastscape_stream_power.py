@@ -6,12 +6,16 @@ Created DEJH, March 2014.
 """
 from __future__ import print_function
 
+import threading
+
 import numpy
 from landlab import ModelParameterDictionary
 from landlab.core.model_parameter_dictionary import MissingKeyError, ParameterValueError
 from landlab.field.scalar_data_fields import FieldError
 from scipy.optimize import newton, fsolve
 
+from .cfuncs import erode_with_alpha, erode_with_link_alpha
+
 
 UNDEFINED_INDEX = numpy.iinfo(numpy.int32).max
 
@@ -31,20 +35,22 @@ class SPEroder(object):
         *m_sp*
     
     ...which it will draw from the supplied input file. *n_sp*  can be any 
-    value ~ 0.5<n_sp<4., but note that performance will be EXTREMELY degraded
-    if n<1.
+    value ~ 0.5<n_sp<4.
     
     If you want to supply a spatial variation in K, set K_sp to the string
     'array', and pass a field name or array to the erode method's K_if_used
     argument.
     
-    *dt*, *rainfall_intensity*, and *value_field* are optional variables.
+    *dt*, *rainfall_intensity*, *value_field*, and *threads* are optional
+    variables.
     
     *dt* is a fixed timestep, and *rainfall_intensity* is a parameter which 
     modulates K_sp (by a product, r_i**m_sp) to reflect the direct influence of
     rainfall intensity on erosivity. *value_field* is a string giving the name
     of the field containing the elevation data in the grid. It defaults to
-    'topographic__elevation' if not supplied.
+    'topographic__elevation' if not supplied. *threads* is the number of
+    threads across which independent drainage basins are eroded (default 1);
+    it can also be given as the *threads* keyword.
     
     This module assumes you have already run 
     :func:`landlab.components.flow_routing.route_flow_dn.FlowRouter.route_flow`
@@ -63,7 +69,7 @@ class SPEroder(object):
     The primary method of this class is :func:`erode`.
     '''
     
-    def __init__(self, grid, input_stream):
+    def __init__(self, grid, input_stream, threads=None):
         self.grid = grid
         inputs = ModelParameterDictionary(input_stream)
         
@@ -92,6 +98,12 @@ class SPEroder(object):
             self.value_field = inputs.read_str('value_field')
         except:
             self.value_field = 'topographic__elevation'
+        if threads is None:
+            try:
+                threads = inputs.read_int('threads')
+            except:
+                threads = 1
+        self.threads = max(int(threads), 1)
             
         #make storage variables
         self.A_to_the_m = grid.create_node_array_zeros()
@@ -103,8 +115,6 @@ class SPEroder(object):
         if self.n != 1.:
             #raise ValueError('The Braun Willett stream power algorithm requires n==1. at the moment, sorry...')
             self.nonlinear_flag = True
-            if self.n<1.:
-                print("***WARNING: With n<1 performance of the Fastscape algorithm is slow!***")
         else:
             self.nonlinear_flag = False
         
@@ -119,6 +129,42 @@ class SPEroder(object):
         self.func_for_newton = func_for_newton
         self.func_for_newton_diff = func_for_newton_diff
 
+    def _basin_chunks(self, upstream_order_IDs, flow_receivers):
+        """Split the stack into about *threads* runs of whole basins.
+
+        Each basin starts at a node that is its own receiver and occupies a
+        contiguous run of the stack, so the runs returned can be eroded
+        independently of one another.
+        """
+        (basin_starts, ) = numpy.where(
+            flow_receivers[upstream_order_IDs] == upstream_order_IDs)
+        n_nodes = upstream_order_IDs.size
+        targets = numpy.arange(1, self.threads) * n_nodes // self.threads
+        bounds = basin_starts[numpy.searchsorted(basin_starts, targets)
+                              .clip(max=basin_starts.size - 1)]
+        bounds = numpy.unique(numpy.concatenate(([0], bounds, [n_nodes])))
+        return [upstream_order_IDs[start:stop]
+                for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    def _erode_basins(self, kernel, upstream_order_IDs, *args):
+        """Run a (GIL-releasing) erosion kernel over the stack.
+
+        With more than one thread, each thread erodes its own runs of
+        basins.
+        """
+        if self.threads == 1:
+            kernel(upstream_order_IDs, *args)
+            return
+
+        flow_receivers = args[0]
+        workers = [threading.Thread(target=kernel, args=(chunk, ) + args)
+                   for chunk in self._basin_chunks(upstream_order_IDs,
+                                                   flow_receivers)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
     def gear_timestep(self, dt_in, rainfall_intensity_in=None):
         self.dt = dt_in
         if rainfall_intensity_in is not None:
@@ -178,32 +224,21 @@ class SPEroder(object):
 
         if self.nonlinear_flag == False: #n==1
             if method == 'cython':
-                from .cfuncs import erode_with_alpha
-                erode_with_alpha(upstream_order_IDs, flow_receivers, alpha, z)
+                self._erode_basins(erode_with_alpha, upstream_order_IDs,
+                                   flow_receivers, alpha, z)
             else:
                 for i in upstream_order_IDs:
                     j = flow_receivers[i]
                     if i != j:
                         z[i] = (z[i] + alpha[i]*z[j])/(1.0+alpha[i])
         else: #general, nonlinear n case
-            print('Non-linear')
             self.alpha_by_flow_link_lengthtothenless1[defined_flow_receivers] = alpha[defined_flow_receivers]/flow_link_lengths**(self.n-1.)
             alpha_by_flow_link_lengthtothenless1 = self.alpha_by_flow_link_lengthtothenless1
             n = float(self.n)
             if method == 'cython':
-                if n < 1.:
-                    #this is SLOOOOOOOOOOOW...
-                    for i in upstream_order_IDs:
-                        j = flow_receivers[i]
-                        func_for_newton = self.func_for_newton
-                        func_for_newton_diff = self.func_for_newton_diff
-                        if i != j:
-                            z[i] = fsolve(func_for_newton, z[i], args=(z[i], z[j], alpha_by_flow_link_lengthtothenless1[i], n))
-                else:
-                    from .cfuncs import erode_with_link_alpha
-                    erode_with_link_alpha(upstream_order_IDs, flow_receivers,
-                                          alpha_by_flow_link_lengthtothenless1,
-                                          n, z)
+                self._erode_basins(erode_with_link_alpha, upstream_order_IDs,
+                                   flow_receivers,
+                                   alpha_by_flow_link_lengthtothenless1, n, z)
             else:
                 for i in upstream_order_IDs:
                     j = flow_receivers[i]
@@ -7,6 +7,8 @@ from landlab.core.model_parameter_dictionary import MissingKeyError, ParameterVa
 from landlab.field.scalar_data_fields import FieldError
 from landlab.grid.base import BAD_INDEX_VALUE
 
+from .cfuncs import erode_avoiding_pits, erode_explicit_subcycled
+
 class StreamPowerEroder(object):
     """
     This component is now verified stable for simple m,n specified, followup-to-
@@ -83,6 +85,10 @@ class StreamPowerEroder(object):
             use_Q -> Bool. If true, the equation becomes E=K*Q**m*S**n. 
                 Effectively sets c=1 in Wh&T's 1999 derivation, if you are 
                 setting m and n through a, b, and c.
+            subcycle -> Bool. If true, erode() divides its timestep into as
+                many substeps as are needed for stability, recalculating the
+                slopes along the flow directions before each one. Can be
+                overridden in erode(). Defaults to False.
             
         '''
         self.grid = grid
@@ -116,6 +122,10 @@ class StreamPowerEroder(object):
             self.use_Q = inputs.read_bool('use_Q')
         except MissingKeyError:
             self.use_Q = False
+        try:
+            self.subcycle = inputs.read_bool('subcycle')
+        except MissingKeyError:
+            self.subcycle = False
         try:
             self._m = inputs.read_float('m_sp')
         except MissingKeyError:
@@ -151,6 +161,16 @@ class StreamPowerEroder(object):
         #m and n will always be set, but care needs to be taken to include Q and W directly if appropriate
                 
         self.stream_power_erosion = grid.zeros(centering='node')
+
+        #work arrays, reused from one call to erode to the next
+        self._A_for_A_to_the_m = grid.empty(centering='node')
+        self._A_to_the_m_is_set = False
+        self._A_to_the_m = grid.empty(centering='node')
+        self._erosion_coeff = grid.empty(centering='node')
+        self._S_to_the_n = grid.empty(centering='node')
+        self._erosion_increment = grid.empty(centering='node')
+        self._flow_length = grid.empty(centering='node')
+        self._is_active = np.empty(grid.number_of_nodes, dtype=bool)
         ##Flags for self-building of derived data:
         #self.made_link_gradients = False
         ##This will us the MPD once finalized
@@ -168,7 +188,7 @@ class StreamPowerEroder(object):
             slopes_at_nodes='topographic__steepest_slope',
             link_node_mapping='links_to_flow_receiver', 
             link_slopes=None, slopes_from_elevs=None, 
-            W_if_used=None, Q_if_used=None, K_if_used=None):
+            W_if_used=None, Q_if_used=None, K_if_used=None, subcycle=None):
         """
         A simple, explicit implementation of a stream power algorithm.
         
@@ -225,6 +245,16 @@ class StreamPowerEroder(object):
         runoff values at each pixel to the flow router, then pass discharges
         at each node using *Q_if_used* to this component.
         
+        Set *subcycle* to True (or False) to override the subcycle setting
+        from the input file. When subcycling, the slopes are always
+        calculated from the elevations along the flow directions given by
+        *flow_receiver*, so the slope options above are ignored, and *dt* is
+        divided into substeps short enough to keep the explicit scheme stable
+        (all within compiled code).
+        
+        A**m (or Q**m) is cached between calls, and only recalculated if the
+        drainage areas (or discharges) have changed.
+        
         RETURNS (grid, modified_elevs, stream_power_erosion); modifies grid elevation
         fields to reflect updates; creates and maintains
         grid.at_node['stream_power_erosion']. Note the value stream_power_erosion
@@ -242,49 +272,15 @@ class StreamPowerEroder(object):
         if K_if_used!=None:
             assert self.use_K, "An array of erodabilities was provided, but you didn't set K_sp to 'array' in your input file! Aborting..."
             try:
-                self._K_unit_time = grid.at_node[K_if_used][active_nodes]
+                self._K_unit_time = grid.at_node[K_if_used]
             except TypeError:
-                self._K_unit_time = K_if_used[active_nodes]
+                self._K_unit_time = K_if_used
         
         if type(node_elevs)==str:
             node_z = grid.at_node[node_elevs]
         else:
             node_z = node_elevs
         
-        #Perform check on whether we use grid or direct fed data:
-        try:
-            self.slopes = grid.at_node[slopes_at_nodes]
-        except TypeError:
-            if type(slopes_at_nodes)==np.ndarray:
-                self.slopes = slopes_at_nodes
-            else:
-                raise TypeError('slopes_at_nodes input not recognised')
-        except FieldError:
-            if slopes_from_elevs==True:
-                S_links = (node_z[grid.node_at_link_tail]-node_z[grid.node_at_link_head])/grid.link_length
-            else:
-                if link_slopes:
-                    if type(link_slopes)==str:
-                        S_links = grid.at_link[link_slopes]
-                    else:
-                        S_links = link_slopes
-                else:
-                    S_links = grid.at_link['planet_surface__derivative_of_elevation']
-                    
-            #put the slopes onto the nodes
-            try:
-                self.slopes = S_links[grid.at_node[link_node_mapping]]
-            except TypeError:
-                try:
-                    self.slopes = S_links[link_node_mapping]
-                except IndexError:
-                    #need to do the mapping on the fly.
-                    #we're going to use the max slope (i.e., + or -) of *all* adjacent nodes.
-                    #This isn't ideal. It should probably just be the outs...
-                    #i.e., np.max(self.link_S_with_trailing_blank[grid.node_outlinks] AND -self.link_S_with_trailing_blank[grid.node_inlinks])
-                    self.link_S_with_trailing_blank[:-1] = S_links
-                    self.slopes = np.amax(np.fabs(self.link_S_with_trailing_blank[grid.node_links]),axis=0)
-        
         if type(node_drainage_areas)==str:
             node_A = grid.at_node[node_drainage_areas]
         else:
@@ -296,58 +292,108 @@ class StreamPowerEroder(object):
         if type(node_order_upstream)==str:
             node_order_upstream = grid.at_node[node_order_upstream]
         
+        if subcycle is None:
+            subcycle = self.subcycle
+
         #Operate the main function:
-        if self.use_W==False and self.use_Q==False: #normal case
-            stream_power_active_nodes = self._K_unit_time * dt * node_A[active_nodes]**self._m * self.slopes[active_nodes]**self._n
-        elif self.use_W:
-            try:
-                W = grid.at_node[W_if_used]
-            except TypeError:
-                W = W_if_used
-            if self.use_Q: #use both Q and W direct
-                try:
-                    Q_direct = grid.at_node[Q_if_used]
-                except TypeError:
-                    Q_direct = Q_if_used
-                stream_power_active_nodes = self._K_unit_time * dt * Q_direct[active_nodes]**self._m * self.slopes[active_nodes]**self._n / W
-            else: #just W to be used
-                stream_power_active_nodes = self._K_unit_time * dt * node_A[active_nodes]**self._m * self.slopes[active_nodes]**self._n / W
-        else: #just use_Q
+        if self.use_Q:
             try:
                 Q_direct = grid.at_node[Q_if_used]
             except TypeError:
                 assert type(Q_if_used) in (np.ndarray, list)
-                Q_direct = Q_if_used
-            stream_power_active_nodes = self._K_unit_time * dt * Q_direct[active_nodes]**self._m * self.slopes[active_nodes]**self._n
+                Q_direct = np.asarray(Q_if_used)
+            A_to_the_m = self._cached_power(Q_direct)
+        else:
+            A_to_the_m = self._cached_power(node_A)
+
+        #erosion per unit time per unit S**n, zero away from the active nodes
+        coeff = np.multiply(A_to_the_m, self._K_unit_time,
+                            out=self._erosion_coeff)
+        if self.use_W:
+            try:
+                W = grid.at_node[W_if_used]
+            except TypeError:
+                W = W_if_used
+            np.divide(coeff, W, out=coeff)
+        self._is_active.fill(False)
+        self._is_active[active_nodes] = True
+        np.multiply(coeff, self._is_active, out=coeff)
 
         #Note that we save "stream_power_erosion" incorporating both K and a. Most definitions would need this value /K then **(1/a) to give actual stream power (unit, total, whatever), and it does not yet include the threshold
-        self.stream_power_erosion[active_nodes] = stream_power_active_nodes
-        grid.at_node['stream_power_erosion'] = self.stream_power_erosion
-        #print "max stream power: ", self.stream_power_erosion.max()
-        erosion_increment = (self.stream_power_erosion - self.sp_crit).clip(0.)
+        if subcycle:
+            flow_length = self._flow_length
+            np.hypot(grid.node_x - grid.node_x[flow_receiver],
+                     grid.node_y - grid.node_y[flow_receiver],
+                     out=flow_length)
+            erode_explicit_subcycled(node_order_upstream, flow_receiver,
+                                     flow_length, coeff, float(self._n),
+                                     float(self.sp_crit), float(dt), 0.5,
+                                     dt * 1.e-3, node_z,
+                                     self._erosion_increment,
+                                     self.stream_power_erosion)
+            grid.at_node['stream_power_erosion'] = self.stream_power_erosion
+        else:
+            #Perform check on whether we use grid or direct fed data:
+            try:
+                self.slopes = grid.at_node[slopes_at_nodes]
+            except TypeError:
+                if type(slopes_at_nodes)==np.ndarray:
+                    self.slopes = slopes_at_nodes
+                else:
+                    raise TypeError('slopes_at_nodes input not recognised')
+            except FieldError:
+                if slopes_from_elevs==True:
+                    S_links = (node_z[grid.node_at_link_tail]-node_z[grid.node_at_link_head])/grid.link_length
+                else:
+                    if link_slopes:
+                        if type(link_slopes)==str:
+                            S_links = grid.at_link[link_slopes]
+                        else:
+                            S_links = link_slopes
+                    else:
+                        S_links = grid.at_link['planet_surface__derivative_of_elevation']
                     
-        #this prevents any node from incising below any node downstream of it
-        #we have to go in upstream order in case our rate is so big we impinge on baselevels > 1 node away
-
-        elev_dstr = node_z[flow_receiver]# we substract erosion_increment[flow_receiver] in the loop, as it can update
+                #put the slopes onto the nodes
+                try:
+                    self.slopes = S_links[grid.at_node[link_node_mapping]]
+                except TypeError:
+                    try:
+                        self.slopes = S_links[link_node_mapping]
+                    except IndexError:
+                        #need to do the mapping on the fly.
+                        #we're going to use the max slope (i.e., + or -) of *all* adjacent nodes.
+                        #This isn't ideal. It should probably just be the outs...
+                        #i.e., np.max(self.link_S_with_trailing_blank[grid.node_outlinks] AND -self.link_S_with_trailing_blank[grid.node_inlinks])
+                        self.link_S_with_trailing_blank[:-1] = S_links
+                        self.slopes = np.amax(np.fabs(self.link_S_with_trailing_blank[grid.node_links]),axis=0)
 
-        method = 'cython'
-        if method == 'cython':
-            from .cfuncs import erode_avoiding_pits
+            S_to_the_n = np.clip(self.slopes, 0., np.inf,
+                                 out=self._S_to_the_n)
+            np.power(S_to_the_n, self._n, out=S_to_the_n)
+            np.multiply(coeff, S_to_the_n, out=self.stream_power_erosion)
+            self.stream_power_erosion *= dt
+            grid.at_node['stream_power_erosion'] = self.stream_power_erosion
+            erosion_increment = np.subtract(self.stream_power_erosion,
+                                            self.sp_crit,
+                                            out=self._erosion_increment)
+            erosion_increment.clip(0., out=erosion_increment)
 
+            #this prevents any node from incising below any node downstream of it
+            #we have to go in upstream order in case our rate is so big we impinge on baselevels > 1 node away
             erode_avoiding_pits(node_order_upstream, flow_receiver, node_z,
                                 erosion_increment)
-        else:           
-            for i in node_order_upstream:
-                elev_this_node_before = node_z[i]
-                elev_this_node_after = elev_this_node_before - erosion_increment[i]
-                elev_dstr_node_after = elev_dstr[i] - erosion_increment[flow_receiver[i]]
-                if elev_this_node_after<elev_dstr_node_after:
-                    erosion_increment[i] = (elev_this_node_before - elev_dstr_node_after)*0.999999 #we add a tiny elevation excess to prevent the module from ever totally severing its own flow paths
-                
-        node_z -= erosion_increment
-            
+
+            node_z -= erosion_increment
             
         self.grid = grid
         
         return grid, node_z, self.stream_power_erosion
+
+    def _cached_power(self, A):
+        """Return A**m, recalculating it only if *A* has changed."""
+        if (not self._A_to_the_m_is_set or
+                not np.array_equal(A, self._A_for_A_to_the_m)):
+            self._A_for_A_to_the_m[:] = A
+            self._A_to_the_m_is_set = True
+            np.power(self._A_for_A_to_the_m, self._m, out=self._A_to_the_m)
+        return self._A_to_the_m
@@ -0,0 +1,116 @@
+#! /usr/bin/env python
+"""
+Unit tests for landlab.components.stream_power.fastscape_stream_power
+"""
+import numpy as np
+from numpy.testing import assert_array_equal, assert_allclose
+from nose.tools import assert_true
+from scipy.optimize import newton, fsolve
+from six import StringIO
+
+from landlab import RasterModelGrid
+from landlab.components.flow_routing.route_flow_dn import FlowRouter
+from landlab.components.stream_power.fastscape_stream_power import SPEroder
+from landlab.components.stream_power.cfuncs import (erode_with_alpha,
+                                                    erode_with_link_alpha)
+
+
+# Relative tolerance of the compiled solve compared with the Python one.
+# Both stop iterating once a step is less than 1.48e-8 of the elevation,
+# but may stop at different iterates (the largest relative difference is
+# about 1.5e-8).
+_RTOL = 1e-7
+
+
+def _routed_grid(shape=(20, 30), seed=1066):
+    """A raster, with all edges open, with flow routed over random
+    elevations (so it has many basins)."""
+    np.random.seed(seed)
+    grid = RasterModelGrid(shape, 10.)
+    grid.add_field('node', 'topographic__elevation',
+                   np.random.rand(grid.number_of_nodes) * 10. +
+                   grid.node_y * .01)
+    FlowRouter(grid).route_flow()
+    return grid
+
+
+def _erode_in_python(stack, receivers, alpha, n, z):
+    """The implicit update as it was solved in Python, before it was
+    compiled for any n."""
+    def func(x, z_old, z_dst, alpha, n):
+        return x - z_old + alpha * (x - z_dst) ** n
+
+    def func_diff(x, z_old, z_dst, alpha, n):
+        return 1. + n * alpha * (x - z_dst) ** (n - 1.)
+
+    for i in stack:
+        j = receivers[i]
+        if i == j:
+            continue
+        if n == 1.:
+            z[i] = (z[i] + alpha[i] * z[j]) / (1. + alpha[i])
+        elif n >= 1.:
+            z[i] = newton(func, z[i], fprime=func_diff,
+                          args=(z[i], z[j], alpha[i], n), maxiter=10)
+        else:
+            z[i] = fsolve(func, z[i], args=(z[i], z[j], alpha[i], n))[0]
+
+
+def _kernel_inputs(grid):
+    stack = grid.at_node['upstream_ID_order']
+    receivers = grid.at_node['flow_receiver']
+    alpha = np.random.uniform(.01, .5, grid.number_of_nodes)
+    z = grid.at_node['topographic__elevation'].copy()
+    return (stack, receivers, alpha, z)
+
+
+def test_erode_with_alpha_matches_python():
+    (stack, receivers, alpha, z) = _kernel_inputs(_routed_grid())
+    expected = z.copy()
+    _erode_in_python(stack, receivers, alpha, 1., expected)
+
+    erode_with_alpha(stack, receivers, alpha, z)
+    assert_allclose(z, expected, rtol=_RTOL)
+
+
+def test_erode_with_link_alpha_matches_python():
+    for n in (1., 1.5, 2., 0.7):
+        (stack, receivers, alpha, z) = _kernel_inputs(_routed_grid())
+        expected = z.copy()
+        _erode_in_python(stack, receivers, alpha, n, expected)
+
+        erode_with_link_alpha(stack, receivers, alpha, n, z)
+        assert_allclose(z, expected, rtol=_RTOL)
+
+
+def _erode_with_threads(threads, n):
+    grid = _routed_grid((40, 50))
+    sp = SPEroder(grid, StringIO('K_sp:\n0.001\nm_sp:\n0.5\nn_sp:\n%f\n'
+                                 'dt:\n100.\n' % n), threads=threads)
+    sp.erode(grid)
+    return grid.at_node['topographic__elevation']
+
+
+def test_threads_match_serial():
+    for n in (1., 2., 0.7):
+        serial = _erode_with_threads(1, n)
+        assert_true(np.any(serial != _routed_grid((40, 50)).at_node[
+            'topographic__elevation']))
+        for threads in (2, 4, 7):
+            assert_array_equal(_erode_with_threads(threads, n), serial)
+
+
+def test_basin_chunks_are_whole_basins():
+    grid = _routed_grid((40, 50))
+    sp = SPEroder(grid, StringIO('K_sp:\n0.001\nm_sp:\n0.5\ndt:\n100.\n'),
+                  threads=4)
+    stack = grid.at_node['upstream_ID_order']
+    receivers = grid.at_node['flow_receiver']
+    chunks = sp._basin_chunks(stack, receivers)
+
+    assert_true(len(chunks) > 1)
+    assert_array_equal(np.concatenate(chunks), stack)
+    for chunk in chunks:
+        in_chunk = np.zeros(grid.number_of_nodes, dtype=bool)
+        in_chunk[chunk] = True
+        assert_true(np.all(in_chunk[receivers[chunk]]))
@@ -0,0 +1,148 @@
+#! /usr/bin/env python
+"""
+Unit tests for the subcycling of landlab.components.stream_power.stream_power
+"""
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_almost_equal
+from nose.tools import assert_equal, assert_true
+from six import StringIO
+
+from landlab import RasterModelGrid
+from landlab.components.flow_routing.route_flow_dn import FlowRouter
+from landlab.components.stream_power.stream_power import StreamPowerEroder
+from landlab.components.stream_power.cfuncs import erode_explicit_subcycled
+
+
+def _routed_grid(shape=(6, 8), seed=1066):
+    """A small raster with flow routed over a rough, tilted surface."""
+    np.random.seed(seed)
+    grid = RasterModelGrid(shape, 10.)
+    grid.add_field('node', 'topographic__elevation',
+                   grid.node_y * .1 + np.random.rand(grid.number_of_nodes))
+    FlowRouter(grid).route_flow()
+    return grid
+
+
+def _eroder(grid, n):
+    return StreamPowerEroder(grid, StringIO(
+        'K_sp:\n0.001\nm_sp:\n0.5\nn_sp:\n%f\ndt:\n1.\n' % n))
+
+
+def _slopes_to_receivers(grid, z):
+    """Slopes from each node to its receiver, as the subcycled erosion
+    calculates them."""
+    receiver = grid.at_node['flow_receiver']
+    drop = z - z[receiver]
+    length = np.hypot(grid.node_x - grid.node_x[receiver],
+                      grid.node_y - grid.node_y[receiver])
+    slopes = np.zeros_like(z)
+    flows = (receiver != np.arange(grid.number_of_nodes)) & (drop > 0.)
+    slopes[flows] = drop[flows] / length[flows]
+    return slopes
+
+
+def _erode_explicitly(grid, eroder, z, dt):
+    """Erode with the vectorised explicit path, in the stable substeps the
+    subcycled erosion takes. Return the number of substeps."""
+    coeff = (eroder._K_unit_time *
+             grid.at_node['drainage_area'] ** eroder._m)
+    is_active = np.zeros(grid.number_of_nodes, dtype=bool)
+    is_active[grid.get_active_cell_node_ids()] = True
+    n_stab = max(eroder._n, 1.)
+
+    time_left = dt
+    n_substeps = 0
+    while time_left > 0.:
+        slopes = _slopes_to_receivers(grid, z)
+        rate = coeff * slopes ** eroder._n * is_active
+        drop = z - z[grid.at_node['flow_receiver']]
+        eroding = rate > 0.
+        dt_sub = time_left
+        if np.any(eroding):
+            dt_sub = min(dt_sub, np.min(0.5 * drop[eroding] /
+                                        (n_stab * rate[eroding])))
+        dt_sub = max(dt_sub, dt * 1.e-3)
+        if dt_sub > time_left or time_left - dt_sub < 1e-9 * dt:
+            dt_sub = time_left
+        eroder.erode(grid, dt_sub, node_elevs=z, slopes_at_nodes=slopes,
+                     subcycle=False)
+        time_left -= dt_sub
+        n_substeps += 1
+    return n_substeps
+
+
+def _erode_subcycled(grid, eroder, z, dt):
+    """Erode with the compiled subcycling, directly. Return the number of
+    substeps."""
+    receiver = grid.at_node['flow_receiver']
+    coeff = (eroder._K_unit_time *
+             grid.at_node['drainage_area'] ** eroder._m)
+    is_active = np.zeros(grid.number_of_nodes, dtype=bool)
+    is_active[grid.get_active_cell_node_ids()] = True
+    return erode_explicit_subcycled(
+        grid.at_node['upstream_ID_order'], receiver,
+        np.hypot(grid.node_x - grid.node_x[receiver],
+                 grid.node_y - grid.node_y[receiver]),
+        coeff * is_active, float(eroder._n), 0., float(dt), 0.5, dt * 1.e-3,
+        z, np.empty_like(z), np.empty_like(z))
+
+
+def test_one_substep():
+    """A short step is taken at once, as the explicit path would take it."""
+    for n in (1., 2.):
+        grid = _routed_grid()
+        z = grid.at_node['topographic__elevation']
+        dt = 1.
+
+        z_explicit = z.copy()
+        explicit = _eroder(grid, n)
+        assert_equal(_erode_explicitly(grid, explicit, z_explicit, dt), 1)
+
+        z_subcycled = z.copy()
+        assert_equal(_erode_subcycled(grid, _eroder(grid, n),
+                                      z_subcycled.copy(), dt), 1)
+        subcycled = _eroder(grid, n)
+        subcycled.erode(grid, dt, node_elevs=z_subcycled, subcycle=True)
+
+        assert_true(np.any(z_subcycled < z))
+        assert_allclose(z_subcycled, z_explicit, rtol=1e-12)
+        assert_allclose(subcycled.stream_power_erosion,
+                        explicit.stream_power_erosion, rtol=1e-12)
+
+
+def test_many_substeps():
+    """A long step is split into the stable substeps of the explicit path."""
+    for n in (0.7, 1., 2.):
+        grid = _routed_grid()
+        z = grid.at_node['topographic__elevation']
+        dt = 1.e4
+
+        z_explicit = z.copy()
+        n_substeps = _erode_explicitly(grid, _eroder(grid, n), z_explicit, dt)
+        assert_true(n_substeps > 1)
+
+        z_subcycled = z.copy()
+        assert_equal(_erode_subcycled(grid, _eroder(grid, n),
+                                      z_subcycled.copy(), dt), n_substeps)
+        subcycled = _eroder(grid, n)
+        subcycled.erode(grid, dt, node_elevs=z_subcycled, subcycle=True)
+
+        assert_array_almost_equal(z_subcycled, z_explicit, decimal=10)
+
+
+def test_stream_power_erosion_at_start_of_step():
+    """The stream power erosion reported is that of the first substep's
+    slopes over the whole step."""
+    grid = _routed_grid()
+    z = grid.at_node['topographic__elevation']
+    dt = 1.e4
+
+    explicit = _eroder(grid, 1.)
+    explicit.erode(grid, dt, node_elevs=z.copy(),
+                   slopes_at_nodes=_slopes_to_receivers(grid, z),
+                   subcycle=False)
+    subcycled = _eroder(grid, 1.)
+    subcycled.erode(grid, dt, node_elevs=z.copy(), subcycle=True)
+
+    assert_allclose(subcycled.stream_power_erosion,
+                    explicit.stream_power_erosion, rtol=1e-12)
@@ -629,6 +629,42 @@ class ModelDataFields(object):
         """
         return self[group].add_field(name, value_array, **kwds)
 
+    def add_lazy_field(self, group, name, load, **kwds):
+        """add_lazy_field(group, name, load, units='-', noclobber=False)
+        Add a field whose values are loaded when they are first used.
+
+        The function *load* is called, without arguments, the first time
+        the field is accessed, and the array that it returns becomes the
+        values of the field.
+
+        Parameters
+        ----------
+        group : str
+            Name of the group.
+        name : str
+            Name of the new field to add.
+        load : callable
+            Function that returns the array of values of the field.
+        units : str, optional
+            Optionally specify the units of the field.
+        noclobber : boolean, optional
+            Raise an exception if adding to an already existing field.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab.field import ModelDataFields
+        >>> field = ModelDataFields()
+        >>> field.new_field_location('node', 4)
+        >>> field.add_lazy_field('node', 'topographic__elevation',
+        ...                      lambda: np.arange(4.))
+        >>> field.has_field('node', 'topographic__elevation')
+        True
+        >>> field.at_node['topographic__elevation']
+        array([ 0.,  1.,  2.,  3.])
+        """
+        self[group].add_lazy_field(name, load, **kwds)
+
     def set_units(self, group, name, units):
         """Set the units for a field of values.
 
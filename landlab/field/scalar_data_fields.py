@@ -20,6 +20,22 @@ class FieldError(Error, KeyError):
         return self._field
 
 
+class _LazyValues(object):
+
+    """Values of a field that are loaded the first time they are used.
+
+    Parameters
+    ----------
+    load : callable
+        Function, called without arguments, that returns the values.
+    size : int
+        The number of values.
+    """
+    def __init__(self, load, size):
+        self.load = load
+        self.size = size
+
+
 class ScalarDataFields(dict):
     """Collection of named data fields that are of the same size.
 
@@ -340,6 +356,69 @@ class ScalarDataFields(dict):
         self.set_units(name, units)
         return self[name]
 
+    def add_lazy_field(self, name, load, units=_UNKNOWN_UNITS,
+                       noclobber=False):
+        """Add a field whose values are loaded when they are first used.
+
+        Rather than an array of values, add a function that returns the
+        values of the field. The function is called, without arguments, the
+        first time the field is accessed, and the array it returns then
+        replaces it as the field's values. Use this to add fields that are
+        expensive to read (from a large file, say) but that may not be used.
+
+        Parameters
+        ----------
+        name : str
+            Name of the new field to add.
+        load : callable
+            Function that returns the array of values of the field.
+        units : str, optional
+            Optionally specify the units of the field.
+        noclobber : boolean, optional
+            Raise an exception if adding to an already existing field.
+
+        Raises
+        ------
+        ValueError :
+            If, when it is loaded, the array has a size different from the
+            field.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab.field import ScalarDataFields
+        >>> field = ScalarDataFields(4)
+        >>> def load_elevation():
+        ...     print('loading')
+        ...     return np.arange(4.)
+        >>> field.add_lazy_field('topographic__elevation', load_elevation)
+        >>> list(field.keys())
+        ['topographic__elevation']
+
+        The values are loaded when the field is first accessed, and only
+        then.
+
+        >>> field['topographic__elevation']
+        loading
+        array([ 0.,  1.,  2.,  3.])
+        >>> field['topographic__elevation']
+        array([ 0.,  1.,  2.,  3.])
+        """
+        if noclobber and name in self:
+            raise FieldError(name)
+
+        self[name] = _LazyValues(load, self.size)
+        self.set_units(name, units)
+
+    def _load(self, name, value_array):
+        """Replace lazy values of a field with the array they load."""
+        if isinstance(value_array, _LazyValues):
+            value_array = np.asanyarray(value_array.load())
+            if value_array.ndim != 1:
+                value_array = value_array.reshape((value_array.size, ))
+            self[name] = value_array
+        return value_array
+
     def set_units(self, name, units):
         """Set the units for a field of values.
 
@@ -368,6 +447,27 @@ class ScalarDataFields(dict):
 
     def __getitem__(self, name):
         try:
-            return super(ScalarDataFields, self).__getitem__(name)
+            value_array = super(ScalarDataFields, self).__getitem__(name)
         except KeyError:
             raise FieldError(name)
+        return self._load(name, value_array)
+
+    def get(self, name, default=None):
+        if name in self:
+            return self[name]
+        else:
+            return default
+
+    def values(self):
+        return [self[name] for name in self.keys()]
+
+    def items(self):
+        return [(name, self[name]) for name in self.keys()]
+
+    def __iter__(self):
+        # Overriding __iter__ keeps dict(fields) and {**fields} from copying
+        # the stored values directly, so lazy fields are loaded first.
+        return iter(self.keys())
+
+    def copy(self):
+        return dict(self.items())
@@ -101,3 +101,43 @@ def test_has_group():
 
     assert_true(fields.has_group('node'))
     assert_false(fields.has_group('cell'))
+
+
+def test_add_lazy_field():
+    loaded = []
+    def load():
+        loaded.append(True)
+        return np.arange(12.).reshape((3, 4))
+
+    fields = ModelDataFields()
+    fields.new_field_location('node', 12)
+    fields.add_lazy_field('node', 'z', load, units='m')
+
+    assert_true(fields.has_field('node', 'z'))
+    assert_true(fields.field_units('node', 'z') == 'm')
+    assert_false(loaded)
+
+    for (name, values) in fields.at_node.items():
+        assert_array_equal(np.arange(12.), values)
+    assert_array_equal(np.arange(12.), fields.at_node.get('z'))
+    assert_array_equal(np.arange(12.), fields.field_values('node', 'z'))
+    assert_true(len(loaded) == 1)
+
+
+def test_copy_lazy_field():
+    fields = ModelDataFields()
+    fields.new_field_location('node', 12)
+
+    fields.add_lazy_field('node', 'z', lambda: np.arange(12.))
+    assert_array_equal(np.arange(12.), dict(fields.at_node)['z'])
+
+    fields.add_lazy_field('node', 'z', lambda: np.arange(12.))
+    assert_array_equal(np.arange(12.), fields.at_node.copy()['z'])
+
+
+def test_add_lazy_field_with_wrong_size():
+    fields = ModelDataFields()
+    fields.new_field_location('node', 12)
+    fields.add_lazy_field('node', 'z', lambda: np.arange(10.))
+
+    assert_raises(ValueError, lambda: fields.at_node['z'])
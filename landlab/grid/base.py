@@ -69,6 +69,7 @@ array to the ModelGrid:
     ~landlab.field.grouped.ModelDataFields.add_ones
     ~landlab.field.grouped.ModelDataFields.add_zeros
     ~landlab.field.grouped.ModelDataFields.add_field
+    ~landlab.field.grouped.ModelDataFields.add_lazy_field
 
 These methods operate in the same way as the previous set except that, in
 addition to creating a new array, the newly-created array is added to the
@@ -76,7 +77,8 @@ ModelGrid. The calling signature is the same but with the addition of an
 argument that gives the name of the new field as a string. The additional
 method, :meth:`~.ModelDataFields.add_field`, adds a previously allocation
 array to the ModelGrid. If the array is of the incorrect size it will raise
-``ValueError``.
+``ValueError``. Use :meth:`~.ModelDataFields.add_lazy_field` to add a
+field whose values are not loaded until it is first used.
 
 Query Fields
 ++++++++++++
@@ -179,6 +181,7 @@ import numpy
 import warnings
 
 import six
+from scipy.spatial import cKDTree
 from six.moves import range
 
 from landlab.testing.decorators import track_this_method
@@ -270,6 +273,164 @@ def _default_axis_units(n_dims):
     return ('-', ) * n_dims
 
 
+def _find_index_dtype(dtype, max_index):
+    """Integer type to use for the element IDs of a grid.
+
+    Parameters
+    ----------
+    dtype : data-type, 'auto' or None
+        Integer type of a grid's arrays of IDs. Use ``None`` for the default
+        integer type, or ``'auto'`` for 32-bit integers if they are big
+        enough for the grid.
+    max_index : int
+        The largest ID, or count, that the grid will need to store.
+
+    Returns
+    -------
+    numpy.dtype
+        The integer type.
+
+    Raises
+    ------
+    ValueError
+        If *dtype* is not an integer type, is too small for the grid, or is
+        too small to hold ``BAD_INDEX_VALUE`` (is smaller than 32 bits).
+
+    Examples
+    --------
+    >>> from landlab.grid.base import _find_index_dtype
+    >>> _find_index_dtype('auto', 100)
+    dtype('int32')
+    >>> _find_index_dtype('auto', 2 ** 40)
+    dtype('int64')
+    >>> _find_index_dtype(numpy.int32, 100)
+    dtype('int32')
+
+    Types smaller than 32 bits can't hold ``BAD_INDEX_VALUE``.
+
+    >>> _find_index_dtype(numpy.int16, 100)
+    Traceback (most recent call last):
+    ...
+    ValueError: index type int16 is too small to hold BAD_INDEX_VALUE
+    >>> _find_index_dtype(float, 100)
+    Traceback (most recent call last):
+    ...
+    ValueError: index type float64 is not a signed integer type
+    """
+    if dtype is None:
+        dtype = numpy.int
+    elif dtype == 'auto':
+        if max_index < BAD_INDEX_VALUE:
+            dtype = numpy.int32
+        else:
+            dtype = numpy.int64
+    dtype = numpy.dtype(dtype)
+
+    if dtype.kind != 'i':
+        raise ValueError('index type %s is not a signed integer type' % dtype)
+    if numpy.iinfo(dtype).max < BAD_INDEX_VALUE:
+        raise ValueError('index type %s is too small to hold BAD_INDEX_VALUE' %
+                         dtype)
+    if max_index > numpy.iinfo(dtype).max:
+        raise ValueError('index type %s is too small for %d elements' %
+                         (dtype, max_index))
+    return dtype
+
+
+def _is_active_link(tail_status, head_status):
+    """Test if links are active, given the statuses of their end nodes."""
+    return (((tail_status == CORE_NODE) & (head_status != CLOSED_BOUNDARY)) |
+            ((head_status == CORE_NODE) & (tail_status != CLOSED_BOUNDARY)))
+
+
+def _is_in_sorted_ids(ids, values):
+    """Test if values are in a sorted array of IDs.
+
+    Examples
+    --------
+    >>> _is_in_sorted_ids(numpy.array([1, 3, 5]), numpy.array([0, 3, 6]))
+    array([False,  True, False], dtype=bool)
+    """
+    position = numpy.searchsorted(ids, values)
+    is_in = position < len(ids)
+    is_in[is_in] = ids[position[is_in]] == values[is_in]
+    return is_in
+
+
+def _splice(array, removed_at, added_at, values):
+    """Remove elements from an array, and insert values into it.
+
+    The elements at positions *removed_at* are removed, and each of *values*
+    is inserted before the matching position of *added_at* (both being
+    positions in the original array). The unchanged elements are copied in
+    blocks, so this is fast if there are only a few changes.
+
+    Examples
+    --------
+    >>> _splice(numpy.array([1, 3, 5, 7]), [1, 3], [0, 3], [0, 9])
+    array([0, 1, 5, 9])
+    """
+    values = numpy.asarray(values, dtype=array.dtype)
+
+    # Insertions go before a removal at the same position.
+    changes = sorted([(position, 0, n) for (n, position) in
+                      enumerate(added_at)] +
+                     [(position, 1, None) for position in removed_at])
+
+    blocks = []
+    start = 0
+    for (position, is_removal, n) in changes:
+        blocks.append(array[start:position])
+        if is_removal:
+            start = position + 1
+        else:
+            blocks.append(values[n:n + 1])
+            start = position
+    blocks.append(array[start:])
+
+    return numpy.concatenate(blocks)
+
+
+def _update_sorted_ids(ids, remove, add):
+    """Remove IDs from, and add IDs to, a sorted array of IDs.
+
+    The IDs to remove must be in *ids*, and those to add must not be.
+
+    Examples
+    --------
+    >>> _update_sorted_ids(numpy.array([1, 3, 5, 7]), [3, 7], [0, 4])
+    array([0, 1, 4, 5])
+    """
+    return _splice(ids, numpy.searchsorted(ids, remove),
+                   numpy.searchsorted(ids, add), add)
+
+
+def _as_points(coords):
+    """Array of (x, y) points, and whether more than one point was given.
+
+    *coords* is a tuple of x and y coordinates, either scalars or arrays.
+    """
+    (x, y) = numpy.broadcast_arrays(numpy.asarray(coords[0], dtype=float),
+                                    numpy.asarray(coords[1], dtype=float))
+    points = numpy.column_stack((x.flat, y.flat))
+    return (points, x.ndim > 0)
+
+
+def _distances_and_azimuths(grid, points, nodes):
+    """Distances and azimuths of nodes from points.
+
+    *nodes* is either an array of node IDs for a single (x, y) point, or a
+    2D array with a row of IDs for each of *points*. Azimuths are measured
+    clockwise from north (up), in radians, as with
+    :meth:`ModelGrid.get_distances_of_nodes_to_point`.
+    """
+    points = numpy.asarray(points)
+    dx = grid.node_x[nodes] - points[..., 0:1]
+    dy = grid.node_y[nodes] - points[..., 1:2]
+    return (numpy.sqrt(dx * dx + dy * dy),
+            numpy.arctan2(dx, dy) % (2. * numpy.pi))
+
+
 def find_true_vector_from_link_vector_pair(L1, L2, b1x, b1y, b2x, b2y):
     """Separates a pair of links with vector values into x and y components.
 
@@ -412,6 +573,11 @@ class ModelGrid(ModelDataFields):
         Name of axes
     axis_units : tuple, optional
         Units of coordinates
+    index_dtype : data-type, optional
+        Integer type of the grid's arrays of element IDs (the default
+        integer type if not given). Use ``'auto'`` for 32-bit IDs on grids
+        that are small enough for them. Types smaller than 32 bits are not
+        allowed, as they can't hold ``BAD_INDEX_VALUE``.
     """
     # Debugging flags (if True, activates some output statements)
     _DEBUG_VERBOSE = False
@@ -429,6 +595,12 @@ class ModelGrid(ModelDataFields):
     node_inlink_matrix = numpy.array([], dtype=numpy.int32) #: Nodes on the other end of links pointing into a node.
     node_outlink_matrix = numpy.array([], dtype=numpy.int32) #: Nodes on the other end of links pointing out of a node.
 
+    _index_dtype = numpy.dtype(numpy.int)
+
+    # Set once the lists of nodes and cells have been made from the node
+    # statuses, and so can be patched as statuses change.
+    _node_lists_are_reset = False
+
     def __init__(self, **kwds):
         super(ModelGrid, self).__init__()
         for element_name in _ARRAY_LENGTH_ATTRIBUTES:
@@ -444,6 +616,23 @@ class ModelGrid(ModelDataFields):
     def _initialize( self ):
         pass
 
+    @property
+    def index_dtype(self):
+        """Integer type of the grid's arrays of element IDs.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> rmg = RasterModelGrid((3, 4), index_dtype='int32')
+        >>> rmg.index_dtype
+        dtype('int32')
+        >>> rmg.node_at_link_tail.dtype
+        dtype('int32')
+        >>> rmg.core_nodes
+        array([5, 6], dtype=int32)
+        """
+        return self._index_dtype
+
     @property
     def ndim(self):
         """Number of spatial dimensions of the grid"""
@@ -461,7 +650,7 @@ class ModelGrid(ModelDataFields):
         core_nodes will return just core nodes.
         """
         (active_node_ids, ) = numpy.where(self.node_status != CLOSED_BOUNDARY)
-        return active_node_ids.astype(numpy.int, copy=False)
+        return active_node_ids.astype(self.index_dtype, copy=False)
 
     @property
     def core_nodes(self):
@@ -472,7 +661,7 @@ class ModelGrid(ModelDataFields):
             return self._core_nodes
         except:
             (core_node_ids, ) = numpy.where(self.node_status == CORE_NODE)
-            return core_node_ids.astype(numpy.int, copy=False)
+            return core_node_ids.astype(self.index_dtype, copy=False)
 
     @property
     def boundary_nodes(self):
@@ -483,7 +672,7 @@ class ModelGrid(ModelDataFields):
             return self._boundary_nodes
         except:
             (boundary_node_ids, ) = numpy.where(self.node_status != CORE_NODE)
-            return boundary_node_ids.astype(numpy.int, copy=False)
+            return boundary_node_ids.astype(self.index_dtype, copy=False)
 
     @property
     def node_boundary_status(self):
@@ -509,7 +698,7 @@ class ModelGrid(ModelDataFields):
         Node id for all nodes not marked as a closed boundary
         """
         (open_node_ids, ) = numpy.where(self.node_status != CLOSED_BOUNDARY)
-        return open_node_ids.astype(numpy.int, copy=False)
+        return open_node_ids.astype(self.index_dtype, copy=False)
 
     @property
     def open_boundary_nodes(self):
@@ -517,7 +706,7 @@ class ModelGrid(ModelDataFields):
         (open_boundary_node_ids, ) = numpy.where(
             (self.node_status != CLOSED_BOUNDARY) &
             (self.node_status != CORE_NODE))
-        return open_boundary_node_ids.astype(numpy.int, copy=False)
+        return open_boundary_node_ids.astype(self.index_dtype, copy=False)
 
     @property
     def closed_boundary_nodes(self):
@@ -525,7 +714,7 @@ class ModelGrid(ModelDataFields):
         """
         (closed_boundary_node_ids, ) = numpy.where(
             self.node_status == CLOSED_BOUNDARY)
-        return closed_boundary_node_ids.astype(numpy.int, copy=False)
+        return closed_boundary_node_ids.astype(self.index_dtype, copy=False)
 
     @property
     def fixed_gradient_boundary_nodes(self):
@@ -533,7 +722,7 @@ class ModelGrid(ModelDataFields):
         """
         (fixed_gradient_boundary_node_ids, ) = numpy.where(
             self.node_status == FIXED_GRADIENT_BOUNDARY)
-        return fixed_gradient_boundary_node_ids.astype(numpy.int, copy=False)
+        return fixed_gradient_boundary_node_ids.astype(self.index_dtype, copy=False)
 
     @property
     def fixed_value_boundary_nodes(self):
@@ -541,7 +730,7 @@ class ModelGrid(ModelDataFields):
         """
         (fixed_value_boundary_node_ids, ) = numpy.where(
             self.node_status == FIXED_VALUE_BOUNDARY)
-        return fixed_value_boundary_node_ids.astype(numpy.int, copy=False)
+        return fixed_value_boundary_node_ids.astype(self.index_dtype, copy=False)
 
     @property
     def active_links(self):
@@ -561,13 +750,13 @@ class ModelGrid(ModelDataFields):
             use :func:`node_at_core_cell` for an exact equivalent.
         """
         (active_cell_ids, ) = numpy.where(self.node_status == CORE_NODE)
-        return active_cell_ids.astype(numpy.int, copy=False)
+        return active_cell_ids.astype(self.index_dtype, copy=False)
 
     @property
     def node_at_core_cell(self):
         """Node ID associated with core grid cells."""
         (core_cell_ids, ) = numpy.where(self.node_status == CORE_NODE)
-        return core_cell_ids.astype(numpy.int, copy=False)
+        return core_cell_ids.astype(self.index_dtype, copy=False)
 
     @property
     def active_cell_index_at_nodes(self):
@@ -697,7 +886,7 @@ class ModelGrid(ModelDataFields):
             Deprecated due to outdated terminology;
             use :func:`get_core_nodes` instead.
         """
-        return numpy.where(self.node_status == CORE_NODE)[0].astype(numpy.int, copy=False)
+        return numpy.where(self.node_status == CORE_NODE)[0].astype(self.index_dtype, copy=False)
 
     def get_core_nodes(self):
         """Node IDs of core nodes.
@@ -1102,6 +1291,24 @@ class ModelGrid(ModelDataFields):
         Calculates the gradient in quantity *node_values* at each active link
         in the grid.
         This method follows the convention POSITIVE UP.
+
+        To find the gradients of several fields (or of each member of an
+        ensemble) at once, give *node_values* as a stack of arrays, of shape
+        (number of fields, number of nodes). The result is then of shape
+        (number of fields, number of active links).
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import HexModelGrid
+        >>> hmg = HexModelGrid(3, 2)
+        >>> z = np.vstack((hmg.node_x, hmg.node_y))
+        >>> grads = hmg.calculate_gradients_at_active_links(z)
+        >>> grads.shape == (2, hmg.number_of_active_links)
+        True
+        >>> np.allclose(grads[0],
+        ...             hmg.calculate_gradients_at_active_links(hmg.node_x))
+        True
         """
         return gfuncs.calculate_gradients_at_active_links(self, node_values,
                                                           out=out)
@@ -1498,11 +1705,109 @@ class ModelGrid(ModelDataFields):
         caller can work with node-based arrays instead of active-cell-based
         arrays.
 
+        *active_link_flux* can also be a stack of arrays, of shape (number of
+        fields, number of active links), in which case the result is of shape
+        (number of fields, number of nodes).
+
         This method is untested with looped boundary conditions.
         """
         return gfuncs.calculate_flux_divergence_at_nodes(self, active_link_flux,
                                                         out=out)
 
+    @property
+    def gradient_operator(self):
+        """Sparse matrix that maps node values to gradients at active links.
+
+        The (number of active links, number of nodes) CSR matrix is made the
+        first time it is used, and kept until the boundary conditions change.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> rmg = RasterModelGrid((4, 5))
+        >>> z = np.random.rand(rmg.number_of_nodes)
+        >>> np.allclose(rmg.gradient_operator.dot(z),
+        ...             rmg.calculate_gradients_at_active_links(z))
+        True
+        >>> rmg.gradient_operator is rmg.gradient_operator
+        True
+        """
+        try:
+            return self._gradient_operator
+        except AttributeError:
+            self._gradient_operator = gfuncs.make_gradient_operator(self)
+            return self._gradient_operator
+
+    @property
+    def flux_divergence_operator(self):
+        """Sparse matrix that maps active-link fluxes to divergence at nodes.
+
+        The (number of nodes, number of active links) CSR matrix gives the
+        same result as :func:`calculate_flux_divergence_at_nodes`. It is made
+        the first time it is used, and kept until the boundary conditions
+        change.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> rmg = RasterModelGrid((4, 5))
+        >>> q = np.random.rand(rmg.number_of_active_links)
+        >>> np.allclose(rmg.flux_divergence_operator.dot(q),
+        ...             rmg.calculate_flux_divergence_at_nodes(q))
+        True
+        """
+        try:
+            return self._flux_divergence_operator
+        except AttributeError:
+            self._flux_divergence_operator = (
+                self._make_flux_divergence_operator())
+            return self._flux_divergence_operator
+
+    @property
+    def laplacian_operator(self):
+        """Sparse matrix that maps node values to their Laplacian at nodes.
+
+        This is the product of :attr:`flux_divergence_operator` and
+        :attr:`gradient_operator`, and so is the divergence of the gradient
+        of the values. Implicit solvers can build their system matrices from
+        it. It is kept until the boundary conditions change.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> rmg = RasterModelGrid((3, 3))
+        >>> rmg.laplacian_operator.toarray()[4]
+        array([ 0.,  1.,  0.,  1., -4.,  1.,  0.,  1.,  0.])
+        """
+        try:
+            return self._laplacian_operator
+        except AttributeError:
+            self._laplacian_operator = self.flux_divergence_operator.dot(
+                self.gradient_operator).tocsr()
+            return self._laplacian_operator
+
+    def _make_flux_divergence_operator(self):
+        """Make the sparse flux divergence matrix for this grid.
+
+        Divergence is found only at nodes with active cells; other nodes
+        have empty rows.
+        """
+        inverse_area = numpy.zeros(self.number_of_nodes)
+        inverse_area[self.activecell_node] = 1. / self.active_cell_areas
+        return gfuncs.make_flux_divergence_operator(self, self.face_width,
+                                                    inverse_area)
+
+    def _reset_operators(self):
+        """Forget the cached sparse gradient and divergence matrices."""
+        for name in ('_gradient_operator', '_flux_divergence_operator',
+                     '_laplacian_operator'):
+            try:
+                delattr(self, name)
+            except AttributeError:
+                pass
+
 
     @property
     @make_return_array_immutable
@@ -1553,18 +1858,17 @@ class ModelGrid(ModelDataFields):
         '''
         Sets up an array of cell areas which is nnodes long. Nodes which have
         cells receive the area of that cell. Nodes which do not receive
-        numpy.nan entries.
-        Note this method is typically only required for some raster purposes,
-        and is overridden in raster.py. It is unlikely this parent method will
-        ever need to be called.
+        zero, so that, for instance, flow accumulated over the grid is
+        finite where it leaves through the perimeter nodes.
+        Note this method is overridden in raster.py.
         '''
-        self._forced_cell_areas = numpy.empty(self.number_of_nodes)
-        self._forced_cell_areas.fill(numpy.nan)
+        self._forced_cell_areas = numpy.zeros(self.number_of_nodes)
         cell_node_ids = self.get_active_cell_node_ids()
         try:
             self._forced_cell_areas[cell_node_ids] = self.cell_areas
         except AttributeError:
             self._forced_cell_areas[cell_node_ids] = self.active_cell_areas #in the case of the Voronoi
+        return self._forced_cell_areas
 
     def get_active_cell_node_ids( self ):
         """Nodes of active cells.
@@ -1718,13 +2022,10 @@ class ModelGrid(ModelDataFields):
         fromnode_status = self.node_status[self.node_at_link_tail]
         tonode_status = self.node_status[self.node_at_link_head]
 
-        active_links = (((fromnode_status == CORE_NODE) & ~
-                         (tonode_status == CLOSED_BOUNDARY)) |
-                        ((tonode_status == CORE_NODE) & ~
-                         (fromnode_status == CLOSED_BOUNDARY)))
+        active_links = _is_active_link(fromnode_status, tonode_status)
 
         (self.active_link_ids, ) = numpy.where(active_links)
-        self.active_link_ids = self.active_link_ids.astype(numpy.int, copy=False)
+        self.active_link_ids = self.active_link_ids.astype(self.index_dtype, copy=False)
 
         self._num_active_links = len(self.active_link_ids)
         self._num_active_faces = self._num_active_links
@@ -1751,33 +2052,184 @@ class ModelGrid(ModelDataFields):
             node_corecell
             _boundary_nodes
         """
-        self.activecell_node = numpy.where(self.node_status != CLOSED_BOUNDARY)[0].astype(numpy.int, copy=False)
-        self.corecell_node = numpy.where(self.node_status == CORE_NODE)[0].astype(numpy.int, copy=False)
+        self.activecell_node = numpy.where(self.node_status != CLOSED_BOUNDARY)[0].astype(self.index_dtype, copy=False)
+        self.corecell_node = numpy.where(self.node_status == CORE_NODE)[0].astype(self.index_dtype, copy=False)
         self._num_core_cells = self.corecell_node.size
         self._num_core_nodes = self._num_core_cells
         self._num_active_nodes = self.activecell_node.size
         self._num_active_cells = self._num_core_cells
-        self.active_cells = numpy.arange(self._num_active_cells)
-        self._core_cells = numpy.arange(self._num_core_cells)
-        self.node_corecell = numpy.empty(self.number_of_nodes, dtype=int)
+        self.active_cells = numpy.arange(self._num_active_cells,
+                                         dtype=self.index_dtype)
+        self._core_cells = numpy.arange(self._num_core_cells,
+                                        dtype=self.index_dtype)
+        self.node_corecell = numpy.empty(self.number_of_nodes, dtype=self.index_dtype)
         self.node_corecell.fill(BAD_INDEX_VALUE)
         self.node_corecell[self.corecell_node] = self._core_cells
-        self.node_activecell = numpy.empty(self.number_of_nodes, dtype=int)
+        self.node_activecell = numpy.empty(self.number_of_nodes, dtype=self.index_dtype)
         self.node_activecell.fill(BAD_INDEX_VALUE)
         self.node_activecell.flat[self.activecell_node] = self.active_cells
-        self._boundary_nodes = numpy.where(self.node_status != CORE_NODE)[0].astype(numpy.int, copy=False)
+        self._boundary_nodes = numpy.where(self.node_status != CORE_NODE)[0].astype(self.index_dtype, copy=False)
+        self._node_lists_are_reset = True
+
+
+    def _links_at_nodes(self, nodes):
+        """IDs of the links that touch any of the given nodes, sorted."""
+        links = numpy.concatenate((self.node_inlink_matrix[:, nodes].flat,
+                                   self.node_outlink_matrix[:, nodes].flat))
+        return numpy.unique(links[links >= 0])
+
+    def _nodes_at_link_ends(self, links):
+        """IDs of the nodes at the tails and heads of the given links."""
+        return self.node_at_link_tail[links], self.node_at_link_head[links]
+
+    def _update_active_links(self, links):
+        """
+        Updates the lists of active links after the statuses of some nodes
+        have changed. Only *links*, the sorted IDs of the links that touch
+        those nodes, are checked. Links that have become active are added to
+        the lists, and links that are no longer active are removed, and then
+        the active in-link and out-link matrices are patched.
+        """
+        (tail, head) = self._nodes_at_link_ends(links)
+        is_active = _is_active_link(self.node_status[tail],
+                                    self.node_status[head])
+        was_active = _is_in_sorted_ids(self.active_link_ids, links)
+
+        is_added = is_active & ~ was_active
+        is_removed = was_active & ~ is_active
+        if not numpy.any(is_added | is_removed):
+            return
+
+        removed_at = numpy.searchsorted(self.active_link_ids,
+                                        links[is_removed])
+        added_at = numpy.searchsorted(self.active_link_ids, links[is_added])
+
+        self.active_link_ids = _splice(self.active_link_ids, removed_at,
+                                       added_at, links[is_added])
+        self.activelink_fromnode = _splice(self.activelink_fromnode,
+                                           removed_at, added_at,
+                                           tail[is_added])
+        self.activelink_tonode = _splice(self.activelink_tonode, removed_at,
+                                         added_at, head[is_added])
+        self._num_active_links = len(self.active_link_ids)
+        self._num_active_faces = self._num_active_links
 
+        is_changed = is_added | is_removed
+        nodes = numpy.unique(numpy.concatenate((tail[is_changed],
+                                                head[is_changed])))
+        self._update_active_inlink_and_outlink_matrices(nodes, removed_at,
+                                                        added_at)
+
+    def _update_active_inlink_and_outlink_matrices(self, nodes, removed_at,
+                                                   added_at):
+        """
+        Patches the active inlink and outlink matrices after the active links
+        at *removed_at* have been removed from the list of active links, and
+        new ones inserted before *added_at* (see _splice). The active link
+        IDs in the matrices are moved to their new positions, and the columns
+        of *nodes*, which are at the ends of links that have become active or
+        inactive, are made again (active links in order of link ID, as
+        _setup_active_inlink_and_outlink_matrices does).
+        """
+        n_active_links = self.number_of_active_links
+        n_old_active_links = n_active_links + len(removed_at) - len(added_at)
+
+        # Where each of the old active links now is in the list of active
+        # links: moved on by the links added before or at it, and back by
+        # those removed before it. The extra last element maps the -1 padding
+        # of the matrices to itself.
+        shift = (numpy.bincount(added_at, minlength=n_old_active_links + 1) -
+                 numpy.bincount(removed_at + 1,
+                                minlength=n_old_active_links + 1))
+        new_index = numpy.arange(n_old_active_links + 1,
+                                 dtype=self.index_dtype)
+        new_index += numpy.cumsum(shift).astype(self.index_dtype)
+        new_index[removed_at] = -1
+        new_index[-1] = -1
+
+        columns = numpy.arange(len(nodes))
+        for (matrix, matrix2, count, links_at_node) in [
+                ('node_active_inlink_matrix', 'node_active_inlink_matrix2',
+                 'node_numactiveinlink', self.node_inlink_matrix),
+                ('node_active_outlink_matrix', 'node_active_outlink_matrix2',
+                 'node_numactiveoutlink', self.node_outlink_matrix)]:
+            links = links_at_node[:, nodes]
+            is_active = _is_in_sorted_ids(self.active_link_ids, links)
+            order = numpy.argsort(numpy.where(is_active, links,
+                                              self.number_of_links),
+                                  axis=0, kind='mergesort')
+            links = links[order, columns]
+            is_active = is_active[order, columns]
+
+            active_index = new_index[getattr(self, matrix)]
+            active_index[:, nodes] = numpy.where(
+                is_active, numpy.searchsorted(self.active_link_ids, links), -1)
+            setattr(self, matrix, active_index)
+            getattr(self, matrix2)[:, nodes] = numpy.where(is_active, links,
+                                                           -1)
+            getattr(self, count)[nodes] = is_active.sum(axis=0)
+
+    def _update_lists_of_nodes_cells(self, nodes, old_status):
+        """
+        Updates the lists of nodes and cells (see _reset_lists_of_nodes_cells)
+        after the statuses of *nodes* have changed from *old_status*. Nodes
+        are added to, and removed from, the sorted lists of active, core and
+        boundary nodes.
+
+        The lists that a grid starts with are not always in this form, in
+        which case they are all made again.
+        """
+        if not self._node_lists_are_reset:
+            self._reset_lists_of_nodes_cells()
+            return
+
+        n_old_active_cells = self._num_active_cells
+        new_status = self.node_status[nodes]
+        (was_core, is_core) = (old_status == CORE_NODE,
+                               new_status == CORE_NODE)
+        (was_closed, is_closed) = (old_status == CLOSED_BOUNDARY,
+                                   new_status == CLOSED_BOUNDARY)
+
+        self.activecell_node = _update_sorted_ids(
+            self.activecell_node, nodes[is_closed & ~ was_closed],
+            nodes[was_closed & ~ is_closed])
+        self.corecell_node = _update_sorted_ids(
+            self.corecell_node, nodes[was_core & ~ is_core],
+            nodes[is_core & ~ was_core])
+        self._boundary_nodes = _update_sorted_ids(
+            self._boundary_nodes, nodes[is_core & ~ was_core],
+            nodes[was_core & ~ is_core])
 
-    def update_links_nodes_cells_to_new_BCs(self):
-        """Update grid element connectivity, status.
-
-        This method updates all of the various lists and attributes governed
-        by node status (e.g., core nodes, active links, etc) when you change
-        node statuses. Call it if your method or driver makes changes to the
-        boundary conditions of nodes in the grid.
-        """
-        self._reset_list_of_active_links()
-        self._reset_lists_of_nodes_cells()
+        self._num_core_cells = self.corecell_node.size
+        self._num_core_nodes = self._num_core_cells
+        self._num_active_nodes = self.activecell_node.size
+        self._num_active_cells = self._num_core_cells
+        self.active_cells = numpy.arange(self._num_active_cells,
+                                         dtype=self.index_dtype)
+        self._core_cells = numpy.arange(self._num_core_cells,
+                                        dtype=self.index_dtype)
+
+        # Only the cells of nodes after the first changed node are renumbered.
+        self.node_corecell[nodes] = BAD_INDEX_VALUE
+        first = numpy.searchsorted(self.corecell_node, nodes[0])
+        self.node_corecell[self.corecell_node[first:]] = (
+            self._core_cells[first:])
+        # Active nodes are numbered modulo the number of active cells (as
+        # by _reset_lists_of_nodes_cells) so, if that number has changed, all
+        # of them are renumbered.
+        if self._num_active_cells == n_old_active_cells:
+            self.node_activecell[nodes] = BAD_INDEX_VALUE
+            first = numpy.searchsorted(self.activecell_node, nodes[0])
+        else:
+            self.node_activecell.fill(BAD_INDEX_VALUE)
+            first = 0
+        if self._num_active_cells > 0:
+            self.node_activecell[self.activecell_node[first:]] = (
+                numpy.arange(first, self._num_active_nodes) %
+                self._num_active_cells)
+
+    def _reset_neighbor_lists(self):
+        """Mark the lists of neighbor and diagonal nodes as out of date."""
         try:
             if self.diagonal_list_created:
                 self.diagonal_list_created = False
@@ -1789,6 +2241,23 @@ class ModelGrid(ModelDataFields):
         except AttributeError:
             pass
 
+    def update_links_nodes_cells_to_new_BCs(self):
+        """Update grid element connectivity, status.
+
+        This method updates all of the various lists and attributes governed
+        by node status (e.g., core nodes, active links, etc) when you change
+        node statuses. Call it if your method or driver makes changes to the
+        boundary conditions of nodes in the grid.
+
+        See Also
+        --------
+        set_status_at_node : Change the statuses of a few nodes.
+        """
+        self._reset_list_of_active_links()
+        self._reset_lists_of_nodes_cells()
+        self._reset_operators()
+        self._reset_neighbor_lists()
+
 
     def set_nodata_nodes_to_inactive(self, node_data, nodata_value):
         """Make no-data nodes inactive.
@@ -1895,15 +2364,13 @@ class ModelGrid(ModelDataFields):
         accordingly. Assumes that self.number_of_nodes, self.node_at_link_tail, and
         self.node_at_link_head have already been set up.
         
-        Algorithm works by simply looping through all links; for each, the 
-        endpoints are neighbors of one another, so we increment the number of
-        neighbors for both the endpoint nodes.
+        The endpoints of each link are neighbors of one another, so we count
+        the number of times each node is at the tail or head of a link.
         """
-        num_nbrs = numpy.zeros(self.number_of_nodes, dtype=int)
-        for link in range(self.number_of_links):
-            num_nbrs[self.node_at_link_tail[link]] += 1
-            num_nbrs[self.node_at_link_head[link]] += 1
-        return num_nbrs
+        return (numpy.bincount(self.node_at_link_tail,
+                               minlength=self.number_of_nodes) +
+                numpy.bincount(self.node_at_link_head,
+                               minlength=self.number_of_nodes))
 
 
     def _setup_inlink_and_outlink_matrices(self):
@@ -1941,14 +2408,15 @@ class ModelGrid(ModelDataFields):
 
         # Create active in-link and out-link matrices.
         self.node_inlink_matrix = - numpy.ones(
-            (self.max_num_nbrs, self.number_of_nodes), dtype=numpy.int)
+            (self.max_num_nbrs, self.number_of_nodes), dtype=self.index_dtype)
         self.node_outlink_matrix = - numpy.ones(
-            (self.max_num_nbrs, self.number_of_nodes), dtype=numpy.int)
+            (self.max_num_nbrs, self.number_of_nodes), dtype=self.index_dtype)
 
         # Set up the inlink arrays
         tonodes = self.node_at_link_head
-        self.node_numinlink = numpy.bincount(tonodes,
-                                             minlength=self.number_of_nodes)
+        self.node_numinlink = numpy.bincount(
+            tonodes, minlength=self.number_of_nodes).astype(self.index_dtype,
+                                                            copy=False)
 
         counts = count_repeated_values(self.node_at_link_head)
         for (count, (tonodes, link_ids)) in enumerate(counts):
@@ -1956,8 +2424,9 @@ class ModelGrid(ModelDataFields):
 
         # Set up the outlink arrays
         fromnodes = self.node_at_link_tail
-        self.node_numoutlink = numpy.bincount(fromnodes,
-                                              minlength=self.number_of_nodes)
+        self.node_numoutlink = numpy.bincount(
+            fromnodes, minlength=self.number_of_nodes).astype(self.index_dtype,
+                                                              copy=False)
         counts = count_repeated_values(self.node_at_link_tail)
         for (count, (fromnodes, link_ids)) in enumerate(counts):
             self.node_outlink_matrix[count][fromnodes] = link_ids
@@ -1995,14 +2464,14 @@ class ModelGrid(ModelDataFields):
         """
         # Create active in-link and out-link matrices.
         self.node_active_inlink_matrix = - numpy.ones(
-            (self.max_num_nbrs, self.number_of_nodes), dtype=numpy.int)
+            (self.max_num_nbrs, self.number_of_nodes), dtype=self.index_dtype)
         self.node_active_outlink_matrix = - numpy.ones(
-            (self.max_num_nbrs, self.number_of_nodes), dtype=numpy.int)
+            (self.max_num_nbrs, self.number_of_nodes), dtype=self.index_dtype)
 
         # Set up the inlink arrays
         tonodes = self.activelink_tonode
         self.node_numactiveinlink = numpy.bincount(
-            tonodes, minlength=self.number_of_nodes).astype(numpy.int,
+            tonodes, minlength=self.number_of_nodes).astype(self.index_dtype,
                                                             copy=False)
 
         counts = count_repeated_values(self.activelink_tonode)
@@ -2012,7 +2481,7 @@ class ModelGrid(ModelDataFields):
         # Set up the outlink arrays
         fromnodes = self.activelink_fromnode
         self.node_numactiveoutlink = numpy.bincount(
-            fromnodes, minlength=self.number_of_nodes).astype(numpy.int,
+            fromnodes, minlength=self.number_of_nodes).astype(self.index_dtype,
                                                               copy=False)
         counts = count_repeated_values(self.activelink_fromnode)
         for (count, (fromnodes, active_link_ids)) in enumerate(counts):
@@ -2030,14 +2499,14 @@ class ModelGrid(ModelDataFields):
         # RID OF THE "2")
         # TODO: MAKE THIS CHANGE ONCE CODE THAT USES IT HAS BEEN PREPPED
         self.node_active_inlink_matrix2 = - numpy.ones(
-            (self.max_num_nbrs, self.number_of_nodes), dtype=numpy.int)
+            (self.max_num_nbrs, self.number_of_nodes), dtype=self.index_dtype)
         self.node_active_outlink_matrix2 = - numpy.ones(
-            (self.max_num_nbrs, self.number_of_nodes), dtype=numpy.int)
+            (self.max_num_nbrs, self.number_of_nodes), dtype=self.index_dtype)
 
         # Set up the inlink arrays
         tonodes = self.node_at_link_head[self.active_links]
         self.node_numactiveinlink = numpy.bincount(
-            tonodes, minlength=self.number_of_nodes).astype(numpy.int,
+            tonodes, minlength=self.number_of_nodes).astype(self.index_dtype,
                                                             copy=False)
 
         # OK, HERE WE HAVE TO MAKE A CHANGE, BECAUSE THE INDICES RETURNED BY
@@ -2053,7 +2522,7 @@ class ModelGrid(ModelDataFields):
         # Set up the outlink arrays
         fromnodes = self.node_at_link_tail[self.active_links]
         self.node_numactiveoutlink = numpy.bincount(
-            fromnodes, minlength=self.number_of_nodes).astype(numpy.int,
+            fromnodes, minlength=self.number_of_nodes).astype(self.index_dtype,
                                                               copy=False)
         counts = count_repeated_values(self.activelink_fromnode)
         for (count, (fromnodes, active_link_ids)) in enumerate(counts):
@@ -2406,7 +2875,7 @@ class ModelGrid(ModelDataFields):
         ndarray
             IDs of boundary nodes.
         """
-        return numpy.where(self.node_status != 0)[0].astype(numpy.int, copy=False)
+        return numpy.where(self.node_status != 0)[0].astype(self.index_dtype, copy=False)
 
     def _assign_boundary_nodes_to_grid_sides(self):
         """
@@ -2535,6 +3004,56 @@ class ModelGrid(ModelDataFields):
         self.node_status[nodes] = CLOSED_BOUNDARY
         self.update_links_nodes_cells_to_new_BCs()
 
+    def set_status_at_node(self, node_ids, status):
+        """Set the boundary condition status of nodes.
+
+        Sets the statuses of the given nodes to *status*, and updates only
+        what depends on them. The links that touch the nodes are checked and
+        added to, or removed from, the active links, and the nodes are added
+        to, or removed from, the lists of core, boundary and active nodes.
+        Unlike changing *node_status* and then calling
+        :func:`update_links_nodes_cells_to_new_BCs`, nothing is rebuilt for
+        the whole grid, so use this if a few node statuses change each time
+        step (as when a rising sea or lake closes nodes).
+
+        Parameters
+        ----------
+        node_ids : array_like of int
+            IDs of nodes whose status is to be set.
+        status : int
+            New boundary condition status of the nodes (for instance,
+            CORE_NODE or CLOSED_BOUNDARY).
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid, CLOSED_BOUNDARY, CORE_NODE
+        >>> rmg = RasterModelGrid((4, 5))
+        >>> rmg.set_status_at_node([6, 7], CLOSED_BOUNDARY)
+        >>> rmg.core_nodes
+        array([ 8, 11, 12, 13])
+        >>> rmg.active_links
+        array([ 3,  8, 11, 12, 13, 22, 23, 24, 25, 26])
+
+        >>> rmg.set_status_at_node(6, CORE_NODE)
+        >>> rmg.core_nodes
+        array([ 6,  8, 11, 12, 13])
+        >>> rmg.active_links
+        array([ 1,  3,  6,  8, 11, 12, 13, 19, 22, 23, 24, 25, 26])
+        """
+        node_ids = numpy.unique(node_ids)
+        old_status = self.node_status[node_ids]
+        is_changed = old_status != status
+        if not numpy.any(is_changed):
+            return
+
+        nodes = node_ids[is_changed].astype(self.index_dtype, copy=False)
+        self.node_status[nodes] = status
+
+        self._update_active_links(self._links_at_nodes(nodes))
+        self._update_lists_of_nodes_cells(nodes, old_status[is_changed])
+        self._reset_operators()
+        self._reset_neighbor_lists()
+
     def get_distances_of_nodes_to_point(self, tuple_xy, get_az=None, node_subset=numpy.nan, out_distance=None, out_azimuth=None):
         """
         Returns an array of distances for each node to a provided point.
@@ -2721,6 +3240,201 @@ class ModelGrid(ModelDataFields):
         else:
             return out_distance
 
+    @property
+    def _node_tree(self):
+        """KD-tree of the grid's node coordinates.
+
+        The tree is made the first time it is used, and is the spatial index
+        for :meth:`nodes_within_radius` and :meth:`k_nearest_nodes`.
+        """
+        try:
+            return self._node_tree_index
+        except AttributeError:
+            self._node_tree_index = cKDTree(
+                numpy.column_stack((self.node_x, self.node_y)))
+            return self._node_tree_index
+
+    def _find_nodes_within_radius(self, points, radius):
+        """IDs of nodes within *radius* of each point, as a list of arrays.
+
+        The IDs for each of the (number of points, 2) *points* are sorted.
+        """
+        return [numpy.array(sorted(nodes), dtype=self.index_dtype)
+                for nodes in self._node_tree.query_ball_point(points, radius)]
+
+    def _find_k_nearest_nodes(self, points, k):
+        """IDs of the *k* nodes nearest each point, nearest first.
+
+        Returns a (number of points, *k*) array.
+        """
+        (_, nodes) = self._node_tree.query(points, k=k)
+        return nodes.reshape((len(points), k)).astype(self.index_dtype)
+
+    def nodes_within_radius(self, coords, radius, return_distances=False,
+                            return_azimuths=False):
+        """Nodes within some distance of a point.
+
+        Find the IDs of the nodes that are no farther than *radius* from
+        a point. Unlike :meth:`build_all_node_distances_azimuths_maps`, only
+        the nodes near the point are visited: rasters find them from their
+        row and column spacing, and other grids from a KD-tree of their nodes
+        that is made the first time it is needed.
+
+        Parameters
+        ----------
+        coords : tuple
+            Coordinates of point as (x, y). *x* and *y* can also be arrays,
+            to find the nodes near each of several points at once.
+        radius : float
+            Search distance.
+        return_distances : boolean, optional
+            Also return the distances of the nodes from the point.
+        return_azimuths : boolean, optional
+            Also return the azimuths of the nodes from the point, in radians
+            clockwise from north (up).
+
+        Returns
+        -------
+        ndarray or tuple of ndarray
+            Node IDs, in increasing order, followed, if requested, by their
+            distances and then their azimuths. If several points were given,
+            each of these is a list, with an array for each point.
+
+        See Also
+        --------
+        k_nearest_nodes
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> rmg = RasterModelGrid((4, 5))
+        >>> rmg.nodes_within_radius((2., 1.), 1.)
+        array([ 2,  6,  7,  8, 12])
+        >>> (nodes, dists, az) = rmg.nodes_within_radius(
+        ...     (2., 1.), 1., return_distances=True, return_azimuths=True)
+        >>> dists
+        array([ 1.,  1.,  0.,  1.,  1.])
+        >>> az * 180. / np.pi
+        array([ 180.,  270.,    0.,   90.,    0.])
+
+        Find the nodes near several points.
+
+        >>> rmg.nodes_within_radius((np.array([0., 2.5]), np.array([0., 3.])),
+        ...                         1.)
+        [array([0, 1, 5]), array([17, 18])]
+
+        Other grids find the same nodes with a KD-tree.
+
+        >>> from landlab import HexModelGrid
+        >>> hmg = HexModelGrid(3, 3)
+        >>> hmg.nodes_within_radius((1., 0.), 0.5)
+        array([1])
+        """
+        (points, is_batch) = _as_points(coords)
+        nodes = self._find_nodes_within_radius(points, radius)
+
+        results = [nodes]
+        if return_distances or return_azimuths:
+            (distances, azimuths) = zip(*[
+                _distances_and_azimuths(self, point, ids)
+                for (point, ids) in zip(points, nodes)])
+            if return_distances:
+                results.append(list(distances))
+            if return_azimuths:
+                results.append(list(azimuths))
+
+        if not is_batch:
+            results = [result[0] for result in results]
+
+        if len(results) == 1:
+            return results[0]
+        else:
+            return tuple(results)
+
+    def k_nearest_nodes(self, coords, k, return_distances=False,
+                        return_azimuths=False):
+        """Nodes nearest a point.
+
+        Find the IDs of the *k* nodes closest to a point. As with
+        :meth:`nodes_within_radius`, rasters find them from their row
+        and column spacing, and other grids use a KD-tree of their nodes.
+
+        Parameters
+        ----------
+        coords : tuple
+            Coordinates of point as (x, y). *x* and *y* can also be arrays,
+            to find the nodes nearest each of several points at once.
+        k : int
+            Number of nodes to find.
+        return_distances : boolean, optional
+            Also return the distances of the nodes from the point.
+        return_azimuths : boolean, optional
+            Also return the azimuths of the nodes from the point, in radians
+            clockwise from north (up).
+
+        Returns
+        -------
+        ndarray or tuple of ndarray
+            Node IDs, nearest first, followed, if requested, by their
+            distances and then their azimuths. If several points were given,
+            these are of shape (number of points, *k*).
+
+        Raises
+        ------
+        ValueError
+            If *k* is less than one, or more than the number of nodes.
+
+        See Also
+        --------
+        nodes_within_radius
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> rmg = RasterModelGrid((4, 5))
+        >>> rmg.k_nearest_nodes((1.2, 1.4), 3)
+        array([ 6, 11,  7])
+        >>> (nodes, dists) = rmg.k_nearest_nodes((1.2, 1.4), 2,
+        ...                                      return_distances=True)
+        >>> dists.round(3)
+        array([ 0.447,  0.632])
+        >>> rmg.k_nearest_nodes((np.array([1.2, -1.]), np.array([1.4, 0.])),
+        ...                     2)
+        array([[ 6, 11],
+               [ 0,  5]])
+
+        >>> from landlab import HexModelGrid
+        >>> hmg = HexModelGrid(3, 3)
+        >>> hmg.k_nearest_nodes((1., 0.), 1)
+        array([1])
+        """
+        k = int(k)
+        if k < 1 or k > self.number_of_nodes:
+            raise ValueError('k must be between 1 and the number of nodes')
+
+        (points, is_batch) = _as_points(coords)
+        nodes = self._find_k_nearest_nodes(points, k)
+
+        results = [nodes]
+        if return_distances or return_azimuths:
+            (distances, azimuths) = _distances_and_azimuths(self, points,
+                                                            nodes)
+            if return_distances:
+                results.append(distances)
+            if return_azimuths:
+                results.append(azimuths)
+
+        if not is_batch:
+            results = [result[0] for result in results]
+
+        if len(results) == 1:
+            return results[0]
+        else:
+            return tuple(results)
+
+    @deprecated
     def build_all_node_distances_azimuths_maps(self):
         """Build distance-azimuth maps.
 
@@ -2743,21 +3457,23 @@ class ModelGrid(ModelDataFields):
         -------
         tuple of ndarrays
             Tuple of (distances, azimuths)
-        """
 
-        self.all_node_distances_map = numpy.empty((self.number_of_nodes,
-                                                  self.number_of_nodes))
-        self.all_node_azimuths_map = numpy.empty((self.number_of_nodes,
-                                                 self.number_of_nodes))
-
-        node_coords = numpy.empty((self.number_of_nodes, 2))
-        node_coords[:,0] = self.node_x
-        node_coords[:,1] = self.node_y
+        See Also
+        --------
+        nodes_within_radius, k_nearest_nodes
 
-        for i in range(self.number_of_nodes):
-            self.all_node_distances_map[i,:], self.all_node_azimuths_map[i,:] = self.get_distances_of_nodes_to_point((node_coords[i,0],node_coords[i,1]), get_az='angles')
+        Notes
+        -----
+        The maps grow with the square of the number of nodes, and so cannot
+        be made for grids of more than a few tens of thousands of nodes. Use
+        :meth:`nodes_within_radius` or :meth:`k_nearest_nodes`, which only
+        visit the nodes near a point, instead.
+        """
+        node_coords = numpy.column_stack((self.node_x, self.node_y))
 
-        assert numpy.all(self.all_node_distances_map >= 0.)
+        (self.all_node_distances_map, self.all_node_azimuths_map) = (
+            _distances_and_azimuths(self, node_coords,
+                                    numpy.arange(self.number_of_nodes)))
 
         return self.all_node_distances_map, self.all_node_azimuths_map
 
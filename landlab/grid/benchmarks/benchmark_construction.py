@@ -0,0 +1,70 @@
+#! /usr/bin/env python
+"""Time and memory needed to create a RasterModelGrid.
+
+Only the nodes, links, cells and active links of a raster grid are set up
+along with it; the other connectivity arrays are made the first time they
+are used. Run this module as a script to report the time taken, and the
+memory allocated, both to create a grid and to create one and then use all
+of its connectivity::
+
+    $ python benchmark_construction.py 2000
+"""
+from __future__ import print_function
+
+import sys
+import time
+
+from landlab import RasterModelGrid
+
+
+def bench_construction():
+    rmg = RasterModelGrid(1000, 1000)
+
+
+def bench_construction_with_connectivity():
+    rmg = RasterModelGrid(1000, 1000)
+    _use_all_connectivity(rmg)
+
+
+def _use_all_connectivity(grid):
+    """Touch each of the connectivity arrays that are made on first use."""
+    grid.node_inlink_matrix
+    grid.node_active_inlink_matrix
+    grid.node_unit_vector_sum_x
+    grid.link_face
+    grid.patch_nodes
+
+
+def _measure(shape, use_connectivity=False):
+    """Time (s), and current and peak memory (bytes) to make a grid."""
+    import tracemalloc
+
+    tracemalloc.start()
+    start = time.time()
+    grid = RasterModelGrid(shape)
+    if use_connectivity:
+        _use_all_connectivity(grid)
+    elapsed = time.time() - start
+    (current, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, current, peak
+
+
+def main():
+    try:
+        n_rows = int(sys.argv[1])
+    except IndexError:
+        n_rows = 1000
+
+    print('Grid of %d x %d nodes' % (n_rows, n_rows))
+    for (label, use_connectivity) in [('nodes and active links', False),
+                                      ('all connectivity', True)]:
+        (elapsed, current, peak) = _measure((n_rows, n_rows),
+                                            use_connectivity=use_connectivity)
+        print('%-24s %8.2f s %10.1f MB %10.1f MB (peak)' % (
+            label, elapsed, current / 2. ** 20, peak / 2. ** 20))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,20 @@
+#! /usr/bin/env python
+"""Time taken to find gradients and divergences on a RasterModelGrid.
+
+When gradients are wanted for all of the cells of a raster, they are found
+from shifted views of the node values (a stencil). Otherwise, the values at
+the neighbors of each cell are gathered with the grid's neighbor and
+diagonal lists. Run this module as a script to compare the two for grids
+of 1000 x 1000 nodes and larger. Divergences, found with the stencil, are
+compared with those found with the grid's sparse divergence operator::
+
+    $ python benchmark_gradients.py 1000 2000 4000
+"""
+from __future__ import print_function
+
+import sys
+import time
+
 import numpy as np
 from numpy.testing import assert_array_equal
 from nose import with_setup
@@ -12,14 +29,98 @@ def bench_gradient_across_faces():
     grads = rmg.calculate_gradient_across_cell_faces(node_values)
 
 
+def bench_gradient_across_faces_indexed():
+    rmg = RasterModelGrid(1000, 1000)
+    node_values = rmg.zeros()
+    grads = rmg.calculate_gradient_across_cell_faces(
+        node_values, np.arange(rmg.number_of_cells))
+
+
 def bench_gradient_across_corners():
     rmg = RasterModelGrid(1000, 1000)
     node_values = rmg.zeros()
     grads = rmg.calculate_gradient_across_cell_corners(node_values)
 
 
+def bench_gradient_across_corners_indexed():
+    rmg = RasterModelGrid(1000, 1000)
+    node_values = rmg.zeros()
+    grads = rmg.calculate_gradient_across_cell_corners(
+        node_values, np.arange(rmg.number_of_cells))
+
+
 def bench_max_gradients():
     rmg = RasterModelGrid(1000, 1000)
     node_values = rmg.zeros()
-    (grads, nodes) = rmg.calculate_max_gradient_across_adjacent_cells(
+    (grads, nodes) = rmg.calculate_steepest_descent_across_adjacent_cells(
         node_values, method='d8', return_node=True)
+
+
+def bench_max_gradients_indexed():
+    rmg = RasterModelGrid(1000, 1000)
+    node_values = rmg.zeros()
+    (grads, nodes) = rmg.calculate_steepest_descent_across_adjacent_cells(
+        node_values, np.arange(rmg.number_of_cells), method='d8',
+        return_node=True)
+
+
+def bench_flux_divergence():
+    rmg = RasterModelGrid(1000, 1000)
+    flux = np.ones(rmg.number_of_active_links)
+    div = rmg.calculate_flux_divergence_at_nodes(flux)
+
+
+def _time(func, *args, **kwds):
+    """Time (s) to call a function."""
+    start = time.time()
+    func(*args, **kwds)
+    return time.time() - start
+
+
+def _compare(shape):
+    """Times (s) for the stencil and indexed versions of each function."""
+    grid = RasterModelGrid(shape)
+    node_values = np.random.rand(grid.number_of_nodes)
+    cell_ids = np.arange(grid.number_of_cells)
+
+    # Make the neighbor and diagonal lists so they are not part of the timing.
+    grid.get_neighbor_list()
+    grid.get_diagonal_list()
+
+    times = []
+    for (label, func, kwds) in [
+            ('gradient across faces',
+             grid.calculate_gradient_across_cell_faces, {}),
+            ('gradient across corners',
+             grid.calculate_gradient_across_cell_corners, {}),
+            ('d4 steepest descent',
+             grid.calculate_steepest_descent_across_adjacent_cells,
+             dict(method='d4', return_node=True)),
+            ('d8 steepest descent',
+             grid.calculate_steepest_descent_across_adjacent_cells,
+             dict(method='d8', return_node=True)),
+    ]:
+        times.append((label, _time(func, node_values, **kwds),
+                      _time(func, node_values, cell_ids, **kwds)))
+
+    flux = np.random.rand(grid.number_of_active_links)
+    operator = grid.flux_divergence_operator
+    times.append(('flux divergence',
+                  _time(grid.calculate_flux_divergence_at_nodes, flux),
+                  _time(operator.dot, flux)))
+
+    return times
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 2000]
+
+    for n_rows in sizes:
+        print('Grid of %d x %d nodes' % (n_rows, n_rows))
+        print('%-24s %10s %10s' % ('', 'stencil', 'indexed'))
+        for (label, stencil, indexed) in _compare((n_rows, n_rows)):
+            print('%-24s %8.3f s %8.3f s' % (label, stencil, indexed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#! /usr/bin/env python
+"""Time taken to create a HexModelGrid.
+
+The triangles of a hex grid are found directly from the rows (or columns)
+of its nodes, rather than by triangulating them. Its links, faces and
+cells are then found from these triangles as for any VoronoiDelaunayGrid.
+Run this module as a script to compare the time to make hex grids with the
+time to make a VoronoiDelaunayGrid, which triangulates them, from the same
+nodes::
+
+    $ python benchmark_hex.py 100 300 1000
+"""
+from __future__ import print_function
+
+import sys
+import time
+
+from landlab import HexModelGrid
+from landlab.grid import VoronoiDelaunayGrid
+
+
+def bench_construction():
+    hmg = HexModelGrid(300, 300)
+
+
+def bench_construction_with_patches():
+    hmg = HexModelGrid(300, 300)
+    hmg.patch_nodes
+
+
+def _time(func, *args, **kwds):
+    """Time (s) to call a function."""
+    start = time.time()
+    func(*args, **kwds)
+    return time.time() - start
+
+
+def _compare(n_rows, orientation='horizontal', shape='hex'):
+    """Times (s) to make a hex grid, and to triangulate its nodes."""
+    hmg = HexModelGrid(n_rows, n_rows, orientation=orientation, shape=shape)
+    return (hmg.number_of_nodes,
+            _time(HexModelGrid, n_rows, n_rows, orientation=orientation,
+                  shape=shape),
+            _time(VoronoiDelaunayGrid, hmg.node_x.copy(), hmg.node_y.copy()))
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 300]
+
+    print('%-24s %10s %12s %12s' % ('', 'nodes', 'hex', 'triangulated'))
+    for n_rows in sizes:
+        for shape in ('hex', 'rect'):
+            label = '%d x %d %s' % (n_rows, n_rows, shape)
+            print('%-24s %10d %10.3f s %10.3f s' % ((label, ) +
+                                                    _compare(n_rows,
+                                                             shape=shape)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#! /usr/bin/env python
+"""Time taken to create a VoronoiDelaunayGrid.
+
+The grid is built from a single Delaunay triangulation of its nodes: links
+are the edges of the triangles, faces join the circumcenters of the
+triangles on either side of a link, and the area of a cell is summed from
+its faces. Run this module as a script to time the construction of grids
+of randomly-placed nodes, along with finding the links and faces from the
+triangulation compared with from a scipy Voronoi diagram (which is how
+they were found before)::
+
+    $ python benchmark_voronoi.py 10000 100000 1000000
+"""
+from __future__ import print_function
+
+import sys
+import time
+
+import numpy as np
+from scipy.spatial import Delaunay, Voronoi
+
+from landlab.grid import VoronoiDelaunayGrid
+
+
+def bench_construction():
+    (x, y) = _random_points(100000)
+    vmg = VoronoiDelaunayGrid(x, y)
+
+
+def bench_construction_with_patches():
+    (x, y) = _random_points(100000)
+    vmg = VoronoiDelaunayGrid(x, y)
+    vmg.patch_nodes
+
+
+def _random_points(n_points):
+    """Points scattered over a square whose edges are lined with points.
+
+    Points on the edges keep the perimeter straight. Otherwise, nearly flat
+    triangles along the convex hull have faces that reach far beyond the
+    grid.
+    """
+    n_per_side = int(np.sqrt(n_points))
+    edge = np.linspace(0., 1., n_per_side)[:-1]
+    x = np.concatenate((edge, np.ones_like(edge), 1. - edge,
+                        np.zeros_like(edge)))
+    y = np.concatenate((np.zeros_like(edge), edge, np.ones_like(edge),
+                        1. - edge))
+    n_inside = n_points - len(x)
+    return (np.concatenate((x, np.random.uniform(.001, .999, n_inside))),
+            np.concatenate((y, np.random.uniform(.001, .999, n_inside))))
+
+
+def _time(func, *args, **kwds):
+    """Time (s) to call a function."""
+    start = time.time()
+    func(*args, **kwds)
+    return time.time() - start
+
+
+def _compare(n_points):
+    """Times (s) to make a grid, and to find its links and faces."""
+    (x, y) = _random_points(n_points)
+    pts = np.column_stack((x, y))
+
+    times = [('grid', _time(VoronoiDelaunayGrid, x, y))]
+    tri = Delaunay(pts)
+    times.append(('links and faces from triangulation', _time(
+        VoronoiDelaunayGrid.create_links_and_faces_from_triangulation, tri)))
+    times.append(('links and faces from voronoi', _time(
+        lambda: VoronoiDelaunayGrid.create_links_and_faces_from_voronoi_diagram(
+            Voronoi(pts)))))
+
+    return times
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+
+    for n_points in sizes:
+        print('Grid of %d nodes' % n_points)
+        for (label, elapsed) in _compare(n_points):
+            print('%-36s %8.3f s' % (label, elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 import numpy as np
+from scipy import sparse
 from six.moves import range
 
 
@@ -37,16 +38,53 @@ def resolve_values_on_links(grid, link_values, out=None):
                          grid.link_length),
                          link_values, out=out)
 
+def empty_stack(grid, values, centering):
+    """Uninitialized array for a stack of values at grid elements.
+
+    The last dimension of *values* is taken to be along grid elements; any
+    others (for example, one row for each of several fields, or for each
+    member of an ensemble) are kept.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        A landlab grid.
+    values : array_like
+        Values at grid elements, or a stack of them.
+    centering : str
+        Element that the new values are at.
+
+    Returns
+    -------
+    ndarray
+        The new array.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.grid.grid_funcs import empty_stack
+    >>> rmg = RasterModelGrid((3, 4))
+    >>> empty_stack(rmg, np.zeros(12), 'link').shape
+    (17,)
+    >>> empty_stack(rmg, np.zeros((2, 12)), 'active_link').shape
+    (2, 7)
+    """
+    return np.empty(np.shape(values)[:-1] +
+                    (grid.number_of_elements(centering), ))
+
+
 def calculate_gradients_at_active_links(grid, node_values, out=None):
     """
     Calculates the gradient in *quantity* node_values at each active link in
     the grid.
-    Convention is POSITIVE UP.
+    Convention is POSITIVE UP. *node_values* can be a stack of arrays (the
+    last dimension being along nodes), in which case so is the result.
     """
     if out is None:
-        out = grid.empty(centering='active_link')
-    return np.divide(node_values[grid.activelink_tonode] -
-                     node_values[grid.activelink_fromnode],
+        out = empty_stack(grid, node_values, 'active_link')
+    return np.divide(node_values[..., grid.activelink_tonode] -
+                     node_values[..., grid.activelink_fromnode],
                      grid.link_length[grid.active_links], out=out)
 
 
@@ -54,12 +92,13 @@ def calculate_gradients_at_links(grid, node_values, out=None):
     """
     Calculates the gradient in *quantity* node_values at each link in
     the grid.
-    Convention is POSITIVE UP.
+    Convention is POSITIVE UP. *node_values* can be a stack of arrays (the
+    last dimension being along nodes), in which case so is the result.
     """
     if out is None:
-        out = grid.empty(centering='link')
-    return np.divide(node_values[grid.node_at_link_head] -
-                     node_values[grid.node_at_link_tail],
+        out = empty_stack(grid, node_values, 'link')
+    return np.divide(node_values[..., grid.node_at_link_head] -
+                     node_values[..., grid.node_at_link_tail],
                      grid.link_length, out=out)
 
 
@@ -67,24 +106,26 @@ def calculate_diff_at_active_links(grid, node_values, out=None):
     """
     Calculates the difference in quantity *node_values* at each active link
     in the grid.
-    Slope UP is positive.
+    Slope UP is positive. *node_values* can be a stack of arrays (the last
+    dimension being along nodes), in which case so is the result.
     """
     if out is None:
-        out = grid.empty(centering='active_link')
-    return np.subtract(node_values[grid.activelink_tonode],
-                       node_values[grid.activelink_fromnode], out=out)
+        out = empty_stack(grid, node_values, 'active_link')
+    return np.subtract(node_values[..., grid.activelink_tonode],
+                       node_values[..., grid.activelink_fromnode], out=out)
 
 
 def calculate_diff_at_links(grid, node_values, out=None):
     """
     Calculates the difference in quantity *node_values* at each link in the
     grid.
-    Slope UP is positive.
+    Slope UP is positive. *node_values* can be a stack of arrays (the last
+    dimension being along nodes), in which case so is the result.
     """
     if out is None:
-        out = grid.empty(centering='link')
-    return np.subtract(node_values[grid.node_at_link_head],
-                       node_values[grid.node_at_link_tail], out=out)
+        out = empty_stack(grid, node_values, 'link')
+    return np.subtract(node_values[..., grid.node_at_link_head],
+                       node_values[..., grid.node_at_link_tail], out=out)
 
 
 def calculate_flux_divergence_at_nodes(grid, active_link_flux, out=None):
@@ -99,41 +140,122 @@ def calculate_flux_divergence_at_nodes(grid, active_link_flux, out=None):
     but simply return zeros for these entries. The advantage is that the 
     caller can work with node-based arrays instead of active-cell-based 
     arrays.
+
+    *active_link_flux* can be a stack of arrays (the last dimension being
+    along active links), in which case so is the result.
     """
-    assert (len(active_link_flux) == grid.number_of_active_links), \
+    active_link_flux = np.asarray(active_link_flux)
+    assert (active_link_flux.shape[-1] == grid.number_of_active_links), \
            "incorrect length of active_link_flux array"
         
     # If needed, create net_unit_flux array
     if out is None:
-        out = grid.empty(centering='node')
-    out.fill(0.)
+        out = empty_stack(grid, active_link_flux, 'node')
     net_unit_flux = out
 
-    assert len(net_unit_flux) == grid.number_of_nodes
-    
-    # Create a flux array one item longer than the number of active links.
-    # Populate it with flux times face width (so, total flux rather than
-    # unit flux). Here, face_width is an array with one entry for each
-    # active link, so we are multiplying the unit flux at each link by the
-    # width of its corresponding face.
-    flux = np.zeros(len(active_link_flux) + 1)
-    flux[:len(active_link_flux)] = active_link_flux * grid.face_width
+    assert net_unit_flux.shape[-1] == grid.number_of_nodes
     
-    # Next, we need to add up the incoming and outgoing fluxes.
-    #
-    # Notes: 
-    #    1) because "net flux" is defined as positive outward, we add the
-    #       outflux and subtract the influx
-    #    2) the loop is over the number of rows in the inlink/outlink
-    #       matrices. This dimension is equal to the maximum number of links
-    #       attached to a node, so should be of order 6 or 7 and won't
-    #       generally increase with the number of nodes in the grid.
-    # 
-    for i in range(np.size(grid.node_active_inlink_matrix, 0)):
-        net_unit_flux += flux[grid.node_active_outlink_matrix[i][:]]
-        net_unit_flux -= flux[grid.node_active_inlink_matrix[i][:]]
-        
-    # Now divide by cell areas ... where there are active cells.
-    net_unit_flux[grid.activecell_node] /= grid.active_cell_areas
-            
+    # Net outward flux, divided by cell area, as a single sparse
+    # matrix product. Nodes without active cells have empty rows. A stack of
+    # fluxes is done in one product, with a column for each array.
+    stack_shape = active_link_flux.shape[:-1]
+    fluxes = active_link_flux.reshape((-1, grid.number_of_active_links))
+    net_unit_flux[...] = grid.flux_divergence_operator.dot(
+        fluxes.T).T.reshape(stack_shape + (grid.number_of_nodes, ))
+
     return net_unit_flux
+
+
+def make_gradient_operator(grid):
+    """Sparse matrix that maps node values to gradients at active links.
+
+    Row *i* of the matrix holds the inverse length of active link *i* in the
+    column of the link's head node, and minus that in the column of its tail
+    node.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        A landlab grid.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        A (number of active links, number of nodes) matrix.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.grid.grid_funcs import make_gradient_operator
+    >>> rmg = RasterModelGrid((3, 3), 2.)
+    >>> make_gradient_operator(rmg).toarray()
+    array([[ 0. , -0.5,  0. ,  0. ,  0.5,  0. ,  0. ,  0. ,  0. ],
+           [ 0. ,  0. ,  0. ,  0. , -0.5,  0. ,  0. ,  0.5,  0. ],
+           [ 0. ,  0. ,  0. , -0.5,  0.5,  0. ,  0. ,  0. ,  0. ],
+           [ 0. ,  0. ,  0. ,  0. , -0.5,  0.5,  0. ,  0. ,  0. ]])
+    """
+    n_links = grid.number_of_active_links
+    inverse_length = 1. / grid.link_length[grid.active_links]
+
+    rows = np.repeat(np.arange(n_links), 2)
+    cols = np.column_stack((grid.activelink_tonode,
+                            grid.activelink_fromnode)).ravel()
+    values = np.column_stack((inverse_length, - inverse_length)).ravel()
+
+    return sparse.csr_matrix((values, (rows, cols)),
+                             shape=(n_links, grid.number_of_nodes))
+
+
+def make_flux_divergence_operator(grid, face_width, inverse_area):
+    """Sparse matrix that maps active-link fluxes to net outflux at nodes.
+
+    A unit flux along an active link, times the width of its face, leaves
+    the link's tail node and enters its head node. The net total flux out of
+    a node is multiplied by *inverse_area* to give a net unit flux.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        A landlab grid.
+    face_width : float or ndarray
+        Width of the face of each active link.
+    inverse_area : float or ndarray
+        One over the area of the cell of each node. Use zero for nodes at
+        which the divergence is not wanted.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        A (number of nodes, number of active links) matrix.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.grid.grid_funcs import make_flux_divergence_operator
+    >>> rmg = RasterModelGrid((3, 3))
+    >>> inverse_area = rmg.zeros(centering='node')
+    >>> inverse_area[4] = 1.
+    >>> div = make_flux_divergence_operator(rmg, 1., inverse_area)
+    >>> div.shape
+    (9, 4)
+    >>> div.toarray()[4]
+    array([-1.,  1., -1.,  1.])
+    >>> div.nnz
+    4
+    """
+    n_links = grid.number_of_active_links
+    n_nodes = grid.number_of_nodes
+    face_width = np.broadcast_to(face_width, (n_links, ))
+    inverse_area = np.broadcast_to(inverse_area, (n_nodes, ))
+    fromnode = grid.activelink_fromnode
+    tonode = grid.activelink_tonode
+
+    rows = np.column_stack((fromnode, tonode)).ravel()
+    cols = np.repeat(np.arange(n_links), 2)
+    values = np.column_stack((face_width * inverse_area[fromnode],
+                              - face_width * inverse_area[tonode])).ravel()
+
+    operator = sparse.csr_matrix((values, (rows, cols)),
+                                 shape=(n_nodes, n_links))
+    operator.eliminate_zeros()
+    return operator
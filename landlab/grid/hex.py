@@ -6,6 +6,175 @@ import six
 from landlab.grid.voronoi import VoronoiDelaunayGrid
 
 
+def _hex_lines(base_num_nodes, num_lines, shape):
+    """Position of the first node, and number of nodes, of each line of a hex
+    grid.
+
+    The nodes of a hex grid are arranged in lines (rows of a horizontal grid,
+    or columns of a vertical one) that are numbered one after the other.
+    Positions along a line are measured in half node spacings, so that the
+    neighbors of the node at *p* on the next line are at *p* - 1 and
+    *p* + 1.
+
+    Examples
+    --------
+    >>> from landlab.grid.hex import _hex_lines
+    >>> _hex_lines(2, 4, 'hex')
+    (array([ 0, -1, -2, -1]), array([2, 3, 4, 3]))
+    >>> _hex_lines(3, 3, 'rect')
+    (array([0, 1, 0]), array([3, 3, 3]))
+    """
+    lines = numpy.arange(num_lines)
+    if shape == 'hex':
+        extra = numpy.minimum(lines, 2 * (num_lines // 2) - lines)
+        return - extra, base_num_nodes + extra
+    else:
+        return lines % 2, numpy.full(num_lines, base_num_nodes, dtype=int)
+
+
+def _lines_and_positions(count):
+    """Line of each node, and its index along the line, given the number of
+    nodes on each line.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.grid.hex import _lines_and_positions
+    >>> _lines_and_positions(np.array([2, 3]))
+    (array([0, 0, 1, 1, 1]), array([0, 1, 0, 1, 2]))
+    """
+    line = numpy.repeat(numpy.arange(len(count)), count)
+    first = numpy.cumsum(count) - count
+    return line, numpy.arange(len(line)) - first[line]
+
+
+def _hex_triangles(start, count):
+    """Triangles of a hexagonal lattice.
+
+    Parameters
+    ----------
+    start : ndarray of int
+        Position (in half node spacings) of the first node of each line.
+    count : ndarray of int
+        Number of nodes on each line.
+
+    Returns
+    -------
+    (n_triangles, 3) ndarray
+        Nodes at the corners of each triangle.
+
+    Notes
+    -----
+    Each node is the lower-left corner of the triangle (if any) that it makes
+    with the next node on its line and the node between them on the next
+    line, and the bottom corner of the triangle that it makes with the two
+    nodes either side of it on the next line. The triangles of each node are
+    numbered one after the other, in that order.
+
+    Where a line is indented between the lines on either side of it (the
+    odd lines of a grid with a rectangular shape), the first (or last) nodes
+    of the three lines make another triangle that fills in the convex hull.
+    These follow the other triangles.
+
+    Examples
+    --------
+    >>> from landlab.grid.hex import _hex_lines, _hex_triangles
+    >>> _hex_triangles(*_hex_lines(2, 3, 'hex'))
+    array([[0, 1, 3],
+           [0, 3, 2],
+           [1, 4, 3],
+           [2, 3, 5],
+           [3, 4, 6],
+           [3, 6, 5]])
+    >>> _hex_triangles(*_hex_lines(2, 3, 'rect'))
+    array([[0, 1, 2],
+           [1, 3, 2],
+           [2, 3, 5],
+           [2, 5, 4],
+           [0, 2, 4]])
+    """
+    num_lines = len(start)
+    first = numpy.cumsum(count) - count
+    last = first + count - 1
+    (line, position) = _lines_and_positions(count)
+    position = start[line] + 2 * position
+
+    nodes = numpy.where(line < num_lines - 1)[0]
+    (line, position) = (line[nodes] + 1, position[nodes])
+
+    def _node_on_next_line(offset):
+        """Node at *position* + *offset* on the next line, or -1."""
+        steps = position + offset - start[line]
+        return numpy.where((steps >= 0) & (steps < 2 * count[line]),
+                           first[line] + steps // 2, -1)
+
+    (upper_left, upper_right) = (_node_on_next_line(-1),
+                                 _node_on_next_line(1))
+    right = numpy.where(nodes < last[line - 1], nodes + 1, -1)
+
+    triangles = numpy.empty((len(nodes), 2, 3), dtype=int)
+    triangles[:, 0] = numpy.column_stack((nodes, right, upper_right))
+    triangles[:, 1] = numpy.column_stack((nodes, upper_right, upper_left))
+    triangles = triangles.reshape((-1, 3))
+    triangles = triangles[numpy.all(triangles >= 0, axis=1)]
+
+    end = start + 2 * (count - 1)
+    is_indented = numpy.zeros((2, num_lines), dtype=bool)
+    is_indented[0, 1:-1] = (start[1:-1] > start[:-2]) & (
+        start[1:-1] > start[2:])
+    is_indented[1, 1:-1] = (end[1:-1] < end[:-2]) & (end[1:-1] < end[2:])
+    fill = [numpy.column_stack((ends[lines - 1], ends[lines], ends[lines + 1]))
+            for (ends, lines) in ((first, numpy.where(is_indented[0])[0]),
+                                  (last, numpy.where(is_indented[1])[0]))]
+
+    return numpy.vstack([triangles] + fill)
+
+
+class _HexTriangulation(object):
+
+    """Triangulation of the nodes of a hex grid.
+
+    This has the attributes of a ``scipy.spatial.Delaunay`` that are used to
+    build a grid, but its triangles are found directly from the arrangement
+    of the nodes rather than by triangulating them.
+    """
+
+    def __init__(self, points, simplices):
+        self.points = points
+        self.simplices = simplices
+        self.nsimplex = len(simplices)
+        self.neighbors = _find_neighbors_of_triangles(simplices)
+        self.convex_hull = numpy.vstack([
+            simplices[:, ((vertex + 1) % 3, (vertex + 2) % 3)][
+                self.neighbors[:, vertex] == -1] for vertex in range(3)])
+        self.coplanar = numpy.empty((0, 3), dtype=int)
+
+
+def _find_neighbors_of_triangles(triangles):
+    """Triangle opposite each corner of each triangle, or -1.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.grid.hex import _find_neighbors_of_triangles
+    >>> _find_neighbors_of_triangles(np.array([[0, 1, 3], [0, 3, 2]]))
+    array([[-1,  1, -1],
+           [-1, -1,  0]])
+    """
+    (tail, head) = (triangles[:, (1, 2, 0)].flatten().astype(numpy.int64),
+                    triangles[:, (2, 0, 1)].flatten().astype(numpy.int64))
+    edges = (numpy.minimum(tail, head) * (triangles.max() + 1) +
+             numpy.maximum(tail, head))
+    order = numpy.argsort(edges)
+    is_shared = edges[order[1:]] == edges[order[:-1]]
+    (first, second) = (order[:-1][is_shared], order[1:][is_shared])
+
+    neighbors = numpy.full(len(edges), -1, dtype=int)
+    neighbors[first] = second // 3
+    neighbors[second] = first // 3
+    return neighbors.reshape((-1, 3))
+
+
 class HexModelGrid(VoronoiDelaunayGrid):
     """A grid of hexagonal cells.
 
@@ -41,6 +210,8 @@ class HexModelGrid(VoronoiDelaunayGrid):
         orientation : string, optional
             One of the 3 cardinal directions in the grid, either 'horizontal' 
             (default) or 'vertical'
+        index_dtype : data-type, optional
+            Integer type of the grid's arrays of element IDs.
 
         Returns
         -------
@@ -57,6 +228,8 @@ class HexModelGrid(VoronoiDelaunayGrid):
         >>> hmg.number_of_nodes
         7
         """
+        self._index_dtype = kwds.pop('index_dtype', self._index_dtype)
+
         # Set number of nodes, and initialize if caller has given dimensions
         #self._num_nodes = num_rows * num_cols
         if base_num_rows * base_num_cols > 0:
@@ -142,6 +315,12 @@ class HexModelGrid(VoronoiDelaunayGrid):
                'shape must be either "hex" (default) or "rect"'
                
         # Create a set of hexagonally arranged points. These will be our nodes.
+        # They are arranged in lines: rows of a horizontal grid, or columns of
+        # a vertical one.
+        if orientation[0].lower() == 'h':
+            lines = _hex_lines(base_num_cols, base_num_rows, shape)
+        else:
+            lines = _hex_lines(base_num_rows, base_num_cols, shape)
         if orientation=='horizontal' and shape=='hex':
             [pts, self._num_nodes] = HexModelGrid.make_hex_points_horizontal_hex(base_num_rows, base_num_cols, dx)
             self.orientation = 'horizontal'
@@ -161,12 +340,19 @@ class HexModelGrid(VoronoiDelaunayGrid):
             self._nrows = base_num_rows
             self._ncols = base_num_cols
         
-        # Call the VoronoiDelaunayGrid constructor to triangulate/Voronoi
-        # the nodes into a grid.
-        super(HexModelGrid, self)._initialize(pts[:,0], pts[:,1], reorient_links)
+        # Call the VoronoiDelaunayGrid constructor to make the nodes into a
+        # grid. The triangles of the lattice are known from the arrangement
+        # of its lines, so the nodes don't need to be triangulated.
+        triangulation = _HexTriangulation(pts, _hex_triangles(*lines))
+        super(HexModelGrid, self)._initialize(pts[:,0], pts[:,1],
+                                              reorient_links,
+                                              triangulation=triangulation)
         
-        # Remember grid spacing
+        # Remember grid spacing, and the size and shape of the lattice
         self._dx = dx
+        self._base_num_rows = base_num_rows
+        self._base_num_cols = base_num_cols
+        self._hex_shape = shape
 
     def _setup_cell_areas_array(self):
         """
@@ -215,25 +401,14 @@ class HexModelGrid(VoronoiDelaunayGrid):
         dxv = dxh * numpy.sqrt(3.) / 2.
         half_dxh = dxh / 2.
 
-        if numpy.mod(num_rows, 2) == 0:  # even number of rows
-            npts = num_rows * base_num_cols + (num_rows * num_rows) // 4
-        else:  # odd number of rows
-            npts = num_rows * base_num_cols + ((num_rows - 1) // 2) * ((num_rows - 1) // 2)
+        (start, num_cols) = _hex_lines(base_num_cols, num_rows, 'hex')
+        xshift = half_dxh * start
+        (row, col) = _lines_and_positions(num_cols)
+
+        npts = len(row)
         pts = numpy.zeros((npts, 2))
-        middle_row = num_rows // 2
-        extra_cols = 0
-        xshift = 0.
-        i = 0
-        for r in range(num_rows):
-            for c in range(base_num_cols + extra_cols):
-                pts[i,0] = c * dxh + xshift
-                pts[i,1] = r * dxv
-                i += 1
-            if r < middle_row:
-                extra_cols += 1
-            else:
-                extra_cols -= 1
-            xshift = - half_dxh * extra_cols
+        pts[:,0] = col * dxh + xshift[row]
+        pts[:,1] = row * dxv
         
         return pts, npts
 
@@ -270,14 +445,10 @@ class HexModelGrid(VoronoiDelaunayGrid):
 
         npts = num_rows * num_cols
         pts = numpy.zeros((npts, 2))
-        xshift = 0.
-        i = 0
-        for r in range(num_rows):
-            for c in range(num_cols):
-                xshift = half_dxh * (r%2)
-                pts[i,0] = c * dxh + xshift
-                pts[i,1] = r * dxv
-                i += 1
+        (row, col) = _lines_and_positions(numpy.full(num_rows, num_cols,
+                                                     dtype=int))
+        pts[:,0] = col * dxh + half_dxh * (row%2)
+        pts[:,1] = row * dxv
         
         return pts, npts
 
@@ -313,25 +484,14 @@ class HexModelGrid(VoronoiDelaunayGrid):
         dxh = dxv * numpy.sqrt(3.) / 2.
         half_dxv = dxv / 2.
 
-        if numpy.mod(num_cols, 2) == 0:  # even number of columns
-            npts = base_num_rows * num_cols + (num_cols * num_cols) // 4
-        else:  # odd number of columns
-            npts = base_num_rows * num_cols + ((num_cols - 1) // 2) * ((num_cols - 1) // 2)
+        (start, num_rows) = _hex_lines(base_num_rows, num_cols, 'hex')
+        yshift = half_dxv * start
+        (col, row) = _lines_and_positions(num_rows)
+
+        npts = len(col)
         pts = numpy.zeros((npts, 2))
-        middle_col = num_cols // 2
-        extra_rows = 0
-        yshift = 0.
-        i = 0
-        for c in range(num_cols):
-            for r in range(base_num_rows + extra_rows):
-                pts[i,1] = r * dxv + yshift
-                pts[i,0] = c * dxh
-                i += 1
-            if c < middle_col:
-                extra_rows += 1
-            else:
-                extra_rows -= 1
-            yshift = - half_dxv * extra_rows
+        pts[:,1] = row * dxv + yshift[col]
+        pts[:,0] = col * dxh
         
         return pts, npts
         
@@ -368,14 +528,10 @@ class HexModelGrid(VoronoiDelaunayGrid):
 
         npts = num_rows * num_cols
         pts = numpy.zeros((npts, 2))
-        yshift = 0.
-        i = 0
-        for c in range(num_cols):
-            for r in range(num_rows):
-                yshift = half_dxv * (c%2)
-                pts[i,1] = r * dxv + yshift
-                pts[i,0] = c * dxh
-                i += 1
+        (col, row) = _lines_and_positions(numpy.full(num_cols, num_rows,
+                                                     dtype=int))
+        pts[:,1] = row * dxv + half_dxv * (col%2)
+        pts[:,0] = col * dxh
         
         return pts, npts
         
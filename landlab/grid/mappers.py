@@ -34,6 +34,19 @@ from __future__ import division
 import numpy as np
 
 
+def _node_values_at_link_ends(mg, values_at_nodes):
+    """Values at the tail and head nodes of each link.
+
+    A grid with implicit connectivity does not store the nodes at the ends
+    of its links, so it provides the values itself.
+    """
+    if getattr(mg, 'implicit_connectivity', False):
+        return mg._node_values_at_link_ends(values_at_nodes)
+    else:
+        return (values_at_nodes[mg.node_at_link_tail],
+                values_at_nodes[mg.node_at_link_head])
+
+
 def map_link_head_node_to_link(mg, var_name, out=None):
     """Map values from a link head nodes to links.
 
@@ -81,7 +94,7 @@ def map_link_head_node_to_link(mg, var_name, out=None):
     values_at_nodes = mg.at_node[var_name]
     if out is None:
         out = mg.empty(centering='link')
-    out[:] = values_at_nodes[mg.node_at_link_head]
+    out[:] = _node_values_at_link_ends(mg, values_at_nodes)[1]
 
     return out
 
@@ -135,7 +148,7 @@ def map_link_tail_node_to_link(mg, var_name, out=None):
         out = mg.empty(centering='link')
 
     values_at_nodes = mg.at_node[var_name]
-    out[:] = values_at_nodes[mg.node_at_link_tail]
+    out[:] = _node_values_at_link_ends(mg, values_at_nodes)[0]
 
     return out
 
@@ -186,9 +199,8 @@ def map_min_of_link_nodes_to_link(mg, var_name, out=None):
         out = mg.empty(centering='link')
 
     values_at_nodes = mg.at_node[var_name]
-    np.minimum(values_at_nodes[mg.node_at_link_head],
-               values_at_nodes[mg.node_at_link_tail],
-               out=out)
+    (tail_values, head_values) = _node_values_at_link_ends(mg, values_at_nodes)
+    np.minimum(head_values, tail_values, out=out)
 
     return out
 
@@ -239,9 +251,8 @@ def map_max_of_link_nodes_to_link(mg, var_name, out=None):
         out = mg.empty(centering='link')
 
     values_at_nodes = mg.at_node[var_name]
-    np.maximum(values_at_nodes[mg.node_at_link_head],
-               values_at_nodes[mg.node_at_link_tail],
-               out=out)
+    (tail_values, head_values) = _node_values_at_link_ends(mg, values_at_nodes)
+    np.maximum(head_values, tail_values, out=out)
 
     return out
 
@@ -293,8 +304,8 @@ def map_mean_of_link_nodes_to_link(mg, var_name, out=None):
         out = mg.empty(centering='link')
 
     values_at_nodes = mg.at_node[var_name]
-    out[:] = 0.5 * (values_at_nodes[mg.node_at_link_head] +
-                    values_at_nodes[mg.node_at_link_tail])
+    (tail_values, head_values) = _node_values_at_link_ends(mg, values_at_nodes)
+    out[:] = 0.5 * (head_values + tail_values)
 
     return out
 
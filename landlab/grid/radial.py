@@ -43,6 +43,8 @@ class RadialModelGrid(VoronoiDelaunayGrid):
             x-coordinate of origin node.
         origin_y : float, optional
             y-coordinate of origin node.
+        index_dtype : data-type, optional
+            Integer type of the grid's arrays of element IDs.
 
         Returns
         -------
@@ -67,6 +69,8 @@ class RadialModelGrid(VoronoiDelaunayGrid):
         >>> omg.number_of_nodes
         20
         """
+        self._index_dtype = kwds.pop('index_dtype', self._index_dtype)
+
         # Set number of nodes, and initialize if caller has given dimensions
         #self._num_nodes = num_rows * num_cols
         if num_shells > 0:
@@ -80,6 +84,10 @@ class RadialModelGrid(VoronoiDelaunayGrid):
         
         [pts, npts] = self.make_radial_points(num_shells, dr)
         super(RadialModelGrid, self)._initialize(pts[:,0], pts[:,1])
+
+        # Remember the number and spacing of the shells
+        self._num_shells = num_shells
+        self._dr = dr
         
         
     def make_radial_points(self, num_shells, dr, origin_x=0.0, origin_y=0.0):
@@ -13,7 +13,7 @@ from landlab.testing.decorators import track_this_method
 from landlab.utils import structured_grid as sgrid
 from landlab.utils import count_repeated_values
 
-from .base import ModelGrid
+from .base import ModelGrid, _find_index_dtype, _is_active_link
 from . import grid_funcs as gfuncs
 from .base import (CORE_NODE, FIXED_VALUE_BOUNDARY,
                    FIXED_GRADIENT_BOUNDARY, TRACKS_CELL_BOUNDARY,
@@ -87,6 +87,46 @@ has_boundary_neighbor = np.vectorize(node_has_boundary_neighbor,
                                         excluded=['mg'])
 
 
+def _lazy_connectivity(name, setup):
+    """Make a grid attribute that is only created when first used.
+
+    The first time attribute *name* is read, the grid method named *setup*
+    is called to create it (along with any related attributes). After that,
+    the attribute behaves like an ordinary one. Deleting the attribute means
+    that it is re-created the next time it is used. Integer arrays stored in
+    the attribute are converted to the grid's ``index_dtype``.
+
+    Parameters
+    ----------
+    name : str
+        Name of the attribute.
+    setup : str
+        Name of the method that creates the attribute.
+
+    Returns
+    -------
+    property
+        The attribute.
+    """
+    def get_value(self):
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            getattr(self, setup)()
+            return self.__dict__[name]
+
+    def set_value(self, value):
+        if isinstance(value, np.ndarray) and value.dtype.kind in 'iu':
+            value = value.astype(self.index_dtype, copy=False)
+        self.__dict__[name] = value
+
+    def del_value(self):
+        self.__dict__.pop(name, None)
+
+    return property(get_value, set_value, del_value,
+                    'Created by ``%s`` when first used.' % setup)
+
+
 class RasterModelGridPlotter(object):
     """MixIn that provides plotting functionality.
 
@@ -188,6 +228,20 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
     "closed". If an edge location key is missing, that edge is assumed to be
     *open*.
 
+    Only the node coordinates and statuses, the link end points, and the
+    lists of cells and active links are created along with the grid. Other
+    connectivity arrays (the in-link and out-link matrices, the link unit
+    vectors, the link faces and the patch nodes) are made the first time
+    they are used, so a large grid that does not need them costs no time or
+    memory for them.
+
+    Set *implicit_connectivity* to ``True`` to go further, and not keep any
+    arrays of node, link or cell IDs at all. Because every link of a raster
+    joins a node to its neighbor to the north or east, the gradient,
+    divergence and link mapping functions can instead work with shifted
+    views of the node values. Arrays such as *node_at_link_head*,
+    *active_links* and *core_cells* are only made if they are asked for.
+
     Parameters
     ----------
     shape : tuple of int
@@ -196,6 +250,8 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         Row and column node spacing.
     bc : dict, optional
         Edge boundary conditions.
+    implicit_connectivity : boolean, optional
+        If ``True``, do not store the grid's connectivity arrays.
 
     Examples
     --------
@@ -224,7 +280,81 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
     >>> vals = rmg.add_zeros('active_link', 'vals')
     >>> vals.size
     14
+
+    A grid with implicit connectivity gives the same results, but only makes
+    the arrays of link IDs that it is asked for.
+
+    >>> rmg = RasterModelGrid((4, 5), 1.0, implicit_connectivity=True)
+    >>> rmg.number_of_active_links
+    17
+    >>> 'active_link_ids' in rmg.__dict__
+    False
+    >>> rmg.active_links
+    array([ 1,  2,  3,  6,  7,  8, 11, 12, 13, 19, 20, 21, 22, 23, 24, 25, 26])
     """
+    _node_at_link_tail = _lazy_connectivity(
+        '_node_at_link_tail', '_setup_link_nodes')
+    _node_at_link_head = _lazy_connectivity(
+        '_node_at_link_head', '_setup_link_nodes')
+
+    _active_link_mask = _lazy_connectivity(
+        '_active_link_mask', '_setup_active_link_mask')
+    active_link_ids = _lazy_connectivity(
+        'active_link_ids', '_setup_active_link_lists')
+    activelink_fromnode = _lazy_connectivity(
+        'activelink_fromnode', '_setup_active_link_lists')
+    activelink_tonode = _lazy_connectivity(
+        'activelink_tonode', '_setup_active_link_lists')
+
+    _node_at_cell = _lazy_connectivity('_node_at_cell', '_setup_node_at_cell')
+    activecell_node = _lazy_connectivity(
+        'activecell_node', '_setup_lists_of_nodes_cells')
+    corecell_node = _lazy_connectivity(
+        'corecell_node', '_setup_lists_of_nodes_cells')
+    active_cells = _lazy_connectivity(
+        'active_cells', '_setup_lists_of_nodes_cells')
+    _core_cells = _lazy_connectivity(
+        '_core_cells', '_setup_lists_of_nodes_cells')
+    node_activecell = _lazy_connectivity(
+        'node_activecell', '_setup_lists_of_nodes_cells')
+    node_corecell = _lazy_connectivity(
+        'node_corecell', '_setup_lists_of_nodes_cells')
+    _boundary_nodes = _lazy_connectivity(
+        '_boundary_nodes', '_setup_lists_of_nodes_cells')
+
+    node_inlink_matrix = _lazy_connectivity(
+        'node_inlink_matrix', '_setup_inlink_and_outlink_matrices')
+    node_numinlink = _lazy_connectivity(
+        'node_numinlink', '_setup_inlink_and_outlink_matrices')
+    node_outlink_matrix = _lazy_connectivity(
+        'node_outlink_matrix', '_setup_inlink_and_outlink_matrices')
+    node_numoutlink = _lazy_connectivity(
+        'node_numoutlink', '_setup_inlink_and_outlink_matrices')
+
+    node_active_inlink_matrix = _lazy_connectivity(
+        'node_active_inlink_matrix', '_make_active_inlink_and_outlink_matrices')
+    node_active_inlink_matrix2 = _lazy_connectivity(
+        'node_active_inlink_matrix2', '_make_active_inlink_and_outlink_matrices')
+    node_numactiveinlink = _lazy_connectivity(
+        'node_numactiveinlink', '_make_active_inlink_and_outlink_matrices')
+    node_active_outlink_matrix = _lazy_connectivity(
+        'node_active_outlink_matrix', '_make_active_inlink_and_outlink_matrices')
+    node_active_outlink_matrix2 = _lazy_connectivity(
+        'node_active_outlink_matrix2', '_make_active_inlink_and_outlink_matrices')
+    node_numactiveoutlink = _lazy_connectivity(
+        'node_numactiveoutlink', '_make_active_inlink_and_outlink_matrices')
+
+    link_unit_vec_x = _lazy_connectivity(
+        'link_unit_vec_x', '_make_link_unit_vectors')
+    link_unit_vec_y = _lazy_connectivity(
+        'link_unit_vec_y', '_make_link_unit_vectors')
+    node_unit_vector_sum_x = _lazy_connectivity(
+        'node_unit_vector_sum_x', '_make_link_unit_vectors')
+    node_unit_vector_sum_y = _lazy_connectivity(
+        'node_unit_vector_sum_y', '_make_link_unit_vectors')
+
+    link_face = _lazy_connectivity('link_face', '_setup_link_faces')
+
     def __init__(self, *args, **kwds):
         """Create a 2D grid with equal spacing.
 
@@ -241,6 +371,10 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
             Row and column node spacing.
         bc : dict, optional
             Edge boundary conditions.
+        implicit_connectivity : boolean, optional
+            If ``True``, do not store the grid's connectivity arrays.
+        index_dtype : data-type, optional
+            Integer type of the grid's arrays of element IDs.
 
         Returns
         -------
@@ -267,6 +401,9 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         if dx is None:
             dx = kwds.pop('spacing', _parse_grid_spacing_from_args(args) or 1.)
 
+        self._implicit_connectivity = kwds.pop('implicit_connectivity', False)
+        self._index_dtype = _find_index_dtype(kwds.pop('index_dtype', None),
+                                              4 * num_rows * num_cols)
 
         # Set number of nodes, and initialize if caller has given dimensions
         self._num_nodes = num_rows * num_cols
@@ -446,13 +583,17 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         # While we're at it, we will also build the node_activecell list. This
         # list records, for each node, the ID of its associated active cell,
         # or None if it has no associated active cell (i.e., it is a boundary)
-        self._node_at_cell = sgrid.node_at_cell(self.shape)
-        self.node_activecell = sgrid.active_cell_index_at_nodes(self.shape)
-        self.node_corecell = sgrid.core_cell_index_at_nodes(self.shape)
-        self.active_cells = sgrid.active_cell_index(self.shape)
-        self._core_cells = sgrid.core_cell_index(self.shape)
-        self.activecell_node = self._node_at_cell.copy()
-        self.corecell_node = self._node_at_cell
+        #
+        # With implicit connectivity, these lists (and the link lists,
+        # below) are only made when they are used.
+        if not self._implicit_connectivity:
+            self._node_at_cell = sgrid.node_at_cell(self.shape)
+            self.node_activecell = sgrid.active_cell_index_at_nodes(self.shape)
+            self.node_corecell = sgrid.core_cell_index_at_nodes(self.shape)
+            self.active_cells = sgrid.active_cell_index(self.shape)
+            self._core_cells = sgrid.core_cell_index(self.shape)
+            self.activecell_node = self._node_at_cell.copy()
+            self.corecell_node = self._node_at_cell
         #self.active_faces = sgrid.active_face_index(self.shape)
 
         # Link lists:
@@ -481,11 +622,13 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         #  *--15-->*--16-->*--17-->*--18-->*
         #
         #   create the fromnode and tonode lists
-        (self._node_at_link_tail,
-         self._node_at_link_head) = sgrid.node_index_at_link_ends(self.shape)
+        if not self._implicit_connectivity:
+            self._setup_link_nodes()
 
-        #   set up in-link and out-link matrices and numbers
-        self._setup_inlink_and_outlink_matrices()
+        #   The in-link and out-link matrices, link unit vectors and link
+        # faces are set up when they are first used (see
+        # _setup_inlink_and_outlink_matrices, _make_link_unit_vectors and
+        # _setup_link_faces).
 
         # Flag indicating whether we have created diagonal links.
         self._diagonal_links_created = False
@@ -493,22 +636,6 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         #   set up the list of active links
         self._reset_list_of_active_links()
 
-        #   set up link unit vectors and node unit-vector sums
-        self._make_link_unit_vectors()
-
-        #   set up link faces
-        #
-        #   Here we assume that we've already created a list of active links
-        # in which all 4 boundaries are "open", such that each boundary node
-        # (except the 4 corners) is connected to an adjacent interior node. In
-        # this case, there will be the same number of faces as active links,
-        # and the numbering of faces will be the same as the corresponding
-        # active links. We start off creating a list of all None values. Only
-        # those links that cross a face will have this None value replaced with
-        # a face ID.
-        self.link_face = sgrid.face_at_link(self.shape,
-                                            actives=self.active_link_ids)
-
         # List of neighbors for each cell: we will start off with no
         # list. If a caller requests it via get_neighbor_list or
         # create_neighbor_list, we'll create it if necessary.
@@ -778,7 +905,7 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         try:
             self._node_diagonal_links
         except AttributeError:
-            self._node_diagonal_links = np.empty((4,self.number_of_nodes), dtype=int)
+            self._node_diagonal_links = np.empty((4,self.number_of_nodes), dtype=self.index_dtype)
             self._node_diagonal_links.fill(-1)
             self._node_diagonal_links[0,:][
                 np.setdiff1d(np.arange(self.number_of_nodes),np.union1d(self.left_edge_node_ids(),
@@ -822,7 +949,7 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
                 nodata=np.nan
             elif nodata=='bad_value':
                 nodata=BAD_INDEX_VALUE
-            self.node_patch_matrix = np.ma.empty((self.number_of_nodes,4),dtype=int)
+            self.node_patch_matrix = np.ma.empty((self.number_of_nodes,4),dtype=self.index_dtype)
             self.node_patch_matrix.fill(BAD_INDEX_VALUE)
             self.node_patch_matrix[:,0][
                 np.setdiff1d(np.arange(self.number_of_nodes), np.union1d(self.left_edge_node_ids(),
@@ -847,15 +974,191 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
             return self.node_patch_matrix
 
 
-    @property
-    def patch_nodes(self):
+    patch_nodes = _lazy_connectivity('patch_nodes', '_setup_patch_nodes')
+
+    def _setup_patch_nodes(self):
         """
-        Returns the four nodes at the corners of each patch in a regular grid.
-        Shape of the returned array is (nnodes, 4).
+        Creates the array of the four nodes at the corners of each patch in a
+        regular grid, patch_nodes. Its shape is (npatches, 4).
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> rmg = RasterModelGrid(3, 4)
+        >>> rmg.patch_nodes
+        array([[ 0,  1,  4,  5],
+               [ 1,  2,  5,  6],
+               [ 2,  3,  6,  7],
+               [ 4,  5,  8,  9],
+               [ 5,  6,  9, 10],
+               [ 6,  7, 10, 11]])
         """
         base = np.arange(self.number_of_patches)
         bottom_left_corner = base + base//(self._ncols-1)
-        return np.column_stack((bottom_left_corner,bottom_left_corner+1,bottom_left_corner+self._ncols,bottom_left_corner+self._ncols+1))
+        self.patch_nodes = np.column_stack((bottom_left_corner,bottom_left_corner+1,bottom_left_corner+self._ncols,bottom_left_corner+self._ncols+1))
+
+    def _setup_link_faces(self):
+        """
+        Creates the array of the face that crosses each link, link_face.
+
+        Faces are numbered in the same order as the links that are active
+        when all four grid edges are open boundaries (that is, every link
+        that touches an interior node). Links that do not cross a face are
+        given BAD_INDEX_VALUE.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> rmg = RasterModelGrid(3, 4)
+        >>> rmg.link_face[[1, 5, 12, 0]] # doctest: +NORMALIZE_WHITESPACE
+        array([         0,          2,          5, 2147483647])
+        """
+        self.link_face = sgrid.face_at_link(self.shape)
+
+    def _setup_link_nodes(self):
+        """
+        Creates the arrays of the nodes at the tail and head of each link,
+        _node_at_link_tail and _node_at_link_head.
+        """
+        (self._node_at_link_tail,
+         self._node_at_link_head) = sgrid.node_index_at_link_ends(self.shape)
+
+    def _setup_active_link_mask(self):
+        """
+        Creates a boolean array, _active_link_mask, that is True for each
+        active link. The statuses of the nodes at either end of the vertical
+        (and then the horizontal) links are found from shifted views of the
+        node statuses, so no link-node arrays are needed.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> rmg = RasterModelGrid(3, 4, implicit_connectivity=True)
+        >>> rmg._active_link_mask.nonzero()[0]
+        array([ 1,  2,  5,  6, 11, 12, 13])
+        """
+        status = self.node_status.reshape(self.shape)
+        n_vertical = (self.number_of_node_rows - 1) * self.number_of_node_columns
+
+        self._active_link_mask = np.empty(self.number_of_links, dtype=bool)
+        self._active_link_mask[:n_vertical] = _is_active_link(
+            status[:-1, :], status[1:, :]).flat
+        self._active_link_mask[n_vertical:] = _is_active_link(
+            status[:, :-1], status[:, 1:]).flat
+
+    def _setup_active_link_lists(self):
+        """
+        Creates the list of active links, active_link_ids, and the nodes at
+        their tails and heads, activelink_fromnode and activelink_tonode.
+        """
+        (links, ) = np.where(self._active_link_mask)
+        links = links.astype(np.int, copy=False)
+
+        self.active_link_ids = links
+        (self.activelink_fromnode,
+         self.activelink_tonode) = self._nodes_at_link_ends(links)
+
+    def _nodes_at_link_ends(self, links):
+        """IDs of the nodes at the tails and heads of the given links.
+
+        The first links are vertical, and point from node *i* to node
+        *i + ncols*. The rest are horizontal; horizontal link *h* (counting
+        from the first horizontal link) lies in row *h // (ncols - 1)* and
+        points from node *h + row* to the next node along.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> rmg = RasterModelGrid(3, 4)
+        >>> rmg._nodes_at_link_ends([1, 7, 8, 13])
+        (array([1, 7, 0, 6]), array([ 5, 11,  1,  7]))
+        """
+        links = np.asarray(links)
+        n_cols = self.number_of_node_columns
+        n_vertical = (self.number_of_node_rows - 1) * n_cols
+
+        is_vertical = links < n_vertical
+        tail = np.empty_like(links)
+        tail[is_vertical] = links[is_vertical]
+        horizontal = links[~ is_vertical] - n_vertical
+        tail[~ is_vertical] = horizontal + horizontal // (n_cols - 1)
+
+        head = tail + 1
+        head[is_vertical] = tail[is_vertical] + n_cols
+
+        return tail, head
+
+    def _links_at_nodes(self, nodes):
+        """IDs of the links that touch any of the given nodes, sorted.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> rmg = RasterModelGrid(3, 4)
+        >>> rmg._links_at_nodes([0, 6])
+        array([ 0,  2,  6,  8, 12, 13])
+        """
+        nodes = np.asarray(nodes)
+        (n_rows, n_cols) = self.shape
+        n_vertical = (n_rows - 1) * n_cols
+
+        (row, col) = (nodes // n_cols, nodes % n_cols)
+        horizontal = n_vertical + row * (n_cols - 1) + col
+        links = np.concatenate((nodes[row < n_rows - 1],
+                                nodes[row > 0] - n_cols,
+                                horizontal[col < n_cols - 1],
+                                horizontal[col > 0] - 1))
+
+        return np.unique(links)
+
+    def _setup_node_at_cell(self):
+        """
+        Creates the array of the node at each cell, _node_at_cell.
+        """
+        self._node_at_cell = sgrid.node_at_cell(self.shape)
+
+    def _setup_lists_of_nodes_cells(self):
+        """
+        Creates the lists of nodes and cells that depend on the node
+        statuses (see ModelGrid._reset_lists_of_nodes_cells).
+        """
+        super(RasterModelGrid, self)._reset_lists_of_nodes_cells()
+
+    @property
+    def implicit_connectivity(self):
+        """Whether the grid's connectivity arrays are only made on request.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> RasterModelGrid((3, 4)).implicit_connectivity
+        False
+        >>> RasterModelGrid((3, 4), implicit_connectivity=True).implicit_connectivity
+        True
+        """
+        return self._implicit_connectivity
+
+    def _node_values_at_link_ends(self, node_values):
+        """Values at the tail and head nodes of every link.
+
+        The values are taken from shifted views of the node values, so no
+        link-node arrays are needed.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> rmg = RasterModelGrid(3, 3)
+        >>> (tail, head) = rmg._node_values_at_link_ends(np.arange(9.))
+        >>> tail
+        array([ 0.,  1.,  2.,  3.,  4.,  5.,  0.,  1.,  3.,  4.,  6.,  7.])
+        >>> head
+        array([ 3.,  4.,  5.,  6.,  7.,  8.,  1.,  2.,  4.,  5.,  7.,  8.])
+        """
+        values = np.asarray(node_values).reshape(self.shape)
+        tail = np.concatenate((values[:-1, :].flat, values[:, :-1].flat))
+        head = np.concatenate((values[1:, :].flat, values[:, 1:].flat))
+        return tail, head
 
 
     def _setup_inlink_and_outlink_matrices(self):
@@ -911,6 +1214,19 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
          self.node_numoutlink) = sgrid.setup_outlink_matrix(self.shape)
 
     def _setup_active_inlink_and_outlink_matrices(self):
+        """
+        Discards the active inlink and outlink matrices, as the node statuses
+        have changed. They are made again, for the new statuses, when they are
+        next used (see _make_active_inlink_and_outlink_matrices).
+        """
+        del self.node_active_inlink_matrix
+        del self.node_active_inlink_matrix2
+        del self.node_numactiveinlink
+        del self.node_active_outlink_matrix
+        del self.node_active_outlink_matrix2
+        del self.node_numactiveoutlink
+
+    def _make_active_inlink_and_outlink_matrices(self):
         """
         Creates data structures to record the numbers of active inlinks and
         active outlinks for each node. These data structures are equivalent to
@@ -976,11 +1292,100 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         Assuming the active link list has already been created elsewhere, this
         helper method checks link statuses (active/inactive) for internal
         consistency after the BC status of some nodes has been changed.
+
+        With implicit connectivity, only the number of active links is
+        updated. The lists of active links are made again when next used.
+        '''
+        del self._active_link_mask
+        if self._implicit_connectivity:
+            del self.active_link_ids
+            del self.activelink_fromnode
+            del self.activelink_tonode
+            self._num_active_links = np.count_nonzero(self._active_link_mask)
+            self._num_active_faces = self._num_active_links
+            self._setup_active_inlink_and_outlink_matrices()
+        else:
+            super(RasterModelGrid, self)._reset_list_of_active_links()
+        if self._diagonal_links_created:
+            self._reset_list_of_active_diagonal_links()
+
+    def _reset_lists_of_nodes_cells(self):
+        '''
+        Creates or resets various lists of nodes and cells based on their
+        statuses (see ModelGrid._reset_lists_of_nodes_cells).
+
+        With implicit connectivity, only the numbers of nodes and cells are
+        updated. The lists are made again when next used.
+        '''
+        if self._implicit_connectivity:
+            del self.activecell_node
+            del self.corecell_node
+            del self.active_cells
+            del self._core_cells
+            del self.node_activecell
+            del self.node_corecell
+            del self._boundary_nodes
+            self._num_core_cells = np.count_nonzero(
+                self.node_status == CORE_NODE)
+            self._num_core_nodes = self._num_core_cells
+            self._num_active_cells = self._num_core_cells
+            self._num_active_nodes = np.count_nonzero(
+                self.node_status != CLOSED_BOUNDARY)
+        else:
+            super(RasterModelGrid, self)._reset_lists_of_nodes_cells()
+
+    def _update_active_links(self, links):
+        '''
+        Updates the active links after the statuses of some nodes have changed
+        (see ModelGrid._update_active_links). The mask of active links is
+        patched at *links*.
+
+        With implicit connectivity, only the number of active links is
+        updated. The lists of active links are made again when next used.
+
+        The active inlink and outlink matrices of a raster depend on which
+        nodes are closed rather than on which links are active, so they are
+        made again even if no link has changed.
         '''
-        super(RasterModelGrid, self)._reset_list_of_active_links()
+        if '_active_link_mask' in self.__dict__:
+            (tail, head) = self._nodes_at_link_ends(links)
+            self._active_link_mask[links] = _is_active_link(
+                self.node_status[tail], self.node_status[head])
+
+        if self._implicit_connectivity:
+            del self.active_link_ids
+            del self.activelink_fromnode
+            del self.activelink_tonode
+            self._num_active_links = np.count_nonzero(self._active_link_mask)
+            self._num_active_faces = self._num_active_links
+        else:
+            super(RasterModelGrid, self)._update_active_links(links)
+        self._setup_active_inlink_and_outlink_matrices()
         if self._diagonal_links_created:
             self._reset_list_of_active_diagonal_links()
 
+    def _update_active_inlink_and_outlink_matrices(self, nodes, removed_at,
+                                                   added_at):
+        """
+        Discards the active inlink and outlink matrices, which are made again
+        when next used (see _make_active_inlink_and_outlink_matrices).
+        """
+        self._setup_active_inlink_and_outlink_matrices()
+
+    def _update_lists_of_nodes_cells(self, nodes, old_status):
+        '''
+        Updates the lists of nodes and cells after the statuses of *nodes*
+        have changed (see ModelGrid._update_lists_of_nodes_cells).
+
+        With implicit connectivity, only the numbers of nodes and cells are
+        updated. The lists are made again when next used.
+        '''
+        if self._implicit_connectivity:
+            self._reset_lists_of_nodes_cells()
+        else:
+            super(RasterModelGrid, self)._update_lists_of_nodes_cells(
+                nodes, old_status)
+
     def _make_link_unit_vectors(self):
         """Makes arrays to store the unit vectors associated with each link.
         Overrides ModelGrid._make_link_unit_vectors().
@@ -1620,6 +2025,89 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         """
         return rfuncs.find_nearest_node(self, coords, mode=mode)
 
+    def _find_nodes_in_windows(self, points, radius):
+        """Nodes in the square windows that bound circles about points.
+
+        Each window is the block of rows and columns of nodes that spans
+        *radius* on either side of one of the (number of points, 2)
+        *points*, clipped to the grid. Windows of points near the edges of
+        the grid are shifted, rather than shrunk, so that all are of the
+        same shape.
+
+        Returns
+        -------
+        tuple of ndarray
+            Node IDs and their distances from the points, each of shape
+            (number of points, nodes per window). Within each window, IDs
+            are in increasing order.
+        """
+        (n_rows, n_cols) = self.shape
+        x = (points[:, 0] - self.node_x[0]) / self._dx
+        y = (points[:, 1] - self.node_y[0]) / self._dx
+
+        width = int(2. * radius / self._dx) + 2
+        (width_in_cols, width_in_rows) = (min(width, n_cols),
+                                          min(width, n_rows))
+        first_col = np.clip(np.floor(x - radius / self._dx).astype(int),
+                            0, n_cols - width_in_cols)
+        first_row = np.clip(np.floor(y - radius / self._dx).astype(int),
+                            0, n_rows - width_in_rows)
+
+        cols = first_col[:, np.newaxis, np.newaxis] + np.arange(width_in_cols)
+        rows = (first_row[:, np.newaxis, np.newaxis] +
+                np.arange(width_in_rows)[:, np.newaxis])
+
+        distances = np.hypot(cols - x[:, np.newaxis, np.newaxis],
+                             rows - y[:, np.newaxis, np.newaxis]) * self._dx
+        nodes = rows * n_cols + cols
+
+        shape = (len(points), -1)
+        return (nodes.reshape(shape).astype(self.index_dtype),
+                distances.reshape(shape))
+
+    def _find_nodes_within_radius(self, points, radius):
+        """IDs of nodes within *radius* of each point, as a list of arrays.
+
+        Overrides :meth:`~.ModelGrid._find_nodes_within_radius` to look only
+        at the rows and columns of nodes about each point, rather than use a
+        KD-tree.
+        """
+        (nodes, distances) = self._find_nodes_in_windows(points, radius)
+        is_near = distances <= radius
+        return [nodes[i][is_near[i]] for i in range(len(points))]
+
+    def _find_k_nearest_nodes(self, points, k):
+        """IDs of the *k* nodes nearest each point, nearest first.
+
+        Overrides :meth:`~.ModelGrid._find_k_nearest_nodes`. Nodes are
+        looked for within a radius that would hold about *k* of them, which
+        is doubled for any point that does not yet have *k* nodes that close.
+        Nodes equally far from a point are ordered by ID.
+        """
+        nearest = np.empty((len(points), k), dtype=self.index_dtype)
+
+        remaining = np.arange(len(points))
+        radius = self._dx * (np.sqrt(k / np.pi) + 1.)
+        while len(remaining) > 0:
+            (nodes, distances) = self._find_nodes_in_windows(
+                points[remaining], radius)
+            distances[distances > radius] = np.inf
+
+            # Windows clipped to a narrow grid may hold fewer than k nodes,
+            # in which case none of the points is found.
+            is_found = np.sum(np.isfinite(distances), axis=1) >= k
+            if np.any(is_found):
+                order = np.argsort(distances[is_found], axis=1,
+                                   kind='mergesort')[:, :k]
+                nearest[remaining[is_found]] = (
+                    nodes[is_found][np.arange(len(order))[:, np.newaxis],
+                                    order])
+
+            remaining = remaining[~ is_found]
+            radius *= 2.
+
+        return nearest
+
     def min_active_link_length(self):
         """Length of shortest active link.
 
@@ -1733,7 +2221,9 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
             return self._link_length
         except AttributeError:
             if not self._diagonal_links_created:
-                return self._calculate_link_length()
+                self._link_length = np.empty(self.number_of_links)
+                self._link_length.fill(self._dx)
+                return self._link_length
             else:
                 self._link_length = np.empty(self.number_of_links + self.number_of_diagonal_links)
                 self._link_length[:self.number_of_links] = self._dx
@@ -1751,8 +2241,8 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         the steepest downslope direction.
         """
         n_diagonal_links = 2*(self._nrows-1)*(self._ncols-1)
-        self._diag_link_fromnode = np.zeros(n_diagonal_links, dtype=int)
-        self._diag_link_tonode = np.zeros(n_diagonal_links, dtype=int)
+        self._diag_link_fromnode = np.zeros(n_diagonal_links, dtype=self.index_dtype)
+        self._diag_link_tonode = np.zeros(n_diagonal_links, dtype=self.index_dtype)
         i = 0
         for r in range(self._nrows-1):
             for c in range(self._ncols-1):
@@ -3118,6 +3608,39 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
             #no fixed grad boundaries have been set
             pass
 
+    def calculate_diff_at_links(self, node_values, out=None):
+        """Differences in node values across links.
+
+        Calculates the difference between the values at the head and tail
+        nodes of every link, from shifted views of the node values.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> rmg = RasterModelGrid(3, 3)
+        >>> rmg.calculate_diff_at_links(np.array([0., 1., 2., 1., 3., 5., 2., 5., 8.]))
+        array([ 1.,  2.,  3.,  1.,  2.,  3.,  1.,  1.,  2.,  2.,  3.,  3.])
+        """
+        return rfuncs.calculate_diff_at_links(self, node_values, out=out)
+
+    def calculate_diff_at_active_links(self, node_values, out=None):
+        """Differences in node values across active links.
+
+        Calculates the difference between the values at the head and tail
+        nodes of every active link.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> rmg = RasterModelGrid(3, 3)
+        >>> rmg.calculate_diff_at_active_links(np.array([0., 1., 2., 1., 3., 5., 2., 5., 8.]))
+        array([ 2.,  2.,  2.,  2.])
+        """
+        return rfuncs.calculate_diff_at_active_links(self, node_values,
+                                                     out=out)
+
     def calculate_gradients_at_links(self, node_values, out=None):
         """*Deprecated*.
 
@@ -3125,7 +3648,7 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
             Use :func:`calculate_gradient_across_cell_faces`
                     or :func:`calculate_gradient_across_cell_corners` instead
         """
-        diffs = gfuncs.calculate_diff_at_links(self, node_values, out=out)
+        diffs = rfuncs.calculate_diff_at_links(self, node_values, out=out)
         return np.divide(diffs, self._dx, out=diffs)
 
 
@@ -3172,7 +3695,7 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         array([ 10.,  10., -10., -10., -10., -10., -10.,   0.,  10.,  10.,  10.,
                -10.,  10.,  10.,  10., -10.,  10.])
         """
-        diffs = gfuncs.calculate_diff_at_active_links(self, node_values,
+        diffs = rfuncs.calculate_diff_at_active_links(self, node_values,
                                                       out=out)
         return np.divide(diffs, self._dx, out=diffs)
 
@@ -3186,13 +3709,21 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         """
 
         diag_dist = 1.4142*self._dx
-        straight_link_slopes = (node_values[self.activelink_tonode] -
-                                node_values[self.activelink_fromnode]) / \
-                                self._dx
-        diagonal_link_slopes = (node_values[self._diag_activelink_tonode] -
-                                node_values[self._diag_activelink_fromnode]) / \
-                                diag_dist
-        return np.concatenate((straight_link_slopes, diagonal_link_slopes))
+        n_straight = len(self.activelink_tonode)
+        if out is None:
+            out = np.empty(n_straight + len(self._diag_activelink_tonode))
+        straight_link_slopes = out[:n_straight]
+        diagonal_link_slopes = out[n_straight:]
+
+        np.subtract(node_values[self.activelink_tonode],
+                    node_values[self.activelink_fromnode],
+                    out=straight_link_slopes)
+        straight_link_slopes /= self._dx
+        np.subtract(node_values[self._diag_activelink_tonode],
+                    node_values[self._diag_activelink_fromnode],
+                    out=diagonal_link_slopes)
+        diagonal_link_slopes /= diag_dist
+        return out
 
 
     def calculate_steepest_descent_on_nodes(self, elevs_in, link_gradients, max_slope=False, dstr_node_ids=False):
@@ -3316,6 +3847,15 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         return rfuncs.calculate_flux_divergence_at_nodes(
             self, active_link_flux, out=out)
 
+    def _make_flux_divergence_operator(self):
+        """Make the sparse flux divergence matrix for this grid.
+
+        As for :func:`calculate_flux_divergence_at_nodes`, divergence is
+        found at every node, including boundary nodes.
+        """
+        return gfuncs.make_flux_divergence_operator(self, self.dx,
+                                                    1. / self.cellarea)
+
     def calculate_flux_divergence(self, q, id):
         """Flux divergence.
 
@@ -3574,7 +4114,7 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
             inactive=bad_index).T
 
         self.neighbor_list_created = True
-        return neighbor_nodes
+        return neighbor_nodes.astype(self.index_dtype, copy=False)
 
     def has_boundary_neighbor(self, ids):
         """
@@ -3668,7 +4208,8 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
 
         self.diagonal_list_created = True
         self.diagonal_cells = sgrid.diagonal_node_array(
-            self.shape, out_of_bounds=bad_index)
+            self.shape, out_of_bounds=bad_index).astype(self.index_dtype,
+                                                        copy=False)
 
         closed_boundaries = np.empty(4, dtype=np.int)
         closed_boundaries.fill(bad_index)
@@ -4,6 +4,7 @@ from six.moves import range
 
 from .base import CLOSED_BOUNDARY
 from .base import BAD_INDEX_VALUE
+from .grid_funcs import empty_stack
 
 
 _VALID_ROUTING_METHODS = set(['d8', 'd4'])
@@ -30,6 +31,123 @@ def _make_optional_arg_into_array(number_of_elements, *args):
     return ids
 
 
+def _node_values_as_grid(grid, node_values):
+    """View node values as a 2D array with the shape of the grid."""
+    return np.asarray(node_values).reshape(grid.shape)
+
+
+def _inactive_faces_of_cells(grid):
+    """Mask of cell faces that are crossed by inactive links.
+
+    The faces of each cell are ordered as right, top, left, bottom, which are
+    the faces that are masked when the neighbor list of the cell's node has a
+    bad index.
+    """
+    n_rows, n_cols = grid.shape
+    n_vertical = (n_rows - 1) * n_cols
+    is_active = grid._active_link_mask
+    vertical = is_active[:n_vertical].reshape((n_rows - 1, n_cols))
+    horizontal = is_active[n_vertical:].reshape((n_rows, n_cols - 1))
+
+    is_inactive = np.empty((n_rows - 2, n_cols - 2, 4), dtype=bool)
+    np.logical_not(horizontal[1:-1, 1:], out=is_inactive[..., 0])
+    np.logical_not(vertical[1:, 1:-1], out=is_inactive[..., 1])
+    np.logical_not(horizontal[1:-1, :-1], out=is_inactive[..., 2])
+    np.logical_not(vertical[:-1, 1:-1], out=is_inactive[..., 3])
+
+    return is_inactive.reshape((-1, 4))
+
+
+def _calculate_gradient_across_cell_faces_stencil(grid, node_values, out=None):
+    """Gradients across the faces of all cells, using a stencil.
+
+    The cells of a raster are the interior nodes so the values at the right,
+    top, left, and bottom neighbors of every cell are shifted views of the
+    node values.
+    """
+    values = _node_values_as_grid(grid, node_values)
+    if out is None:
+        out = np.empty((grid.number_of_cells, 4), dtype=float)
+    faces = np.ma.getdata(out).reshape((grid.shape[0] - 2,
+                                        grid.shape[1] - 2, 4))
+
+    faces[..., 0] = values[1:-1, 2:]
+    faces[..., 1] = values[2:, 1:-1]
+    faces[..., 2] = values[1:-1, :-2]
+    faces[..., 3] = values[:-2, 1:-1]
+
+    is_inactive = _inactive_faces_of_cells(grid)
+    if np.any(is_inactive):
+        faces.reshape((-1, 4))[is_inactive] = BAD_INDEX_VALUE
+    else:
+        is_inactive = np.ma.nomask
+
+    faces -= values[1:-1, 1:-1, np.newaxis]
+    faces *= 1. / grid.node_spacing
+
+    return np.ma.array(np.ma.getdata(out), mask=is_inactive)
+
+
+def _calculate_gradient_across_cell_corners_stencil(grid, node_values,
+                                                    out=None):
+    """Gradients to the diagonals of all cells, using a stencil.
+
+    The values at the upper-right, upper-left, lower-left and lower-right
+    diagonals of every cell are shifted views of the node values.
+    """
+    values = _node_values_as_grid(grid, node_values)
+    if out is None:
+        out = np.empty((grid.number_of_cells, 4), dtype=float)
+    corners = out.reshape((grid.shape[0] - 2, grid.shape[1] - 2, 4))
+
+    center = values[1:-1, 1:-1]
+    np.subtract(values[2:, 2:], center, out=corners[..., 0])
+    np.subtract(values[2:, :-2], center, out=corners[..., 1])
+    np.subtract(values[:-2, :-2], center, out=corners[..., 2])
+    np.subtract(values[:-2, 2:], center, out=corners[..., 3])
+    np.divide(out, np.sqrt(2.) * grid.node_spacing, out=out)
+
+    return out
+
+
+def _has_closed_nodes(grid):
+    """Check if any of a grid's nodes are closed."""
+    return np.any(grid.node_status == CLOSED_BOUNDARY)
+
+
+def _use_stencil_for_faces(grid, *args):
+    """Check if face gradients can be found with a stencil.
+
+    A stencil is used when gradients are wanted for all of the cells of the
+    grid.
+    """
+    return len(args) == 0 and grid.number_of_cells > 0
+
+
+def _use_stencil_for_corners(grid, *args):
+    """Check if corner gradients can be found with a stencil.
+
+    As well as being wanted for all cells, the grid must not have closed
+    nodes as the diagonal lists of cells next to them have bad indices.
+    """
+    return _use_stencil_for_faces(grid, *args) and not _has_closed_nodes(grid)
+
+
+def _node_at_cell_face(grid, face):
+    """IDs of the nodes across given faces of each cell."""
+    n_cols = grid.number_of_node_columns
+    offsets = np.array([1, n_cols, -1, - n_cols], dtype=grid.index_dtype)
+    return grid.node_at_cell + offsets[face]
+
+
+def _node_at_cell_corner(grid, corner):
+    """IDs of the nodes at given corners of each cell."""
+    n_cols = grid.number_of_node_columns
+    offsets = np.array([n_cols + 1, n_cols - 1, - n_cols - 1, - n_cols + 1],
+                       dtype=grid.index_dtype)
+    return grid.node_at_cell + offsets[corner]
+
+
 def calculate_gradient_across_cell_faces(grid, node_values, *args, **kwds):
     """calculate_gradient_across_cell_faces(grid, node_values, [cell_ids], out=None)
     Gradients across the faces of a cell.
@@ -79,6 +197,10 @@ def calculate_gradient_across_cell_faces(grid, node_values, *args, **kwds):
            fill_value = 1e+20)
     <BLANKLINE>
     """
+    if _use_stencil_for_faces(grid, *args):
+        return _calculate_gradient_across_cell_faces_stencil(
+            grid, node_values, **kwds)
+
     padded_node_values = np.empty(node_values.size+1,dtype=float)
     padded_node_values[-1] = BAD_INDEX_VALUE
     padded_node_values[:-1] = node_values
@@ -140,6 +262,10 @@ def calculate_gradient_across_cell_corners(grid, node_values, *args, **kwds):
     array([[ 3.,  3.,  1.,  0.],
            [ 2.,  2., -1.,  0.]])
     """
+    if _use_stencil_for_corners(grid, *args):
+        return _calculate_gradient_across_cell_corners_stencil(
+            grid, node_values, **kwds)
+
     cell_ids = _make_optional_arg_into_array(grid.number_of_cells, *args)
     node_ids = grid.node_at_cell[cell_ids]
 
@@ -411,14 +537,17 @@ def calculate_steepest_descent_across_cell_corners(grid, node_values, *args,
 
     cell_ids = _make_optional_arg_into_array(grid.number_of_cells, *args)
 
-    grads = calculate_gradient_across_cell_corners(grid, node_values, cell_ids)
+    grads = calculate_gradient_across_cell_corners(grid, node_values, *args)
 
     if return_node:
         ind = np.argmin(grads, axis=1)
-        node_ids = grid.diagonal_cells[grid.node_at_cell[cell_ids], ind]
+        if _use_stencil_for_corners(grid, *args):
+            node_ids = _node_at_cell_corner(grid, ind)
+        else:
+            node_ids = grid.diagonal_cells[grid.node_at_cell[cell_ids], ind]
         if 'out' not in kwds:
             out = np.empty(len(cell_ids), dtype=grads.dtype)
-        out[:] = grads[range(len(cell_ids)), ind]
+        out[:] = grads[np.arange(len(cell_ids)), ind]
         return (out, node_ids)
         #return (out, 3 - ind)
     else:
@@ -490,15 +619,21 @@ def calculate_steepest_descent_across_cell_faces(grid, node_values, *args,
 
     cell_ids = _make_optional_arg_into_array(grid.number_of_cells, *args)
 
-    grads = calculate_gradient_across_cell_faces(grid, node_values, cell_ids)
+    grads = calculate_gradient_across_cell_faces(grid, node_values, *args)
 
     if return_node:
         ind = np.argmin(grads, axis=1)
-        node_ids = grid.get_neighbor_list()[grid.node_at_cell[cell_ids],ind]
+        rows = np.arange(len(cell_ids))
+        if _use_stencil_for_faces(grid, *args):
+            node_ids = _node_at_cell_face(grid, ind)
+            node_ids[np.ma.getmaskarray(grads)[rows, ind]] = BAD_INDEX_VALUE
+        else:
+            node_ids = grid.get_neighbor_list()[grid.node_at_cell[cell_ids],
+                                                ind]
         #node_ids = grid.neighbor_nodes[grid.node_at_cell[cell_ids], ind]
         if 'out' not in kwds:
             out = np.empty(len(cell_ids), dtype=grads.dtype)
-        out[:] = grads[range(len(cell_ids)), ind]
+        out[:] = grads[rows, ind]
         return (out, node_ids)
         #return (out, 3 - ind)
     else:
@@ -645,23 +780,152 @@ def node_id_of_cell_corner(grid, inds, *args):
     #return diagonals[range(len(cell_ids)), 3 - inds]
 
 
+def calculate_diff_at_links(grid, node_values, out=None):
+    """Differences in node values across links.
+
+    The differences across the vertical links, and then the horizontal ones,
+    are found by subtracting shifted views of the node values, so no
+    link-node arrays are needed.
+
+    Parameters
+    ----------
+    grid : RasterModelGrid
+        Input grid.
+    node_values : ndarray
+        Values at nodes, or a stack of arrays of them (the last dimension
+        being along nodes).
+    out : ndarray, optional
+        Alternative output array in which to place the result.
+
+    Returns
+    -------
+    ndarray
+        Value at the head node less the value at the tail node, for each
+        link.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.grid.raster_funcs import calculate_diff_at_links
+    >>> rmg = RasterModelGrid(3, 4)
+    >>> z = np.array([0., 1., 3., 6.,
+    ...               1., 2., 4., 7.,
+    ...               3., 4., 6., 9.])
+    >>> calculate_diff_at_links(rmg, z)
+    array([ 1.,  1.,  1.,  1.,  2.,  2.,  2.,  2.,  1.,  2.,  3.,  1.,  2.,
+            3.,  1.,  2.,  3.])
+
+    Differences of several fields are found together.
+
+    >>> calculate_diff_at_links(rmg, np.vstack((z, 2. * z)))[:, :4]
+    array([[ 1.,  1.,  1.,  1.],
+           [ 2.,  2.,  2.,  2.]])
+    """
+    values = np.asarray(node_values)
+    if out is None:
+        out = empty_stack(grid, values, 'link')
+
+    stack_shape = values.shape[:-1]
+    values = values.reshape(stack_shape + grid.shape)
+    n_cols = grid.number_of_node_columns
+    n_vertical = (grid.number_of_node_rows - 1) * n_cols
+
+    np.subtract(values[..., 1:, :], values[..., :-1, :],
+                out=out[..., :n_vertical].reshape(stack_shape + (-1, n_cols)))
+    np.subtract(values[..., :, 1:], values[..., :, :-1],
+                out=out[..., n_vertical:].reshape(
+                    stack_shape + (-1, n_cols - 1)))
+
+    return out
+
+
+def calculate_diff_at_active_links(grid, node_values, out=None):
+    """Differences in node values across active links.
+
+    If *grid* has implicit connectivity, the differences across all links
+    are found from shifted views of the node values (a row of vertical, or
+    horizontal, links at a time), and then those at active links are picked
+    out. Otherwise, the grid's lists of the nodes at the ends of each active
+    link are used.
+
+    Parameters
+    ----------
+    grid : RasterModelGrid
+        Input grid.
+    node_values : ndarray
+        Values at nodes, or a stack of arrays of them (the last dimension
+        being along nodes).
+    out : ndarray, optional
+        Alternative output array in which to place the result.
+
+    Returns
+    -------
+    ndarray
+        Value at the head node less the value at the tail node, for each
+        active link.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.grid.raster_funcs import calculate_diff_at_active_links
+    >>> z = np.array([0., 1., 3., 6.,
+    ...               1., 2., 4., 7.,
+    ...               3., 4., 6., 9.])
+    >>> rmg = RasterModelGrid(3, 4)
+    >>> calculate_diff_at_active_links(rmg, z)
+    array([ 1.,  1.,  2.,  2.,  1.,  2.,  3.])
+    >>> rmg = RasterModelGrid(3, 4, implicit_connectivity=True)
+    >>> calculate_diff_at_active_links(rmg, z)
+    array([ 1.,  1.,  2.,  2.,  1.,  2.,  3.])
+    >>> calculate_diff_at_active_links(rmg, np.vstack((z, - z)))
+    array([[ 1.,  1.,  2.,  2.,  1.,  2.,  3.],
+           [-1., -1., -2., -2., -1., -2., -3.]])
+    """
+    values = np.asarray(node_values)
+    if out is None:
+        out = empty_stack(grid, values, 'active_link')
+
+    if not grid.implicit_connectivity:
+        return np.subtract(values[..., grid.activelink_tonode],
+                           values[..., grid.activelink_fromnode], out=out)
+
+    stack_shape = values.shape[:-1]
+    values = values.reshape(stack_shape + grid.shape)
+    n_cols = grid.number_of_node_columns
+    n_vertical = (grid.number_of_node_rows - 1) * n_cols
+    is_active = grid._active_link_mask
+
+    n_active_vertical = np.count_nonzero(is_active[:n_vertical])
+    np.compress(is_active[:n_vertical],
+                np.subtract(values[..., 1:, :], values[..., :-1, :]).reshape(
+                    stack_shape + (-1, )),
+                axis=-1, out=out[..., :n_active_vertical])
+    np.compress(is_active[n_vertical:],
+                np.subtract(values[..., :, 1:], values[..., :, :-1]).reshape(
+                    stack_shape + (-1, )),
+                axis=-1, out=out[..., n_active_vertical:])
+
+    return out
+
+
 def calculate_flux_divergence_at_nodes(grid, active_link_flux, out=None):
     """Net flux into or out of nodes.
 
     Same as calculate_flux_divergence_at_core_cells, but works with and
     returns a list of net unit fluxes that corresponds to all nodes, rather
     than just core nodes.
-    
+
     Parameters
     ----------
     grid : RasterModelGrid
         Input grid.
     active_link_flux : array_like
-        Flux values at links.
+        Flux values at active links, or a stack of arrays of them (the last
+        dimension being along active links).
     out : ndarray, optional
         Alternative output array in which to place the result.  Must
         be of the same shape and buffer length as the expected output.
-        
+
     See Also
     --------
     calculate_flux_divergence_at_active_cells
@@ -669,8 +933,8 @@ def calculate_flux_divergence_at_nodes(grid, active_link_flux, out=None):
     Notes
     -----
     Note that we DO compute net unit fluxes at boundary nodes (even though
-    these don't have active cells associated with them, and often don't have 
-    cells of any kind, because they are on the perimeter). It's up to the 
+    these don't have active cells associated with them, and often don't have
+    cells of any kind, because they are on the perimeter). It's up to the
     user to decide what to do with these boundary values.
 
     Example
@@ -694,41 +958,73 @@ def calculate_flux_divergence_at_nodes(grid, active_link_flux, out=None):
     >>> rmg.calculate_flux_divergence_at_nodes(flux)
     array([ 0., -1., -1.,  1.,  0., -1.,  2.,  4., -2.,  1., -1.,  0.,  1.,
            -4.,  1.,  0., -1.,  0.,  1.,  0.])
-        
+
     If calculate_gradients_at_nodes is called inside a loop, you can
     improve speed by creating an array outside the loop. For example, do
     this once, before the loop:
-        
+
     >>> df = rmg.zeros(centering='node') # outside loop
     >>> rmg.number_of_nodes
     20
-        
+
     Then do this inside the loop so that the function will not have to create
     the df array but instead puts values into the *df* array.
-        
+
     >>> df = rmg.calculate_flux_divergence_at_nodes(flux, out=df)
+
+    The divergences of a stack of fluxes (one row for each of several
+    fields, say) are found in one pass over the links.
+
+    >>> fluxes = np.vstack((flux, 2. * flux))
+    >>> rmg.calculate_flux_divergence_at_nodes(fluxes)[:, 5:10]
+    array([[-1.,  2.,  4., -2.,  1.],
+           [-2.,  4.,  8., -4.,  2.]])
     """
-    assert (len(active_link_flux) == grid.number_of_active_links), \
+    active_link_flux = np.asarray(active_link_flux)
+    assert (active_link_flux.shape[-1] == grid.number_of_active_links), \
            "incorrect length of active_link_flux array"
-        
+
     # If needed, create net_unit_flux array
     if out is None:
-        out = grid.empty(centering='node')
-    out.fill(0.)
+        out = empty_stack(grid, active_link_flux, 'node')
     net_unit_flux = out
-        
-    assert(len(net_unit_flux) == grid.number_of_nodes)
-    
-    flux = np.zeros(len(active_link_flux) + 1)
-    flux[:len(active_link_flux)] = active_link_flux * grid.dx
 
-    net_unit_flux[:] = (
-        (flux[grid.node_active_outlink_matrix[0][:]] +
-         flux[grid.node_active_outlink_matrix[1][:]]) -
-        (flux[grid.node_active_inlink_matrix[0][:]] +
-         flux[grid.node_active_inlink_matrix[1][:]])) / grid.cellarea
+    assert(net_unit_flux.shape[-1] == grid.number_of_nodes)
 
-    return net_unit_flux
+    return _calculate_flux_divergence_at_nodes_stencil(
+        grid, active_link_flux, out=net_unit_flux)
+
+
+def _calculate_flux_divergence_at_nodes_stencil(grid, active_link_flux, out):
+    """Net flux out of nodes, using a stencil.
+
+    The fluxes are spread onto all of the grid's links (zero at inactive
+    ones). Each link's flux then leaves its tail node and enters its head
+    node, which, for rows of vertical or horizontal links, are shifted views
+    of the nodes. This needs neither the active in-link nor out-link
+    matrices, so it works the same whether or not the grid has implicit
+    connectivity.
+    """
+    n_rows, n_cols = grid.shape
+    n_vertical = (n_rows - 1) * n_cols
+    stack_shape = active_link_flux.shape[:-1]
+
+    flux = np.zeros(stack_shape + (grid.number_of_links, ))
+    flux[..., grid._active_link_mask] = active_link_flux
+    vertical_flux = flux[..., :n_vertical].reshape(
+        stack_shape + (n_rows - 1, n_cols))
+    horizontal_flux = flux[..., n_vertical:].reshape(
+        stack_shape + (n_rows, n_cols - 1))
+
+    net_flux = out.reshape(stack_shape + grid.shape)
+    net_flux.fill(0.)
+    net_flux[..., :-1, :] += vertical_flux
+    net_flux[..., 1:, :] -= vertical_flux
+    net_flux[..., :, :-1] += horizontal_flux
+    net_flux[..., :, 1:] -= horizontal_flux
+    out *= grid.dx / grid.cellarea
+
+    return out
 
 
 # TODO: Functions below here still need to be refactored for speed and to
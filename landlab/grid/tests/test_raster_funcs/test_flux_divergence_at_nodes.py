@@ -50,3 +50,15 @@ def test_out_array():
                   0., 1., 2., 3., -6.,
                   0., 0., 0., 0.,  0.]))
     assert_is(rtn_divs, divs)
+
+
+def test_stacked_fluxes():
+    for rmg in (RasterModelGrid(4, 5),
+                RasterModelGrid(4, 5, implicit_connectivity=True)):
+        fluxes = np.random.rand(3, rmg.number_of_active_links)
+        divs = rmg.calculate_flux_divergence_at_nodes(fluxes)
+
+        assert_array_equal(divs.shape, (3, rmg.number_of_nodes))
+        for (flux, div) in zip(fluxes, divs):
+            assert_array_equal(div,
+                               rmg.calculate_flux_divergence_at_nodes(flux))
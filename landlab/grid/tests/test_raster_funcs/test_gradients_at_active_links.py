@@ -65,3 +65,14 @@ def test_diff_out_array():
         np.array([5, 5, 5, 5, 5, 5, 5, 5, 5,
                   1, 1, 1, 1, 1, 1, 1, 1]))
     assert_is(rtn_diff, diff)
+
+
+def test_stacked_node_values():
+    for rmg in (RasterModelGrid(4, 5, 2.),
+                RasterModelGrid(4, 5, 2., implicit_connectivity=True)):
+        values = np.random.rand(2, 3, rmg.number_of_nodes)
+        grads = rmg.calculate_gradients_at_active_links(values)
+
+        assert_array_equal(grads.shape, (2, 3, rmg.number_of_active_links))
+        assert_array_equal(
+            grads[1, 2], rmg.calculate_gradients_at_active_links(values[1, 2]))
@@ -0,0 +1,60 @@
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+
+from landlab import RasterModelGrid
+from landlab.grid import raster_funcs as rfuncs
+
+
+def _grid_with_boundaries():
+    rmg = RasterModelGrid((6, 7), 2.)
+    rmg.set_closed_boundaries_at_grid_edges(True, False, True, False)
+    rmg.set_closed_nodes([16])
+    rmg.set_fixed_value_boundaries([24, 25])
+    return rmg
+
+
+def test_faces_stencil_matches_indexed():
+    rmg = _grid_with_boundaries()
+    values = np.random.rand(rmg.number_of_nodes)
+    cell_ids = np.arange(rmg.number_of_cells)
+
+    stencil = rfuncs.calculate_gradient_across_cell_faces(rmg, values)
+    indexed = rfuncs.calculate_gradient_across_cell_faces(rmg, values,
+                                                          cell_ids)
+    assert_array_equal(np.ma.getmaskarray(stencil),
+                       np.ma.getmaskarray(indexed))
+    assert_array_almost_equal(stencil.filled(0.), indexed.filled(0.))
+
+
+def test_corners_stencil_matches_indexed():
+    rmg = RasterModelGrid((6, 7), 2.)
+    values = np.random.rand(rmg.number_of_nodes)
+    cell_ids = np.arange(rmg.number_of_cells)
+
+    assert_array_almost_equal(
+        rfuncs.calculate_gradient_across_cell_corners(rmg, values),
+        rfuncs.calculate_gradient_across_cell_corners(rmg, values, cell_ids))
+
+
+def _assert_steepest_descent_stencil_matches_indexed(rmg, method):
+    values = np.random.rand(rmg.number_of_nodes)
+    cell_ids = np.arange(rmg.number_of_cells)
+
+    (stencil_grads, stencil_nodes) = (
+        rfuncs.calculate_steepest_descent_across_adjacent_cells(
+            rmg, values, method=method, return_node=True))
+    (indexed_grads, indexed_nodes) = (
+        rfuncs.calculate_steepest_descent_across_adjacent_cells(
+            rmg, values, cell_ids, method=method, return_node=True))
+    assert_array_almost_equal(stencil_grads, indexed_grads)
+    assert_array_equal(stencil_nodes, indexed_nodes)
+
+
+def test_d4_steepest_descent_stencil_matches_indexed():
+    for rmg in (RasterModelGrid((6, 7), 2.), _grid_with_boundaries()):
+        _assert_steepest_descent_stencil_matches_indexed(rmg, 'd4')
+
+
+def test_d8_steepest_descent_stencil_matches_indexed():
+    _assert_steepest_descent_stencil_matches_indexed(
+        RasterModelGrid((6, 7), 2.), 'd8')
@@ -0,0 +1,67 @@
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+from nose.tools import assert_equal, assert_false
+
+from landlab import RasterModelGrid, CLOSED_BOUNDARY
+from landlab.grid import mappers
+
+
+def _grids_with_closed_nodes(shape):
+    """An explicit and an implicit grid with the same boundaries."""
+    grids = (RasterModelGrid(shape, 2.),
+             RasterModelGrid(shape, 2., implicit_connectivity=True))
+    for grid in grids:
+        grid.set_closed_boundaries_at_grid_edges(True, False, False, True)
+        grid.node_status[shape[1] + 2] = CLOSED_BOUNDARY
+        grid.update_links_nodes_cells_to_new_BCs()
+    return grids
+
+
+def test_no_connectivity_arrays():
+    rmg = RasterModelGrid((4, 5), implicit_connectivity=True)
+    for name in ['_node_at_link_tail', '_node_at_link_head',
+                 'active_link_ids', 'activelink_fromnode',
+                 'activelink_tonode', 'corecell_node', 'node_corecell']:
+        assert_false(name in rmg.__dict__)
+    assert_equal(rmg.number_of_active_links, 17)
+    assert_equal(rmg.number_of_core_nodes, 6)
+
+
+def test_connectivity_on_request():
+    (explicit, implicit) = _grids_with_closed_nodes((5, 6))
+    for name in ['active_links', 'activelink_fromnode', 'activelink_tonode',
+                 'node_at_link_tail', 'node_at_link_head', 'core_nodes',
+                 'core_cells', 'node_corecell', 'node_activecell',
+                 'boundary_nodes', 'node_active_inlink_matrix']:
+        assert_array_equal(getattr(explicit, name), getattr(implicit, name))
+    assert_equal(explicit.number_of_active_links,
+                 implicit.number_of_active_links)
+
+
+def test_gradients_and_divergence():
+    (explicit, implicit) = _grids_with_closed_nodes((5, 6))
+    z = np.random.rand(explicit.number_of_nodes)
+
+    assert_array_equal(explicit.calculate_gradients_at_active_links(z),
+                       implicit.calculate_gradients_at_active_links(z))
+    assert_array_equal(explicit.calculate_gradients_at_links(z),
+                       implicit.calculate_gradients_at_links(z))
+
+    flux = np.random.rand(explicit.number_of_active_links)
+    assert_array_almost_equal(
+        explicit.calculate_flux_divergence_at_nodes(flux),
+        implicit.calculate_flux_divergence_at_nodes(flux))
+
+
+def test_mappers():
+    (explicit, implicit) = _grids_with_closed_nodes((4, 5))
+    z = np.random.rand(explicit.number_of_nodes)
+    explicit.add_field('node', 'z', z)
+    implicit.add_field('node', 'z', z)
+
+    for mapper in [mappers.map_link_head_node_to_link,
+                   mappers.map_link_tail_node_to_link,
+                   mappers.map_min_of_link_nodes_to_link,
+                   mappers.map_max_of_link_nodes_to_link,
+                   mappers.map_mean_of_link_nodes_to_link]:
+        assert_array_equal(mapper(explicit, 'z'), mapper(implicit, 'z'))
@@ -0,0 +1,61 @@
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+from nose.tools import assert_equal, assert_raises
+
+from landlab import RasterModelGrid, HexModelGrid
+from landlab.components.flow_routing.route_flow_dn import FlowRouter
+
+
+def test_default_index_dtype():
+    rmg = RasterModelGrid((4, 5))
+    assert_equal(rmg.index_dtype, np.dtype(int))
+    assert_equal(rmg.node_at_link_tail.dtype, np.dtype(int))
+
+
+def test_auto_index_dtype():
+    rmg = RasterModelGrid((4, 5), index_dtype='auto')
+    assert_equal(rmg.index_dtype, np.int32)
+
+
+def test_connectivity_arrays():
+    rmg = RasterModelGrid((4, 5), index_dtype=np.int32)
+    for name in ['node_at_link_tail', 'node_at_link_head', 'active_links',
+                 'activelink_fromnode', 'activelink_tonode', 'core_nodes',
+                 'boundary_nodes', 'node_inlink_matrix',
+                 'node_active_outlink_matrix']:
+        assert_equal(getattr(rmg, name).dtype, np.int32)
+
+
+def test_voronoi_connectivity_arrays():
+    hmg = HexModelGrid(4, 3, index_dtype=np.int32)
+    for name in ['node_at_link_tail', 'node_at_link_head', 'active_links',
+                 'core_nodes', 'node_at_cell']:
+        assert_equal(getattr(hmg, name).dtype, np.int32)
+
+
+def test_too_small():
+    assert_raises(ValueError, RasterModelGrid, (400, 500),
+                  index_dtype=np.int16)
+
+
+def test_must_hold_bad_index_value():
+    for dtype in (np.int8, np.int16):
+        assert_raises(ValueError, RasterModelGrid, (4, 5), index_dtype=dtype)
+        assert_raises(ValueError, HexModelGrid, 4, 3, index_dtype=dtype)
+
+
+def test_flow_routing_with_int32_ids():
+    z = np.random.rand(30)
+    grids = (RasterModelGrid((5, 6)),
+             RasterModelGrid((5, 6), index_dtype=np.int32))
+    for grid in grids:
+        grid.add_field('node', 'topographic__elevation', z.copy())
+        FlowRouter(grid).route_flow()
+
+    (grid64, grid32) = grids
+    for name in ['flow_receiver', 'links_to_flow_receiver',
+                 'upstream_ID_order']:
+        assert_equal(grid32.at_node[name].dtype, np.int32)
+        assert_array_equal(grid32.at_node[name], grid64.at_node[name])
+    assert_array_almost_equal(grid32.at_node['drainage_area'],
+                              grid64.at_node['drainage_area'])
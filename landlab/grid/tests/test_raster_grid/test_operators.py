@@ -0,0 +1,41 @@
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+from nose.tools import assert_equal, assert_is, assert_is_not
+
+from landlab import RasterModelGrid
+
+
+def test_gradient_operator():
+    rmg = RasterModelGrid((4, 5), 2.)
+    z = np.random.rand(rmg.number_of_nodes)
+    assert_equal(rmg.gradient_operator.shape,
+                 (rmg.number_of_active_links, rmg.number_of_nodes))
+    assert_array_almost_equal(rmg.gradient_operator.dot(z),
+                              rmg.calculate_gradients_at_active_links(z))
+
+
+def test_flux_divergence_operator():
+    rmg = RasterModelGrid((4, 5), 2.)
+    q = np.random.rand(rmg.number_of_active_links)
+    assert_array_almost_equal(rmg.flux_divergence_operator.dot(q),
+                              rmg.calculate_flux_divergence_at_nodes(q))
+
+
+def test_laplacian_of_quadratic():
+    rmg = RasterModelGrid((5, 6), 2.)
+    z = rmg.node_x ** 2 + 3. * rmg.node_y ** 2
+    laplacian = rmg.laplacian_operator.dot(z)
+    assert_array_almost_equal(laplacian[rmg.core_nodes], 8.)
+
+
+def test_operators_reset_with_boundary_conditions():
+    rmg = RasterModelGrid((4, 5))
+    gradient = rmg.gradient_operator
+    assert_is(rmg.gradient_operator, gradient)
+
+    rmg.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    assert_is_not(rmg.gradient_operator, gradient)
+    assert_equal(rmg.gradient_operator.shape,
+                 (rmg.number_of_active_links, rmg.number_of_nodes))
+    assert_equal(rmg.laplacian_operator.shape,
+                 (rmg.number_of_nodes, rmg.number_of_nodes))
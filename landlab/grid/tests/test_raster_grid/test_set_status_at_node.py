@@ -0,0 +1,107 @@
+import numpy as np
+from numpy.testing import assert_array_equal
+from nose.tools import assert_equal
+
+from landlab import (RasterModelGrid, HexModelGrid, CORE_NODE,
+                     FIXED_VALUE_BOUNDARY, FIXED_GRADIENT_BOUNDARY,
+                     CLOSED_BOUNDARY)
+
+
+_NODE_AND_LINK_LISTS = [
+    'active_links', 'activelink_fromnode', 'activelink_tonode', 'core_nodes',
+    'boundary_nodes', 'activecell_node', 'corecell_node', 'node_corecell',
+    'node_activecell', 'active_cells', 'core_cells']
+
+_ACTIVE_LINK_MATRICES = [
+    'node_active_inlink_matrix', 'node_active_outlink_matrix',
+    'node_active_inlink_matrix2', 'node_active_outlink_matrix2',
+    'node_numactiveinlink', 'node_numactiveoutlink']
+
+
+def _assert_same_as_full_update(updated, reset, names):
+    for name in names:
+        assert_array_equal(getattr(updated, name), getattr(reset, name),
+                           err_msg=name)
+    assert_equal(updated.number_of_active_links, reset.number_of_active_links)
+    assert_equal(updated.number_of_core_nodes, reset.number_of_core_nodes)
+    assert_equal(updated.number_of_active_nodes,
+                 reset.number_of_active_nodes)
+    assert_equal(updated.number_of_active_cells,
+                 reset.number_of_active_cells)
+
+
+def _change_statuses(make_grid, changes, names):
+    updated, reset = make_grid(), make_grid()
+    for (nodes, status) in changes:
+        updated.set_status_at_node(nodes, status)
+        reset.node_status[nodes] = status
+        reset.update_links_nodes_cells_to_new_BCs()
+        _assert_same_as_full_update(updated, reset, names)
+
+
+def test_raster():
+    changes = [([6, 7, 13], CLOSED_BOUNDARY),
+               ([0, 1, 7], CORE_NODE),
+               (12, FIXED_VALUE_BOUNDARY),
+               ([6, 12], CORE_NODE)]
+    _change_statuses(lambda: RasterModelGrid((5, 6)), changes,
+                     _NODE_AND_LINK_LISTS)
+    _change_statuses(
+        lambda: RasterModelGrid((5, 6), implicit_connectivity=True), changes,
+        _NODE_AND_LINK_LISTS)
+
+
+def test_hex():
+    changes = [([4, 5, 9], CLOSED_BOUNDARY),
+               ([0, 5], CORE_NODE),
+               (10, FIXED_VALUE_BOUNDARY),
+               ([4, 9, 10], CORE_NODE)]
+    _change_statuses(lambda: HexModelGrid(5, 4), changes,
+                     _NODE_AND_LINK_LISTS + _ACTIVE_LINK_MATRICES)
+
+
+def test_unchanged_status():
+    rmg = RasterModelGrid((4, 5))
+    active_links = rmg.active_links
+    rmg.set_status_at_node([6, 7], CORE_NODE)
+    assert_array_equal(rmg.active_links, active_links)
+
+
+def test_operators_are_reset():
+    rmg = RasterModelGrid((4, 5))
+    n_active_links = rmg.number_of_active_links
+    assert_equal(rmg.gradient_operator.shape[0], n_active_links)
+
+    rmg.set_status_at_node([6], CLOSED_BOUNDARY)
+    assert_equal(rmg.gradient_operator.shape[0], n_active_links - 4)
+
+
+def _change_statuses_at_random(make_grid, names, n_changes=400, seed=1945):
+    np.random.seed(seed)
+    statuses = [CORE_NODE, FIXED_VALUE_BOUNDARY, FIXED_GRADIENT_BOUNDARY,
+                CLOSED_BOUNDARY]
+    n_nodes = make_grid().number_of_nodes
+    changes = [(np.random.randint(n_nodes, size=np.random.randint(1, 4)),
+                statuses[np.random.randint(len(statuses))])
+               for _ in range(n_changes)]
+    _change_statuses(make_grid, changes, names)
+
+
+def test_random_changes():
+    _change_statuses_at_random(lambda: RasterModelGrid((5, 6)),
+                               _NODE_AND_LINK_LISTS + _ACTIVE_LINK_MATRICES)
+    _change_statuses_at_random(
+        lambda: RasterModelGrid((5, 6), implicit_connectivity=True),
+        _NODE_AND_LINK_LISTS + _ACTIVE_LINK_MATRICES)
+    _change_statuses_at_random(lambda: HexModelGrid(5, 4),
+                               _NODE_AND_LINK_LISTS + _ACTIVE_LINK_MATRICES)
+
+
+def test_number_of_active_cells_changes():
+    """Nodes before the first changed node are renumbered too."""
+    changes = [([13, 12], CLOSED_BOUNDARY),
+               ([7], CORE_NODE),
+               ([12], CORE_NODE),
+               ([8, 20], CLOSED_BOUNDARY)]
+    _change_statuses(lambda: RasterModelGrid((5, 6)), changes,
+                     _NODE_AND_LINK_LISTS)
@@ -0,0 +1,99 @@
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+from nose.tools import assert_equal, raises
+
+from landlab import RasterModelGrid, HexModelGrid
+
+
+def _brute_force_distances(grid, x, y):
+    return np.hypot(grid.node_x - x, grid.node_y - y)
+
+
+def _random_points(grid, n_points):
+    """Points on, and a little beyond, the grid."""
+    x = np.random.uniform(grid.node_x.min() - 2., grid.node_x.max() + 2.,
+                          n_points)
+    y = np.random.uniform(grid.node_y.min() - 2., grid.node_y.max() + 2.,
+                          n_points)
+    return (x, y)
+
+
+def _assert_nodes_within_radius(grid):
+    (x, y) = _random_points(grid, 20)
+    for radius in (0.5, 1.7, 4., 100.):
+        nodes = grid.nodes_within_radius((x, y), radius)
+        assert_equal(len(nodes), len(x))
+        for i in range(len(x)):
+            dists = _brute_force_distances(grid, x[i], y[i])
+            assert_array_equal(nodes[i], np.where(dists <= radius)[0])
+            assert_array_equal(grid.nodes_within_radius((x[i], y[i]), radius),
+                               nodes[i])
+
+
+def _assert_k_nearest_nodes(grid, ks=None):
+    if ks is None:
+        ks = (1, 5, 12, grid.number_of_nodes)
+    (x, y) = _random_points(grid, 20)
+    for k in ks:
+        (nodes, dists) = grid.k_nearest_nodes((x, y), k,
+                                              return_distances=True)
+        assert_equal(nodes.shape, (len(x), k))
+        for i in range(len(x)):
+            expected = np.sort(_brute_force_distances(grid, x[i], y[i]))[:k]
+            assert_array_almost_equal(dists[i], expected)
+            assert_array_almost_equal(
+                _brute_force_distances(grid, x[i], y[i])[nodes[i]], expected)
+
+
+def test_raster_nodes_within_radius():
+    _assert_nodes_within_radius(RasterModelGrid((9, 13), 1.5))
+
+
+def test_hex_nodes_within_radius():
+    _assert_nodes_within_radius(HexModelGrid(7, 6))
+
+
+def test_raster_k_nearest_nodes():
+    _assert_k_nearest_nodes(RasterModelGrid((9, 13), 1.5))
+
+
+def test_hex_k_nearest_nodes():
+    _assert_k_nearest_nodes(HexModelGrid(7, 6))
+
+
+def test_narrow_raster_k_nearest_nodes():
+    for shape in ((3, 15), (15, 3), (3, 3), (4, 40)):
+        grid = RasterModelGrid(shape, 2.)
+        n_nodes = grid.number_of_nodes
+        _assert_k_nearest_nodes(
+            grid, ks=(1, 4, n_nodes // 2, n_nodes - 1, n_nodes))
+
+
+def test_k_nearest_more_nodes_than_a_window():
+    rmg = RasterModelGrid((3, 15))
+    for k in (33, 40, 45):
+        (nodes, dists) = rmg.k_nearest_nodes((7., 1.), k,
+                                             return_distances=True)
+        assert_equal(len(nodes), k)
+        assert_array_almost_equal(
+            dists, np.sort(_brute_force_distances(rmg, 7., 1.))[:k])
+
+
+def test_k_nearest_ties_ordered_by_id():
+    rmg = RasterModelGrid((4, 5))
+    assert_array_equal(rmg.k_nearest_nodes((2., 1.), 5), [7, 2, 6, 8, 12])
+
+
+def test_azimuths_match_get_distances_of_nodes_to_point():
+    rmg = RasterModelGrid((5, 6))
+    (nodes, dists, azimuths) = rmg.nodes_within_radius(
+        (2.5, 1.), 2., return_distances=True, return_azimuths=True)
+    (expected_dists, expected_azimuths) = rmg.get_distances_of_nodes_to_point(
+        (2.5, 1.), get_az='angles', node_subset=nodes)
+    assert_array_almost_equal(dists, expected_dists)
+    assert_array_almost_equal(azimuths, expected_azimuths)
+
+
+@raises(ValueError)
+def test_too_many_nearest_nodes():
+    RasterModelGrid((4, 5)).k_nearest_nodes((1., 1.), 21)
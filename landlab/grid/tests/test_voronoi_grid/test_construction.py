@@ -0,0 +1,66 @@
+import numpy as np
+from numpy.testing import assert_array_almost_equal, assert_equal
+from scipy.spatial import Delaunay, Voronoi
+
+from landlab import HexModelGrid
+from landlab.grid import VoronoiDelaunayGrid
+from landlab.grid.voronoi import simple_poly_area
+
+
+def _links_and_faces(links_and_faces):
+    """Face widths keyed by the (sorted) nodes of each link."""
+    (fromnode, tonode, active_links, face_width) = links_and_faces
+    nodes = np.sort(np.column_stack((fromnode, tonode)), axis=1)
+    links = set(map(tuple, nodes))
+    faces = dict(zip(map(tuple, nodes[active_links]), face_width))
+    return links, faces
+
+
+def _assert_same_as_voronoi_diagram(pts):
+    (links, faces) = _links_and_faces(
+        VoronoiDelaunayGrid.create_links_and_faces_from_triangulation(
+            Delaunay(pts)))
+    (expected_links, expected_faces) = _links_and_faces(
+        VoronoiDelaunayGrid.create_links_and_faces_from_voronoi_diagram(
+            Voronoi(pts)))
+
+    assert_equal(links, expected_links)
+    assert_equal(set(faces), set(expected_faces))
+    for link in faces:
+        assert_array_almost_equal(faces[link], expected_faces[link])
+
+
+def test_links_and_faces_of_random_points():
+    np.random.seed(1066)
+    _assert_same_as_voronoi_diagram(np.random.rand(500, 2))
+
+
+def test_links_and_faces_of_cocircular_points():
+    (x, y) = np.meshgrid(np.arange(6.), np.arange(5.))
+    _assert_same_as_voronoi_diagram(np.column_stack((x.flat, y.flat)))
+
+
+def test_cell_areas():
+    np.random.seed(1066)
+    vmg = VoronoiDelaunayGrid(np.random.rand(300), np.random.rand(300))
+    vor = Voronoi(vmg.pts)
+    for (cell, node) in enumerate(vmg.activecell_node):
+        corners = vor.vertices[vor.regions[vor.point_region[node]]]
+        assert_array_almost_equal(
+            vmg.active_cell_areas[cell],
+            simple_poly_area(corners[:, 0], corners[:, 1]))
+
+
+def test_hex_cell_areas():
+    hmg = HexModelGrid(5, 4, 2.)
+    assert_array_almost_equal(hmg.active_cell_areas,
+                              np.sqrt(3.) / 2. * 4.)
+
+
+def test_node_patches():
+    hmg = HexModelGrid(4, 3)
+    node_patches = hmg.node_patches()
+    for node in range(hmg.number_of_nodes):
+        patches = np.where(np.any(hmg.patch_nodes == node, axis=1))[0]
+        assert_equal(node_patches[node].compressed().tolist(),
+                     patches.tolist())
@@ -0,0 +1,108 @@
+import numpy as np
+from numpy.testing import (assert_array_almost_equal, assert_array_equal,
+                           assert_equal)
+
+from landlab import HexModelGrid
+from landlab.grid import VoronoiDelaunayGrid
+
+
+_GRIDS = [dict(orientation=orientation, shape=shape)
+          for orientation in ('horizontal', 'vertical')
+          for shape in ('hex', 'rect')]
+
+
+def _elements(grid):
+    """Links, faces, cells and patches keyed by the (sorted) nodes of each."""
+    nodes = np.sort(np.column_stack((grid.node_at_link_tail,
+                                     grid.node_at_link_head)), axis=1)
+    return dict(
+        links=set(map(tuple, nodes)),
+        active_links=set(map(tuple, nodes[grid.active_links])),
+        faces=dict(zip(map(tuple, nodes[grid.active_links_ids]),
+                       grid.face_width)),
+        cells=dict(zip(grid.activecell_node, grid.active_cell_areas)),
+        patches=set(map(tuple, np.sort(grid.patch_nodes, axis=1))))
+
+
+def _assert_same_as_triangulated(hmg):
+    vmg = VoronoiDelaunayGrid(hmg.node_x.copy(), hmg.node_y.copy())
+    (actual, expected) = (_elements(hmg), _elements(vmg))
+
+    assert_array_equal(hmg.node_status, vmg.node_status)
+    for name in ('links', 'active_links', 'patches'):
+        assert_equal(actual[name], expected[name])
+    for name in ('faces', 'cells'):
+        assert_equal(set(actual[name]), set(expected[name]))
+        for key in actual[name]:
+            assert_array_almost_equal(actual[name][key], expected[name][key])
+
+
+def test_same_as_triangulated():
+    for kwds in _GRIDS:
+        _assert_same_as_triangulated(HexModelGrid(6, 5, **kwds))
+        _assert_same_as_triangulated(HexModelGrid(5, 4, 2., **kwds))
+
+
+def test_rect_shape_fills_convex_hull():
+    hmg = HexModelGrid(5, 3, shape='rect')
+    assert_array_equal(hmg.node_status[[3, 8, 9]], [0, 0, 0])
+    assert_equal(hmg.number_of_patches, 4 * 4 + 3)
+
+    links = _elements(hmg)['links']
+    for link in [(0, 6), (6, 12), (5, 11)]:
+        assert link in links
+
+
+def test_numbering_does_not_depend_on_triangulation():
+    hmg = HexModelGrid(3, 2, 1., orientation='vertical', reorient_links=True)
+    assert_array_equal(hmg.node_at_link_tail,
+                       [1, 0, 0, 3, 0, 2, 1, 1, 4, 5, 2])
+    assert_array_equal(hmg.node_at_link_head,
+                       [4, 4, 1, 4, 3, 5, 5, 2, 5, 6, 6])
+
+
+def test_point_location():
+    np.random.seed(1945)
+    for kwds in _GRIDS:
+        hmg = HexModelGrid(4, 5, **kwds)
+        (x, y) = (np.random.uniform(-2., 6., 100),
+                  np.random.uniform(-2., 6., 100))
+        patches = hmg.find_patch_at_point((x, y))
+        on_grid = patches >= 0
+        z = 2. * hmg.node_x - hmg.node_y
+        assert_array_almost_equal(
+            hmg.interpolate_values_at_points(z, (x, y))[on_grid],
+            2. * x[on_grid] - y[on_grid])
+
+        corners = hmg.patch_nodes[patches[on_grid]]
+        (px, py) = (hmg.node_x[corners], hmg.node_y[corners])
+        assert np.all(x[on_grid] >= px.min(axis=1) - 1e-12)
+        assert np.all(x[on_grid] <= px.max(axis=1) + 1e-12)
+        assert np.all(y[on_grid] >= py.min(axis=1) - 1e-12)
+        assert np.all(y[on_grid] <= py.max(axis=1) + 1e-12)
+
+
+def test_point_location_with_slivers():
+    hmg = HexModelGrid(6, 7, 1.3)
+    assert hmg.number_of_patches < len(hmg._delaunay.simplices)
+
+    patch_at_simplex = hmg._patch_at_simplex
+    assert np.all(patch_at_simplex >= 0)
+    assert np.all(patch_at_simplex < hmg.number_of_patches)
+
+    np.random.seed(1871)
+    (x, y) = (np.random.uniform(-2., 12., 500),
+              np.random.uniform(-2., 10., 500))
+    patches = hmg.find_patch_at_point((x, y))
+    on_grid = patches >= 0
+    assert np.any(on_grid) and not np.all(on_grid)
+    assert_array_equal(hmg.is_point_on_grid(x, y), on_grid)
+
+    nodes = hmg.get_nodes_around_point(x, y)
+    assert_array_equal(np.sort(nodes[:, on_grid].T, axis=1),
+                       np.sort(hmg.patch_nodes[patches[on_grid]], axis=1))
+    assert_array_equal(hmg.find_nearest_node((x[on_grid], y[on_grid])),
+                       hmg.find_nearest_node((x[on_grid], y[on_grid]),
+                                             mode='clip'))
+
+    assert not hmg.is_point_on_grid(100., 100.)
@@ -0,0 +1,28 @@
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+from nose.tools import assert_equal, assert_is
+
+from landlab import HexModelGrid
+
+
+def test_hex_divergence_is_zero_at_boundaries():
+    hmg = HexModelGrid(5, 4)
+    q = np.random.rand(hmg.number_of_active_links)
+    div = hmg.flux_divergence_operator.dot(q)
+    assert_array_almost_equal(div[hmg.node_status != 0], 0.)
+    assert_array_almost_equal(div, hmg.calculate_flux_divergence_at_nodes(q))
+
+
+def test_hex_divergence_of_3d_stack():
+    hmg = HexModelGrid(5, 4)
+    q = np.random.rand(2, 3, hmg.number_of_active_links)
+    div = hmg.calculate_flux_divergence_at_nodes(q)
+    assert_equal(div.shape, (2, 3, hmg.number_of_nodes))
+    for i in range(2):
+        for j in range(3):
+            assert_array_almost_equal(
+                div[i, j], hmg.calculate_flux_divergence_at_nodes(q[i, j]))
+
+    out = np.empty((2, 3, hmg.number_of_nodes))
+    assert_is(hmg.calculate_flux_divergence_at_nodes(q, out=out), out)
+    assert_array_almost_equal(out, div)
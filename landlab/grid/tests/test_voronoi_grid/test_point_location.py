@@ -0,0 +1,94 @@
+import numpy as np
+from numpy.testing import (assert_array_equal, assert_array_almost_equal,
+                           assert_equal)
+from nose.tools import raises
+
+from landlab import HexModelGrid, BAD_INDEX_VALUE
+from landlab.grid import VoronoiDelaunayGrid
+
+
+def _random_grid():
+    np.random.seed(1945)
+    return VoronoiDelaunayGrid(np.random.rand(200), np.random.rand(200))
+
+
+def _random_points(n_points):
+    return (np.random.uniform(-.2, 1.2, n_points),
+            np.random.uniform(-.2, 1.2, n_points))
+
+
+def test_find_nearest_node():
+    vmg = _random_grid()
+    (x, y) = _random_points(500)
+    dists = np.hypot(vmg.node_x - x[:, np.newaxis],
+                     vmg.node_y - y[:, np.newaxis])
+    assert_array_equal(vmg.find_nearest_node((x, y), mode='clip'),
+                       np.argmin(dists, axis=1))
+
+
+def test_find_nearest_node_of_grid_of_points():
+    hmg = HexModelGrid(5, 5)
+    x = np.array([[0.9, 1.1], [2.1, 1.9]])
+    y = np.full((2, 2), .1)
+    assert_array_equal(hmg.find_nearest_node((x, y)), [[1, 1], [2, 2]])
+
+
+@raises(ValueError)
+def test_find_nearest_node_off_grid():
+    HexModelGrid(3, 3).find_nearest_node((np.array([1., 10.]), 0.))
+
+
+def test_point_in_patch():
+    vmg = _random_grid()
+    (x, y) = _random_points(500)
+    patches = vmg.find_patch_at_point((x, y))
+    is_on_grid = patches >= 0
+
+    assert_array_equal(vmg.is_point_on_grid(x, y), is_on_grid)
+
+    nodes = vmg.patch_nodes[patches[is_on_grid]]
+    (px, py) = (vmg.node_x[nodes], vmg.node_y[nodes])
+    for (a, b) in [(0, 1), (1, 2), (2, 0)]:
+        area = ((px[:, b] - px[:, a]) * (y[is_on_grid] - py[:, a]) -
+                (py[:, b] - py[:, a]) * (x[is_on_grid] - px[:, a]))
+        orientation = ((px[:, 1] - px[:, 0]) * (py[:, 2] - py[:, 0]) -
+                       (py[:, 1] - py[:, 0]) * (px[:, 2] - px[:, 0]))
+        assert np.all(area * orientation >= -1e-12)
+
+
+def test_nodes_around_point():
+    hmg = HexModelGrid(3, 3)
+    nodes = hmg.get_nodes_around_point([1., 10.], [.2, .2])
+    assert_equal(nodes.shape, (3, 2))
+    assert_array_equal(np.sort(nodes[:, 0]), [1, 4, 5])
+    assert_array_equal(nodes[:, 1], [BAD_INDEX_VALUE] * 3)
+
+
+def test_interpolate_linear_field():
+    vmg = _random_grid()
+    (x, y) = _random_points(500)
+    z = 3. * vmg.node_x - 2. * vmg.node_y + 1.
+
+    values = vmg.interpolate_values_at_points(z, (x, y))
+    is_on_grid = vmg.is_point_on_grid(x, y)
+    assert_array_almost_equal(values[is_on_grid],
+                              3. * x[is_on_grid] - 2. * y[is_on_grid] + 1.)
+    assert np.all(np.isnan(values[~ is_on_grid]))
+
+
+def test_interpolate_at_nodes():
+    hmg = HexModelGrid(4, 5)
+    z = np.random.rand(hmg.number_of_nodes)
+    assert_array_almost_equal(
+        hmg.interpolate_values_at_points(z, (hmg.node_x, hmg.node_y)), z)
+
+
+def test_interpolate_stack():
+    hmg = HexModelGrid(4, 5)
+    z = np.random.rand(2, hmg.number_of_nodes)
+    (x, y) = (np.array([1.2, 2.3]), np.array([.5, 1.]))
+    out = np.empty((2, 2))
+    values = hmg.interpolate_values_at_points(z, (x, y), out=out)
+    assert values is out
+    assert_array_almost_equal(
+        values[1], hmg.interpolate_values_at_points(z[1], (x, y)))
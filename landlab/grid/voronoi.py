@@ -4,8 +4,15 @@ import numpy
 import six
 from six.moves import range
 
-from landlab.grid.base import ModelGrid, CORE_NODE, BAD_INDEX_VALUE
-from scipy.spatial import Voronoi
+from landlab.grid.base import (ModelGrid, CORE_NODE, CLOSED_BOUNDARY,
+                               BAD_INDEX_VALUE, _find_index_dtype, _as_points)
+from scipy.spatial import Voronoi, Delaunay
+
+def _shape_of_points(coords):
+    """Shape of the arrays of x and y coordinates of points, once broadcast."""
+    return numpy.broadcast(numpy.asarray(coords[0]),
+                           numpy.asarray(coords[1])).shape
+
 
 def simple_poly_area(x, y):
     """Calculates and returns the area of a 2-D simple polygon.
@@ -85,6 +92,119 @@ def calculate_link_lengths(pts, link_from, link_to):
     return link_length
     
     
+#: Voronoi vertices farther than this from the origin are taken to be at
+#: infinity (they are the circumcenters of nearly flat triangles).
+_SUSPICIOUSLY_BIG = 40000000.0
+
+#: Two triangles whose circumcenters are closer than this fraction of the
+#: length of the edge between them have all of their corners on one circle.
+_COCIRCULAR_TOLERANCE = 1e-9
+
+
+def _find_edges_of_triangles(tri):
+    """Edges of a Delaunay triangulation, and the triangles on either side.
+
+    Each triangle contributes the edge opposite each of its vertices, unless
+    the triangle on the other side of the edge has a lower ID (and so
+    has already contributed it). Edges are ordered by triangle and then by
+    the vertex they are opposite.
+
+    Parameters
+    ----------
+    tri : scipy.spatial.Delaunay
+        Triangulation of the grid's nodes.
+
+    Returns
+    -------
+    tuple of ndarray
+        Nodes at the start and end of each edge, and the triangles to the
+        left and right of it. Edges on the convex hull have only one
+        triangle; the other is given as -1.
+    """
+    triangle = numpy.arange(tri.nsimplex).reshape((-1, 1))
+    is_new = (tri.neighbors == -1) | (tri.neighbors > triangle)
+
+    return (tri.simplices[:, (1, 2, 0)][is_new].astype(int),
+            tri.simplices[:, (2, 0, 1)][is_new].astype(int),
+            numpy.broadcast_to(triangle, is_new.shape)[is_new],
+            tri.neighbors[is_new])
+
+
+def _find_circumcenters(pts, triangles):
+    """Centers of the circles through the corners of each triangle.
+
+    These are the vertices of the Voronoi diagram of the points.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.grid.voronoi import _find_circumcenters
+    >>> pts = np.array([[0., 0.], [2., 0.], [0., 2.], [2., 2.]])
+    >>> _find_circumcenters(pts, np.array([[0, 1, 2], [1, 3, 2]]))
+    array([[ 1.,  1.],
+           [ 1.,  1.]])
+    """
+    (a, b, c) = (pts[triangles[:, 0]], pts[triangles[:, 1]],
+                 pts[triangles[:, 2]])
+    (b, c) = (b - a, c - a)
+    b_squared = numpy.sum(b * b, axis=1)
+    c_squared = numpy.sum(c * c, axis=1)
+    d = 2. * (b[:, 0] * c[:, 1] - b[:, 1] * c[:, 0])
+
+    centers = numpy.empty((len(triangles), 2))
+    centers[:, 0] = (c[:, 1] * b_squared - b[:, 1] * c_squared) / d
+    centers[:, 1] = (b[:, 0] * c_squared - c[:, 0] * b_squared) / d
+    return centers + a
+
+
+def calculate_cell_areas(link_from, link_to, link_length, face_width,
+                         num_nodes):
+    """Calculates and returns the areas of the Voronoi cells of nodes.
+
+    Each face is a side of the cells on either side of it. With the node of
+    a cell, it makes a triangle whose height is half the length of the link
+    that crosses the face. The area of a cell is the sum of the areas of
+    these triangles.
+
+    Parameters
+    ----------
+    link_from : ndarray
+        Node at the starting point ("from") of each link that crosses a face.
+    link_to : ndarray
+        Node at the ending point ("to") of each link that crosses a face.
+    link_length : ndarray
+        Length of each of these links.
+    face_width : ndarray
+        Width of the face crossed by each of these links.
+    num_nodes : int
+        Number of nodes.
+
+    Returns
+    -------
+    out : ndarray
+        Area of each node's cell. Only nodes whose cells are bounded by
+        faces on all sides (core nodes) have a true cell area.
+
+    Examples
+    --------
+    The cell of the center node of a 3 x 3 block of points is a 1 x 1
+    square.
+
+    >>> import numpy as np
+    >>> from landlab.grid.voronoi import calculate_cell_areas
+    >>> link_from = np.array([1, 3, 4, 4])
+    >>> link_to = np.array([4, 4, 5, 7])
+    >>> calculate_cell_areas(link_from, link_to, np.ones(4), np.ones(4),
+    ...                      9)[4]
+    1.0
+    """
+    triangle_area = .25 * link_length * face_width
+    return (numpy.bincount(link_from, weights=triangle_area,
+                           minlength=num_nodes) +
+            numpy.bincount(link_to, weights=triangle_area,
+                           minlength=num_nodes))
+    
+    
 class VoronoiDelaunayGrid(ModelGrid):
     """
     This inherited class implements an unstructured grid in which cells are
@@ -112,6 +232,8 @@ class VoronoiDelaunayGrid(ModelGrid):
             x-coordinate of points
         y : array_like
             y-coordinate of points
+        index_dtype : data-type, optional
+            Integer type of the grid's arrays of element IDs.
 
         Returns
         -------
@@ -127,18 +249,30 @@ class VoronoiDelaunayGrid(ModelGrid):
         >>> vmg.number_of_nodes
         25
         """
+        self._index_dtype = kwds.pop('index_dtype', self._index_dtype)
         if (x is not None) and (y is not None):
             self._initialize(x, y, reorient_links)
         super(VoronoiDelaunayGrid, self).__init__(**kwds)
         
-    def _initialize(self, x, y, reorient_links=False):
+    def _initialize(self, x, y, reorient_links=False, triangulation=None):
         """
         Creates an unstructured grid around the given (x,y) points.
+
+        The links, faces, cells and patches of the grid are found from
+        *triangulation*, which is made with ``scipy.spatial.Delaunay`` if not
+        given. Grids whose nodes are arranged in a known way (for instance,
+        a hexagonal lattice) can pass their own triangulation: any object
+        with the ``points``, ``simplices``, ``neighbors``, ``nsimplex``,
+        ``convex_hull`` and ``coplanar`` attributes of a
+        ``scipy.spatial.Delaunay``.
         """
         
         assert type(x)==numpy.ndarray, 'x must be a numpy array'
         assert type(y)==numpy.ndarray, 'y must be a numpy array'
         assert len(x)==len(y), 'x and y arrays must have the same size'
+
+        # A Delaunay triangulation has fewer than three links per node.
+        self._index_dtype = _find_index_dtype(self._index_dtype, 3 * len(x))
         
         # Make a copy of the points in a 2D array (useful for calls to geometry
         # routines, but takes extra memory space).
@@ -146,6 +280,18 @@ class VoronoiDelaunayGrid(ModelGrid):
         pts[:,0] = x
         pts[:,1] = y
         self.pts = pts
+
+        # TRIANGULATION: Everything else (perimeter nodes, links, faces, cells
+        # and patches) is found, with array operations, from this one Delaunay
+        # triangulation of the points. Its dual is the Voronoi diagram, whose
+        # vertices are the circumcenters of the triangles.
+        if triangulation is None:
+            tri = Delaunay(pts)
+            self._delaunay_triangulation = tri
+        else:
+            tri = triangulation
+        self._triangles = tri.simplices
+        self._reorient_links = reorient_links
         
         # NODES AND CELLS: Set up information pertaining to nodes and cells:
         #   - number of nodes
@@ -167,46 +313,50 @@ class VoronoiDelaunayGrid(ModelGrid):
         self._node_x = x
         self._node_y = y
         [self.node_status, self._core_nodes, self._boundary_nodes] = \
-                self.find_perimeter_nodes(pts)
+                self.find_perimeter_nodes(pts, tri)
         self._num_active_nodes = self.number_of_nodes
         self._num_core_nodes = len(self.core_nodes)
         self._num_cells = len(self.core_nodes)
         self._num_active_cells = self.number_of_cells
-        [self._cell_at_node, self._node_at_cell] = self.setup_node_cell_connectivity(
-            self.node_status, self.number_of_cells)
+        [self._cell_at_node, self._node_at_cell] = [
+            ids.astype(self.index_dtype, copy=False) for ids in
+            self.setup_node_cell_connectivity(self.node_status,
+                                              self.number_of_cells)]
         self.node_activecell = self._cell_at_node
         self.activecell_node = self._node_at_cell
 
-        # ACTIVE CELLS: Construct Voronoi diagram and calculate surface area of
-        # each active cell.
-        vor = Voronoi(pts)
-        self.vor = vor
-        self.active_cell_areas = numpy.zeros(self.number_of_active_cells)
-        for node in self.activecell_node:
-            xv = vor.vertices[vor.regions[vor.point_region[node]],0]
-            yv = vor.vertices[vor.regions[vor.point_region[node]],1]
-            self.active_cell_areas[self.node_activecell[node]] = simple_poly_area(xv, yv)
-        
-        # LINKS: Construct Delaunay triangulation and construct lists of link
-        # "from" and "to" nodes.
+        # LINKS AND FACES: Find the links of the triangulation, and the faces
+        # (Voronoi ridges) that cross them.
         (self._node_at_link_tail,
          self._node_at_link_head,
          self.active_links_ids,
-         self.face_width) = self.create_links_and_faces_from_voronoi_diagram(vor)
+         self.face_width) = self.create_links_and_faces_from_triangulation(tri)
+        self._node_at_link_tail = self._node_at_link_tail.astype(
+            self.index_dtype, copy=False)
+        self._node_at_link_head = self._node_at_link_head.astype(
+            self.index_dtype, copy=False)
+        self.active_links_ids = self.active_links_ids.astype(
+            self.index_dtype, copy=False)
         
         # Optionally re-orient links so that they all point within upper-right
         # semicircle
         if reorient_links:
             self.reorient_links_upper_right()
 
-        #[self.node_at_link_tail, self.node_at_link_head, self.active_links, self.face_width] \
-        #        = self.create_links_and_faces_from_voronoi_diagram(vor)
         self._num_links = len(self.node_at_link_tail)
         self._num_faces = self._num_links # temporary: to be done right!
                     
         # LINKS: Calculate link lengths
         self._link_length = calculate_link_lengths(pts, self.node_at_link_tail,
                                                   self.node_at_link_head)
+
+        # ACTIVE CELLS: Calculate the surface area of each active cell from
+        # the faces around it.
+        self.active_cell_areas = calculate_cell_areas(
+            self.node_at_link_tail[self.active_links_ids],
+            self.node_at_link_head[self.active_links_ids],
+            self._link_length[self.active_links_ids], self.face_width,
+            self.number_of_nodes)[self.activecell_node]
                                                        
         # LINKS: inlink and outlink matrices
         self._setup_inlink_and_outlink_matrices()
@@ -219,12 +369,24 @@ class VoronoiDelaunayGrid(ModelGrid):
         self._make_link_unit_vectors()
 
         # LINKS: ID of corresponding face, if any
-        self.link_face = (numpy.zeros(self.number_of_links, dtype=int) +
+        self.link_face = (numpy.zeros(self.number_of_links, dtype=self.index_dtype) +
                           BAD_INDEX_VALUE)  # make the list
-        face_id = 0
-        for link in self.active_links:
-            self.link_face[link] = face_id
-            face_id += 1
+        self.link_face[self.active_links] = numpy.arange(
+            len(self.active_links), dtype=self.index_dtype)
+
+    @property
+    def vor(self):
+        """Voronoi diagram of the grid's nodes.
+
+        The grid itself is built from its Delaunay triangulation; this
+        ``scipy.spatial.Voronoi`` object (which is used for plotting) is
+        made the first time it is needed.
+        """
+        try:
+            return self._voronoi_diagram
+        except AttributeError:
+            self._voronoi_diagram = Voronoi(self.pts)
+            return self._voronoi_diagram
             
     @property
     def number_of_patches(self):
@@ -234,7 +396,7 @@ class VoronoiDelaunayGrid(ModelGrid):
         try:
             return self._number_of_patches
         except AttributeError:
-            self.create_patches_from_delaunay_diagram(self.pts, self.vor)
+            self.create_patches_from_delaunay_diagram(self.pts)
             return self._number_of_patches
             
     @property
@@ -245,7 +407,7 @@ class VoronoiDelaunayGrid(ModelGrid):
         try:
             return self._patch_nodes
         except AttributeError:
-            self.create_patches_from_delaunay_diagram(self.pts, self.vor)
+            self.create_patches_from_delaunay_diagram(self.pts)
             return self._patch_nodes
 
     def node_patches(self, nodata=-1):
@@ -265,52 +427,345 @@ class VoronoiDelaunayGrid(ModelGrid):
             try:
                 return self._node_patches
             except AttributeError:
-                self.create_patches_from_delaunay_diagram(self.pts, self.vor, nodata)        
+                self.create_patches_from_delaunay_diagram(self.pts, nodata=nodata)        
                 return self._node_patches
         else:
             try:
                 self.set_bad_value
             except:
-                self.create_patches_from_delaunay_diagram(self.pts, self.vor, nodata)  
+                self.create_patches_from_delaunay_diagram(self.pts, nodata=nodata)  
                 self.set_bad_value=True      
                 return self._node_patches
             else:
                 return self._node_patches
             
 
-    def find_perimeter_nodes(self, pts):
+    @property
+    def _delaunay(self):
+        """Delaunay triangulation of the grid's nodes.
+
+        The triangles of the triangulation are the grid's patches (though
+        not necessarily in the same order, see :attr:`_patch_at_simplex`). It
+        is made the first time it is used.
+        """
+        try:
+            return self._delaunay_triangulation
+        except AttributeError:
+            self._delaunay_triangulation = Delaunay(self.pts)
+            return self._delaunay_triangulation
+
+    @property
+    def _patch_at_simplex(self):
+        """Patch that is each triangle of the Delaunay triangulation.
+
+        The patches of a grid that was built from its own triangulation
+        (rather than from ``scipy.spatial.Delaunay``) are mostly the same
+        triangles in a different order. The Delaunay triangulation may also
+        have thin slivers along the convex hull that aren't patches; these
+        are given a patch that they share an edge with (or -1, if they
+        share an edge only with other slivers).
+        """
+        try:
+            return self._patch_at_simplex_index
+        except AttributeError:
+            pass
+
+        tri = self._delaunay
+        if tri.simplices is self._triangles:
+            patch_at_simplex = None
+        else:
+            patch_of_nodes = dict(
+                (tuple(nodes), patch) for (patch, nodes) in
+                enumerate(numpy.sort(self._triangles, axis=1).tolist()))
+            patch_at_simplex = numpy.array(
+                [patch_of_nodes.get(tuple(nodes), -1) for nodes in
+                 numpy.sort(tri.simplices, axis=1).tolist()], dtype=int)
+
+            is_sliver = patch_at_simplex < 0
+            while numpy.any(is_sliver):
+                neighbors = tri.neighbors[is_sliver]
+                neighbor_patches = numpy.where(
+                    neighbors < 0, -1, patch_at_simplex[neighbors])
+                found = neighbor_patches.max(axis=1)
+                if numpy.all(found < 0):
+                    break
+                patch_at_simplex[is_sliver] = found
+                is_sliver = patch_at_simplex < 0
+
+        self._patch_at_simplex_index = patch_at_simplex
+        return patch_at_simplex
+
+    def _find_patches(self, points):
+        """Patches that contain each of (number of points, 2) *points*.
+
+        Points off the grid are given -1.
+        """
+        simplices = self._find_simplices(points)
+        if self._patch_at_simplex is None:
+            return simplices
+        else:
+            return numpy.where(simplices < 0, -1,
+                               self._patch_at_simplex[simplices])
+
+    def _find_simplices(self, points):
+        """Triangles of the Delaunay triangulation that contain *points*.
+
+        Points off the grid are given -1. The triangulation is walked from
+        one point to the next, so the points are visited in bands, about
+        one node spacing high, from left to right along each band. This keeps
+        each walk short, which, for many scattered points, is much quicker
+        than visiting them in the given order.
+        """
+        spacing = numpy.sqrt(numpy.ptp(self.node_x) * numpy.ptp(self.node_y) /
+                             self.number_of_nodes)
+        order = numpy.lexsort((points[:, 0],
+                               numpy.floor(points[:, 1] / spacing)))
+
+        patches = numpy.empty(len(points), dtype=int)
+        patches[order] = self._delaunay.find_simplex(points[order])
+        return patches
+
+    def find_patch_at_point(self, coords):
+        """Patch that contains a point.
+
+        Find the IDs of the patches (the triangles of the grid's Delaunay
+        triangulation) that contain points, by walking through the
+        triangulation.
+
+        Parameters
+        ----------
+        coords : tuple
+            Coordinates of point as (x, y). *x* and *y* can be scalars or
+            arrays.
+
+        Returns
+        -------
+        int or ndarray
+            IDs of the patches that contain the points, or -1 for points
+            that are off the grid.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import HexModelGrid
+        >>> hmg = HexModelGrid(3, 3)
+        >>> patch = hmg.find_patch_at_point((1., 0.2))
+        >>> np.sort(hmg.patch_nodes[patch])
+        array([1, 4, 5])
+        >>> hmg.find_patch_at_point((np.array([1., 10.]), np.array([0.2, 0.])))[1]
+        -1
+        """
+        (points, is_batch) = _as_points(coords)
+        patches = self._find_patches(points).astype(self.index_dtype)
+        if is_batch:
+            return patches.reshape(_shape_of_points(coords))
+        else:
+            return patches[0]
+
+    def is_point_on_grid(self, xcoord, ycoord):
+        """Check if a point is on a grid.
+
+        A point is on the grid if it lies within the convex hull of the
+        grid's nodes, which is covered by its patches.
+
+        Parameters
+        ----------
+        xcoord : float, array-like
+            x-coordinate of point
+        ycoord : float, array-like
+            y-coordinate of point
+
+        Returns
+        -------
+        boolean or ndarray of boolean
+            ``True`` for points that are on the grid.
+
+        Examples
+        --------
+        >>> from landlab import HexModelGrid
+        >>> hmg = HexModelGrid(3, 3)
+        >>> hmg.is_point_on_grid(1., 0.2)
+        True
+        >>> hmg.is_point_on_grid([1., 1.], [0.2, -0.2])
+        array([ True, False], dtype=bool)
+        """
+        return self.find_patch_at_point((xcoord, ycoord)) >= 0
+
+    def find_nearest_node(self, coords, mode='raise'):
+        """Node nearest a point.
+
+        Find the IDs of the nodes nearest the given x, y coordinates, using
+        the grid's spatial index. As the cell of a node is its Voronoi
+        polygon, this is also the node of the cell that contains the point.
+
+        Parameters
+        ----------
+        coords : tuple
+            Coordinates of point as (x, y). *x* and *y* can be scalars or
+            arrays.
+        mode : {'raise', 'clip'}, optional
+            What to do if a point is off the grid: raise a ``ValueError``,
+            or return the nearest node anyway.
+
+        Returns
+        -------
+        int or ndarray
+            IDs of the nearest nodes.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import HexModelGrid
+        >>> hmg = HexModelGrid(3, 3)
+        >>> hmg.find_nearest_node((0.9, 0.2))
+        1
+        >>> hmg.find_nearest_node((np.array([0.9, 1.4]), np.array([0.2, 0.8])))
+        array([1, 5])
+        >>> hmg.find_nearest_node((10., 0.))
+        Traceback (most recent call last):
+            ...
+        ValueError: point is off the grid
+        >>> hmg.find_nearest_node((10., 0.), mode='clip')
+        6
+        """
+        if mode not in ('raise', 'clip'):
+            raise ValueError('mode must be one of raise or clip')
+        if mode == 'raise' and not numpy.all(self.is_point_on_grid(*coords)):
+            raise ValueError('point is off the grid')
+
+        (points, is_batch) = _as_points(coords)
+        nodes = self._find_k_nearest_nodes(points, 1)[:, 0]
+        if is_batch:
+            return nodes.reshape(_shape_of_points(coords))
+        else:
+            return nodes[0]
+
+    def get_nodes_around_point(self, xcoord, ycoord):
+        """Nodes surrounding a point.
+
+        Return IDs of the three nodes of the patch that contains a point
+        with coordinates *xcoord*, *ycoord*. Nodes of points that are off the
+        grid are given as ``BAD_INDEX_VALUE``.
+
+        Parameters
+        ----------
+        xcoord : float, array-like
+            x-coordinate of point
+        ycoord : float, array-like
+            y-coordinate of point
+
+        Returns
+        -------
+        (3, N) ndarray
+            IDs of nodes around the point.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import HexModelGrid
+        >>> hmg = HexModelGrid(3, 3)
+        >>> np.sort(hmg.get_nodes_around_point(1., 0.2))
+        array([1, 4, 5])
+        >>> hmg.get_nodes_around_point([1., 10.], 0.2)[:, 1]
+        array([2147483647, 2147483647, 2147483647])
+        """
+        patches = numpy.atleast_1d(self.find_patch_at_point((xcoord, ycoord)))
+        nodes = self.patch_nodes[patches].T
+        nodes[:, patches < 0] = BAD_INDEX_VALUE
+        if numpy.ndim(patches) == 1 and numpy.ndim(xcoord) == 0 and (
+                numpy.ndim(ycoord) == 0):
+            return nodes[:, 0]
+        else:
+            return nodes
+
+    def interpolate_values_at_points(self, node_values, coords, out=None):
+        """Interpolate node values at points.
+
+        Values are linearly (barycentric) interpolated from the nodes of the
+        patches that contain the points. Points that are off the grid are
+        given NaN.
+
+        Parameters
+        ----------
+        node_values : ndarray
+            Values at nodes, or a stack of arrays of them (the last dimension
+            being along nodes).
+        coords : tuple
+            Coordinates of points as (x, y), where *x* and *y* are scalars or
+            1D arrays.
+        out : ndarray, optional
+            Alternative output array in which to place the result.
+
+        Returns
+        -------
+        ndarray
+            Values at the points, the last dimension being along points.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import HexModelGrid
+        >>> hmg = HexModelGrid(3, 3)
+        >>> z = 2. * hmg.node_x + hmg.node_y
+        >>> hmg.interpolate_values_at_points(
+        ...     z, (np.array([1., 1.5, 10.]), np.array([0.2, 0.5, 0.])))
+        array([ 2.2,  3.5,  nan])
+
+        Interpolate several fields at once.
+
+        >>> hmg.interpolate_values_at_points(np.vstack((z, - z)), (1., 0.2))
+        array([[ 2.2],
+               [-2.2]])
+        """
+        values = numpy.asarray(node_values)
+        (points, _) = _as_points(coords)
+        tri = self._delaunay
+
+        simplices = self._find_simplices(points)
+        is_off_grid = simplices < 0
+        simplices[is_off_grid] = 0
+
+        transform = tri.transform[simplices]
+        weights = numpy.empty((len(points), 3))
+        weights[:, :2] = numpy.einsum('ijk,ik->ij', transform[:, :2],
+                                      points - transform[:, 2])
+        weights[:, 2] = 1. - weights[:, 0] - weights[:, 1]
+
+        if out is None:
+            out = numpy.empty(values.shape[:-1] + (len(points), ))
+        numpy.sum(values[..., tri.simplices[simplices]] * weights, axis=-1,
+                  out=out)
+        out[..., is_off_grid] = numpy.nan
+
+        return out
+
+    def find_perimeter_nodes(self, pts, tri=None):
         """
         Uses a convex hull to locate the perimeter nodes of the Voronoi grid,
         then sets them as fixed value boundary nodes.
         It then sets/updates the various relevant node lists held by the grid, 
         and returns *node_status*, *core_nodes*, *boundary_nodes*.
+
+        The convex hull is that of the triangulation *tri* of *pts*, if
+        given.
         """
     
-        # Calculate the convex hull for the set of points
-        from scipy.spatial import ConvexHull
-        hull = ConvexHull(pts, qhull_options='Qc') # see below why we use 'Qt'
-        
-        # The ConvexHull object lists the edges that form the hull. We need to
-        # get from this list of edges the unique set of nodes. To do this, we
-        # first flatten the list of vertices that make up all the hull edges 
-        # ("simplices"), so it becomes a 1D array. With that, we can use the set()
-        # function to turn the array into a set, which removes duplicate vertices.
-        # Then we turn it back into an array, which now contains the set of IDs for
-        # the nodes that make up the convex hull.
-        #   The next thing to worry about is the fact that the mesh perimeter 
-        # might contain nodes that are co-planar (that is, co-linear in our 2D 
-        # world). For example, if you make a set of staggered points for a
-        # hexagonal lattice using make_hex_points(), there will be some 
-        # co-linear points along the perimeter. The ones of these that don't 
-        # form convex corners won't be included in convex_hull_nodes, but they
-        # are nonetheless part of the perimeter and need to be included in
-        # the list of boundary_nodes. To deal with this, we pass the 'Qt'
-        # option to ConvexHull, which makes it generate a list of coplanar
-        # points. We include these in our set of boundary nodes.
-        convex_hull_nodes = numpy.array(list(set(hull.simplices.flatten())))
-        coplanar_nodes = hull.coplanar[:,0]
-        boundary_nodes = numpy.concatenate(
-            (convex_hull_nodes, coplanar_nodes)).astype(numpy.int, copy=False)
+        # The edges of the Delaunay triangulation that have a triangle on
+        # only one side form the convex hull of the points. Every point is a
+        # vertex of the triangulation, so those that lie along the perimeter
+        # but don't form convex corners (for example, the co-linear points
+        # along the edges of a hexagonal lattice made by make_hex_points())
+        # are also the ends of these edges. Points that qhull could not add to
+        # the triangulation ("coplanar" points) are also put on the boundary.
+        if tri is not None:
+            pass
+        elif pts is self.pts:
+            tri = self._delaunay
+        else:
+            tri = Delaunay(pts)
+        boundary_nodes = numpy.union1d(
+            tri.convex_hull.flat, tri.coplanar[:, 0]).astype(self.index_dtype,
+                                                             copy=False)
     
         # Now we'll create the "node_status" array, which contains the code
         # indicating whether the node is interior and active (=0) or a
@@ -321,18 +776,18 @@ class VoronoiDelaunayGrid(ModelGrid):
         node_status[boundary_nodes] = 1
         
         # It's also useful to have a list of interior nodes
-        core_nodes = numpy.where(node_status==0)[0].astype(numpy.int, copy=False)
+        core_nodes = numpy.where(node_status==0)[0].astype(self.index_dtype, copy=False)
         
         #save the arrays and update the properties
         self.node_status = node_status
         self._num_active_nodes = node_status.size
         self._num_core_nodes = len(core_nodes)
         self._num_core_cells = len(core_nodes)
-        self._core_cells = numpy.arange(len(core_nodes), dtype=numpy.int)
-        self.node_corecell = numpy.empty(node_status.size, dtype=numpy.int)
+        self._core_cells = numpy.arange(len(core_nodes), dtype=self.index_dtype)
+        self.node_corecell = numpy.empty(node_status.size, dtype=self.index_dtype)
         self.node_corecell.fill(BAD_INDEX_VALUE)
         self.node_corecell[core_nodes] = self._core_cells
-        self.active_cells = numpy.arange(node_status.size, dtype=numpy.int)
+        self.active_cells = numpy.arange(node_status.size, dtype=self.index_dtype)
         self._node_at_cell = core_nodes
         self.activecell_node = core_nodes
         self.corecell_node = core_nodes
@@ -374,14 +829,9 @@ class VoronoiDelaunayGrid(ModelGrid):
         assert ncells==numpy.count_nonzero(node_status==CORE_NODE), \
                'ncells must equal number of CORE_NODE values in node_status'
 
-        cell = 0
         node_cell = numpy.ones(len(node_status), dtype=int)*BAD_INDEX_VALUE
-        cell_node = numpy.zeros(ncells, dtype=int)
-        for node in range(len(node_cell)):
-            if node_status[node] == CORE_NODE:
-                node_cell[node] = cell
-                cell_node[cell] = node
-                cell += 1
+        cell_node = numpy.where(node_status == CORE_NODE)[0]
+        node_cell[cell_node] = numpy.arange(ncells)
                 
         return node_cell, cell_node
         
@@ -408,45 +858,8 @@ class VoronoiDelaunayGrid(ModelGrid):
         [5 3 4 6 4 3 0 4 1 1 2 6] [3 4 5 5 6 0 4 1 0 2 4 2] 12
         """
     
-        # Calculate how many links there will be and create the arrays.
-        #
-        # The number of links equals 3 times the number of triangles minus
-        # half the number of shared links. Finding out the number of shared links
-        # is easy: for every shared link, there is an entry in the tri.neighbors
-        # array that is > -1 (indicating that the triangle has a neighbor opposite
-        # a given vertex; in other words, two triangles are sharing an edge).
-        #
-        num_shared_links = numpy.count_nonzero(tri.neighbors>-1)
-        num_links = 3 * tri.nsimplex - num_shared_links // 2
-        link_fromnode = numpy.zeros(num_links, dtype=int)
-        link_tonode = numpy.zeros(num_links, dtype=int)
-        
-        # Sweep through the list of triangles, assigning "from" and "to" nodes to
-        # the list of links.
-        #
-        # The basic algorithm works as follows. For each triangle, we will add its
-        # 3 edges as links. However, we have to make sure that each shared edge
-        # is added only once. To do this, we keep track of whether or not each
-        # triangle has been processed yet using a boolean array called "tridone".
-        # When we look at a given triangle, we check each vertex in turn. If there
-        # is no neighboring triangle opposite that vertex, then we need to add the
-        # corresponding edge. If there is a neighboring triangle but we haven't
-        # processed it yet, we also need to add the edge. If neither condition is
-        # true, then this edge has already been added, so we skip it.
-        link_id = 0
-        tridone = numpy.zeros(tri.nsimplex, dtype=bool)    
-        for t in range(tri.nsimplex):  # loop over triangles
-            for i in range(0, 3):       # loop over vertices & neighbors
-                if tri.neighbors[t,i] == -1 or not tridone[tri.neighbors[t,i]]:
-                    link_fromnode[link_id] = tri.simplices[t,numpy.mod(i+1,3)]
-                    link_tonode[link_id] = tri.simplices[t,numpy.mod(i+2,3)]
-                    link_id += 1
-            tridone[t] = True
-        
-        #save the results
-        #self.node_at_link_tail = link_fromnode
-        #self.node_at_link_head = link_tonode
-        #self._num_links = num_links
+        (link_fromnode, link_tonode, _, _) = _find_edges_of_triangles(tri)
+        num_links = len(link_fromnode)
     
         # Return the results
         return link_fromnode, link_tonode, num_links
@@ -454,9 +867,8 @@ class VoronoiDelaunayGrid(ModelGrid):
     @staticmethod
     def is_valid_voronoi_ridge(vor, n):
         
-        SUSPICIOUSLY_BIG = 40000000.0
         return vor.ridge_vertices[n][0]!=-1 and vor.ridge_vertices[n][1]!=-1 \
-                and numpy.amax(numpy.abs(vor.vertices[vor.ridge_vertices[n]]))<SUSPICIOUSLY_BIG
+                and numpy.amax(numpy.abs(vor.vertices[vor.ridge_vertices[n]]))<_SUSPICIOUSLY_BIG
 
     @staticmethod
     def create_links_and_faces_from_voronoi_diagram(vor):
@@ -501,55 +913,30 @@ class VoronoiDelaunayGrid(ModelGrid):
         # Each Voronoi "ridge" corresponds to a link. The Voronoi object has an
         # attribute ridge_points that contains the IDs of the nodes on either
         # side (including ridges that have one of their endpoints undefined).
-        # So, we set the number of links equal to the number of ridges.
-        num_links = len(vor.ridge_points)
-        
-        # Create the arrays for link from and to nodes
-        link_fromnode = -numpy.ones(num_links, dtype=int)
-        link_tonode = -numpy.ones(num_links, dtype=int)
-        
+        # So, we have one link for each ridge, whose "from" and "to" nodes are
+        # the associated "points".
+        link_fromnode = vor.ridge_points[:, 0].astype(int)
+        link_tonode = vor.ridge_points[:, 1].astype(int)
+
         # Ridges along the perimeter of the grid will have one of their 
         # endpoints undefined. The endpoints of each ridge are contained in
         # vor.ridge_vertices, and an undefined vertex is flagged with -1.
-        # Ridges with both vertices defined correspond to faces and active 
-        # links, while ridges with an undefined vertex correspond to inactive
-        # links. So, to find the number of active links, we subtract from the
-        # total number of links the number of occurrences of an undefined
-        # vertex.
-        num_active_links = num_links \
-                    - numpy.count_nonzero(numpy.array(vor.ridge_vertices)==-1)
-        
-        # Create arrays for active links and width of faces (which are Voronoi
-        # ridges).
-        active_links = -numpy.ones(num_active_links, dtype=int)
-        face_width = -numpy.ones(num_active_links)
-    
-        # Loop through the list of ridges. For each ridge, there is a link, and
-        # its "from" and "to" nodes are the associated "points". In addition, if
-        # the ridge endpoints are defined, we have a face and an active link,
-        # so we add them to our arrays as well.
-        j = 0
-        for i in range(num_links):
-            link_fromnode[i] = vor.ridge_points[i,0]
-            link_tonode[i] = vor.ridge_points[i,1]
-            face_corner1 = vor.ridge_vertices[i][0]
-            face_corner2 = vor.ridge_vertices[i][1]
-            if VoronoiDelaunayGrid.is_valid_voronoi_ridge(vor, i):  # means it's a valid face
-                dx = vor.vertices[face_corner2,0]-vor.vertices[face_corner1,0]
-                dy = vor.vertices[face_corner2,1]-vor.vertices[face_corner1,1]
-                face_width[j] = numpy.sqrt(dx*dx+dy*dy)
-                if abs(face_width[j])>=40000.0:
-                    six.print_('link ' + i + ' from ' + link_fromnode[i] +
-                               ' to ' + link_tonode[i] + ' has face width ' +
-                               face_width[j])
-                    six.print_(vor.ridge_vertices[i])
-                    six.print_(vor.vertices[vor.ridge_vertices[i]])
-
-                    from scipy.spatial import voronoi_plot_2d
-                    voronoi_plot_2d(vor)
-                assert face_width[j] < 40000., 'face width must be less than earth circumference!'
-                active_links[j] = i
-                j += 1
+        # Ridges with both (reasonably placed) vertices defined correspond to
+        # faces and active links, while other ridges correspond to inactive
+        # links.
+        ridge_vertices = numpy.array(vor.ridge_vertices).reshape((-1, 2))
+        is_face = numpy.all(ridge_vertices != -1, axis=1)
+        is_face[is_face] = numpy.all(
+            numpy.abs(vor.vertices[ridge_vertices[is_face]]) <
+            _SUSPICIOUSLY_BIG, axis=(1, 2))
+        active_links = numpy.where(is_face)[0]
+
+        # The width of a face is the length of its ridge.
+        corners = vor.vertices[ridge_vertices[active_links]]
+        face_width = numpy.hypot(corners[:, 1, 0] - corners[:, 0, 0],
+                                 corners[:, 1, 1] - corners[:, 0, 1])
+        assert numpy.all(face_width < 40000.), \
+               'face width must be less than earth circumference!'
         
         #save the data
         #self.node_at_link_tail = link_fromnode
@@ -562,6 +949,88 @@ class VoronoiDelaunayGrid(ModelGrid):
         return link_fromnode, link_tonode, active_links, face_width
         
     
+    @staticmethod
+    def create_links_and_faces_from_triangulation(tri):
+        """
+        From a Delaunay triangulation created by scipy.spatial.Delaunay(),
+        builds and returns:
+        1. Arrays of link "from" and "to" nodes
+        2. Array of link IDs for each active link
+        3. Array containing with of each face
+
+        This gives the same links and faces as
+        :meth:`create_links_and_faces_from_voronoi_diagram`, but without
+        having to make the Voronoi diagram. The vertices of the Voronoi
+        diagram are the circumcenters of the triangles, and the face that
+        crosses an edge shared by two triangles joins their circumcenters.
+        Edges on the convex hull have a triangle on only one side, and so
+        are not crossed by a face.
+
+        Parameters
+        ----------
+        tri : scipy.spatial.Delaunay
+            Delaunay triangulation of the grid nodes.
+
+        Returns
+        -------
+        out : tuple of ndarrays
+            - link_fromnode = "from" node for each link (len=num_links)
+            - link_tonode   = "to" node for each link (len=num_links)
+            - active_links  = link ID for each active link (len=num_active_links)
+            - face_width    = width of each face (len=num_active_links
+
+        Notes
+        -----
+        Where four or more nodes lie on one circle, the triangulation
+        splits the polygon they form into triangles that have the same
+        circumcenter. The diagonals of these polygons are not crossed by a
+        face, and are not links.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from scipy.spatial import Delaunay
+        >>> from landlab.grid import VoronoiDelaunayGrid
+        >>> pts = np.array([[ 0., 0.],[  1., 0.],[  1.5, 0.87],[-0.5, 0.87],[ 0.5, 0.87],[  0., 1.73],[  1., 1.73]])
+        >>> [fr, to, al, fw] = VoronoiDelaunayGrid.create_links_and_faces_from_triangulation(Delaunay(pts))
+        >>> len(fr), len(al)
+        (12, 6)
+        >>> np.sort(fw)
+        array([ 0.575973  ,  0.575973  ,  0.57669199,  0.57669199,  0.57836419,
+                0.57836419])
+        """
+        (link_fromnode, link_tonode,
+         left_triangle, right_triangle) = _find_edges_of_triangles(tri)
+
+        # Faces join the circumcenters of the triangles on either side of
+        # interior edges.
+        centers = _find_circumcenters(tri.points, tri.simplices)
+        is_face = right_triangle != -1
+        left_corner = centers[left_triangle]
+        right_corner = centers[right_triangle]
+        face_width = numpy.hypot(right_corner[:, 0] - left_corner[:, 0],
+                                 right_corner[:, 1] - left_corner[:, 1])
+        is_face &= numpy.all(numpy.abs(left_corner) < _SUSPICIOUSLY_BIG,
+                             axis=1)
+        is_face &= numpy.all(numpy.abs(right_corner) < _SUSPICIOUSLY_BIG,
+                             axis=1)
+
+        # Drop the diagonals of polygons whose corners are on one circle.
+        link_length = calculate_link_lengths(tri.points, link_fromnode,
+                                             link_tonode)
+        is_link = ~ (is_face &
+                     (face_width <= _COCIRCULAR_TOLERANCE * link_length))
+        (link_fromnode, link_tonode, is_face, face_width) = (
+            link_fromnode[is_link], link_tonode[is_link], is_face[is_link],
+            face_width[is_link])
+
+        active_links = numpy.where(is_face)[0]
+        face_width = face_width[active_links]
+        assert numpy.all(face_width < 40000.), \
+               'face width must be less than earth circumference!'
+
+        return link_fromnode, link_tonode, active_links, face_width
+
     def reorient_links_upper_right(self):
         """
         Reorients links so that all point within the upper-right semi-circle.
@@ -581,9 +1050,9 @@ class VoronoiDelaunayGrid(ModelGrid):
         >>> from landlab.grid import HexModelGrid
         >>> hg = HexModelGrid(3, 2, 1., reorient_links=True)
         >>> hg.node_at_link_tail
-        array([3, 3, 2, 0, 3, 1, 4, 5, 2, 0, 0, 1])
+        array([1, 0, 0, 2, 0, 3, 1, 3, 2, 4, 3, 5])
         >>> hg.node_at_link_head
-        array([6, 5, 3, 3, 4, 3, 6, 6, 5, 2, 1, 4])
+        array([3, 3, 1, 3, 2, 4, 4, 5, 5, 6, 6, 6])
         """
         
         # Calculate the horizontal (dx) and vertical (dy) link offsets
@@ -615,16 +1084,15 @@ class VoronoiDelaunayGrid(ModelGrid):
             self._node_at_link_tail[flip_locs] = self.node_at_link_head[flip_locs]
             self._node_at_link_head[flip_locs] = fromnode_temp
             
-    def create_patches_from_delaunay_diagram(self, pts, vor, nodata=-1):
+    def create_patches_from_delaunay_diagram(self, pts, vor=None, nodata=-1):
         """
         Uses a delaunay diagram drawn from the provided points to
         generate an array of patches and patch-node-link connectivity.
         Returns ...
         DEJH, 10/3/14
         """
-        from scipy.spatial import Delaunay
-        tri = Delaunay(pts)
-        assert numpy.array_equal(tri.points, vor.points)
+        if vor is not None:
+            assert numpy.array_equal(pts, vor.points)
         
         if nodata==-1:
             pass
@@ -635,32 +1103,32 @@ class VoronoiDelaunayGrid(ModelGrid):
         else:
             raise ValueError('Do not recognise nodata value!')
         
-        self._patch_nodes = tri.simplices
-        self._number_of_patches = tri.simplices.shape[0]
-        max_dimension = 0
-        #need to build a squared off, masked array of the node_patches
-        #the max number of patches for a node in the grid is the max sides of
-        #the side-iest voronoi region.
-        for i in range(len(vor.regions)):
-            if len(vor.regions[i])>max_dimension:
-                max_dimension=len(vor.regions[i])
-        _node_patches = numpy.empty((self.number_of_nodes, max_dimension), dtype=int)
+        self._patch_nodes = self._triangles.astype(self.index_dtype,
+                                                   copy=False)
+        self._number_of_patches = self._triangles.shape[0]
+        #need to build a squared off, masked array of the node_patches, with
+        #a row for each node that lists its patches in id order. Sorting the
+        #patch corners by node (stably, so patch ids stay in order) gives
+        #these rows one after the other.
+        nodes = self._patch_nodes.flatten()
+        order = numpy.argsort(nodes, kind='mergesort')
+        patches_at_node = numpy.bincount(nodes, minlength=self.number_of_nodes)
+        max_dimension = patches_at_node.max()
+        first_patch = numpy.cumsum(patches_at_node) - patches_at_node
+        column = numpy.arange(len(nodes)) - numpy.repeat(first_patch,
+                                                         patches_at_node)
+        _node_patches = numpy.empty((self.number_of_nodes, max_dimension), dtype=self.index_dtype)
         _node_patches.fill(nodata)
-        for i in range(self.number_of_nodes):
-            if not self.is_boundary(i, boundary_flag=4): #don't include closed nodes
-                patches_with_node = numpy.argwhere(numpy.equal(self._patch_nodes,i))[:,0]
-                _node_patches[i,:patches_with_node.size] = patches_with_node[:]
+        _node_patches[nodes[order], column] = order // 3
+        _node_patches[self.node_status == CLOSED_BOUNDARY] = nodata #don't include closed nodes
         #mask it
         self._node_patches = numpy.ma.array(_node_patches, mask=numpy.equal(_node_patches, -1))
 
     def save(self, path, clobber=False):
         """Save a grid and fields.
 
-        This method uses cPickle to save a Voronoi grid as a cPickle file.
-        At the time of coding, this is the only convenient output format
-        for Voronoi grids, but support for netCDF is likely coming.
-        
-        All fields will be saved, along with the grid.
+        This method saves a Voronoi grid, along with all of its fields, in
+        the Landlab "native" format.
 
         The recommended suffix for the save file is '.grid'. This will
         be added to your save if you don't include it.
@@ -670,10 +1138,6 @@ class VoronoiDelaunayGrid(ModelGrid):
         :py:func:`~landlab.io.native_landlab.load_grid` can be used to
         load these files.
 
-        Caution: Pickling can be slow, and can produce very large files.
-        Caution 2: Future updates to Landlab could potentially render old
-        saves unloadable.
-
         Parameters
         ----------
         path : str
@@ -692,16 +1156,6 @@ class VoronoiDelaunayGrid(ModelGrid):
         >>> vmg.save('./mytestsave.grid')
         >>> os.remove('mytestsave.grid') #to remove traces of this test
         """
-        import os
-        from six.moves import cPickle
-
-        if os.path.exists(path) and not clobber:
-            raise ValueError('file exists')
-
-        (base, ext) = os.path.splitext(path)
-        if ext != '.grid':
-            ext = ext+'.grid'
-        path = base+ext
+        from landlab.io.native_landlab import save_grid
 
-        with open(path, 'wb') as fp:
-            cPickle.dump(self, fp)
+        save_grid(self, path, clobber=clobber)
@@ -4,7 +4,8 @@ Modules that read/write ModelGrids from various file formats.
 from .esri_ascii import (read_esri_ascii, read_asc_header, write_esri_ascii)
 from .esri_ascii import (MissingRequiredKeyError, KeyTypeError, KeyValueError,
                          DataSizeError, BadHeaderLineError)
+from .output_scheduler import OutputScheduler
 
 __all__ = ['read_esri_ascii', 'read_asc_header', 'write_esri_ascii',
            'MissingRequiredKeyError', 'KeyTypeError', 'DataSizeError',
-           'BadHeaderLineError', 'KeyValueError']
+           'BadHeaderLineError', 'KeyValueError', 'OutputScheduler']
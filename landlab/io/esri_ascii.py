@@ -26,6 +26,9 @@ _HEADER_VALUE_TESTS = {
     'nodata_value': (float, lambda x: True),
 }
 
+# Number of characters of data to read and parse at a time.
+_CHUNK_SIZE = 2 ** 22
+
 
 class Error(Exception):
     """
@@ -181,22 +184,116 @@ def read_asc_header(asc_file):
     return header
 
 
-def _read_asc_data(asc_file):
+def _split_at_last_space(text):
+    """Split *text* into whole values and a (possibly) partial last one."""
+    if len(text) == 0 or text[-1].isspace():
+        return text, ''
+    parts = text.rsplit(None, 1)
+    if len(parts) == 1:
+        return '', parts[0]
+    else:
+        return parts[0], parts[1]
+
+
+def _copy_to_rows(values, offset, rows):
+    """Copy *values* into *rows*, starting at the flat index *offset*.
+
+    *rows* may be a view (for instance, with its rows reversed) of some other
+    array, which is filled in place.
+    """
+    n_cols = rows.shape[1]
+    (row, col) = divmod(offset, n_cols)
+
+    n_copied = 0
+    if col > 0:
+        n_copied = min(n_cols - col, values.size)
+        rows[row, col:col + n_copied] = values[:n_copied]
+        row += 1
+
+    n_full_rows = (values.size - n_copied) // n_cols
+    if n_full_rows > 0:
+        rows[row:row + n_full_rows] = values[
+            n_copied:n_copied + n_full_rows * n_cols].reshape(
+                (n_full_rows, n_cols))
+        n_copied += n_full_rows * n_cols
+        row += n_full_rows
+
+    if n_copied < values.size:
+        rows[row, :values.size - n_copied] = values[n_copied:]
+
+
+def _read_asc_data(asc_file, shape, out=None, rows=None):
     """Read gridded data from an ESRI ASCII data file.
 
+    The data are read and parsed a chunk at a time, and put straight into
+    *out* in the grid's (bottom-up) row order.
+
     Parameters
     ----------
     asc_file : file-like
         File-like object of the data file pointing to the start of the data.
+    shape : tuple of int
+        Number of rows and columns of data in the file.
+    out : ndarray, optional
+        Flat array into which to put the data.
+    rows : tuple of int, optional
+        Range, (start, stop), of grid rows (counted from the bottom) to read.
+        If not given, read all of them.
+
+    Returns
+    -------
+    ndarray
+        The data, as a flat array with the bottom row first.
 
     .. note::
         First row of the data is at the top of the raster grid, the second
         row is the second from the top, and so on.
     """
-    return np.loadtxt(asc_file)
-
-
-def read_esri_ascii(asc_file, reshape=False, name=None):
+    (n_rows, n_cols) = shape
+    (start, stop) = rows or (0, n_rows)
+    if start < 0 or stop > n_rows or start >= stop:
+        raise ValueError('row range is out of bounds')
+
+    if out is None:
+        out = np.empty((stop - start) * n_cols, dtype=float)
+
+    # Values from first_value up to (but not including) last_value, in the
+    # order they appear in the file, fall within the requested rows.
+    first_value = (n_rows - stop) * n_cols
+    last_value = (n_rows - start) * n_cols
+    rows_in_file_order = out.reshape((stop - start, n_cols))[::-1]
+
+    n_values = 0
+    partial_value = ''
+    while True:
+        chunk = asc_file.read(_CHUNK_SIZE)
+        (text, partial_value) = _split_at_last_space(partial_value + chunk)
+        if len(chunk) == 0:
+            text += partial_value
+
+        if len(text.strip()) > 0:
+            values = np.fromstring(text, sep=' ')
+            (lower, upper) = (max(first_value - n_values, 0),
+                              min(last_value - n_values, values.size))
+            if lower < upper:
+                _copy_to_rows(values[lower:upper],
+                              n_values + lower - first_value,
+                              rows_in_file_order)
+            n_values += values.size
+
+        if len(chunk) == 0 or (rows is not None and n_values >= last_value):
+            break
+
+    if rows is None and n_values != n_rows * n_cols:
+        raise DataSizeError(n_rows * n_cols, n_values)
+    elif n_values < last_value:
+        raise DataSizeError(last_value, n_values)
+
+    return out
+
+
+def read_esri_ascii(asc_file, reshape=False, name=None, rows=None,
+                    close_nodata=False):
     """Read :py:class:`~landlab.RasterModelGrid` from an ESRI ASCII file.
 
     Read data from *asc_file*, an ESRI_ ASCII file, into a
@@ -209,6 +306,9 @@ def read_esri_ascii(asc_file, reshape=False, name=None):
     array of doubles with that has been reshaped to have the number of rows
     and columns given in the header.
 
+    The data are parsed a chunk at a time and stored directly, in the grid's
+    node order, so no more than one copy of the data is held in memory.
+
     .. _ESRI: http://resources.esri.com/help/9.3/arcgisengine/java/GP_ToolRef/spatial_analyst_tools/esri_ascii_raster_format.htm
 
     Parameters
@@ -219,39 +319,89 @@ def read_esri_ascii(asc_file, reshape=False, name=None):
         Reshape the returned array, otherwise return a flattened array.
     name : str, optional
         Add data to the grid as a named field.
+    rows : tuple of int, optional
+        Only read the grid rows from *rows[0]* up to (but not including)
+        *rows[1]*, counting from the bottom of the grid. The grid that is
+        returned contains just these rows.
+    close_nodata : boolean, optional
+        Set nodes whose value is the header's *NODATA_value* to be closed
+        boundaries.
 
     Returns
     -------
     (grid, data) : tuple
         A newly-created RasterModel grid and the associated node data.
+
+    Examples
+    --------
+    >>> from six import StringIO
+    >>> from landlab.io import read_esri_ascii
+    >>> asc_file = StringIO('''
+    ... nrows         5
+    ... ncols         3
+    ... xllcorner     1.
+    ... yllcorner     2.
+    ... cellsize      10.
+    ... NODATA_value  -9
+    ... 0. 1. 2.
+    ... 3. 4. 5.
+    ... 6. -9 8.
+    ... 9. 10. 11.
+    ... 12. 13. 14.
+    ... ''')
+    >>> (grid, data) = read_esri_ascii(asc_file, close_nodata=True)
+    >>> data.reshape((5, 3))
+    array([[ 12.,  13.,  14.],
+           [  9.,  10.,  11.],
+           [  6.,  -9.,   8.],
+           [  3.,   4.,   5.],
+           [  0.,   1.,   2.]])
+    >>> grid.node_status.reshape((5, 3))
+    array([[1, 1, 1],
+           [1, 0, 1],
+           [1, 4, 1],
+           [1, 0, 1],
+           [1, 1, 1]], dtype=int8)
+
+    Read just the middle three rows.
+
+    >>> _ = asc_file.seek(0)
+    >>> (grid, data) = read_esri_ascii(asc_file, rows=(1, 4), reshape=True)
+    >>> grid.number_of_node_rows
+    3
+    >>> data
+    array([[  9.,  10.,  11.],
+           [  6.,  -9.,   8.],
+           [  3.,   4.,   5.]])
     """
     from ..grid import RasterModelGrid
 
     if isinstance(asc_file, six.string_types):
         file_name = asc_file
         with open(file_name, 'r') as asc_file:
-            header = read_asc_header(asc_file)
-            data = _read_asc_data(asc_file)
-    else:
-        header = read_asc_header(asc_file)
-        data = _read_asc_data(asc_file)
+            return read_esri_ascii(asc_file, reshape=reshape, name=name,
+                                   rows=rows, close_nodata=close_nodata)
+
+    header = read_asc_header(asc_file)
 
     shape = (header['nrows'], header['ncols'])
     spacing = (header['cellsize'], header['cellsize'])
-    origin = (header['xllcorner'], header['yllcorner'])
-
-    if data.size != shape[0] * shape[1]:
-        raise DataSizeError(shape[0] * shape[1], data.size)
+    (start, stop) = rows or (0, shape[0])
 
-    data.shape = shape
-    data = np.flipud(data)
-    if not reshape:
-        data = data.flatten()
-
-    grid = RasterModelGrid(num_rows=shape[0], num_cols=shape[1],
+    grid = RasterModelGrid(num_rows=stop - start, num_cols=shape[1],
                            dx=spacing[0])
     if name:
-        grid.add_field('node', name, data)
+        data = grid.add_empty('node', name)
+    else:
+        data = np.empty(grid.number_of_nodes, dtype=float)
+
+    _read_asc_data(asc_file, shape, out=data, rows=rows)
+
+    if close_nodata and 'nodata_value' in header:
+        grid.set_nodata_nodes_to_closed(data, header['nodata_value'])
+
+    if reshape:
+        data = data.reshape((stop - start, shape[1]))
 
     return (grid, data)
 
@@ -260,7 +410,8 @@ def write_esri_ascii(path, fields, names=None, clobber=False):
     """Write landlab fields to ESRI ASCII.
 
     Write the data and grid information for *fields* to *path* in the ESRI
-    ASCII format.
+    ASCII format. Rows are written one at a time, top row first, straight
+    from the field's values (without making a flipped copy of them).
 
     Parameters
     ----------
@@ -328,7 +479,7 @@ def write_esri_ascii(path, fields, names=None, clobber=False):
         header_lines = ['%s %s' % (key, str(val))
                         for key, val in list(header.items())]
         data = fields.at_node[name].reshape(header['nrows'], header['ncols'])
-        np.savetxt(path, np.flipud(data), header=os.linesep.join(header_lines),
+        np.savetxt(path, data[::-1], header=os.linesep.join(header_lines),
                    comments='')
 
     return paths
@@ -11,10 +11,14 @@ except ImportError:
 
 from scipy.io import netcdf as nc
 
+from functools import partial
+
 import numpy as np
+import six
 
 from landlab import RasterModelGrid
 from landlab.io.netcdf.errors import NotRasterGridError
+from landlab.io.netcdf.read import _open_netcdf, _close_netcdf, _find_window
 
 
 _COORDINATE_NAMES = ['x_range', 'y_range', 'z_range', 'spacing', 'dimension' ]
@@ -45,42 +49,95 @@ def _read_netcdf_coordinate_units(root):
     return ['degrees_east', 'degrees_north']
 
 
-def _read_netcdf_structured_data(root):
+def _read_netcdf_structured_data(root, names=None, rows=None, cols=None):
     fields = dict()
-    for (name, var) in root.variables.items():
-        if name not in _COORDINATE_NAMES:
-            fields[name] = var[:] * var.scale_factor + var.add_offset
-            fields[name].shape = (fields[name].size, )
+    for name in _field_names(root, names):
+        fields[name] = _read_netcdf_node_values(root, name, rows=rows,
+                                                cols=cols)
     return fields
 
 
-def read_netcdf(nc_file, reshape=False, just_grid=False):
+def _field_names(root, names=None):
+    """Names of the variables, other than coordinates, to read as fields."""
+    if names is None:
+        return [name for name in root.variables
+                if name not in _COORDINATE_NAMES]
+    if isinstance(names, six.string_types):
+        names = [names]
+    for name in names:
+        if name not in root.variables:
+            raise ValueError('%s: variable not found' % name)
+    return list(names)
+
+
+def _read_netcdf_node_values(root, name, rows=None, cols=None):
+    """Scaled values of a variable at nodes within a window.
+
+    Values are stored by row, so only the rows of the window are read from
+    the file.
+    """
+    var = root.variables[name]
+    n_cols = _read_netcdf_grid_shape(root)[1]
+    (rows, cols) = (rows or slice(None), cols or slice(None))
+    (start, stop, _) = rows.indices(var.shape[0] // n_cols)
+
+    values = var[start * n_cols:stop * n_cols].reshape((-1, n_cols))[:, cols]
+    values = values * var.scale_factor + var.add_offset
+    return values.reshape((values.size, ))
+
+
+def _read_netcdf_field(nc_file, name, rows=None, cols=None):
+    """Read the values of one field of a GEBCO file."""
+    root = _open_netcdf(nc_file)
+    try:
+        return _read_netcdf_node_values(root, name, rows=rows, cols=cols)
+    finally:
+        _close_netcdf(root)
+
+
+def read_netcdf(nc_file, reshape=False, just_grid=False, names=None,
+                bbox=None, lazy=False):
     """
     Reads the NetCDF file *nc_file*, and writes it to the fields of a new
     RasterModelGrid, which it then returns.
     Check the names of the fields in the returned grid with
     grid.at_nodes.keys().
+
+    Use *names* to read only some of the variables, and *bbox* (as
+    ``(x_min, y_min, x_max, y_max)``) to make a grid of only the nodes
+    within a bounding box. If *lazy* is True, the values of each field are
+    read from the file when the field is first used, rather than when the
+    grid is made.
     """
+    root = _open_netcdf(nc_file)
     try:
-        root = nc.netcdf_file(nc_file, 'r', version=2)
-    except TypeError:
-        root = nc4.Dataset(nc_file, 'r', format='NETCDF4')
-
-    shape = _read_netcdf_grid_shape(root)
-    spacing = _read_netcdf_grid_spacing(root)
-
-    assert(len(shape) == 2)
-    assert(len(spacing) == 2)
-    if spacing[0] != spacing[1]:
-        raise NotRasterGridError()
-
-    grid = RasterModelGrid(num_rows=shape[0], num_cols=shape[1], dx=spacing[0])
-
-    if not just_grid:
-        fields = _read_netcdf_structured_data(root)
-        for (name, values) in fields.items():
-            grid.add_field('node', name, values)
-
-    root.close()
+        shape = _read_netcdf_grid_shape(root)
+        spacing = _read_netcdf_grid_spacing(root)
+
+        assert(len(shape) == 2)
+        assert(len(spacing) == 2)
+        if spacing[0] != spacing[1]:
+            raise NotRasterGridError()
+
+        (x, y) = _read_netcdf_coordinate_values(root)
+        (rows, cols) = _find_window(x[:shape[1]], y[:shape[0]], bbox)
+
+        grid = RasterModelGrid(num_rows=rows.stop - rows.start,
+                               num_cols=cols.stop - cols.start,
+                               dx=spacing[0])
+
+        if not just_grid:
+            if lazy:
+                for name in _field_names(root, names):
+                    grid.add_lazy_field(
+                        'node', name, partial(_read_netcdf_field, nc_file,
+                                              name, rows=rows, cols=cols))
+            else:
+                fields = _read_netcdf_structured_data(root, names=names,
+                                                      rows=rows, cols=cols)
+                for (name, values) in fields.items():
+                    grid.add_field('node', name, values)
+    finally:
+        _close_netcdf(root)
 
     return grid
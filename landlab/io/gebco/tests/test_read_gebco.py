@@ -0,0 +1,137 @@
+#! /usr/bin/env python
+"""
+Unit tests for landlab.io.gebco module.
+"""
+
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+from nose.tools import assert_equal, assert_true, raises
+from scipy.io import netcdf as nc
+
+from landlab.field.scalar_data_fields import _LazyValues
+from landlab.io.gebco.read import read_netcdf
+from landlab.testing.tools import cdtemp
+
+
+_X = np.arange(10., 16.)
+_Y = np.arange(20., 25.)
+
+
+def _elevation(x, y, offset=0.):
+    """Values of the synthetic elevation field at nodes with coordinates."""
+    return (np.add.outer(100. * y, x) + offset).flatten()
+
+
+def _write_gebco(path, offset=0.):
+    """Write a small GEBCO file of 5 rows and 6 columns of nodes.
+
+    Elevations are stored, scaled, from the coordinates of each node so
+    that values read from a window show where that window is.
+    """
+    root = nc.netcdf_file(path, 'w', version=2)
+    root.createDimension('side', 2)
+    root.createDimension('xysize', len(_X) * len(_Y))
+
+    for (name, values) in (('x_range', (_X[0], _X[-1])),
+                           ('y_range', (_Y[0], _Y[-1])),
+                           ('z_range', (0., 1.)),
+                           ('spacing', (1., 1.))):
+        root.createVariable(name, 'd', ('side', ))[:] = values
+    root.createVariable('dimension', 'i', ('side', ))[:] = (len(_Y), len(_X))
+
+    z = root.createVariable('z', 'd', ('xysize', ))
+    z[:] = 2. * _elevation(_X, _Y, offset=offset)
+    z.scale_factor = .5
+    z.add_offset = 0.
+
+    w = root.createVariable('w', 'd', ('xysize', ))
+    w[:] = np.arange(len(_X) * len(_Y))
+    w.scale_factor = 1.
+    w.add_offset = 1.
+
+    root.close()
+
+
+def test_read():
+    with cdtemp() as _:
+        _write_gebco('test.nc')
+        grid = read_netcdf('test.nc')
+
+    assert_equal(grid.shape, (5, 6))
+    assert_equal(grid.node_spacing, 1.)
+    assert_equal(sorted(grid.at_node.keys()), ['w', 'z'])
+    assert_array_almost_equal(grid.at_node['z'], _elevation(_X, _Y))
+    assert_array_equal(grid.at_node['w'], np.arange(30.) + 1.)
+
+
+def test_read_bbox():
+    with cdtemp() as _:
+        _write_gebco('test.nc')
+        grid = read_netcdf('test.nc', bbox=(10.5, 21., 14., 23.5))
+
+    assert_equal(grid.shape, (3, 4))
+    assert_array_almost_equal(grid.at_node['z'],
+                              _elevation(_X[1:5], _Y[1:4]))
+    assert_array_equal(grid.at_node['w'],
+                       [8., 9., 10., 11., 14., 15., 16., 17.,
+                        20., 21., 22., 23.])
+
+
+@raises(ValueError)
+def test_read_empty_bbox():
+    with cdtemp() as _:
+        _write_gebco('test.nc')
+        read_netcdf('test.nc', bbox=(20., 30., 25., 35.))
+
+
+def test_read_names():
+    with cdtemp() as _:
+        _write_gebco('test.nc')
+        grid = read_netcdf('test.nc', names='w')
+        assert_equal(list(grid.at_node.keys()), ['w'])
+
+        grid = read_netcdf('test.nc', names=['z'])
+        assert_equal(list(grid.at_node.keys()), ['z'])
+
+        grid = read_netcdf('test.nc', names=[])
+        assert_equal(list(grid.at_node.keys()), [])
+
+
+@raises(ValueError)
+def test_read_missing_name():
+    with cdtemp() as _:
+        _write_gebco('test.nc')
+        read_netcdf('test.nc', names='topographic__elevation')
+
+
+def test_read_lazy():
+    bbox = (11., 20., 15., 22.)
+    with cdtemp() as _:
+        _write_gebco('test.nc')
+        eager_grid = read_netcdf('test.nc', bbox=bbox)
+        lazy_grid = read_netcdf('test.nc', bbox=bbox, lazy=True)
+
+        assert_equal(lazy_grid.shape, eager_grid.shape)
+        assert_equal(sorted(lazy_grid.at_node.keys()), ['w', 'z'])
+        for name in ('w', 'z'):
+            assert_true(isinstance(dict.__getitem__(lazy_grid.at_node, name),
+                                   _LazyValues))
+
+        _write_gebco('test.nc', offset=1000.)
+        assert_array_almost_equal(lazy_grid.at_node['z'],
+                                  eager_grid.at_node['z'] + 1000.)
+        assert_array_equal(lazy_grid.at_node['w'], eager_grid.at_node['w'])
+
+
+def test_read_lazy_copy():
+    with cdtemp() as _:
+        _write_gebco('test.nc')
+        eager_grid = read_netcdf('test.nc')
+
+        copied = dict(read_netcdf('test.nc', lazy=True).at_node)
+        for name in ('w', 'z'):
+            assert_array_almost_equal(copied[name], eager_grid.at_node[name])
+
+        copied = read_netcdf('test.nc', lazy=True).at_node.copy()
+        for name in ('w', 'z'):
+            assert_array_almost_equal(copied[name], eager_grid.at_node[name])
@@ -1,29 +1,185 @@
 #! /usr/bin/env python
 """
-Read data from an ESRI ASCII file into a RasterModelGrid
+Save and load grids, and their fields, in the Landlab "native" format.
+
+A native file holds the type of a grid and the arguments needed to make it
+again, the boundary status of its nodes, and all of its fields. Rather
+than storing the grid object itself, the grid is made anew when it is
+loaded, so its connectivity is rebuilt (and, for a raster with implicit
+connectivity, not stored at all) rather than read from the file.
+
+The file is laid out as::
+
+    magic string     b'\\x93LANDLAB'
+    version          two bytes, major and minor
+    arrays           the raw data of each array, each starting on a
+                     multiple of 64 bytes
+    header           JSON description of the grid, and the name, units,
+                     data type, shape and position of each array
+    header position  8-byte little-endian integer
+
+The arrays can be loaded as memory-mapped views of the file, so the fields
+of a large grid can be used without reading them all into memory.
 """
 
 import os
-import types
-import re
+import json
+import struct
+import warnings
+
+import numpy as np
+from numpy.lib.format import dtype_to_descr, descr_to_dtype
 from six.moves import cPickle
+
 from landlab import ModelGrid
-import numpy as np
+
+
+_MAGIC = b'\x93LANDLAB'
+_VERSION = (1, 0)
+_ALIGNMENT = 64
+_TRAILER = struct.Struct('<Q')
+
+
+def _raster_args(grid):
+    return dict(shape=[grid.number_of_node_rows, grid.number_of_node_columns],
+                spacing=grid.dx,
+                implicit_connectivity=grid.implicit_connectivity)
+
+
+def _make_raster(args, arrays):
+    from landlab import RasterModelGrid
+    return RasterModelGrid(
+        tuple(args['shape']), args['spacing'],
+        implicit_connectivity=args['implicit_connectivity'],
+        index_dtype=args['index_dtype'])
+
+
+def _hex_args(grid):
+    return dict(base_num_rows=grid._base_num_rows,
+                base_num_cols=grid._base_num_cols, dx=grid._dx,
+                orientation=grid.orientation, shape=grid._hex_shape,
+                reorient_links=grid._reorient_links)
+
+
+def _make_hex(args, arrays):
+    from landlab import HexModelGrid
+    return HexModelGrid(args['base_num_rows'], args['base_num_cols'],
+                        args['dx'], orientation=args['orientation'],
+                        shape=args['shape'],
+                        reorient_links=args['reorient_links'],
+                        index_dtype=args['index_dtype'])
+
+
+def _radial_args(grid):
+    return dict(num_shells=grid._num_shells, dr=grid._dr)
+
+
+def _make_radial(args, arrays):
+    from landlab import RadialModelGrid
+    return RadialModelGrid(args['num_shells'], args['dr'],
+                           index_dtype=args['index_dtype'])
+
+
+def _voronoi_args(grid):
+    return dict(reorient_links=grid._reorient_links)
+
+
+def _voronoi_arrays(grid):
+    return [('node_x', grid.node_x), ('node_y', grid.node_y)]
+
+
+def _make_voronoi(args, arrays):
+    from landlab import VoronoiDelaunayGrid
+    return VoronoiDelaunayGrid(np.asarray(arrays['node_x']),
+                               np.asarray(arrays['node_y']),
+                               reorient_links=args['reorient_links'],
+                               index_dtype=args['index_dtype'])
+
+
+def _grid_types():
+    """Grid types that can be saved, with functions that give the
+    arguments and arrays needed to make a grid of each type, and that make
+    the grid from them.
+
+    Subclasses come before the classes they inherit from.
+    """
+    from landlab import (RasterModelGrid, HexModelGrid, RadialModelGrid,
+                         VoronoiDelaunayGrid)
+
+    no_arrays = lambda grid: []
+    return [
+        (RasterModelGrid, _raster_args, no_arrays, _make_raster),
+        (HexModelGrid, _hex_args, no_arrays, _make_hex),
+        (RadialModelGrid, _radial_args, no_arrays, _make_radial),
+        (VoronoiDelaunayGrid, _voronoi_args, _voronoi_arrays, _make_voronoi),
+    ]
+
+
+def _add_suffix(path):
+    """Add the '.grid' suffix to a path, if it doesn't have it."""
+    (base, ext) = os.path.splitext(path)
+    if ext != '.grid':
+        ext = ext+'.grid'
+    return base+ext
+
+
+def _pad(fp):
+    """Pad a file with zeros so that the next write is aligned."""
+    fp.write(b'\0' * (- fp.tell() % _ALIGNMENT))
+
+
+def _write_array(fp, array):
+    """Write the data of an array, and return its description."""
+    array = np.asanyarray(array)
+    description = dict(dtype=dtype_to_descr(array.dtype),
+                       shape=list(array.shape), offset=fp.tell())
+    fp.write(np.ascontiguousarray(array).data)
+    _pad(fp)
+    return description
+
+
+def _read_array(fp, path, description, mmap_mode=None):
+    """Read, or memory-map, an array described in a file's header."""
+    dtype = descr_to_dtype(description['dtype'])
+    shape = tuple(description['shape'])
+    count = int(np.prod(shape))
+
+    if mmap_mode is not None and count > 0:
+        return np.memmap(path, dtype=dtype, mode=mmap_mode,
+                         offset=description['offset'], shape=shape)
+    else:
+        fp.seek(description['offset'])
+        return np.fromfile(fp, dtype=dtype, count=count).reshape(shape)
+
+
+def _read_header(fp):
+    """Read the header of a native file, or return None if it isn't one."""
+    fp.seek(0)
+    if fp.read(len(_MAGIC)) != _MAGIC:
+        return None
+    version = tuple(bytearray(fp.read(2)))
+    if version[0] > _VERSION[0]:
+        raise ValueError(
+            'file has native format version %d.%d, but only versions up to '
+            '%d.x can be read' % (version + (_VERSION[0], )))
+
+    fp.seek(- _TRAILER.size, os.SEEK_END)
+    (offset, ) = _TRAILER.unpack(fp.read(_TRAILER.size))
+    fp.seek(offset)
+    return json.loads(fp.read()[:- _TRAILER.size].decode('utf-8'))
 
 
 def save_grid(grid, path, clobber=False):
     """Save a grid and fields to a Landlab "native" format.
 
-    This method uses cPickle to save a grid as a cPickle file.
-    All fields will be saved, along with the grid.
+    The type of the grid and the arguments used to make it are saved, along
+    with the status of its nodes and all of its fields. Node coordinates
+    are saved only for grids that aren't made from a set of arguments (a
+    :class:`~landlab.grid.voronoi.VoronoiDelaunayGrid`).
 
     The recommended suffix for the save file is '.grid'. This will
     be added to your save if you don't include it.
 
-    Caution: Pickling can be slow, and can produce very large files.
-    Caution 2: Future updates to Landlab could potentially render old
-    saves unloadable.
-
     Parameters
     ----------
     grid : object of subclass ModelGrid
@@ -42,36 +198,69 @@ def save_grid(grid, path, clobber=False):
     >>> save_grid(grid_out, 'testsavedgrid.grid', clobber=True)
     >>> os.remove('testsavedgrid.grid') #to remove traces of this test
     """
+    path = _add_suffix(path)
     if os.path.exists(path) and not clobber:
         raise ValueError('file exists')
-        
+
     #test it's a grid
     assert issubclass(type(grid), ModelGrid)
-        
-    (base, ext) = os.path.splitext(path)
-    if ext != '.grid':
-        ext = ext+'.grid'
-    path = base+ext
+
+    for (grid_type, get_args, get_arrays, _) in _grid_types():
+        if isinstance(grid, grid_type):
+            break
+    else:
+        raise ValueError('unable to save a grid of type %s' %
+                         type(grid).__name__)
+
+    args = get_args(grid)
+    args['index_dtype'] = np.dtype(grid.index_dtype).name
+    arrays = get_arrays(grid) + [('node_status', grid.node_status)]
 
     with open(path, 'wb') as fp:
-        cPickle.dump(grid, fp)
+        fp.write(_MAGIC + bytes(bytearray(_VERSION)))
+        _pad(fp)
+
+        header = dict(grid_type=grid_type.__name__, args=args, arrays={},
+                      fields={})
+        for (name, array) in arrays:
+            header['arrays'][name] = _write_array(fp, array)
+        for group in sorted(grid.groups):
+            header['fields'][group] = {}
+            for name in sorted(grid[group].keys()):
+                field = _write_array(fp, grid[group][name])
+                field['units'] = grid.field_units(group, name)
+                header['fields'][group][name] = field
+
+        offset = fp.tell()
+        fp.write(json.dumps(header, sort_keys=True).encode('utf-8'))
+        fp.write(_TRAILER.pack(offset))
 
 
-def load_grid(path):
+def load_grid(path, mmap_mode=None):
     """Load a grid and its fields from a Landlab "native" format.
-    
-    This method uses cPickle to load a saved grid.
-    It assumes you saved using vmg.save() or save_grid, i.e., that the
-    pickle file is a .grid file.
-    
-    Caution: Pickling can be slow, and can produce very large files.
-    Caution 2: Future updates to Landlab could potentially render old
-    saves unloadable.
+
+    The grid is made again from the arguments saved with it, and then its
+    node statuses and fields are set from those that were saved. Use
+    *mmap_mode* to map the fields onto the file, rather than reading them,
+    so that a large grid can be loaded quickly and without needing memory
+    for all of its fields.
+
+    Files saved (by pickling the grid) with earlier versions of Landlab can
+    still be loaded, though this is deprecated.
 
     Parameters
     ----------
     path : str
         Path to output file, either without suffix, or '.grid'
+    mmap_mode : {None, 'r+', 'r', 'c'}, optional
+        If not None, memory-map the fields using the given mode (see
+        ``numpy.memmap`` for a description of the modes). Changes to fields
+        mapped with 'r+' are written to the file.
+
+    Returns
+    -------
+    ModelGrid
+        The loaded grid.
 
     Examples
     --------
@@ -82,17 +271,58 @@ def load_grid(path):
     >>> x = np.random.rand(20)
     >>> y = np.random.rand(20)
     >>> grid_out = VoronoiDelaunayGrid(x, y)
+    >>> _ = grid_out.add_field('node', 'topographic__elevation', x + y,
+    ...                        units='m')
     >>> save_grid(grid_out, 'testsavedgrid.grid', clobber=True)
-    >>> grid_in = load_grid('testsavedgrid.grid')
+    >>> grid_in = load_grid('testsavedgrid.grid', mmap_mode='r')
+    >>> np.all(grid_in.at_node['topographic__elevation'] == x + y)
+    True
+    >>> grid_in.field_units('node', 'topographic__elevation')
+    'm'
+    >>> del grid_in
     >>> os.remove('testsavedgrid.grid') #to remove traces of this test
     """
-    
-    (base, ext) = os.path.splitext(path)
-    if ext != '.grid':
-        ext = ext+'.grid'
-    path = base+ext
+    if mmap_mode not in (None, 'r+', 'r', 'c'):
+        raise ValueError("mmap_mode must be one of None, 'r+', 'r' or 'c'")
+
+    path = _add_suffix(path)
     with open(path, 'rb') as fp:
-        loaded_grid = cPickle.load(fp)
+        header = _read_header(fp)
+        if header is None:
+            return _load_pickled_grid(fp)
+
+        arrays = dict(
+            (name, _read_array(fp, path, description))
+            for (name, description) in header['arrays'].items())
+        args = header['args']
+        args['index_dtype'] = np.dtype(args['index_dtype'])
+        for (grid_type, _, _, make_grid) in _grid_types():
+            if grid_type.__name__ == header['grid_type']:
+                grid = make_grid(args, arrays)
+                break
+        else:
+            raise ValueError('unknown grid type %s' % header['grid_type'])
+
+        node_status = arrays['node_status']
+        if np.any(grid.node_status != node_status):
+            grid.node_status[:] = node_status
+            grid.update_links_nodes_cells_to_new_BCs()
+
+        for (group, fields) in header['fields'].items():
+            for (name, description) in fields.items():
+                grid.add_field(group, name,
+                               _read_array(fp, path, description,
+                                           mmap_mode=mmap_mode),
+                               units=description['units'])
+
+    return grid
+
+
+def _load_pickled_grid(fp):
+    """Load a grid that was pickled by an earlier version of Landlab."""
+    warnings.warn('loading a pickled grid; save it again to convert it to '
+                  'the current native format', DeprecationWarning)
+    fp.seek(0)
+    loaded_grid = cPickle.load(fp)
     assert issubclass(type(loaded_grid), ModelGrid)
     return loaded_grid
-
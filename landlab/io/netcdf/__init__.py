@@ -16,10 +16,10 @@ NETCDF3_64BIT_EXAMPLE_FILE = os.path.join(os.path.dirname(__file__), 'tests',
 
 
 from .read import read_netcdf
-from .write import write_netcdf
+from .write import write_netcdf, NetcdfWriter
 from .errors import NotRasterGridError
 
 
-__all__ = ['read_netcdf', 'write_netcdf', 'NotRasterGridError',
+__all__ = ['read_netcdf', 'write_netcdf', 'NetcdfWriter', 'NotRasterGridError',
            'WITH_NETCDF4', 'NETCDF4_EXAMPLE_FILE',
            'NETCDF3_64BIT_EXAMPLE_FILE']
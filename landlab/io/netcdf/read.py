@@ -14,8 +14,11 @@ from scipy.io import netcdf as nc
 import os
 import types
 import re
+import warnings
+from functools import partial
 
 import numpy as np
+import six
 
 from landlab.io.netcdf.errors import NotRasterGridError
 from landlab.io.netcdf._constants import (_AXIS_DIMENSION_NAMES,
@@ -60,26 +63,137 @@ def _read_netcdf_coordinate_units(root):
     return units
 
 
+def _open_netcdf(nc_file):
+    """Open a netcdf file for reading, whatever its format."""
+    try:
+        return nc.netcdf_file(nc_file, 'r', version=2)
+    except TypeError:
+        return nc4.Dataset(nc_file, 'r', format='NETCDF4')
+
+
+def _close_netcdf(root):
+    """Close a netcdf file, leaving views of its data usable.
+
+    A netcdf3 file is memory-mapped, so arrays read from it without being
+    copied keep the map open after the file is closed.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        root.close()
+
+
 def _read_netcdf_structured_grid(root):
-    shape = _read_netcdf_grid_shape(root)
-    coordinates = _read_netcdf_coordinate_values(root)
-    units = _read_netcdf_coordinate_units(root)
+    """Coordinates of the rows, and columns, of a raster's nodes.
 
-    for coordinate in coordinates:
-        coordinate.shape = shape
+    Rather than the coordinates of every node, only the first column of *y*
+    and the first row of *x* are read. These are returned with shapes
+    ``(n_rows, 1)`` and ``(1, n_cols)``.
+    """
+    shape = _read_netcdf_grid_shape(root)
+    coordinates = []
+    for (axis, name) in enumerate(_AXIS_COORDINATE_NAMES[-2:]):
+        var = root.variables[name]
+        if len(var.shape) == 2:
+            index = (slice(None), slice(0, 1)) if axis == 0 else (
+                slice(0, 1), slice(None))
+            coordinate = np.array(var[index])
+        else:
+            coordinate = np.array(var[:]).reshape(shape)
+            coordinate = coordinate[:, :1] if axis == 0 else coordinate[:1]
+        coordinates.append(coordinate)
 
     return coordinates
 
 
-def _read_netcdf_structured_data(root):
+def _read_netcdf_structured_data(root, names=None, rows=None, cols=None,
+                                 time=-1, copy=True):
     fields = dict()
-    for (name, var) in root.variables.items():
-        if not name in _COORDINATE_NAMES:
-            fields[name] = var[:].copy()
-            fields[name].shape = (fields[name].size, )
+    for name in _field_names(root, names):
+        fields[name] = _read_netcdf_node_values(
+            root.variables[name], rows=rows, cols=cols, time=time, copy=copy)
     return fields
 
 
+def _field_names(root, names=None):
+    """Names of the variables, other than coordinates, to read as fields."""
+    if names is None:
+        return [name for name in root.variables
+                if name not in _COORDINATE_NAMES]
+    if isinstance(names, six.string_types):
+        names = [names]
+    for name in names:
+        if name not in root.variables:
+            raise ValueError('%s: variable not found' % name)
+    return list(names)
+
+
+def _read_netcdf_node_values(var, rows=None, cols=None, time=-1, copy=True):
+    """Values of a variable at nodes, within a window, as a flat array.
+
+    Values are read from the time slice, *time*, for a variable that
+    varies with time. If *copy* is False, and the variable is memory-mapped
+    (a netcdf3 file), the values are a view of those in the file if the
+    window spans whole rows of nodes.
+    """
+    index = (rows or slice(None), cols or slice(None))
+    if var.dimensions[0] == 'nt':
+        index = (time, ) + index
+
+    values = var[index]
+    if copy and not values.flags.owndata:
+        values = values.copy()
+    return values.reshape((values.size, ))
+
+
+def _read_netcdf_field(nc_file, name, rows=None, cols=None, time=-1,
+                       copy=True):
+    """Read the values of one field of a netcdf file."""
+    root = _open_netcdf(nc_file)
+    try:
+        return _read_netcdf_node_values(root.variables[name], rows=rows,
+                                        cols=cols, time=time, copy=copy)
+    finally:
+        _close_netcdf(root)
+
+
+def _find_window(x, y, bbox=None):
+    """Rows and columns of nodes that are within a bounding box.
+
+    Parameters
+    ----------
+    x : ndarray
+        Coordinates of the columns of nodes.
+    y : ndarray
+        Coordinates of the rows of nodes.
+    bbox : tuple of float, optional
+        Bounding box as ``(x_min, y_min, x_max, y_max)``. If not given, the
+        window is all of the rows and columns.
+
+    Returns
+    -------
+    tuple of slice
+        Rows and columns of the window.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.io.netcdf.read import _find_window
+    >>> _find_window(np.arange(3.), np.arange(4.), (.5, 1., 2., 2.5))
+    (slice(1, 3, None), slice(1, 3, None))
+    """
+    if bbox is None:
+        return (slice(0, len(y)), slice(0, len(x)))
+
+    (x_min, y_min, x_max, y_max) = bbox
+    cols = np.where((x >= x_min) & (x <= x_max))[0]
+    rows = np.where((y >= y_min) & (y <= y_max))[0]
+    if len(cols) == 0 or len(rows) == 0:
+        raise ValueError('bounding box does not contain any nodes')
+
+    return (slice(int(rows[0]), int(rows[-1]) + 1),
+            slice(int(cols[0]), int(cols[-1]) + 1))
+
+
 def _get_raster_spacing(coords):
     spacing = np.empty(len(coords), dtype=np.float64)
 
@@ -99,7 +213,8 @@ def _get_raster_spacing(coords):
         return spacing[0]
 
 
-def read_netcdf(nc_file, just_grid=False):
+def read_netcdf(nc_file, just_grid=False, names=None, time=-1, bbox=None,
+                lazy=False, copy=True):
     """Create a :class:`~.RasterModelGrid` from a netcdf file.
 
     Create a new :class:`~.RasterModelGrid` from the netcdf file, *nc_file*.
@@ -107,12 +222,35 @@ def read_netcdf(nc_file, just_grid=False):
     To create a new grid without any associated data from the netcdf file,
     set the *just_grid* keyword to ``True``.
 
+    For large files, use *names* to read only some of the variables, *time*
+    to choose the time slice that is read, and *bbox* to make a grid of only
+    the nodes within a bounding box. If *lazy* is True, the values of a
+    field aren't read from the file until the field is first used.
+
     Parameters
     ----------
     nc_file : str
         Name of a netcdf file.
     just_grid : boolean, optional
         Create a new grid but don't add value data.
+    names : str or iterable of str, optional
+        Names of the variables to read as fields. If not given, read all of
+        the variables, other than coordinates.
+    time : int, optional
+        Index of the time slice to read, for variables that vary with time.
+        By default, read the last.
+    bbox : tuple of float, optional
+        Bounding box, as ``(x_min, y_min, x_max, y_max)``, of the nodes to
+        read. The new grid is made from only these rows and columns of
+        nodes (like all rasters, its lower-left node is at (0, 0)).
+    lazy : boolean, optional
+        Read the values of each field when it is first used, rather than
+        when the grid is made.
+    copy : boolean, optional
+        If False, don't copy the values of fields from a netcdf3 file, but
+        have them be read-only views of the file's memory-map. This is only
+        possible if the grid spans whole rows of the file; otherwise,
+        values are copied.
 
     Returns
     -------
@@ -152,30 +290,40 @@ def read_netcdf(nc_file, just_grid=False):
     True
     >>> grid.node_spacing
     1.0
+
+    Make a grid of only the nodes within a bounding box.
+
+    >>> grid = read_netcdf(NETCDF3_64BIT_EXAMPLE_FILE, bbox=(0., 1., 2., 3.))
+    >>> grid.shape == (3, 3)
+    True
+    >>> grid.at_node['planet_surface__elevation']
+    array([  3.,   4.,   5.,   6.,   7.,   8.,   9.,  10.,  11.])
     """
     from landlab import RasterModelGrid
 
+    root = _open_netcdf(nc_file)
     try:
-        root = nc.netcdf_file(nc_file, 'r', version=2)
-    except TypeError:
-        root = nc4.Dataset(nc_file, 'r', format='NETCDF4')
-
-    node_coords = _read_netcdf_structured_grid(root)
-
-    assert(len(node_coords) == 2)
-
-    spacing = _get_raster_spacing(node_coords)
-
-    shape = node_coords[0].shape
-
-    grid = RasterModelGrid(num_rows=shape[0], num_cols=shape[1],
-                           dx=spacing)
-
-    if not just_grid:
-        fields = _read_netcdf_structured_data(root)
-        for (name, values) in fields.items():
-            grid.add_field('node', name, values)
-
-    root.close()
+        (y, x) = _read_netcdf_structured_grid(root)
+        spacing = _get_raster_spacing((y, x))
+        (rows, cols) = _find_window(x[0], y[:, 0], bbox)
+
+        grid = RasterModelGrid(num_rows=rows.stop - rows.start,
+                               num_cols=cols.stop - cols.start, dx=spacing)
+
+        if not just_grid:
+            if lazy:
+                for name in _field_names(root, names):
+                    grid.add_lazy_field(
+                        'node', name,
+                        partial(_read_netcdf_field, nc_file, name, rows=rows,
+                                cols=cols, time=time, copy=copy))
+            else:
+                fields = _read_netcdf_structured_data(
+                    root, names=names, rows=rows, cols=cols, time=time,
+                    copy=copy)
+                for (name, values) in fields.items():
+                    grid.add_field('node', name, values)
+    finally:
+        _close_netcdf(root)
 
     return grid
@@ -4,11 +4,17 @@ Unit tests for landlab.io.netcdf module.
 """
 
 import os
+import warnings
+
 import numpy as np
-from nose.tools import assert_equal
+from numpy.testing import assert_array_equal
+from nose.tools import assert_equal, assert_false, raises
 from nose.plugins.skip import SkipTest
 
-from landlab.io.netcdf import read_netcdf, WITH_NETCDF4
+from landlab import RasterModelGrid
+from landlab.io.netcdf import (read_netcdf, write_netcdf, NetcdfWriter,
+                               WITH_NETCDF4)
+from landlab.testing.tools import cdtemp
 
 
 _TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
@@ -25,3 +31,80 @@ def test_read_netcdf4():
 
     grid = read_netcdf(os.path.join(_TEST_DATA_DIR, 'test-netcdf4.nc'))
     assert_equal(grid.shape, (4, 3))
+
+
+def test_read_names():
+    grid = read_netcdf(os.path.join(_TEST_DATA_DIR, 'test-netcdf3-64bit.nc'),
+                       names='planet_surface__elevation')
+    assert_equal(list(grid.at_node.keys()), ['planet_surface__elevation'])
+
+    grid = read_netcdf(os.path.join(_TEST_DATA_DIR, 'test-netcdf3-64bit.nc'),
+                       names=[])
+    assert_equal(list(grid.at_node.keys()), [])
+
+
+@raises(ValueError)
+def test_read_missing_name():
+    read_netcdf(os.path.join(_TEST_DATA_DIR, 'test-netcdf3-64bit.nc'),
+                names='surface__temperature')
+
+
+def test_read_bbox():
+    grid = RasterModelGrid((5, 6), 2.)
+    grid.add_field('node', 'topographic__elevation', np.arange(30.))
+    with cdtemp() as _:
+        write_netcdf('test.nc', grid, format='NETCDF3_64BIT')
+        grid = read_netcdf('test.nc', bbox=(1., 1., 7., 6.))
+    assert_equal(grid.shape, (3, 3))
+    assert_equal(grid.node_spacing, 2.)
+    assert_array_equal(grid.at_node['topographic__elevation'],
+                       [7., 8., 9., 13., 14., 15., 19., 20., 21.])
+
+
+@raises(ValueError)
+def test_read_empty_bbox():
+    read_netcdf(os.path.join(_TEST_DATA_DIR, 'test-netcdf3-64bit.nc'),
+                bbox=(10., 10., 20., 20.))
+
+
+def test_read_time():
+    grid = RasterModelGrid((4, 3))
+    grid.add_field('node', 'topographic__elevation', np.arange(12.))
+    with cdtemp() as _:
+        with NetcdfWriter('test.nc', grid, format='NETCDF3_64BIT') as writer:
+            for time in range(3):
+                grid.at_node['topographic__elevation'] += 1.
+                writer.write(time=time)
+
+        for (time, offset) in ((0, 1.), (1, 2.), (-1, 3.)):
+            assert_array_equal(
+                read_netcdf('test.nc', time=time).at_node[
+                    'topographic__elevation'],
+                np.arange(12.) + offset)
+
+
+def test_read_lazy():
+    grid = RasterModelGrid((4, 3))
+    grid.add_field('node', 'topographic__elevation', np.arange(12.))
+    with cdtemp() as _:
+        write_netcdf('test.nc', grid, format='NETCDF3_64BIT')
+        lazy_grid = read_netcdf('test.nc', lazy=True, bbox=(0., 1., 2., 3.))
+        assert_equal(list(lazy_grid.at_node.keys()),
+                     ['topographic__elevation'])
+
+        grid.at_node['topographic__elevation'] *= 2.
+        write_netcdf('test.nc', grid, format='NETCDF3_64BIT')
+        assert_array_equal(lazy_grid.at_node['topographic__elevation'],
+                           2. * np.arange(3., 12.))
+
+
+def test_read_without_copy():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        grid = read_netcdf(
+            os.path.join(_TEST_DATA_DIR, 'test-netcdf3-64bit.nc'),
+            copy=False, bbox=(0., 1., 2., 3.))
+    values = grid.at_node['planet_surface__elevation']
+    assert_false(values.flags.owndata)
+    assert_false(values.flags.writeable)
+    assert_array_equal(values, np.arange(3., 12.))
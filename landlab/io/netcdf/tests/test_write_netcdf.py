@@ -14,7 +14,8 @@ except ImportError:
 from numpy.testing import assert_array_equal
 
 from landlab import RasterModelGrid
-from landlab.io.netcdf import write_netcdf, NotRasterGridError, WITH_NETCDF4
+from landlab.io.netcdf import (write_netcdf, NetcdfWriter, NotRasterGridError,
+                               WITH_NETCDF4)
 from landlab.io.netcdf.read import _get_raster_spacing
 from landlab.testing.tools import cdtemp
 
@@ -213,6 +214,88 @@ def test_netcdf_write_names_keyword_as_none():
         root.close()
 
 
+def _write_time_series(path, n_times, **kwds):
+    field = RasterModelGrid(4, 3)
+    z = field.add_field('node', 'topographic__elevation', np.arange(12.))
+    field.add_field('node', 'uplift_rate', np.ones(12))
+
+    with NetcdfWriter(path, field, **kwds) as writer:
+        for time in range(n_times):
+            writer.write(time * 10.)
+            z += 1.
+    return field
+
+
+def test_netcdf_writer_time_series():
+    if not WITH_NETCDF4:
+        raise SkipTest('netCDF4 package not installed')
+
+    with cdtemp() as _:
+        _write_time_series('test.nc', 3, names='topographic__elevation')
+        root = nc.Dataset('test.nc', 'r')
+
+        assert_true(root.dimensions['nt'].isunlimited())
+        assert_equal(set(root.variables),
+                     set(['x', 'y', 't', 'topographic__elevation']))
+        assert_array_equal(root.variables['t'][:], [0., 10., 20.])
+        assert_array_equal(
+            root.variables['topographic__elevation'][:].reshape((3, 12)),
+            np.arange(12.) + np.arange(3.).reshape((3, 1)))
+
+        root.close()
+
+
+def test_netcdf_writer_append():
+    if not WITH_NETCDF4:
+        raise SkipTest('netCDF4 package not installed')
+
+    with cdtemp() as _:
+        _write_time_series('test.nc', 2)
+        _write_time_series('test.nc', 3, append=True)
+        root = nc.Dataset('test.nc', 'r')
+        assert_array_equal(root.variables['t'][:], [0., 10., 0., 10., 20.])
+        assert_equal(root.variables['uplift_rate'].shape, (5, 4, 3))
+        root.close()
+
+
+def test_netcdf_writer_compression():
+    if not WITH_NETCDF4:
+        raise SkipTest('netCDF4 package not installed')
+
+    with cdtemp() as _:
+        _write_time_series('test.nc', 2, dtype='float32', zlib=True,
+                           chunksizes={'uplift_rate': (1, 2, 3)},
+                           flush_every=1)
+        root = nc.Dataset('test.nc', 'r')
+
+        elevation = root.variables['topographic__elevation']
+        assert_equal(elevation.dtype, np.float32)
+        assert_true(elevation.filters()['zlib'])
+        assert_true(elevation.filters()['shuffle'])
+        assert_equal(root.variables['uplift_rate'].chunking(), [1, 2, 3])
+        assert_array_equal(elevation[1].reshape(12), np.arange(12.) + 1.)
+
+        root.close()
+
+
+def test_netcdf_writer_netcdf3():
+    from scipy.io import netcdf
+
+    with cdtemp() as _:
+        _write_time_series('test.nc', 3, format='NETCDF3_64BIT')
+        f = netcdf.netcdf_file('test.nc', 'r')
+        assert_array_equal(f.variables['t'][:], [0., 10., 20.])
+        assert_array_equal(f.variables['uplift_rate'][:].flat, np.ones(36))
+        f.close()
+
+
+def test_netcdf_writer_compression_needs_netcdf4():
+    field = RasterModelGrid(4, 3)
+    with cdtemp() as _:
+        assert_raises(ValueError, NetcdfWriter, 'test.nc', field,
+                      format='NETCDF3_64BIT', zlib=True)
+
+
 def test_2d_unit_spacing():
     (x, y) = np.meshgrid(np.arange(5.), np.arange(4.))
 
@@ -3,6 +3,8 @@ import os
 import warnings
 import six
 
+import numpy as np
+
 try:
     import netCDF4 as nc4
 except ImportError:
@@ -59,13 +61,15 @@ def _set_netcdf_structured_dimensions(root, shape):
     dimensions = _get_dimension_sizes(shape)
 
     dims = root.dimensions
-    for (name, dim_size) in dimensions.items():
-        if name not in dims:
-            root.createDimension(name, dim_size)
 
+    # Some netcdf3 writers need the unlimited dimension to be the first.
     if not 'nt' in dims:
         nt = root.createDimension('nt', None)
 
+    for (name, dim_size) in dimensions.items():
+        if name not in dims:
+            root.createDimension(name, dim_size)
+
 
 def _set_netcdf_variables(root, fields, **kwds):
     """Set the field variables.
@@ -108,10 +112,19 @@ def _add_spatial_variables(root, grid, **kwds):
             var.long_name = grid.axis_name[axis]
 
 
-def _add_variables_at_points(root, fields, names=None):
+def _add_variables_at_points(root, fields, names=None, dtype=None,
+                             variable_kwds=None):
+    """Add values of node fields to *root* at its latest time.
+
+    Variables that are not yet in *root* are created, and given units and a
+    long name. *variable_kwds* maps variable names to keywords (for
+    instance, the chunking and compression of a netCDF4 variable) used
+    to create them. Floating-point fields are written as *dtype*, if given.
+    """
     if isinstance(names, six.string_types):
         names = [names]
     names = names or fields['node'].keys()
+    variable_kwds = variable_kwds or {}
 
     vars = root.variables
 
@@ -127,9 +140,15 @@ def _add_variables_at_points(root, fields, names=None):
         try:
             var = vars[var_name]
         except KeyError:
+            var_type = str(node_fields[var_name].dtype)
+            if dtype is not None and var_type.startswith('float'):
+                var_type = str(np.dtype(dtype))
             var = root.createVariable(
-                var_name, _NP_TO_NC_TYPE[str(node_fields[var_name].dtype)],
-                ['nt'] + spatial_variable_shape)
+                var_name, _NP_TO_NC_TYPE[var_type],
+                ['nt'] + spatial_variable_shape,
+                **variable_kwds.get(var_name, {}))
+            var.units = node_fields.units[var_name] or '?'
+            var.long_name = var_name
 
         if node_fields[var_name].size > 1:
             data = node_fields[var_name].view()
@@ -141,9 +160,6 @@ def _add_variables_at_points(root, fields, names=None):
         else:
             var[n_times] = node_fields[var_name].flat[0]
 
-        var.units = node_fields.units[var_name] or '?'
-        var.long_name = var_name
-
 
 def _add_time_variable(root, time, **kwds):
     units = kwds.get('units', 'days')
@@ -255,3 +271,195 @@ def write_netcdf(path, fields, attrs=None, append=False,
     _set_netcdf_variables(root, fields, names=names)
 
     root.close()
+
+
+class NetcdfWriter(object):
+
+    """Write a time series of a grid's fields to a netcdf file.
+
+    The file is opened, and the grid and its attributes are written, once.
+    Each call to :meth:`write` then adds the current values of the fields
+    as the next time along the file's unlimited time dimension. Use the
+    writer as a context manager, or call :meth:`close`, to close the file.
+
+    Parameters
+    ----------
+    path : str
+        Path to output file.
+    fields : field-like
+        Landlab field object that holds a grid and associated values.
+    names : iterable of str, optional
+        Names of the fields to include in the netcdf file. If not provided,
+        write all node fields.
+    format : {'NETCDF3_CLASSIC', 'NETCDF3_64BIT', 'NETCDF4_CLASSIC', 'NETCDF4'}
+        Format of output netcdf file.
+    attrs : dict, optional
+        Attributes to add to netcdf file.
+    append : boolean, optional
+        Append times to an existing file, otherwise clobber the file.
+    time_units : str, optional
+        Units of time.
+    reference : str, optional
+        Reference time that times are measured from.
+    dtype : data-type, optional
+        Data type in the file of floating-point fields (for instance,
+        'float32' to halve the size of a file of float64 fields).
+    chunksizes : tuple of int, or dict, optional
+        Size, in (time, rows, columns), of the chunks in which the values of
+        each field are stored, or a dict of these keyed by field name.
+        netCDF4 formats only.
+    zlib : boolean, optional
+        Compress the values of fields. netCDF4 formats only.
+    complevel : int, optional
+        Compression level, from 1 to 9.
+    shuffle : boolean, optional
+        Shuffle the bytes of values before they are compressed, which
+        usually makes them compress better.
+    flush_every : int, optional
+        Flush the file to disk after this many times have been written. If
+        not given, the file is only flushed when it is closed.
+
+    Notes
+    -----
+    If the netCDF4 package is installed, it is used to write all formats so
+    that each time is written to the file as it is added. Otherwise, files
+    in netCDF3 formats are written with scipy, which holds the file in
+    memory, and rewrites all of it, whenever it is flushed.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.io.netcdf import NetcdfWriter
+
+    >>> rmg = RasterModelGrid(4, 3)
+    >>> z = rmg.add_zeros('node', 'topographic__elevation')
+
+    Create a temporary directory to write the netcdf file into.
+
+    >>> import tempfile, os
+    >>> temp_dir = tempfile.mkdtemp()
+    >>> os.chdir(temp_dir)
+
+    Write the elevations at three times, compressed, as single precision.
+
+    >>> with NetcdfWriter('test.nc', rmg, format='NETCDF4', dtype='float32',
+    ...                   zlib=True) as writer:
+    ...     for time in [0., 10., 20.]:
+    ...         z += 1.
+    ...         writer.write(time)
+
+    >>> from netCDF4 import Dataset
+    >>> root = Dataset('test.nc', 'r')
+    >>> root.variables['t'][:].tolist()
+    [0.0, 10.0, 20.0]
+    >>> root.variables['topographic__elevation'].dtype
+    dtype('float32')
+    >>> root.variables['topographic__elevation'][:, 0, 0].tolist()
+    [1.0, 2.0, 3.0]
+    >>> root.close()
+    """
+
+    def __init__(self, path, fields, names=None, format='NETCDF4',
+                 attrs=None, append=False, time_units='days',
+                 reference='00:00:00 UTC', dtype=None, chunksizes=None,
+                 zlib=False, complevel=4, shuffle=True, flush_every=None):
+        if format not in _VALID_NETCDF_FORMATS:
+            raise ValueError('format not understood')
+        if (chunksizes is not None or zlib) and not format.startswith(
+                'NETCDF4'):
+            raise ValueError('chunking and compression need a netCDF4 format')
+
+        if isinstance(names, six.string_types):
+            names = [names]
+        self._fields = fields
+        self._names = list(names or fields['node'].keys())
+        self._dtype = dtype
+        self._time_kwds = dict(units=time_units, reference=reference)
+        self._flush_every = flush_every
+        self._unflushed = 0
+
+        self._variable_kwds = {}
+        if format.startswith('NETCDF4'):
+            for name in self._names:
+                kwds = dict(zlib=zlib, complevel=complevel, shuffle=shuffle)
+                if isinstance(chunksizes, dict):
+                    kwds['chunksizes'] = chunksizes.get(name)
+                else:
+                    kwds['chunksizes'] = chunksizes
+                self._variable_kwds[name] = kwds
+
+        if os.path.isfile(path) and append:
+            self._root = self._open(path, 'a', format)
+        else:
+            self._root = self._open(path, 'w', format)
+            _set_netcdf_attributes(self._root, attrs or {})
+            _set_netcdf_structured_dimensions(self._root, fields.shape)
+            _add_spatial_variables(self._root, fields)
+
+    @staticmethod
+    def _open(path, mode, format):
+        """Open a netcdf file, with netCDF4 if it is installed."""
+        try:
+            nc4
+        except NameError:
+            if format == 'NETCDF3_CLASSIC':
+                return nc.netcdf_file(path, mode, version=1)
+            elif format == 'NETCDF3_64BIT':
+                return nc.netcdf_file(path, mode, version=2)
+            else:
+                raise ImportError('netCDF4 package is needed to write %s' %
+                                  format)
+        else:
+            if format == 'NETCDF3_64BIT':
+                format = 'NETCDF3_64BIT_OFFSET'
+            return nc4.Dataset(path, mode, format=format)
+
+    @property
+    def number_of_times(self):
+        """Number of times in the file."""
+        try:
+            return len(self._root.variables['t'])
+        except KeyError:
+            return 0
+
+    def write(self, time=None, fields=None):
+        """Add the current values of the fields to the file.
+
+        Parameters
+        ----------
+        time : float, optional
+            Time of the values. If not given, this is the number of times
+            already in the file.
+        fields : field-like, optional
+            Fields to write the values of, if not those the writer was
+            created with (a snapshot of them, for instance). They must be
+            of the same grid.
+        """
+        _add_time_variable(self._root, time, **self._time_kwds)
+        _add_variables_at_points(self._root, fields or self._fields,
+                                 names=self._names,
+                                 dtype=self._dtype,
+                                 variable_kwds=self._variable_kwds)
+
+        self._unflushed += 1
+        if self._flush_every and self._unflushed >= self._flush_every:
+            self.flush()
+
+    def flush(self):
+        """Write any buffered data to disk."""
+        try:
+            self._root.sync()
+        except AttributeError:
+            self._root.flush()
+        self._unflushed = 0
+
+    def close(self):
+        """Close the file."""
+        self._root.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
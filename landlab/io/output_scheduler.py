@@ -0,0 +1,222 @@
+#! /usr/bin/env python
+"""
+Write snapshots of a grid's fields in the background.
+
+An :class:`OutputScheduler` copies the values of selected fields into one of
+a fixed number of preallocated snapshots, and hands the snapshot to a
+background thread that writes it. The model only waits for the copy, while
+the (slower) formatting and writing of the output overlaps with the
+computation of the next time steps. If output is requested faster than it
+can be written, and all of the snapshots are waiting to be written, the
+model waits for one to be free.
+
+A snapshot is a shallow copy of the grid whose fields are the copied
+values, so it can be passed to any of the writers that take a grid (for
+instance, :func:`~landlab.io.esri_ascii.write_esri_ascii`,
+:func:`~landlab.io.native_landlab.save_grid`, or
+:class:`~landlab.io.netcdf.NetcdfWriter`). Its connectivity, coordinates
+and node statuses are those of the grid itself, and are not copied.
+"""
+
+import copy
+import threading
+
+import numpy as np
+import six
+from six.moves import queue
+
+
+class OutputScheduler(object):
+
+    """Write snapshots of a grid's fields in a background thread.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        The grid whose fields are written.
+    write : callable
+        Function that writes a snapshot, called as ``write(snapshot, time)``
+        from the background thread. *snapshot* is a copy of *grid* whose
+        fields hold the values at *time*.
+    names : str, iterable of str, or dict, optional
+        Names of the fields to copy. A name, or names, are of node fields;
+        use a dict of names keyed by group for fields of other groups. If
+        not given, copy all fields.
+    buffers : int, optional
+        Number of snapshots that can be waiting to be written.
+    block : boolean, optional
+        If all snapshots are waiting to be written, wait for one to be free
+        before taking another. Otherwise, don't take the snapshot.
+
+    Notes
+    -----
+    The values of the fields must not be replaced (by adding a new field of
+    the same name) while the scheduler is in use, though they may be changed
+    in place. Fields are written from a thread rather than a process, so
+    that snapshots needn't be sent to another process. Writers that spend
+    most of their time in numpy, or in reading and writing files, release
+    the GIL and so run alongside the model.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.io import OutputScheduler, write_esri_ascii
+
+    >>> rmg = RasterModelGrid((4, 5))
+    >>> z = rmg.add_zeros('node', 'topographic__elevation')
+
+    Create a temporary directory to write the files into.
+
+    >>> import tempfile, os
+    >>> temp_dir = tempfile.mkdtemp()
+    >>> os.chdir(temp_dir)
+
+    Write the elevations as an ESRI ASCII file at each of three times.
+
+    >>> def write(snapshot, time):
+    ...     write_esri_ascii('z_%d.asc' % time, snapshot)
+    >>> with OutputScheduler(rmg, write, names='topographic__elevation',
+    ...                      buffers=2) as scheduler:
+    ...     for time in range(3):
+    ...         z += 1.
+    ...         _ = scheduler.write(time)
+    >>> sorted(os.listdir(temp_dir))
+    ['z_0.asc', 'z_1.asc', 'z_2.asc']
+
+    The values written are those at the time of the call to :meth:`write`.
+
+    >>> from landlab.io import read_esri_ascii
+    >>> (_, z_1) = read_esri_ascii('z_1.asc')
+    >>> np.all(z_1 == 2.)
+    True
+    """
+
+    def __init__(self, grid, write, names=None, buffers=2, block=True):
+        if buffers < 1:
+            raise ValueError('need at least one buffer')
+
+        self._grid = grid
+        self._write = write
+        self._block = block
+        self._names = _names_by_group(grid, names)
+        self._snapshots = [self._make_snapshot() for _ in range(buffers)]
+
+        self._free = queue.Queue()
+        for index in range(buffers):
+            self._free.put(index)
+        self._pending = queue.Queue()
+        self._error = None
+
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _make_snapshot(self):
+        """A copy of the grid with buffers for the fields to write."""
+        snapshot = copy.copy(self._grid)
+        snapshot._groups = dict()
+        for group in self._grid.groups:
+            snapshot.new_field_location(group, self._grid[group].size)
+        for (group, names) in self._names.items():
+            for name in names:
+                values = self._grid[group][name]
+                snapshot.add_field(group, name, np.empty_like(values),
+                                   units=self._grid.field_units(group, name))
+        return snapshot
+
+    @property
+    def number_of_buffers(self):
+        """Number of snapshots that can be waiting to be written."""
+        return len(self._snapshots)
+
+    def write(self, time=None):
+        """Take a snapshot of the fields, to be written in the background.
+
+        Parameters
+        ----------
+        time : float, optional
+            Time of the snapshot, which is passed on to the writer.
+
+        Returns
+        -------
+        boolean
+            True if the snapshot was taken. If *block* is False, and no
+            snapshot is free, this is False and nothing is written.
+        """
+        self._raise_error()
+        if not self._thread.is_alive():
+            raise ValueError('scheduler is closed')
+        try:
+            index = self._free.get(block=self._block)
+        except queue.Empty:
+            return False
+
+        snapshot = self._snapshots[index]
+        for (group, names) in self._names.items():
+            for name in names:
+                np.copyto(snapshot[group][name], self._grid[group][name])
+
+        self._pending.put((index, time))
+        return True
+
+    def _run(self):
+        """Write snapshots as they arrive, until told to stop."""
+        while True:
+            item = self._pending.get()
+            try:
+                if item is None:
+                    return
+                (index, time) = item
+                if self._error is None:
+                    try:
+                        self._write(self._snapshots[index], time)
+                    except Exception as error:
+                        self._error = error
+                self._free.put(index)
+            finally:
+                self._pending.task_done()
+
+    def _raise_error(self):
+        """Raise, in the calling thread, an error raised by the writer."""
+        if self._error is not None:
+            (error, self._error) = (self._error, None)
+            raise error
+
+    def flush(self):
+        """Wait for all snapshots that have been taken to be written."""
+        self._pending.join()
+        self._raise_error()
+
+    def close(self):
+        """Write any remaining snapshots, and stop the background thread."""
+        if self._thread.is_alive():
+            self._pending.put(None)
+            self._thread.join()
+        self._raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _names_by_group(grid, names=None):
+    """Names of fields, keyed by group."""
+    if names is None:
+        return dict((group, list(grid[group].keys())) for group in grid.groups)
+    if isinstance(names, six.string_types):
+        names = [names]
+    if not isinstance(names, dict):
+        names = {'node': names}
+
+    by_group = dict()
+    for (group, group_names) in names.items():
+        if isinstance(group_names, six.string_types):
+            group_names = [group_names]
+        for name in group_names:
+            if not grid.has_field(group, name):
+                raise ValueError('%s: field not found at %s' % (name, group))
+        by_group[group] = list(group_names)
+    return by_group
@@ -0,0 +1,136 @@
+import os
+import warnings
+
+import numpy as np
+from numpy.testing import assert_array_equal
+from nose.tools import assert_equal, assert_is_instance, assert_true, raises
+from six.moves import cPickle
+
+from landlab.testing.tools import cdtemp
+from landlab import (RasterModelGrid, HexModelGrid, RadialModelGrid,
+                     VoronoiDelaunayGrid, CLOSED_BOUNDARY)
+from landlab.io.native_landlab import save_grid, load_grid
+
+
+def _round_trip(grid):
+    with cdtemp() as _:
+        save_grid(grid, 'test.grid')
+        return load_grid('test.grid')
+
+
+def _assert_same_grid(actual, expected):
+    assert_is_instance(actual, type(expected))
+    assert_array_equal(actual.node_x, expected.node_x)
+    assert_array_equal(actual.node_y, expected.node_y)
+    assert_array_equal(actual.node_status, expected.node_status)
+    assert_array_equal(actual.active_links, expected.active_links)
+    assert_array_equal(actual.node_at_link_tail, expected.node_at_link_tail)
+    assert_array_equal(actual.node_at_link_head, expected.node_at_link_head)
+    assert_equal(actual.groups, expected.groups)
+    for group in expected.groups:
+        assert_equal(set(actual[group].keys()), set(expected[group].keys()))
+        for name in expected[group].keys():
+            assert_array_equal(actual[group][name], expected[group][name])
+            assert_equal(actual.field_units(group, name),
+                         expected.field_units(group, name))
+
+
+def test_raster():
+    rmg = RasterModelGrid((4, 5), 2.)
+    rmg.add_field('node', 'topographic__elevation',
+                  np.arange(20.), units='m')
+    rmg.add_ones('link', 'water__discharge', dtype=int)
+    rmg.set_closed_boundaries_at_grid_edges(True, False, True, False)
+    _assert_same_grid(_round_trip(rmg), rmg)
+
+
+def test_raster_with_implicit_connectivity():
+    rmg = RasterModelGrid((4, 5), implicit_connectivity=True)
+    rmg.add_zeros('node', 'topographic__elevation')
+    grid = _round_trip(rmg)
+    assert_true(grid.implicit_connectivity)
+    _assert_same_grid(grid, rmg)
+
+
+def test_hex():
+    for kwds in (dict(), dict(orientation='vertical', shape='rect',
+                              reorient_links=True)):
+        hmg = HexModelGrid(4, 5, 2., **kwds)
+        hmg.add_field('node', 'topographic__elevation', hmg.node_x.copy())
+        hmg.set_status_at_node([0, 1], CLOSED_BOUNDARY)
+        _assert_same_grid(_round_trip(hmg), hmg)
+
+
+def test_radial():
+    omg = RadialModelGrid(3, 1.5)
+    omg.add_ones('cell', 'porosity')
+    _assert_same_grid(_round_trip(omg), omg)
+
+
+def test_voronoi():
+    np.random.seed(1812)
+    vmg = VoronoiDelaunayGrid(np.random.rand(40), np.random.rand(40))
+    vmg.add_field('node', 'topographic__elevation', vmg.node_y.copy())
+    _assert_same_grid(_round_trip(vmg), vmg)
+
+
+def test_mmap_mode():
+    rmg = RasterModelGrid((4, 5))
+    rmg.add_field('node', 'topographic__elevation', np.arange(20.))
+    with cdtemp() as _:
+        save_grid(rmg, 'test.grid')
+
+        grid = load_grid('test.grid', mmap_mode='r')
+        assert_is_instance(grid.at_node['topographic__elevation'], np.memmap)
+        assert_array_equal(grid.at_node['topographic__elevation'],
+                           np.arange(20.))
+
+        grid = load_grid('test.grid', mmap_mode='r+')
+        grid.at_node['topographic__elevation'][:] = 1.
+        grid.at_node['topographic__elevation'].flush()
+        del grid
+        assert_array_equal(
+            load_grid('test.grid').at_node['topographic__elevation'],
+            np.ones(20))
+
+
+def test_add_suffix():
+    rmg = RasterModelGrid((4, 5))
+    with cdtemp() as _:
+        save_grid(rmg, 'no_suffix')
+        assert_true(os.path.isfile('no_suffix.grid'))
+        _assert_same_grid(load_grid('no_suffix'), rmg)
+
+
+@raises(ValueError)
+def test_no_clobber():
+    with cdtemp() as _:
+        save_grid(RasterModelGrid((4, 5)), 'test.grid')
+        save_grid(RasterModelGrid((4, 5)), 'test.grid')
+
+
+@raises(ValueError)
+def test_no_clobber_without_suffix():
+    with cdtemp() as _:
+        save_grid(RasterModelGrid((4, 5)), 'test.grid')
+        save_grid(RasterModelGrid((4, 5)), 'test')
+
+
+def test_clobber_without_suffix():
+    with cdtemp() as _:
+        save_grid(RasterModelGrid((4, 5)), 'test')
+        save_grid(RasterModelGrid((3, 5)), 'test', clobber=True)
+        assert_equal(load_grid('test.grid').shape, (3, 5))
+
+
+def test_load_pickled_grid():
+    rmg = RasterModelGrid((4, 5))
+    with cdtemp() as _:
+        with open('pickled.grid', 'wb') as fp:
+            cPickle.dump(rmg, fp)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            grid = load_grid('pickled.grid')
+    assert_equal(caught[0].category, DeprecationWarning)
+    assert_equal(grid.number_of_nodes, 20)
@@ -0,0 +1,131 @@
+import threading
+
+import numpy as np
+from numpy.testing import assert_array_equal
+from nose.tools import assert_equal, assert_false, assert_true, raises
+
+from landlab.testing.tools import cdtemp
+from landlab import RasterModelGrid
+from landlab.io import OutputScheduler
+from landlab.io.native_landlab import save_grid, load_grid
+
+
+def _grid():
+    rmg = RasterModelGrid((4, 5))
+    rmg.add_field('node', 'topographic__elevation', np.zeros(20), units='m')
+    rmg.add_zeros('link', 'water__discharge')
+    return rmg
+
+
+def test_snapshot_values():
+    rmg = _grid()
+    written = []
+    def write(snapshot, time):
+        written.append((time, snapshot.at_node['topographic__elevation'].copy(),
+                        snapshot.at_link['water__discharge'].copy()))
+
+    with OutputScheduler(rmg, write, buffers=3) as scheduler:
+        for time in range(10):
+            rmg.at_node['topographic__elevation'][:] = time
+            rmg.at_link['water__discharge'][:] = - time
+            assert_true(scheduler.write(time))
+
+    assert_equal([time for (time, _, _) in written], list(range(10)))
+    for (time, z, q) in written:
+        assert_array_equal(z, time)
+        assert_array_equal(q, - time)
+
+
+def test_names():
+    rmg = _grid()
+    snapshots = []
+    with OutputScheduler(rmg, lambda snapshot, time: snapshots.append(
+            snapshot), names='topographic__elevation') as scheduler:
+        scheduler.write()
+
+    assert_equal(list(snapshots[0].at_node.keys()), ['topographic__elevation'])
+    assert_equal(list(snapshots[0].at_link.keys()), [])
+    assert_equal(snapshots[0].field_units('node', 'topographic__elevation'),
+                 'm')
+
+    with OutputScheduler(rmg, lambda snapshot, time: snapshots.append(
+            snapshot), names={'link': ['water__discharge']}) as scheduler:
+        scheduler.write()
+    assert_equal(list(snapshots[1].at_node.keys()), [])
+    assert_equal(list(snapshots[1].at_link.keys()), ['water__discharge'])
+
+
+@raises(ValueError)
+def test_unknown_name():
+    OutputScheduler(_grid(), lambda snapshot, time: None,
+                    names='surface__temperature')
+
+
+def test_back_pressure():
+    rmg = _grid()
+    release = threading.Event()
+    with OutputScheduler(rmg, lambda snapshot, time: release.wait(),
+                         buffers=2, block=False) as scheduler:
+        assert_true(scheduler.write())
+        assert_true(scheduler.write())
+        assert_false(scheduler.write())
+        release.set()
+        scheduler.flush()
+        assert_true(scheduler.write())
+
+
+@raises(IOError)
+def test_error_in_writer():
+    def write(snapshot, time):
+        raise IOError('disk full')
+
+    scheduler = OutputScheduler(_grid(), write)
+    scheduler.write()
+    scheduler.flush()
+
+
+@raises(ValueError)
+def test_write_after_close():
+    scheduler = OutputScheduler(_grid(), lambda snapshot, time: None)
+    scheduler.close()
+    scheduler.write()
+
+
+def test_save_grid():
+    rmg = _grid()
+    rmg.at_node['topographic__elevation'][:] = np.arange(20.)
+    with cdtemp() as _:
+        with OutputScheduler(
+                rmg, lambda snapshot, time: save_grid(snapshot,
+                                                      'grid_%d.grid' % time),
+                buffers=1) as scheduler:
+            for time in range(3):
+                scheduler.write(time)
+                rmg.at_node['topographic__elevation'] += 1.
+
+        for time in range(3):
+            grid = load_grid('grid_%d.grid' % time)
+            assert_array_equal(grid.at_node['topographic__elevation'],
+                               np.arange(20.) + time)
+            assert_equal(grid.field_units('node', 'topographic__elevation'),
+                         'm')
+
+
+def test_netcdf_writer():
+    from landlab.io.netcdf import NetcdfWriter, read_netcdf
+
+    rmg = _grid()
+    with cdtemp() as _:
+        with NetcdfWriter('test.nc', rmg, names='topographic__elevation',
+                          format='NETCDF3_64BIT') as writer:
+            with OutputScheduler(
+                    rmg, lambda snapshot, time: writer.write(time,
+                                                             fields=snapshot),
+                    names='topographic__elevation') as scheduler:
+                for time in range(4):
+                    rmg.at_node['topographic__elevation'][:] = time
+                    scheduler.write(time)
+
+        for time in range(4):
+            grid = read_netcdf('test.nc', time=time)
+            assert_array_equal(grid.at_node['topographic__elevation'], time)
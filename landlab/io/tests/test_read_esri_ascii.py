@@ -275,5 +275,40 @@ def test_name_keyword():
     assert_is(grid.at_node['air__temperature'], field)
 
 
+def test_read_in_small_chunks():
+    from landlab.io import esri_ascii
+
+    chunk_size = esri_ascii._CHUNK_SIZE
+    esri_ascii._CHUNK_SIZE = 5
+    try:
+        (grid, field) = read_esri_ascii(os.path.join(_TEST_DATA_DIR,
+                                                     '4_x_3.asc'))
+    finally:
+        esri_ascii._CHUNK_SIZE = chunk_size
+
+    assert_array_equal(field,
+                       np.array([9., 10., 11.,
+                                 6.,  7.,  8.,
+                                 3.,  4.,  5.,
+                                 0.,  1.,  2.]))
+
+
+def test_rows_keyword():
+    (grid, field) = read_esri_ascii(os.path.join(_TEST_DATA_DIR,
+                                                 'hugo_site.asc'))
+    (sub_grid, sub_field) = read_esri_ascii(
+        os.path.join(_TEST_DATA_DIR, 'hugo_site.asc'), rows=(10, 20),
+        name='topographic__elevation')
+
+    assert_equal(sub_grid.number_of_node_rows, 10)
+    assert_equal(sub_grid.number_of_node_columns, 76)
+    assert_array_equal(sub_field, field[10 * 76:20 * 76])
+    assert_is(sub_grid.at_node['topographic__elevation'], sub_field)
+
+
+def test_rows_out_of_range():
+    assert_raises(ValueError, read_esri_ascii,
+                  os.path.join(_TEST_DATA_DIR, '4_x_3.asc'), rows=(2, 5))
+
 if __name__ == '__main__':
     unittest.main()
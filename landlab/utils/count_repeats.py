@@ -40,22 +40,24 @@ def count_repeated_values(x):
     (array([30]), array([3]))
 
     """
-    counts = []
+    # Sort the values (stably, so that repeats stay in the order they
+    # appear), and number each repeat within its run of equal values. The
+    # n-th element of the list holds the values with an n-th repeat.
+    x = np.asarray(x)
+    order = np.argsort(x, kind='mergesort')
+    sorted_x = x[order]
+
+    is_first = np.empty(len(x), dtype=bool)
+    is_first[:1] = True
+    np.not_equal(sorted_x[1:], sorted_x[:-1], out=is_first[1:])
+    first_of_run = np.maximum.accumulate(
+        np.where(is_first, np.arange(len(x)), 0))
+    repeat = np.arange(len(x)) - first_of_run
 
-    (unique_values, unique_inds) = np.unique(x, return_index=True)
-    if len(unique_values) > 0:
-        x_inds = np.arange(len(x))
-        counts.append((unique_values, unique_inds.astype(np.int, copy=False)))
-
-        while 1:
-            x = np.delete(x, unique_inds)
-            x_inds = np.delete(x_inds, unique_inds)
-            (unique_values, unique_inds) = np.unique(x, return_index=True)
-
-            if len(unique_values) > 0:
-                counts.append((unique_values,
-                               x_inds[unique_inds].astype(np.int, copy=False)))
-            else:
-                break
+    counts = []
+    for n in range(repeat.max() + 1 if len(x) > 0 else 0):
+        is_nth = repeat == n
+        counts.append((sorted_x[is_nth],
+                       order[is_nth].astype(np.int, copy=False)))
 
     return counts
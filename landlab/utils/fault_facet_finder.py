@@ -270,9 +270,13 @@ class find_facets(object):
             count += 1
             print("Running ", count, " of ", unique_starting_pts.size)
             #set the local angle of the ft trace:
-            ft_pt_distances_to_node = self.grid.get_distances_of_nodes_to_point((grid.node_x[i],grid.node_y[i]),
-                                                                                    node_subset=self.ft_trace_node_ids)
-            close_ft_nodes = np.less(ft_pt_distances_to_node,5.*grid.node_spacing)
+            #nodes_within_radius includes nodes at the radius; exclude them
+            (nodes_near_pt, dists_near_pt) = grid.nodes_within_radius(
+                (grid.node_x[i],grid.node_y[i]), 5.*grid.node_spacing,
+                return_distances=True)
+            nodes_near_pt = nodes_near_pt[np.less(dists_near_pt,
+                                                  5.*grid.node_spacing)]
+            close_ft_nodes = np.in1d(self.ft_trace_node_ids, nodes_near_pt)
             x = grid.node_x[self.ft_trace_node_ids[close_ft_nodes]]
             y = grid.node_y[self.ft_trace_node_ids[close_ft_nodes]]
             (grad, offset) = np.polyfit(x,y,1)
@@ -369,7 +369,15 @@ def interior_iter(shape):
 
 
 def interior_nodes(shape):
-    return np.fromiter(interior_iter(shape), dtype=np.int)
+    """
+    IDs of the interior nodes of a structured grid.
+
+    >>> from landlab.utils.structured_grid import interior_nodes
+    >>> interior_nodes((4, 5))
+    array([ 6,  7,  8, 11, 12, 13])
+    """
+    nodes = np.arange(node_count(shape), dtype=np.int).reshape(shape)
+    return nodes[1:-1, 1:-1].flatten()
 
 
 def node_coords(shape, *args):
@@ -12,8 +12,12 @@ from distutils.extension import Extension
 import sys
 
 ext_modules = [
+    Extension('landlab.components.cellular_automata.cfuncs',
+              ['landlab/components/cellular_automata/cfuncs.pyx']),
     Extension('landlab.components.flexure.cfuncs',
               ['landlab/components/flexure/cfuncs.pyx']),
+    Extension('landlab.components.flow_accum.cfuncs',
+              ['landlab/components/flow_accum/cfuncs.pyx']),
     Extension('landlab.components.flow_routing.cfuncs',
               ['landlab/components/flow_routing/cfuncs.pyx']),
     Extension('landlab.components.stream_power.cfuncs',